@@ -1,6 +1,4 @@
-import ast
 import boto3
-import json
 import pandas as pd
 import traceback
 import uuid
@@ -20,7 +18,6 @@ from .models import (
     Item,
     Community_user_mapping,
     Media,
-    Media_type,
     Location,
     Item_type,
     Item_state,
@@ -42,6 +39,7 @@ from utilities.auth_utils import auth_free
 from nrm_app.settings import S3_BUCKET, S3_REGION
 from utilities.auth_check_decorator import api_security_check
 from .utils import create_community_for_project
+from .feed import get_community_feed, InvalidCursor
 
 
 # Common parameters that can be reused across endpoints
@@ -1814,9 +1812,13 @@ def update_last_accessed_community(request):
         "total": 1,
         "limit": 5,
         "offset": 0,
-        "has_more": true
+        "has_more": true,
+        "next_cursor": "MjAyNS0wOS0xMFQwNjoyMDo1Mi4xMjM0NTYrMDA6MDB8Nw=="
     }
     ```
+    Pass `next_cursor` back as `cursor` to fetch the next page; cursor pages
+    cost the same regardless of depth. `total` is cached for a few minutes
+    and is omitted (null) when `include_total=false`.
     """,
     manual_parameters=[
         openapi.Parameter(
@@ -1850,7 +1852,20 @@ def update_last_accessed_community(request):
             openapi.IN_QUERY,
             type=openapi.TYPE_INTEGER,
             default=0,
-            description="Number of items to skip",
+            description="Number of items to skip (ignored when cursor is given)",
+        ),
+        openapi.Parameter(
+            "cursor",
+            openapi.IN_QUERY,
+            type=openapi.TYPE_STRING,
+            description="Opaque cursor from a previous response's next_cursor",
+        ),
+        openapi.Parameter(
+            "include_total",
+            openapi.IN_QUERY,
+            type=openapi.TYPE_BOOLEAN,
+            default=True,
+            description="Include the (cached) total item count",
         ),
     ],
     responses={
@@ -1881,6 +1896,7 @@ def update_last_accessed_community(request):
                     "limit": 5,
                     "offset": 0,
                     "has_more": True,
+                    "next_cursor": "MjAyNS0wOS0xMFQwNjoyMDo1Mi4xMjM0NTYrMDA6MDB8Nw==",
                 }
             },
         ),
@@ -1925,12 +1941,12 @@ def get_items_by_community(request):
 
         limit = int(request.query_params.get("limit", 10))
         offset = int(request.query_params.get("offset", 0))
-
-        items_qs = Item.objects.filter(community_id=community_id)
+        cursor = request.query_params.get("cursor")
+        include_total = (
+            request.query_params.get("include_total", "true").lower() != "false"
+        )
 
         if item_type:
-            items_qs = items_qs.filter(item_type=item_type)
-
             if item_state:
                 valid_states = [
                     state.value for state in ITEM_TYPE_STATE_MAP.get(item_type, [])
@@ -1943,7 +1959,6 @@ def get_items_by_community(request):
                         },
                         status=status.HTTP_400_BAD_REQUEST,
                     )
-                items_qs = items_qs.filter(state=item_state)
 
         elif item_state:
             return Response(
@@ -1954,73 +1969,23 @@ def get_items_by_community(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        items_qs = items_qs.order_by("-created_at")
-        total_count = items_qs.count()
-        paginated_items = items_qs[offset : offset + limit]
-
-        data = []
-        for item in paginated_items:
-            lat, lon = None, None
-
-            if item.coordinates:
-                try:
-                    coord = json.loads(item.coordinates)
-                except json.JSONDecodeError:
-                    try:
-                        coord = ast.literal_eval(item.coordinates)
-                    except Exception as e:
-                        print(f"Error parsing coordinates for item {item.id}: {e}")
-                        coord = {}
-
-                if isinstance(coord, dict):
-                    lat = (
-                        float(coord["lat"])
-                        if "lat" in coord and coord["lat"] is not None
-                        else None
-                    )
-                    lon = (
-                        float(coord["lon"])
-                        if "lon" in coord and coord["lon"] is not None
-                        else None
-                    )
-
-            images = list(
-                item.media.filter(media_type=Media_type.IMAGE).values_list(
-                    "media_path", flat=True
-                )
-            )
-            audios = list(
-                item.media.filter(media_type=Media_type.AUDIO).values_list(
-                    "media_path", flat=True
-                )
+        try:
+            feed = get_community_feed(
+                community_id,
+                item_type=item_type,
+                item_state=item_state,
+                limit=limit,
+                cursor=cursor,
+                offset=offset,
+                include_total=include_total,
             )
-
-            data.append(
-                {
-                    "id": item.id,
-                    "number": item.user.contact_number,
-                    "title": item.title,
-                    "item_type": item.item_type,
-                    "state": item.state,
-                    "created_at": item.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    "latitude": lat,
-                    "longitude": lon,
-                    "images": images,
-                    "audios": audios,
-                }
+        except InvalidCursor as e:
+            return Response(
+                {"success": False, "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        return Response(
-            {
-                "success": True,
-                "data": data,
-                "total": total_count,
-                "limit": limit,
-                "offset": offset,
-                "has_more": offset + limit < total_count,
-            },
-            status=status.HTTP_200_OK,
-        )
+        return Response({"success": True, **feed}, status=status.HTTP_200_OK)
 
     except Exception as e:
         print("Exception in get_items_by_community API:", str(e))
@@ -2175,12 +2140,14 @@ def get_items_status(request):
 
         data = [
             {
-                "id": item.id,
-                "title": item.title,
-                "transcription": item.transcript,
-                "status": item.state,
+                "id": item["id"],
+                "title": item["title"],
+                "transcription": item["transcript"],
+                "status": item["state"],
             }
-            for item in items_qs
+            for item in items_qs.order_by("-created_at", "-id").values(
+                "id", "title", "transcript", "state"
+            )
         ]
 
         return Response({"success": True, "data": data}, status=status.HTTP_200_OK)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CommunityEngagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'community_engagement'
+
+    def ready(self):
+        import community_engagement.signals
@@ -0,0 +1,196 @@
+import ast
+import base64
+import json
+from collections import defaultdict
+from datetime import datetime
+
+from django.db.models import Q
+
+from utilities.cache import bump_cache_version, get_or_set_versioned
+
+from .models import Item, Media_type
+
+FEED_TOTAL_CACHE_TIMEOUT = 300  # seconds
+# Item fields that decide which cached totals an item is counted in.
+FEED_TOTAL_FIELDS = ("community_id", "item_type", "state")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_coordinates(raw):
+    """Parse the free-form ``coordinates`` text of an item into (lat, lon).
+
+    Items created by the bot store JSON (``{"lat": .., "lon": ..}``) while
+    older rows may hold a Python-literal dict; anything else yields
+    ``(None, None)``.
+    """
+    if not raw:
+        return None, None
+
+    try:
+        coord = json.loads(raw)
+    except (TypeError, json.JSONDecodeError):
+        try:
+            coord = ast.literal_eval(raw)
+        except Exception:
+            return None, None
+
+    if not isinstance(coord, dict):
+        return None, None
+
+    try:
+        lat = float(coord["lat"]) if coord.get("lat") is not None else None
+        lon = float(coord["lon"]) if coord.get("lon") is not None else None
+    except (TypeError, ValueError):
+        return None, None
+    return lat, lon
+
+
+def encode_cursor(created_at, item_id):
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, item_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor '{cursor}'.")
+
+
+def invalidate_feed_total(community_id):
+    """Bump the per-community version so every process recomputes its totals."""
+    bump_cache_version(f"ce_feed:{community_id}")
+
+
+def get_feed_total(items_qs, community_id, item_type=None, item_state=None):
+    return get_or_set_versioned(
+        f"ce_feed:{community_id}",
+        f"ce_feed_total:{community_id}:{item_type or ''}:{item_state or ''}",
+        items_qs.count,
+        FEED_TOTAL_CACHE_TIMEOUT,
+    )
+
+
+def get_media_paths(item_ids, media_types=(Media_type.IMAGE, Media_type.AUDIO)):
+    """Return ``{item_id: {media_type: [media_path, ...]}}`` in one query."""
+    through = Item.media.through
+    rows = (
+        through.objects.filter(item_id__in=item_ids, media__media_type__in=media_types)
+        .order_by("media_id")
+        .values_list("item_id", "media__media_type", "media__media_path")
+    )
+
+    grouped = defaultdict(lambda: defaultdict(list))
+    for item_id, media_type, media_path in rows:
+        grouped[item_id][media_type].append(media_path)
+    return grouped
+
+
+def feed_page_queryset(items_qs, cursor=None):
+    """Items of ``items_qs`` newest first, starting after ``cursor``.
+
+    The redundant ``created_at <= t`` bound lets the database seek straight
+    to the cursor in ``item_community_feed_idx``; with only the OR of the
+    tie-break it would walk the index from the newest item of the community.
+    """
+    page_qs = (
+        items_qs.select_related("user")
+        .only(
+            "id",
+            "title",
+            "item_type",
+            "state",
+            "created_at",
+            "coordinates",
+            "latitude",
+            "longitude",
+            "user__contact_number",
+        )
+        .order_by("-created_at", "-id")
+    )
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        page_qs = page_qs.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=item_id)
+        )
+    return page_qs
+
+
+def get_community_feed(
+    community_id,
+    item_type=None,
+    item_state=None,
+    limit=10,
+    cursor=None,
+    offset=0,
+    include_total=True,
+):
+    """Return one page of a community's items, newest first.
+
+    Pages are addressed by an opaque ``cursor`` on ``(created_at, id)`` so the
+    cost of a page does not depend on how deep it is. A plain ``offset`` is
+    still honoured when no cursor is given, for older clients; the database
+    reads and discards every row before the offset, so those pages still get
+    slower linearly with depth.
+    """
+    items_qs = Item.objects.filter(community_id=community_id)
+    if item_type:
+        items_qs = items_qs.filter(item_type=item_type)
+        if item_state:
+            items_qs = items_qs.filter(state=item_state)
+
+    total = (
+        get_feed_total(items_qs, community_id, item_type, item_state)
+        if include_total
+        else None
+    )
+
+    page_qs = feed_page_queryset(items_qs, cursor)
+    if cursor:
+        offset = 0
+
+    items = list(page_qs[offset : offset + limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    media = get_media_paths([item.id for item in items])
+
+    data = []
+    for item in items:
+        lat, lon = item.latitude, item.longitude
+        if lat is None and lon is None and item.coordinates:
+            # Rows saved before lat/lon were stored.
+            lat, lon = parse_coordinates(item.coordinates)
+
+        item_media = media.get(item.id, {})
+        data.append(
+            {
+                "id": item.id,
+                "number": item.user.contact_number,
+                "title": item.title,
+                "item_type": item.item_type,
+                "state": item.state,
+                "created_at": item.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "latitude": lat,
+                "longitude": lon,
+                "images": item_media.get(Media_type.IMAGE, []),
+                "audios": item_media.get(Media_type.AUDIO, []),
+            }
+        )
+
+    next_cursor = (
+        encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+    )
+    return {
+        "data": data,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from community_engagement.feed import parse_coordinates
+from community_engagement.models import Item
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill Item.latitude/longitude from the raw coordinates text for rows "
+        "saved before the numeric columns existed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Run without making changes to the database",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of items updated per bulk_update call",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING("DRY RUN MODE"))
+
+        queryset = (
+            Item.objects.filter(latitude__isnull=True, longitude__isnull=True)
+            .exclude(coordinates__isnull=True)
+            .exclude(coordinates="")
+            .only("id", "coordinates")
+            .order_by("id")
+        )
+
+        updated = 0
+        skipped = 0
+        batch = []
+        for item in queryset.iterator(chunk_size=batch_size):
+            lat, lon = parse_coordinates(item.coordinates)
+            if lat is None and lon is None:
+                skipped += 1
+                continue
+            item.latitude, item.longitude = lat, lon
+            batch.append(item)
+            if len(batch) >= batch_size:
+                if not dry_run:
+                    Item.objects.bulk_update(batch, ["latitude", "longitude"])
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            if not dry_run:
+                Item.objects.bulk_update(batch, ["latitude", "longitude"])
+            updated += len(batch)
+
+        self.stdout.write("\n" + "=" * 50)
+        self.stdout.write(f"Updated: {updated}, Unparseable: {skipped}")
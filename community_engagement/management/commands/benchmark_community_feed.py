@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from community_engagement.feed import encode_cursor, feed_page_queryset
+from community_engagement.models import Item
+
+
+class Command(BaseCommand):
+    help = (
+        "Time pages of a community feed at increasing depths with offset "
+        "and cursor paging, and print the query plan of a cursor page"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("community_id", type=int)
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument(
+            "--depths",
+            default="0,1000,10000,100000",
+            help="Comma-separated numbers of items before the page",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run EXPLAIN ANALYZE (PostgreSQL only)",
+        )
+
+    def time_page(self, page_qs, repeat):
+        """Best of ``repeat`` runs of fetching ``page_qs``, in milliseconds."""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(page_qs.all())
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        limit = options["limit"]
+        repeat = options["repeat"]
+        items_qs = Item.objects.filter(community_id=options["community_id"])
+        total = items_qs.count()
+        self.stdout.write(f"Community {options['community_id']}: {total} items")
+
+        explain_options = {"analyze": True} if options["analyze"] else {}
+        page_qs = feed_page_queryset(items_qs)
+        cursor_plan = None
+        for depth in (int(d) for d in options["depths"].split(",")):
+            if depth >= total:
+                self.stdout.write(f"depth {depth}: past the end of the feed")
+                continue
+
+            offset_ms = self.time_page(page_qs[depth : depth + limit + 1], repeat)
+            if depth:
+                created_at, item_id = page_qs.values_list("created_at", "id")[depth - 1]
+                cursor = encode_cursor(created_at, item_id)
+            else:
+                cursor = None
+            cursor_qs = feed_page_queryset(items_qs, cursor)[: limit + 1]
+            cursor_ms = self.time_page(cursor_qs, repeat)
+            if cursor:
+                cursor_plan = cursor_qs.explain(**explain_options)
+
+            self.stdout.write(
+                f"depth {depth}: offset {offset_ms:.1f} ms, cursor {cursor_ms:.1f} ms"
+            )
+
+        if cursor_plan:
+            self.stdout.write("\nPlan of the deepest cursor page:")
+            self.stdout.write(cursor_plan)
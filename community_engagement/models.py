@@ -142,9 +142,37 @@ class Item(models.Model):
     media = models.ManyToManyField(Media, blank=True)
     item_type = models.CharField(max_length=255, choices=Item_type.choices)
     coordinates = models.TextField(blank=True, null=True)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
     state = models.CharField(max_length=255, choices=Item_state.choices)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     community = models.ForeignKey(Community, on_delete=models.CASCADE)
     misc = models.JSONField(blank=True, null=True, default=dict)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["community", "-created_at", "-id"],
+                name="item_community_feed_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets a save tell whether it moved the item between feed totals.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Keep the numeric lat/lon columns in step with the raw coordinates
+        # text so feed reads never have to parse it.
+        from .feed import parse_coordinates
+
+        self.latitude, self.longitude = parse_coordinates(self.coordinates)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "coordinates" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"latitude", "longitude"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,32 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .feed import FEED_TOTAL_FIELDS, invalidate_feed_total
+from .models import Item
+
+
+@receiver(post_save, sender=Item)
+def invalidate_community_feed_total(sender, instance, created, **kwargs):
+    """
+    Drop the cached totals of the communities the item is counted in, once
+    the save commits. Saves that leave its community, type and state alone
+    (edits, media, ratings) do not change any total and write nothing.
+    """
+    loaded = getattr(instance, "_loaded_values", {})
+    current = {
+        field: instance.__dict__.get(field, loaded.get(field))
+        for field in FEED_TOTAL_FIELDS
+    }
+    if created or current != {field: loaded.get(field) for field in FEED_TOTAL_FIELDS}:
+        for community_id in {loaded.get("community_id"), instance.community_id}:
+            if community_id is not None:
+                transaction.on_commit(partial(invalidate_feed_total, community_id))
+    instance._loaded_values = {**loaded, **current}
+
+
+@receiver(post_delete, sender=Item)
+def invalidate_community_feed_total_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_feed_total, instance.community_id))
@@ -1,3 +1,133 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from organization.models import Organization
+from projects.models import Project, AppType
+from users.models import User
+
+from utilities.cache import get_cache_version
+
+from .feed import feed_page_queryset, get_community_feed, parse_coordinates
+from .models import Community, Item, Item_state, Item_type, Media, Media_type
+
+
+class ParseCoordinatesTest(TestCase):
+    def test_json_and_literal_coordinates(self):
+        self.assertEqual(parse_coordinates('{"lat": 24.5, "lon": 86.2}'), (24.5, 86.2))
+        self.assertEqual(parse_coordinates("{'lat': '24.5', 'lon': 86}"), (24.5, 86.0))
+        self.assertEqual(parse_coordinates(""), (None, None))
+        self.assertEqual(parse_coordinates("not coordinates"), (None, None))
+
+
+class CommunityFeedTest(TestCase):
+    def setUp(self):
+        patcher = mock.patch("users.signals.send_email_notification")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        organization = Organization.objects.create(name="Test Organization")
+        self.user = User.objects.create_user(
+            username="member", password="password123", contact_number="919999999999"
+        )
+        project = Project.objects.create(
+            name="Test Community",
+            organization=organization,
+            app_type=AppType.COMMUNITY_ENGAGEMENT,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        self.community = Community.objects.create(project=project)
+
+        self.items = []
+        for i in range(7):
+            item = Item.objects.create(
+                title=f"Item {i}",
+                item_type=Item_type.GRIEVANCE,
+                coordinates=f'{{"lat": {20 + i}, "lon": {80 + i}}}',
+                state=Item_state.UNMODERATED,
+                user=self.user,
+                community=self.community,
+            )
+            for media_type in (Media_type.IMAGE, Media_type.AUDIO):
+                media = Media.objects.create(
+                    user=self.user,
+                    media_type=media_type,
+                    media_path=f"{media_type.lower()}/{i}",
+                    source="BOT",
+                )
+                item.media.add(media)
+            self.items.append(item)
+
+    def test_coordinates_stored_on_save(self):
+        item = Item.objects.get(id=self.items[0].id)
+        self.assertEqual((item.latitude, item.longitude), (20.0, 80.0))
+
+    def test_cursor_pages_cover_feed_once(self):
+        seen = []
+        cursor = None
+        while True:
+            page = get_community_feed(self.community.id, limit=3, cursor=cursor)
+            seen.extend(row["id"] for row in page["data"])
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                self.assertIsNone(cursor)
+                break
+
+        expected = [
+            item.id
+            for item in sorted(
+                self.items, key=lambda i: (i.created_at, i.id), reverse=True
+            )
+        ]
+        self.assertEqual(seen, expected)
+
+    @skipUnless(connection.vendor == "sqlite", "checks SQLite's plan output")
+    def test_cursor_page_seeks_in_the_feed_index(self):
+        cursor = get_community_feed(self.community.id, limit=3)["next_cursor"]
+        items_qs = Item.objects.filter(community_id=self.community.id)
+        plan = feed_page_queryset(items_qs, cursor)[:4].explain()
+        self.assertIn(
+            "USING INDEX item_community_feed_idx (community_id=? AND created_at<?)",
+            plan,
+        )
+
+    def test_page_query_count_is_constant(self):
+        get_community_feed(self.community.id, limit=5)  # warm the total cache
+        # Total cache version, page of items, media of the page
+        with self.assertNumQueries(3):
+            page = get_community_feed(self.community.id, limit=5)
+
+        row = page["data"][0]
+        self.assertEqual(page["total"], 7)
+        self.assertEqual(len(row["images"]), 1)
+        self.assertEqual(len(row["audios"]), 1)
+        self.assertIsNotNone(row["latitude"])
+
+    def test_total_is_recomputed_only_when_counts_change(self):
+        def total():
+            return get_community_feed(
+                self.community.id,
+                item_type=Item_type.GRIEVANCE,
+                item_state=Item_state.UNMODERATED,
+            )["total"]
+
+        version = f"ce_feed:{self.community.id}"
+        self.assertEqual(total(), 7)
+        item = Item.objects.get(id=self.items[0].id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            item.title = "Renamed"
+            item.save()
+        self.assertEqual(get_cache_version(version), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            item.state = Item_state.PUBLISHED
+            item.save()
+        self.assertEqual(get_cache_version(version), 2)
+        self.assertEqual(total(), 6)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            item.delete()
+        self.assertEqual(get_cache_version(version), 3)
@@ -1,9 +1,8 @@
-import json
-
 import geojson
 import geopandas as gpd
+import numpy as np
+import shapely
 from shapely import geometry
-import pickle
 import os
 import ee
 
@@ -17,7 +16,10 @@ from utilities.gee_utils import (
 )
 from .crop_gridXlulc import crop_grids_lulc
 from nrm_app.celery import app
-from utilities.constants import SOI_TEHSIL, CROP_GRID_PATH, CRS_4326
+from utilities.constants import SOI_TEHSIL, CROP_GRID_PATH
+
+GRID_SIZE = 0.004
+COVER_FRAC = 0.3
 
 
 @app.task(bind=True)
@@ -36,7 +38,6 @@ def create_crop_grids(self, state, district, block, gee_account_id):
     if not is_gee_asset_exists(asset_id):
         # Get block coordinates
         block_coords = get_block_coordinates(state, district, block)
-        geom_len = len(block_coords)
         state_dir = os.path.join(CROP_GRID_PATH, state)
 
         if not os.path.exists(state_dir):
@@ -57,9 +58,9 @@ def create_crop_grids(self, state, district, block, gee_account_id):
 
         # Generate required files
         gen_geojson_from_coords(path, block_coords)
-        gen_grids(path, block_coords)
+        grids = gen_grids(block_coords)
 
-        task_id = convert_geojson_to_fc(state, district, block, path, geom_len)
+        task_id = export_crop_grids(state, district, block, grids)
         if task_id:
             task_id_list = check_task_status([task_id])
             print("task_id_list", task_id_list)
@@ -108,108 +109,70 @@ def gen_geojson_from_coords(path, coords):
         geojson.dump(feature_collection, f)
 
 
-def gen_grids(path, coords_list):
-    # Extract the inner coordinate list
-    idx = 1
+def _cell_origins(start, stop, step):
+    """Cell origins from ``start`` up to ``stop``, accumulated step by step."""
+    origins = np.cumsum(np.r_[start, np.full(int((stop - start) / step) + 2, step)])
+    return origins[origins <= stop]
+
+
+def gen_grids(coords_list, grid_size=GRID_SIZE, cover_frac=COVER_FRAC):
+    """
+    Grid cells over each polygon of ``coords_list``, as one
+    ``(n, 4)`` array of ``(min_x, min_y, max_x, max_y)`` per polygon.
+    A cell is kept when at least ``cover_frac`` of it lies inside the polygon.
+    """
+    grids = []
     for coords in coords_list:
-        x_ = []
-        y_ = []
-        for coord in coords:
-            x_.append(coord[0])  # longitude
-            y_.append(coord[1])  # latitude
-
-        min_x = min(x_)
-        max_x = max(x_)
-        min_y = min(y_)
-        max_y = max(y_)
-
-        grid_size = 0.004
-        cover_frac = 0.3
-        grid = []
-
-        curr_x = min_x
-        curr_y = min_y
-        while curr_x <= max_x:
-            while curr_y <= max_y:
-                grid_cell = [
-                    [curr_x, curr_y],
-                    [curr_x + grid_size, curr_y],
-                    [curr_x + grid_size, curr_y + grid_size],
-                    [curr_x, curr_y + grid_size],
-                    [curr_x, curr_y],
-                ]
-                grid.append(grid_cell)
-                curr_y += grid_size
-            curr_y = min_y
-            curr_x += grid_size
-
-        # Create polygon from original coordinates
-        poly2 = geometry.Polygon(coords)
-
-        final_grid = []
-        features = []
-
-        for box in grid:
-            try:
-                poly1 = geometry.Polygon(box)
-                intersection = poly2.intersection(poly1)
-                if (
-                    poly1.within(poly2)
-                    or intersection.area >= cover_frac * grid_size * grid_size
-                ):
-                    # Create GeoJSON feature directly
-                    features.append(
-                        {
-                            "type": "Feature",
-                            "properties": {},
-                            "geometry": {"type": "Polygon", "coordinates": [box]},
-                        }
-                    )
-                    final_grid.append(box)
-            except Exception as e:
-                print(f"Error processing grid cell: {e}")
-                continue
-
-        # with open(path + "_grids_without_LULC_" + str(idx) + ".txt", "w") as f:
-        #     for item in final_grid:
-        #         f.write("%s," % item)
-        #
-        # with open(path + "_grids_without_LULC_" + str(idx) + ".pkl", "wb") as f:
-        #     pickle.dump(final_grid, f)
-
-        feature_collection = {"type": "FeatureCollection", "features": features}
-
-        with open(path + "_grids_without_LULC_" + str(idx) + ".geojson", "w") as f:
-            json.dump(feature_collection, f)
-
-        idx += 1
-
-
-def gdf_to_ee_fc(gdf):
+        coords = np.asarray(coords, dtype=float)[:, :2]
+        min_x, min_y = coords.min(axis=0)
+        max_x, max_y = coords.max(axis=0)
+
+        xs = _cell_origins(min_x, max_x, grid_size)
+        ys = _cell_origins(min_y, max_y, grid_size)
+        bounds = np.column_stack(
+            [
+                np.repeat(xs, len(ys)),
+                np.tile(ys, len(xs)),
+                np.repeat(xs + grid_size, len(ys)),
+                np.tile(ys + grid_size, len(xs)),
+            ]
+        )
+        cells = shapely.box(*bounds.T)
+
+        poly = geometry.Polygon(coords)
+        if not poly.is_valid:
+            poly = shapely.make_valid(poly)
+        shapely.prepare(poly)
+
+        # Only cells on the boundary need an actual intersection.
+        keep = shapely.contains(poly, cells)
+        edge = ~keep & shapely.intersects(poly, cells)
+        keep[edge] = (
+            shapely.area(shapely.intersection(cells[edge], poly))
+            >= cover_frac * grid_size * grid_size
+        )
+        grids.append(bounds[keep])
+    return grids
+
+
+def grid_features(block, grids):
+    """ee.Features with a ``uid`` for the cells returned by ``gen_grids``."""
     features = []
-    for i, row in gdf.iterrows():
-        properties = row.drop("geometry").to_dict()
-        geometry = ee.Geometry(row.geometry.__geo_interface__)
-        feature = ee.Feature(geometry, properties)
-        features.append(feature)
+    for cells in grids:
+        for i, (x0, y0, x1, y1) in enumerate(cells.tolist()):
+            ring = [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+            features.append(
+                ee.Feature(
+                    ee.Geometry({"type": "Polygon", "coordinates": [ring]}),
+                    {"uid": block + "_" + str(i)},
+                )
+            )
     return features
 
 
-def convert_geojson_to_fc(state, district, block, path, geom_len):
-    """Converts the GeoJSON to FeatureCollection and pushes the feature collection to the
-    GEE Asset
-    """
-    features = []
-    for idx in range(1, geom_len + 1):
-        gdf = gpd.read_file(path + "_grids_without_LULC_" + str(idx) + ".geojson")
-        unique_ids = []
-        for i in range(gdf.shape[0]):
-            unique_ids.append(block + "_" + str(i))
-        gdf["uid"] = unique_ids
-        gdf = gdf.to_crs(CRS_4326)
-
-        ee_fc = gdf_to_ee_fc(gdf)
-        features.extend(ee_fc)
+def export_crop_grids(state, district, block, grids):
+    """Pushes the grid cells to a GEE asset, in chunks for large tehsils."""
+    features = grid_features(block, grids)
     print("Features' count=", len(features))
 
     if len(features) > 15000:
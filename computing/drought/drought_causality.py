@@ -19,6 +19,27 @@ from utilities.gee_utils import (
 from utilities.constants import GEE_HELPER_PATH, GEE_PATHS
 
 
+def _bin_counts(values, bins, include_lowest=False):
+    """
+    Per-row count of ``values`` (2D, one row per MWS) falling in each
+    ``(lo, hi]`` bin, as ``pd.cut`` would label them. NaN and out-of-range
+    values are not counted.
+    """
+    counts = []
+    for k, (lo, hi) in enumerate(zip(bins[:-1], bins[1:])):
+        above = values >= lo if include_lowest and k == 0 else values > lo
+        counts.append((above & (values <= hi)).sum(axis=1))
+    return np.column_stack(counts)
+
+
+def _mode_rank(counts):
+    """
+    Rank (1 = last label) of the most frequent label per row; ties go to
+    the earlier label.
+    """
+    return counts.shape[1] - counts.argmax(axis=1)
+
+
 def calculation_df(year, df, gdf):
     vcibins = [-1.0, 40.0, 60.0, 100.0]
     vcilabels = ["poor", "fair", "good"]
@@ -38,109 +59,38 @@ def calculation_df(year, df, gdf):
         "extremelyWet",
     ]
 
-    mDrought = 0
     mDroughtCols = [col for col in df.columns if "meteorological_drought" in col]
     df[f"mDrought_{year}"] = df[mDroughtCols].sum(axis=1)
 
     ##DrySPells START
-    drySpells = 0
     drySpellsCols = [col for col in df.columns if "dryspell" in col]
     df[f"drySpells_{year}"] = df[drySpellsCols].sum(axis=1)
 
     ##Cropping Area Sown in Kharif
-    df[f"cas_{year}_mode"] = 0
-    for index, row in df.iterrows():
-        val = df.at[index, f"percent_of_area_cropped_kharif_{year}"]
-        if val <= 33.3:
-            df.at[index, f"cas_{year}_mode"] = 3
-        elif val <= 50.0:
-            df.at[index, f"cas_{year}_mode"] = 2
-        else:
-            df.at[index, f"cas_{year}_mode"] = 1
-
-    ##VCI START
-    # The code processes VCI data from several columns in the DataFrame.
-    # It categorizes each VCI value into bins (based on vcibins and vcilabels)
-    # and counts how many values fall into each category for each row.
-    # It then determines the most frequent VCI category (the mode) for each row and stores this information in a new column.
-    # VCI START
+    cas = df[f"percent_of_area_cropped_kharif_{year}"].to_numpy(dtype=float)
+    df[f"cas_{year}_mode"] = np.select([cas <= 33.3, cas <= 50.0], [3, 2], 1)
+
+    # VCI, MAI and SPI: count how many weekly values of each MWS fall into
+    # each category, then store the most frequent category as the mode.
     vciCols = [col for col in df.columns if "vci" in col]
-    for l in vcilabels:
-        df[f"vci_{year}_{l}"] = 0
-
-    for index, row in df.iterrows():
-        for col in vciCols:
-            vci_value = row[col]
-            # Check if the value is NaN
-            if pd.isna(vci_value):
-                continue
-            else:
-                category = pd.cut([vci_value], bins=vcibins, labels=vcilabels)[0]
-                if pd.notna(category):
-                    df.at[index, f"vci_{year}_{category}"] += 1
-
-    df[f"vci_{year}_mode"] = 0
-    for index, row in df.iterrows():
-        templ = []
-        i = 1
-        for l in vcilabels[::-1]:
-            templ.append([df.at[index, f"vci_{year}_{l}"], i])
-            i += 1
-        templ.sort()
-        df.at[index, f"vci_{year}_mode"] = templ[-1][1]
-
-    # MAI START
+    counts = _bin_counts(df[vciCols].to_numpy(dtype=float), vcibins)
+    for i, l in enumerate(vcilabels):
+        df[f"vci_{year}_{l}"] = counts[:, i]
+    df[f"vci_{year}_mode"] = _mode_rank(counts)
+
     maiCols = [col for col in df.columns if "mai" in col]
-    for l in mailabels:
-        df[f"mai_{year}_{l}"] = 0
-
-    for index, row in df.iterrows():
-        for col in maiCols:
-            mai_value = row[col]
-            # Check if the value is NaN
-            if pd.isna(mai_value):
-                continue
-            else:
-                category = pd.cut([mai_value], bins=maibins, labels=mailabels)[0]
-                if pd.notna(category):
-                    df.at[index, f"mai_{year}_{category}"] += 1
-
-    df[f"mai_{year}_mode"] = 0
-    for index, row in df.iterrows():
-        templ = []
-        i = 1
-        for l in mailabels[::-1]:
-            templ.append([df.at[index, f"mai_{year}_{l}"], i])
-            i += 1
-        templ.sort()
-        df.at[index, f"mai_{year}_mode"] = templ[-1][1]
-
-    ##SPI START
+    counts = _bin_counts(df[maiCols].to_numpy(dtype=float), maibins)
+    for i, l in enumerate(mailabels):
+        df[f"mai_{year}_{l}"] = counts[:, i]
+    df[f"mai_{year}_mode"] = _mode_rank(counts)
+
     spiCols = [col for col in df.columns if "spi" in col]
-    for l in spilabels:
-        df[f"spi_{year}_{l}"] = 0
-
-    for index, row in df.iterrows():
-        for col in spiCols:
-            spi_value = row[col]
-            if pd.isna(spi_value):
-                continue
-            category = pd.cut(
-                [spi_value], bins=spibins, labels=spilabels, include_lowest=True
-            )[0]
-            if pd.isna(category):
-                continue
-            df.at[index, f"spi_{year}_{category}"] += 1
-
-    df[f"spi_{year}_mode"] = 0
-    for index, row in df.iterrows():
-        templ = []
-        i = 1
-        for l in spilabels[::-1]:
-            templ.append([df.at[index, f"spi_{year}_{l}"], i])
-            i += 1
-        templ.sort()
-        df.at[index, f"spi_{year}_mode"] = templ[-1][1]
+    counts = _bin_counts(
+        df[spiCols].to_numpy(dtype=float), spibins, include_lowest=True
+    )
+    for i, l in enumerate(spilabels):
+        df[f"spi_{year}_{l}"] = counts[:, i]
+    df[f"spi_{year}_mode"] = _mode_rank(counts)
 
     # Option to drop columns from df before merging
     columns_to_drop = [col for col in df.columns if col in gdf.columns and col != "uid"]
@@ -149,129 +99,70 @@ def calculation_df(year, df, gdf):
     return gdf
 
 
-def getWeekVector(fin_df, wkCt, year):
-    map = {"severe": 3, "moderate": 2, "mild": 1}
-    for index, row in fin_df.iterrows():
-        ds = row[f"dryspell_{year}_week_{wkCt}"]
-        rfdev = row[f"monthly_rainfall_deviation_{year}_week_{wkCt}"]
-        spi = row[f"spi_{year}_week_{wkCt}"]
-        vci = row[f"vci_{year}_week_{wkCt}"]
-        mai = row[f"mai_{year}_week_{wkCt}"]
-        cas = row[f"kharif_cropped_sqkm_{year}"]
-
-        vci_class = "mild"
-        if 60 < vci and vci <= 100:
-            vci_class = "severe"
-        elif 40 < vci and vci <= 60:
-            vci_class = "moderate"
-        else:
-            vci_class = "mild"
+# (vci, mai, cas) class -> first of the three paths (dry spell, scanty
+# rainfall, SPI) counted for that combination. Classes: 3 severe,
+# 2 moderate, 1 mild.
+DROUGHT_PATHS = {
+    (3, 3, 3): ("severe_drought_path", 1),
+    (1, 3, 3): ("moderate_drought_path", 1),
+    (2, 3, 3): ("moderate_drought_path", 4),
+    (3, 1, 3): ("moderate_drought_path", 7),
+    (3, 2, 3): ("moderate_drought_path", 10),
+    (3, 3, 1): ("moderate_drought_path", 13),
+    (3, 3, 2): ("moderate_drought_path", 16),
+}
+
+
+def getWeekVector(fin_df, weeks, year):
+    """
+    Add the drought paths and mild-drought scores of ``weeks`` (week numbers
+    of the ``*_{year}_week_{n}`` columns) to the year's counters, for every
+    MWS and week at once.
+    """
+
+    def block(label):
+        return fin_df[[f"{label}_{year}_week_{wkCt}" for wkCt in weeks]]
+
+    dry = block("dryspell").eq(1).to_numpy()
+    scanty = block("monthly_rainfall_deviation").eq("scanty").to_numpy()
+    spi = block("spi").to_numpy(dtype=float)
+    vci = block("vci").to_numpy(dtype=float)
+    mai = block("mai").to_numpy(dtype=float)
+    cas = fin_df[[f"kharif_cropped_sqkm_{year}"]].to_numpy(dtype=float)
+
+    vci_class = np.select(
+        [(vci > 60) & (vci <= 100), (vci > 40) & (vci <= 60)], [3, 2], 1
+    )
+    mai_class = np.select([mai <= 25, mai <= 50], [3, 2], 1)
+    cas_class = np.broadcast_to(
+        np.select([cas <= 33.3, cas <= 50], [3, 2], 1), vci_class.shape
+    )
 
-        mai_class = "mild"
-        if mai <= 25:
-            mai_class = "severe"
-        elif mai <= 50:
-            mai_class = "moderate"
-        else:
-            mai_class = "mild"
+    drought = dry | scanty | (spi < -1.5)
+    # 0: dry spell, 1: scanty rainfall, 2: SPI
+    trigger = np.select([dry, scanty], [0, 1], 2)
+
+    mild = drought.copy()
+    for (v, m, c), (prefix, first) in DROUGHT_PATHS.items():
+        combo = drought & (vci_class == v) & (mai_class == m) & (cas_class == c)
+        mild &= ~combo
+        for k in range(3):
+            fin_df[f"{prefix}{first + k}_{year}"] += (combo & (trigger == k)).sum(
+                axis=1
+            )
 
-        cas_class = "mild"
-        if cas <= 33.3:
-            cas_class = "severe"
-        elif cas <= 50:
-            cas_class = "moderate"
-        else:
-            cas_class = "mild"
-
-        mD = 0
-        if ds == 1 or rfdev == "scanty" or spi < -1.5:
-            mD = 1
-        if mD == 1:
-            if (
-                vci_class == "severe"
-                and mai_class == "severe"
-                and cas_class == "severe"
-            ):
-                if ds == 1:
-                    fin_df.at[index, f"severe_drought_path1_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[index, f"severe_drought_path2_{year}"] += 1
-                else:
-                    fin_df.at[index, f"severe_drought_path3_{year}"] += 1
-            elif (
-                vci_class == "mild" and mai_class == "severe" and cas_class == "severe"
-            ):
-                if ds == 1:
-                    fin_df.at[index, f"moderate_drought_path1_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[index, f"moderate_drought_path2_{year}"] += 1
-                else:
-                    fin_df.at[index, f"moderate_drought_path3_{year}"] += 1
-            elif (
-                vci_class == "moderate"
-                and mai_class == "severe"
-                and cas_class == "severe"
-            ):
-                if ds == 1:
-                    fin_df.at[index, f"moderate_drought_path4_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[index, f"moderate_drought_path5_{year}"] += 1
-                else:
-                    fin_df.at[index, f"moderate_drought_path6_{year}"] += 1
-            elif (
-                vci_class == "severe" and mai_class == "mild" and cas_class == "severe"
-            ):
-                if ds == 1:
-                    fin_df.at[index, f"moderate_drought_path7_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[index, f"moderate_drought_path8_{year}"] += 1
-                else:
-                    fin_df.at[index, f"moderate_drought_path9_{year}"] += 1
-            elif (
-                vci_class == "severe"
-                and mai_class == "moderate"
-                and cas_class == "severe"
-            ):
-                if ds == 1:
-                    fin_df.at[index, f"moderate_drought_path10_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[index, f"moderate_drought_path11_{year}"] += 1
-                else:
-                    fin_df.at[index, f"moderate_drought_path12_{year}"] += 1
-            elif (
-                vci_class == "severe" and mai_class == "severe" and cas_class == "mild"
-            ):
-                if ds == 1:
-                    fin_df.at[index, f"moderate_drought_path13_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[index, f"moderate_drought_path14_{year}"] += 1
-                else:
-                    fin_df.at[index, f"moderate_drought_path15_{year}"] += 1
-            elif (
-                vci_class == "severe"
-                and mai_class == "severe"
-                and cas_class == "moderate"
-            ):
-                if ds == 1:
-                    fin_df.at[index, f"moderate_drought_path16_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[index, f"moderate_drought_path17_{year}"] += 1
-                else:
-                    fin_df.at[index, f"moderate_drought_path18_{year}"] += 1
-            else:
-                if ds == 1:
-                    fin_df.at[index, f"mild_drought_dryspell_score_{year}"] += 1
-                elif rfdev == "scanty":
-                    fin_df.at[
-                        index, f"mild_drought_rainfall_deviation_score_{year}"
-                    ] += 1
-                elif spi < -1.5:
-                    fin_df.at[index, f"mild_drought_spi_score_{year}"] += 1
-                fin_df.at[index, f"mild_drought_vci_score_{year}"] += map[vci_class]
-                fin_df.at[index, f"mild_drought_mai_score_{year}"] += map[mai_class]
-                fin_df.at[
-                    index, f"mild_drought_cropping_area_sown_score_{year}"
-                ] += map[cas_class]
+    for k, name in enumerate(["dryspell", "rainfall_deviation", "spi"]):
+        fin_df[f"mild_drought_{name}_score_{year}"] += (mild & (trigger == k)).sum(
+            axis=1
+        )
+    for name, classes in [
+        ("vci", vci_class),
+        ("mai", mai_class),
+        ("cropping_area_sown", cas_class),
+    ]:
+        fin_df[f"mild_drought_{name}_score_{year}"] += np.where(mild, classes, 0).sum(
+            axis=1
+        )
 
 
 """
@@ -365,12 +256,11 @@ def data_with_column(year, gdf, fin_df):
     sorted_dates = sorted(date_objects)
     sorted_dates_strings = [date[1] for date in sorted_dates]
 
-    new_cols = []
+    week_data = {}
     singleLabels = ["monsoon_onset", "total_weeks", "kharif_cropped_sqkm"]
     for label in singleLabels:
         colname = f"{label}_{year}"
-        fin_df[colname] = gdf[colname]
-        new_cols.append(colname)
+        week_data[colname] = gdf[colname]
 
     labels = [
         "dryspell",
@@ -386,14 +276,12 @@ def data_with_column(year, gdf, fin_df):
             s = sorted_dates_strings[i]
             col = f"{label}_{s}"
             colnew = f"{label}_{year}_week_{i + 1}"
-            fin_df[colnew] = gdf[col]
-            new_cols.append(colnew)
+            week_data[colnew] = gdf[col]
 
-    for i in range(len(sorted_dates_strings)):
-        weekCt = i + 1
-        getWeekVector(fin_df, weekCt, year)
+    fin_df = pd.concat([fin_df, pd.DataFrame(week_data, index=fin_df.index)], axis=1)
+    getWeekVector(fin_df, range(1, len(sorted_dates_strings) + 1), year)
 
-    fin_df.drop(new_cols, axis=1, inplace=True)
+    fin_df.drop(list(week_data), axis=1, inplace=True)
     fin_df[f"mild_drought_vci_score_{year}"] = (
         fin_df[f"mild_drought_vci_score_{year}"] / 6
     ).round(2)
@@ -1,4 +1,5 @@
 import ee
+import pandas as pd
 from computing.utils import (
     sync_layer_to_geoserver,
     save_layer_info_to_db,
@@ -16,6 +17,8 @@ from utilities.gee_utils import (
     merge_fc_into_existing_fc,
 )
 from nrm_app.celery import app
+from computing.tree_health.utils import reduce_class_areas
+from computing.zonal_stats import class_areas
 
 
 @app.task(bind=True)
@@ -103,75 +106,93 @@ def vectorise_lulc(self, state, district, block, start_year, end_year, gee_accou
     return layer_at_geoserver
 
 
+# 0 - Background
+# 1 - Built-up
+# 2 - Water in Kharif
+# 3 - Water in Kharif+Rabi
+# 4 - Water in Kharif+Rabi+Zaid
+# 6 - Tree/Forests
+# 7 - Barrenlands
+# 8 - Single cropping cropland
+# 9 - Single Non-Kharif cropping cropland
+# 10 - Double cropping cropland
+# 11 - Triple cropping cropland
+# 12 - Shrub_Scrub
+LULC_CLASSES = [
+    (1, "built-up_area_"),
+    (2, "k_water_area_"),
+    (3, "kr_water_area_"),
+    (4, "krz_water_area_"),
+    (5, "cropland_area_"),
+    (6, "tree_forest_area_"),
+    (7, "barrenlands_area_"),
+    (8, "single_kharif_cropped_area_"),
+    (9, "single_non_kharif_cropped_area_"),
+    (10, "doubly_cropped_area_"),
+    (11, "triply_cropped_area_"),
+    (12, "shrub_scrub_area_"),
+]
+
+
+def lulc_area_columns(years):
+    """Names of the per-class area columns (in hectares) of the vector."""
+    return [f"{txt}{year}" for _, txt in LULC_CLASSES for year in years]
+
+
+def reduce_lulc_areas(fc, lulc_images, years):
+    """
+    Set the per-class area columns of every year on ``fc`` from one grouped
+    reduction of the stacked LULC images.
+    """
+    return reduce_class_areas(
+        fc,
+        lulc_images,
+        "predicted_label",
+        [{label: f"{txt}{year}" for label, txt in LULC_CLASSES} for year in years],
+        scale=10,
+        crs=lulc_images[0].projection(),
+        keep_sum=True,
+    )
+
+
+def lulc_areas_local(zones, rasters, coverage="exact"):
+    """
+    Same per-class area columns as ``reduce_lulc_areas``, computed on the
+    worker from local or mirrored LULC rasters given as ``{year: raster}``.
+    """
+    years = sorted(rasters)
+    areas = [
+        class_areas(
+            rasters[year],
+            zones,
+            {label: f"{txt}{year}" for label, txt in LULC_CLASSES},
+            coverage=coverage,
+        )
+        for year in years
+    ]
+    return zones.join(pd.concat(areas, axis=1)[lulc_area_columns(years)])
+
+
 def generate_vector(
     start_year, end_year, state, district, block, description, asset_id, fc
 ):
-    lulc_list = []
-    s_year = start_year  # START_YEAR
-    while s_year <= end_year:
-        lulc_list.append(
-            ee.Image(
-                get_gee_asset_path(state, district, block)
-                + valid_gee_text(district.lower())
-                + "_"
-                + valid_gee_text(block.lower())
-                + "_"
-                + str(s_year)
-                + "-07-01_"
-                + str(s_year + 1)
-                + "-06-30_LULCmap_10m"
-            )
+    years = list(range(start_year, end_year + 1))
+    lulc_images = [
+        ee.Image(
+            get_gee_asset_path(state, district, block)
+            + valid_gee_text(district.lower())
+            + "_"
+            + valid_gee_text(block.lower())
+            + "_"
+            + str(year)
+            + "-07-01_"
+            + str(year + 1)
+            + "-06-30_LULCmap_10m"
         )
-        s_year += 1
-
-    lulc = ee.List(lulc_list)
-
-    # 0 - Background
-    # 1 - Built-up
-    # 2 - Water in Kharif
-    # 3 - Water in Kharif+Rabi
-    # 4 - Water in Kharif+Rabi+Zaid
-    # 6 - Tree/Forests
-    # 7 - Barrenlands
-    # 8 - Single cropping cropland
-    # 9 - Single Non-Kharif cropping cropland
-    # 10 - Double cropping cropland
-    # 11 - Triple cropping cropland
-    # 12 - Shrub_Scrub
-
-    args = [
-        {"label": 1, "txt": "built-up_area_"},
-        {"label": 2, "txt": "k_water_area_"},
-        {"label": 3, "txt": "kr_water_area_"},
-        {"label": 4, "txt": "krz_water_area_"},
-        {"label": 5, "txt": "cropland_area_"},
-        {"label": 6, "txt": "tree_forest_area_"},
-        {"label": 7, "txt": "barrenlands_area_"},
-        {"label": 8, "txt": "single_kharif_cropped_area_"},
-        {"label": 9, "txt": "single_non_kharif_cropped_area_"},
-        {"label": 10, "txt": "doubly_cropped_area_"},
-        {"label": 11, "txt": "triply_cropped_area_"},
-        {"label": 12, "txt": "shrub_scrub_area_"},
+        for year in years
     ]
 
-    def res(feature):
-        value = feature.get("sum")
-        value = ee.Number(value).divide(10000)
-        return feature.set(arg["txt"] + str(sy), value)
-
-    for arg in args:
-        s_year = start_year
-        while s_year <= end_year:
-            sy = s_year
-            image = ee.Image(lulc.get(sy - start_year)).select(["predicted_label"])
-            mask = image.eq(ee.Number(arg["label"]))
-            pixel_area = ee.Image.pixelArea()
-            forest_area = pixel_area.updateMask(mask)
-            fc = forest_area.reduceRegions(fc, ee.Reducer.sum(), 10, image.projection())
-            s_year += 1
-            fc = fc.map(res)
-
-    fc = ee.FeatureCollection(fc)
+    fc = reduce_lulc_areas(fc, lulc_images, years)
 
     task = export_vector_asset_to_gee(fc, description, asset_id)
     task_status = check_task_status([task])
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from django.core.management.base import BaseCommand
+
+from computing.surface_water_bodies.merge_swb_ponds import (
+    load_staged_layer,
+    merge_swb_pond_layers,
+)
+
+
+def synthetic_block(num_ponds, seed=0):
+    """Random square ponds and round SWBs (one per three ponds) over a 4x4 MWS grid."""
+    rng = np.random.default_rng(seed)
+    extent = 0.01 * (int(np.sqrt(num_ponds)) + 1)
+    step = extent / 4
+
+    mws_gdf = gpd.GeoDataFrame(
+        {"uid": [f"12_{i}_{j}" for i in range(4) for j in range(4)]},
+        geometry=[
+            shapely.box(i * step, j * step, (i + 1) * step, (j + 1) * step)
+            for i in range(4)
+            for j in range(4)
+        ],
+        crs="EPSG:4326",
+    )
+
+    x, y = rng.uniform(0, extent, (2, num_ponds))
+    ponds_gdf = gpd.GeoDataFrame(
+        geometry=shapely.box(x - 0.0005, y - 0.0005, x + 0.0005, y + 0.0005),
+        crs="EPSG:4326",
+    )
+
+    num_swb = max(num_ponds // 3, 1)
+    x, y = rng.uniform(0, extent, (2, num_swb))
+    swb_gdf = gpd.GeoDataFrame(
+        {"UID": [f"swb_{i}" for i in range(num_swb)]},
+        geometry=shapely.buffer(
+            shapely.points(x, y), rng.uniform(0.0005, 0.003, num_swb), quad_segs=4
+        ),
+        crs="EPSG:4326",
+    )
+    return swb_gdf, ponds_gdf, mws_gdf
+
+
+class Command(BaseCommand):
+    help = "Time the SWB/pond merge on a synthetic block staged as GeoParquet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ponds", type=int, default=30000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        layers = synthetic_block(options["ponds"], options["seed"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, gdf in zip(("swb", "ponds", "mws"), layers):
+                path = os.path.join(tmp, f"{name}.parquet")
+                gdf.to_parquet(path)
+                paths.append(path)
+
+            start = time.perf_counter()
+            swb_gdf, ponds_gdf, mws_gdf = [load_staged_layer(p) for p in paths]
+            loaded = time.perf_counter()
+            merged_gdf = merge_swb_pond_layers(swb_gdf, ponds_gdf, mws_gdf)
+            merged = time.perf_counter()
+
+        self.stdout.write(
+            f"SWBs: {len(swb_gdf)}, ponds: {len(ponds_gdf)}, "
+            f"merged rows: {len(merged_gdf)}"
+        )
+        self.stdout.write(f"Load: {loaded - start:.2f}s, merge: {merged - loaded:.2f}s")
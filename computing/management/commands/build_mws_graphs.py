@@ -0,0 +1,51 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from computing.mws.drainage_graph import build_tehsil_graph, graph_path
+from geoadmin.models import TehsilSOI
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the MWS drainage graph index from the published connectivity "
+        "layer, for one tehsil or every active tehsil"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--state", help="State name")
+        parser.add_argument("--district", help="District name")
+        parser.add_argument("--tehsil", help="Tehsil name")
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Skip tehsils that already have a graph file",
+        )
+
+    def handle(self, *args, **options):
+        if options["state"] and options["district"] and options["tehsil"]:
+            targets = [(options["state"], options["district"], options["tehsil"])]
+        else:
+            targets = list(
+                TehsilSOI.objects.filter(active_status=True).values_list(
+                    "district__state__state_name",
+                    "district__district_name",
+                    "tehsil_name",
+                )
+            )
+
+        built = 0
+        failed = 0
+        for state, district, tehsil in targets:
+            if options["missing_only"] and os.path.exists(
+                graph_path(state, district, tehsil)
+            ):
+                continue
+            try:
+                build_tehsil_graph(state, district, tehsil)
+                built += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"{state}/{district}/{tehsil}: {e}"))
+
+        self.stdout.write(f"Built: {built}, Failed: {failed}")
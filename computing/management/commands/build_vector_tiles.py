@@ -0,0 +1,60 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from geoadmin.models import TehsilSOI
+from public_api.vector_tiles import TILE_LAYERS, build_tehsil_tiles, geometry_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the vector tile geometries of the MWS and village boundary "
+        "layers, for one tehsil or every active tehsil"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--state", help="State name")
+        parser.add_argument("--district", help="District name")
+        parser.add_argument("--tehsil", help="Tehsil name")
+        parser.add_argument(
+            "--layer",
+            choices=sorted(TILE_LAYERS),
+            help="Only build this layer (default: all)",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Skip layers that already have a geometry file",
+        )
+
+    def handle(self, *args, **options):
+        if options["state"] and options["district"] and options["tehsil"]:
+            targets = [(options["state"], options["district"], options["tehsil"])]
+        else:
+            targets = list(
+                TehsilSOI.objects.filter(active_status=True).values_list(
+                    "district__state__state_name",
+                    "district__district_name",
+                    "tehsil_name",
+                )
+            )
+        kinds = [options["layer"]] if options["layer"] else sorted(TILE_LAYERS)
+
+        built = 0
+        failed = 0
+        for state, district, tehsil in targets:
+            for kind in kinds:
+                if options["missing_only"] and os.path.exists(
+                    geometry_path(kind, state, district, tehsil)
+                ):
+                    continue
+                try:
+                    build_tehsil_tiles(kind, state, district, tehsil)
+                    built += 1
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(
+                        self.style.ERROR(f"{state}/{district}/{tehsil} {kind}: {e}")
+                    )
+
+        self.stdout.write(f"Built: {built}, Failed: {failed}")
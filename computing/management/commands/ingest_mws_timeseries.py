@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from geoadmin.models import TehsilSOI
+from public_api.timeseries_store import has_tehsil, ingest_tehsil
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the columnar MWS time-series store (hydrology + NDVI) served by "
+        "get_mws_data, for one tehsil or every active tehsil"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--state", help="State name")
+        parser.add_argument("--district", help="District name")
+        parser.add_argument("--tehsil", help="Tehsil name")
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Skip tehsils that already have a store file",
+        )
+
+    def handle(self, *args, **options):
+        if options["state"] and options["district"] and options["tehsil"]:
+            targets = [(options["state"], options["district"], options["tehsil"])]
+        else:
+            targets = list(
+                TehsilSOI.objects.filter(active_status=True).values_list(
+                    "district__state__state_name",
+                    "district__district_name",
+                    "tehsil_name",
+                )
+            )
+
+        ingested = 0
+        failed = 0
+        for state, district, tehsil in targets:
+            if options["missing_only"] and has_tehsil(state, district, tehsil):
+                continue
+            try:
+                ingest_tehsil(state, district, tehsil)
+                ingested += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"{state}/{district}/{tehsil}: {e}"))
+
+        self.stdout.write(f"Ingested: {ingested}, Failed: {failed}")
@@ -25,6 +25,7 @@ from utilities.constants import (
 from computing.utils import save_layer_info_to_db, update_layer_sync_status
 
 from computing.STAC_specs import generate_STAC_layerwise
+from public_api.vector_tiles import build_tehsil_tiles
 
 
 @app.task(bind=True)
@@ -75,6 +76,11 @@ def generate_tehsil_shape_file_data(self, state, district, block, gee_account_id
         update_layer_sync_status(layer_id=layer_id, sync_to_geoserver=True)
         print("sync to geoserver flag updated")
 
+        try:
+            build_tehsil_tiles("villages", state, district, block)
+        except Exception as e:
+            print(f"Failed to build village vector tiles for {description}: {e}")
+
         layer_STAC_generated = False
         layer_STAC_generated = generate_STAC_layerwise.generate_vector_stac(
             state=state,
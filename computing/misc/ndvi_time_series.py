@@ -9,6 +9,7 @@ from nrm_app.celery import app
 
 from computing.misc.hls_interpolated_ndvi import get_padded_ndvi_ts_image
 from computing.utils import (
+    refresh_mws_time_series,
     get_layer_object,
     save_layer_info_to_db,
     sync_layer_to_geoserver,
@@ -177,6 +178,9 @@ def ndvi_timeseries(
                 print("sync to geoserver flag is updated")
 
                 layer_at_geoserver = True
+
+    if layer_at_geoserver:
+        refresh_mws_time_series(state, district, block)
     return layer_at_geoserver
 
 
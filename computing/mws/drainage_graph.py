@@ -0,0 +1,293 @@
+"""
+In-memory MWS drainage network built from the published connectivity layer.
+
+Each tehsil's ``*_mws_connectivity`` layer is read once and stored as compact
+CSR adjacency arrays (one for downstream edges, one for upstream edges).
+Upstream/downstream k-hop lookups, catchment closure and flow paths are then
+numpy breadth-first searches instead of one GEE ``getInfo()`` per MWS.
+Several tehsils can be merged into one graph to query a whole basin.
+"""
+
+import os
+import threading
+from ast import literal_eval
+
+import numpy as np
+import requests
+
+from nrm_app.settings import EXCEL_PATH, GEOSERVER_URL
+from utilities.file_cache import FileCache
+from utilities.gee_utils import valid_gee_text
+
+# Graphs of the tehsils (or tehsil sets) queried most recently
+_graphs = FileCache(max_entries=64)
+
+
+def graph_path(state, district, tehsil):
+    district = valid_gee_text(district.lower())
+    tehsil = valid_gee_text(tehsil.lower())
+    return os.path.join(
+        EXCEL_PATH,
+        "data/mws_graph",
+        state.replace(" ", "_").upper(),
+        district.upper(),
+        f"{district}_{tehsil}.npz",
+    )
+
+
+def _as_id_list(value):
+    """Connectivity properties hold a uid, a list, or a stringified list."""
+    if value in (None, "", "[]", "None"):
+        return []
+    if isinstance(value, str):
+        try:
+            value = literal_eval(value)
+        except (ValueError, SyntaxError):
+            return [value]
+    if isinstance(value, (list, tuple, set)):
+        return [str(v) for v in value if v not in (None, "")]
+    return [str(value)]
+
+
+def _csr(num_nodes, src, dst):
+    order = np.argsort(src, kind="stable")
+    indices = dst[order].astype(np.int32)
+    counts = np.bincount(src, minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, indices
+
+
+def _neighbors(indptr, indices, frontier):
+    """All CSR neighbours of the nodes in ``frontier`` (with repeats)."""
+    starts = indptr[frontier]
+    lengths = indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(total)]
+
+
+class DrainageGraph:
+    def __init__(self, uids, down_indptr, down_indices, up_indptr, up_indices):
+        self.uids = np.asarray(uids)
+        self.index = {uid: i for i, uid in enumerate(self.uids.tolist())}
+        self.down_indptr = down_indptr
+        self.down_indices = down_indices
+        self.up_indptr = up_indptr
+        self.up_indices = up_indices
+
+    def __len__(self):
+        return len(self.uids)
+
+    @classmethod
+    def from_edges(cls, edges, extra_uids=()):
+        """Build from ``(upstream_uid, downstream_uid)`` pairs."""
+        edges = {(str(a), str(b)) for a, b in edges if a and b and a != b}
+        uids = sorted({u for edge in edges for u in edge} | set(map(str, extra_uids)))
+        index = {uid: i for i, uid in enumerate(uids)}
+
+        src = np.fromiter(
+            (index[a] for a, _ in edges), dtype=np.int64, count=len(edges)
+        )
+        dst = np.fromiter(
+            (index[b] for _, b in edges), dtype=np.int64, count=len(edges)
+        )
+
+        down_indptr, down_indices = _csr(len(uids), src, dst)
+        up_indptr, up_indices = _csr(len(uids), dst, src)
+        return cls(
+            np.array(uids, dtype=str), down_indptr, down_indices, up_indptr, up_indices
+        )
+
+    @classmethod
+    def from_features(cls, features):
+        """Build from connectivity-layer features (``uid``/``upstream``/``downstream``)."""
+        edges = []
+        uids = []
+        for feature in features:
+            props = feature.get("properties", feature)
+            uid = props.get("uid")
+            if not uid:
+                continue
+            uid = str(uid)
+            uids.append(uid)
+            edges.extend((up, uid) for up in _as_id_list(props.get("upstream")))
+            edges.extend((uid, down) for down in _as_id_list(props.get("downstream")))
+        return cls.from_edges(edges, extra_uids=uids)
+
+    @classmethod
+    def merge(cls, graphs):
+        """Union of several graphs, e.g. all tehsils of a basin."""
+        edges = []
+        uids = []
+        for graph in graphs:
+            uids.extend(graph.uids.tolist())
+            src = np.repeat(np.arange(len(graph)), np.diff(graph.down_indptr))
+            edges.extend(
+                zip(
+                    graph.uids[src].tolist(),
+                    graph.uids[graph.down_indices].tolist(),
+                )
+            )
+        return cls.from_edges(edges, extra_uids=uids)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            uids=self.uids,
+            down_indptr=self.down_indptr,
+            down_indices=self.down_indices,
+            up_indptr=self.up_indptr,
+            up_indices=self.up_indices,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data["uids"],
+                data["down_indptr"],
+                data["down_indices"],
+                data["up_indptr"],
+                data["up_indices"],
+            )
+
+    def _node_ids(self, mws_ids):
+        return np.array(
+            [self.index[m] for m in mws_ids if m in self.index], dtype=np.int64
+        )
+
+    def _traverse(self, indptr, indices, mws_ids, hops=None):
+        """Breadth-first levels: list of uid lists, one per hop."""
+        frontier = self._node_ids(mws_ids)
+        visited = np.zeros(len(self), dtype=bool)
+        visited[frontier] = True
+
+        levels = []
+        while frontier.size and (hops is None or len(levels) < hops):
+            reached = np.unique(_neighbors(indptr, indices, frontier))
+            frontier = reached[~visited[reached]]
+            if not frontier.size:
+                break
+            visited[frontier] = True
+            levels.append(self.uids[frontier].tolist())
+        return levels
+
+    def upstream(self, mws_ids, hops=None):
+        """Upstream MWS of ``mws_ids`` grouped by hop; ``hops=None`` walks to the sources."""
+        return self._traverse(self.up_indptr, self.up_indices, mws_ids, hops)
+
+    def downstream(self, mws_ids, hops=None):
+        """Downstream MWS of ``mws_ids`` grouped by hop; ``hops=None`` walks to the outlet."""
+        return self._traverse(self.down_indptr, self.down_indices, mws_ids, hops)
+
+    def catchment(self, mws_ids):
+        """``mws_ids`` plus every MWS that drains into them."""
+        closure = [m for m in mws_ids if m in self.index]
+        for level in self.upstream(mws_ids):
+            closure.extend(level)
+        return closure
+
+    def flow_path(self, source, target):
+        """
+        Shortest chain of MWS from ``source`` to ``target`` along the drainage
+        direction (either way round), or ``None`` when they are not connected.
+        """
+        if source not in self.index or target not in self.index:
+            return None
+        if source == target:
+            return [source]
+
+        for indptr, indices in (
+            (self.down_indptr, self.down_indices),
+            (self.up_indptr, self.up_indices),
+        ):
+            start, goal = self.index[source], self.index[target]
+            parent = np.full(len(self), -1, dtype=np.int64)
+            parent[start] = start
+            frontier = np.array([start], dtype=np.int64)
+            while frontier.size and parent[goal] < 0:
+                lengths = indptr[frontier + 1] - indptr[frontier]
+                reached = _neighbors(indptr, indices, frontier)
+                origins = np.repeat(frontier, lengths)
+                new = parent[reached] < 0
+                reached, origins = reached[new], origins[new]
+                reached, first = np.unique(reached, return_index=True)
+                parent[reached] = origins[first]
+                frontier = reached
+
+            if parent[goal] >= 0:
+                path = [goal]
+                while path[-1] != start:
+                    path.append(parent[path[-1]])
+                return self.uids[path[::-1]].tolist()
+        return None
+
+
+def fetch_connectivity_features(district, tehsil):
+    """Attribute-only WFS read of a tehsil's published connectivity layer."""
+    workspace = "mws_connectivity"
+    layer_name = (
+        f"{valid_gee_text(district.lower())}_{valid_gee_text(tehsil.lower())}"
+        "_mws_connectivity"
+    )
+    params = {
+        "service": "WFS",
+        "version": "1.0.0",
+        "request": "GetFeature",
+        "typeName": f"{workspace}:{layer_name}",
+        "outputFormat": "json",
+        "propertyName": "uid,upstream,downstream",
+    }
+    response = requests.get(
+        f"{GEOSERVER_URL}/{workspace}/ows", params=params, timeout=120
+    )
+    response.raise_for_status()
+    return response.json().get("features", [])
+
+
+def build_tehsil_graph(state, district, tehsil):
+    """Rebuild and store a tehsil's graph from its connectivity layer."""
+    graph = DrainageGraph.from_features(fetch_connectivity_features(district, tehsil))
+    path = graph_path(state, district, tehsil)
+    graph.save(path)
+    print(f"MWS drainage graph stored for {district}/{tehsil}: {len(graph)} MWS")
+    return graph
+
+
+def load_graph(locations):
+    """
+    Graph covering one or more ``(state, district, tehsil)`` locations, built
+    from stored tehsil graphs. Returns ``None`` if none have been built yet.
+    """
+    paths = [graph_path(*location) for location in locations]
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
+        return None
+
+    key = tuple(sorted(paths))
+
+    def build():
+        graphs = [DrainageGraph.load(p) for p in key]
+        return graphs[0] if len(graphs) == 1 else DrainageGraph.merge(graphs)
+
+    return _graphs.get(key, key, build)
+
+
+def get_upstream_mws(state, district, tehsil, mws_ids, hops=None):
+    graph = load_graph([(state, district, tehsil)])
+    if graph is None:
+        return None
+    return {m for level in graph.upstream(mws_ids, hops) for m in level}
+
+
+def get_downstream_mws(state, district, tehsil, mws_ids, hops=None):
+    graph = load_graph([(state, district, tehsil)])
+    if graph is None:
+        return None
+    return {m for level in graph.downstream(mws_ids, hops) for m in level}
@@ -18,6 +18,7 @@ from .well_depth import well_depth
 from .calculateG import calculate_g
 import sys
 from computing.utils import (
+    refresh_mws_time_series,
     save_layer_info_to_db,
     sync_layer_to_geoserver,
     update_layer_sync_status,
@@ -241,6 +242,7 @@ def generate_hydrology(
                 update_layer_sync_status(
                     layer_id=layer_id, is_stac_specs_generated=False
                 )
+                refresh_mws_time_series(state, district, block)
 
             layer_at_geoserver = True
     return layer_at_geoserver
@@ -7,6 +7,7 @@ from computing.utils import (
     update_layer_sync_status,
 )
 
+from public_api.vector_tiles import build_tehsil_tiles
 from utilities.constants import MWS_DATASET
 from utilities.gee_utils import (
     ee_initialize,
@@ -85,6 +86,11 @@ def mws_layer(self, state, district, block, gee_account_id):
         if res and layer_id:
             update_layer_sync_status(layer_id=layer_id, sync_to_geoserver=True)
             print("sync to geoserver flag is updated")
+
+            try:
+                build_tehsil_tiles("mws", state, district, block)
+            except Exception as e:
+                print(f"Failed to build MWS vector tiles for {layer_name}: {e}")
         layer_generated = True
     return layer_generated
 
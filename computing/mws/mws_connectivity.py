@@ -5,6 +5,7 @@ from computing.utils import (
     update_layer_sync_status,
 )
 
+from computing.mws.drainage_graph import build_tehsil_graph
 from utilities.constants import MWS_CONNECTIVITY_DATASET
 from utilities.gee_utils import (
     ee_initialize,
@@ -88,4 +89,9 @@ def generate_mws_connectivity_data(self, state, district, block, gee_account_id)
             update_layer_sync_status(layer_id=layer_id, sync_to_geoserver=True)
             print("sync to geoserver flag is updated")
             layer_at_geoserver = True
+
+            try:
+                build_tehsil_graph(state, district, block)
+            except Exception as e:
+                print(f"Failed to build MWS drainage graph for {description}: {e}")
     return layer_at_geoserver
@@ -14,6 +14,7 @@ from utilities.gee_utils import (
     make_asset_public,
     get_gee_asset_path,
     export_vector_asset_to_gee,
+    append_to_vector_asset,
 )
 from nrm_app.celery import app
 from computing.plantation.utils.plantation_utils import combine_kmls
@@ -23,7 +24,6 @@ from ..utils import (
     sync_fc_to_geoserver,
     update_layer_sync_status,
 )
-import geopandas as gpd
 from projects.models import Project, AppType
 from plantations.models import KMLFile
 
@@ -68,7 +68,7 @@ def site_suitability(
             return
 
         kml_files_obj = KMLFile.objects.filter(project=project)
-        have_new_sites = False
+        new_sites = None
 
         # Create a project-specific directory in Google Earth Engine
         create_gee_dir(
@@ -86,9 +86,10 @@ def site_suitability(
 
         # Check if the asset already exists and handle accordingly
         if is_gee_asset_exists(asset_id):
-            have_new_sites = merge_new_kmls(
-                asset_id, description, project_name, kml_files_obj, have_new_sites
+            new_sites = merge_new_kmls(
+                asset_id, description, project_name, kml_files_obj
             )
+            have_new_sites = new_sites is not None
         else:
             have_new_sites = True
             generate_project_roi(asset_id, description, project_name, kml_files_obj)
@@ -104,6 +105,7 @@ def site_suitability(
             start_year=start_year,
             end_year=end_year,
             have_new_sites=have_new_sites,
+            new_sites=new_sites,
             gee_account_id=gee_account_id,
         )
         # Sync the results to GeoServer for visualization
@@ -133,43 +135,41 @@ def site_suitability(
         # sync_suitability_to_geoserver(vector_asset_id, state, asset_name, layer_id)
 
 
-def merge_new_kmls(asset_id, description, project_name, kml_files_obj, have_new_sites):
+def merge_new_kmls(asset_id, description, project_name, kml_files_obj):
     """
-    Merge new KML files into an existing Google Earth Engine asset.
+    Append the sites of newly uploaded KML files to an existing project ROI.
+
+    Only the KML files whose hash is not yet a ``uid`` of the ROI are read,
+    and they are appended server-side, so the work done per upload depends on
+    the number of new sites rather than on the size of the project.
 
     Args:
         asset_id: Existing asset identifier
         description: Project description
         project_name: Project name
         kml_files_obj: Queryset of KML_Files model
-        have_new_sites: Flag to indicate if new sites are added
-    """
-    # Combine KML files into a GeoDataFrame
-    gdf = combine_kmls(kml_files_obj)
-
-    # Load existing ROI from Earth Engine
-    roi = ee.FeatureCollection(asset_id)
-    roi = gpd.GeoDataFrame.from_features(roi.getInfo())
-
-    # Remove duplicate entries based on 'uid'
-    gdf = gdf[~gdf["uid"].isin(roi["uid"])]
 
-    # If new entries exist, update the asset
-    if gdf.shape[0] > 0:
-        ee.data.deleteAsset(asset_id)
-        have_new_sites = True
-        roi = gdf_to_ee_fc(roi)
-        fc = gdf_to_ee_fc(gdf)
-        asset = ee.FeatureCollection([roi, fc]).flatten()
+    Returns:
+        FeatureCollection of the new sites, or None if there are none
+    """
+    existing_uids = (
+        ee.FeatureCollection(asset_id).aggregate_array("uid").distinct().getInfo()
+    )
+    new_kml_files = kml_files_obj.exclude(kml_hash__in=existing_uids)
+    if not new_kml_files.exists():
+        return None
+
+    # Combine the new KML files into a GeoDataFrame
+    gdf = combine_kmls(new_kml_files)
+    fc = gdf_to_ee_fc(gdf)
 
-        # Export updated feature collection to Earth Engine
-        task = export_vector_asset_to_gee(asset, description, asset_id)
-        check_task_status([task])
-        logger.info("ROI for project: %s exported to GEE", project_name)
-        if is_gee_asset_exists(asset_id):
-            make_asset_public(asset_id)
+    append_to_vector_asset(asset_id, fc, description)
+    logger.info(
+        "%s new sites of project: %s added to the ROI", gdf.shape[0], project_name
+    )
+    make_asset_public(asset_id)
 
-    return have_new_sites
+    return fc
 
 
 def generate_project_roi(asset_id, description, project_name, kml_files_obj):
@@ -17,6 +17,8 @@ from utilities.gee_utils import (
     make_asset_public,
     export_vector_asset_to_gee,
     build_gee_helper_paths,
+    append_to_vector_asset,
+    mosaic_into_raster_asset,
 )
 from computing.plantation.utils.lulc_attachment import get_lulc_data
 from computing.plantation.utils.ndvi_attachment import get_ndvi_data
@@ -42,11 +44,15 @@ def check_site_suitability(
     district=None,
     block=None,
     have_new_sites=False,
+    new_sites=None,
     gee_account_id=None,
 ):
     """
     Perform comprehensive site suitability analysis.
 
+    When a project's suitability vector already exists and ``new_sites`` is
+    given, only the new sites are scored and appended to it.
+
     Args:
         roi: Region of Interest feature collection
         org: Organization name
@@ -57,6 +63,7 @@ def check_site_suitability(
         start_year: Analysis start year
         end_year: Analysis end year
         have_new_sites: Boolean flag for if there are new sites in the ROI
+        new_sites: Feature collection of the sites added to the ROI in this run
         gee_account_id: GEE account ID
 
     Returns:
@@ -85,13 +92,33 @@ def check_site_suitability(
 
     # GEE_HELPER = build_gee_helper_paths(app_type, gee_obj.helper_account.name)
 
+    # Prepare asset description and path
+    description = asset_name + "_vector"
+    asset_id = get_gee_dir_path(path_list, asset_path=GEE_PATH) + description
+
+    # Score only the new sites, into a separate asset that is appended to the
+    # existing vector afterwards, instead of re-scoring the whole project
+    append_new_sites = (
+        project is not None and new_sites is not None and is_gee_asset_exists(asset_id)
+    )
+    project_roi = roi
+    if append_new_sites:
+        roi = new_sites
+        pss_asset_name = f"{asset_name}_new_sites"
+        vector_description = f"{description}_new_sites"
+        vector_asset_id = f"{asset_id}_new_sites"
+    else:
+        pss_asset_name = asset_name
+        vector_description = description
+        vector_asset_id = asset_id
+
     # Generate Plantation Site Suitability raster
     # Here, kept start_year=end_year-2 as in this site assessment script, we are taking into account the data of the latest three years only.
     pss_rasters_asset, is_default_profile = get_pss(
         roi=roi,
         start_year=end_year - 2,
         end_year=end_year,
-        asset_name=asset_name,
+        asset_name=pss_asset_name,
         org=org,
         project=project,
         have_new_sites=have_new_sites,
@@ -105,12 +132,11 @@ def check_site_suitability(
 
     print("is_default_profile= ", is_default_profile)
 
-    # Prepare asset description and path
-    description = asset_name + "_vector"
-    asset_id = get_gee_dir_path(path_list, asset_path=GEE_PATH) + description
-
     # Remove existing asset if it exists
-    if is_gee_asset_exists(asset_id):
+    if append_new_sites:
+        if is_gee_asset_exists(vector_asset_id):
+            ee.data.deleteAsset(vector_asset_id)
+    elif is_gee_asset_exists(asset_id):
         if have_new_sites:
             ee.data.deleteAsset(asset_id)
         else:
@@ -132,7 +158,7 @@ def check_site_suitability(
 
     if roi.size().getInfo() > 50:
         chunk_size = 30
-        rois, descs = create_chunk(roi, description, chunk_size)
+        rois, descs = create_chunk(roi, vector_description, chunk_size)
         gee_obj = GEEAccount.objects.get(pk=gee_account_id)
         ee_initialize(gee_obj.helper_account.id)
         GEE_HELPER = build_gee_helper_paths(app_type, gee_obj.helper_account.name)
@@ -167,7 +193,7 @@ def check_site_suitability(
         merge_task_id = merge_chunks(
             roi,
             path_list,
-            description,
+            vector_description,
             chunk_size,
             chunk_asset_path=GEE_HELPER,
             merge_asset_path=GEE_PATH,
@@ -180,13 +206,39 @@ def check_site_suitability(
             end_year,
             pss_rasters,
             is_default_profile,
-            description,
-            asset_id,
+            vector_description,
+            vector_asset_id,
             state,
             project,
         )
         if task_id:
             check_task_status([task_id], 120)
+
+    if append_new_sites and is_gee_asset_exists(vector_asset_id):
+        append_to_vector_asset(
+            asset_id, ee.FeatureCollection(vector_asset_id), description
+        )
+        ee.data.deleteAsset(vector_asset_id)
+
+    if append_new_sites:
+        # Fold the scores of the new sites into the project raster and drop
+        # the raster generated for them alone
+        raster_asset_id = (
+            get_gee_dir_path(path_list, asset_path=GEE_PATH) + f"{asset_name}_raster"
+        )
+        if is_gee_asset_exists(raster_asset_id):
+            mosaic_into_raster_asset(
+                raster_asset_id,
+                pss_rasters,
+                f"{asset_name}_raster",
+                scale=30,
+                region=project_roi.geometry(),
+            )
+        else:
+            ee.data.copyAsset(pss_rasters_asset, raster_asset_id)
+        ee.data.deleteAsset(pss_rasters_asset)
+        make_asset_public(raster_asset_id)
+
     if is_gee_asset_exists(asset_id):
         if state and district and block:
             layer_id = save_layer_info_to_db(
@@ -3,12 +3,10 @@
 
 import geopandas as gpd
 import pandas as pd
-import numpy as np
 import os
 import shapely
 import ee
 import geemap
-import re
 
 from computing.utils import sync_vector_to_gcs, get_geojson_from_gcs
 from utilities.constants import GEE_HELPER_PATH, GEE_ASSET_PATH, CRS_4326
@@ -26,7 +24,7 @@ from utilities.gee_utils import (
 
 
 def split_multipolygon_into_individual_polygons(data_gdf):
-    data_gdf = data_gdf.explode()
+    data_gdf = data_gdf.explode(index_parts=False)
     return data_gdf
 
 
@@ -54,14 +52,6 @@ def dissolve_boundary(data_gdf):
     return data_gdf
 
 
-def uid_for_ponds(mws_id_list, pond_id):
-    # print(row)
-    row_uid = [str(x) for x in mws_id_list]
-    row_uid = "_".join(row_uid)
-    row_uid = "_".join([row_uid, str(pond_id)])
-    return row_uid
-
-
 # from onprem repo utils.py
 def sync_fc_to_gee(fc, description, asset_id):
     try:
@@ -119,97 +109,65 @@ def export_gdf_to_gee_in_chunks(
         sync_fc_to_gee(fc, description, asset_id)
 
 
-@app.task(bind=True)
-def merge_swb_ponds(
-    self,
-    state,
-    district,
-    block,
-    ee_assets_prefix=GEE_ASSET_PATH,
-    output_suffix="_merged_swb_ponds",
-    target_crs=CRS_4326,
-):
-    """
-    module to merge swb and ponds layer
-    """
-    # ee.Initialize()
-    ee_initialize()
-
-    state = state.lower()
-    district = district.lower()
-    block = block.lower()
-
-    block_path_ee = get_gee_asset_path(
-        asset_path=ee_assets_prefix, state=state, district=district, block=block
-    )
-
-    # swb asset
-    assets = ee.data.listAssets({"parent": block_path_ee})["assets"]
-    swb_layer_path = [
-        asset["id"] for asset in assets if "swb3" in os.path.basename(asset["id"])
-    ]
-    if len(swb_layer_path) == 0:
-        swb_layer_path = [
-            asset["id"] for asset in assets if "swb2" in os.path.basename(asset["id"])
-        ]
-
-    # ponds asset
-    ponds_layer_path = [
-        asset["id"] for asset in assets if "ponds_" in os.path.basename(asset["id"])
-    ]
-
-    # mws asset
-    mws_layer_path = [
-        asset["id"] for asset in assets if "mws_" in os.path.basename(asset["id"])
-    ]
-
-    # admin boundary asset
-    # admin_boundary_layer_path = [asset['id'] for asset in assets if 'admin_boundary' in os.path.basename(asset['id'])]
-
-    swb_fc = ee.FeatureCollection(swb_layer_path[0])
-    ponds_fc = ee.FeatureCollection(ponds_layer_path[0])
-    mws_fc = ee.FeatureCollection(mws_layer_path[0])
-    # admin_boundary_fc = ee.FeatureCollection(admin_boundary_layer_path[0])
-
-    # Adding handling for cases where there are more than 5000 rows in any of the files below,
-    # in which case just getInfo() won't work
+def load_staged_layer(path, target_crs=CRS_4326):
+    """Read a locally staged layer (GeoParquet, GPKG or anything GDAL reads)."""
+    if str(path).endswith((".parquet", ".geoparquet")):
+        gdf = gpd.read_parquet(path)
+    else:
+        gdf = gpd.read_file(path)
+    if gdf.crs is None:
+        return gdf.set_crs(target_crs)
+    return gdf.to_crs(target_crs)
 
-    ponds_gdf = gpd.GeoDataFrame.from_features(ponds_fc.getInfo())
-    # swb_gdf = gpd.GeoDataFrame.from_features(swb_fc.getInfo())
-    # mws_gdf = gpd.GeoDataFrame.from_features(mws_fc.getInfo())
-    # admin_boundary_gdf = gpd.GeoDataFrame.from_features(admin_boundary_fc.getInfo())
 
+def fetch_layer_gdf(fc, layer_name):
+    """
+    GeoDataFrame of an ee.FeatureCollection. getInfo() fails above 5000
+    features, in which case the collection is exported through GCS.
+    """
     try:
-        ponds_gdf = gpd.GeoDataFrame.from_features(ponds_fc.getInfo())
+        return gpd.GeoDataFrame.from_features(fc.getInfo())
     except Exception as e:
         print("Exception in getInfo()", e)
-        task_id = sync_vector_to_gcs(ponds_fc, "swb", "GeoJSON")
+        task_id = sync_vector_to_gcs(fc, layer_name, "GeoJSON")
         check_task_status([task_id])
-        ponds_dict = get_geojson_from_gcs("ponds")
-        ponds_gdf = gpd.GeoDataFrame.from_features(ponds_dict)
+        return gpd.GeoDataFrame.from_features(get_geojson_from_gcs(layer_name))
 
-    try:
-        swb_gdf = gpd.GeoDataFrame.from_features(swb_fc.getInfo())
-    except Exception as e:
-        print("Exception in getInfo()", e)
-        task_id = sync_vector_to_gcs(swb_fc, "swb", "GeoJSON")
-        check_task_status([task_id])
-        swb_dict = get_geojson_from_gcs("swb")
-        swb_gdf = gpd.GeoDataFrame.from_features(swb_dict)
 
-    try:
-        mws_gdf = gpd.GeoDataFrame.from_features(mws_fc.getInfo())
-    except Exception as e:
-        print("Exception in getInfo()", e)
-        task_id = sync_vector_to_gcs(mws_fc, "swb", "GeoJSON")
-        check_task_status([task_id])
-        mws_dict = get_geojson_from_gcs("mws")
-        mws_gdf = gpd.GeoDataFrame.from_features(mws_dict)
+def pond_uids(ponds_gdf, mws_gdf):
+    """UID of each pond: the uids of the MWS it falls in, then its pond_id."""
+    mws_uid_ponds_df = ponds_gdf[["pond_id", "geometry"]].sjoin(
+        mws_gdf[["uid", "geometry"]], how="left"
+    )
+    mws_uid_ponds_df = mws_uid_ponds_df.drop_duplicates(["pond_id", "uid"])
+    uids = (
+        mws_uid_ponds_df["uid"]
+        .astype(str)
+        .groupby(mws_uid_ponds_df["pond_id"])
+        .agg("_".join)
+    )
+    return uids + "_" + uids.index.astype(str)
+
 
-    ponds_gdf = ponds_gdf.set_crs(target_crs)
-    swb_gdf = swb_gdf.set_crs(target_crs)
-    mws_gdf = mws_gdf.set_crs(target_crs)
-    # admin_boundary_gdf = admin_boundary_gdf.set_crs(target_crs)
+def merge_swb_pond_layers(swb_gdf, ponds_gdf, mws_gdf, target_crs=CRS_4326):
+    """
+    Merge the SWB and pond layers of a block into one layer.
+
+    Every SWB/pond pair is found with a single spatial join and each SWB
+    falls in one of:
+
+    - standalone SWB / standalone pond (no intersection); ponds get a UID
+      built from the MWS they fall in
+    - case 1: SWB touches one pond which touches only that SWB; the
+      geometries are merged
+    - case 2: SWB touches one pond which also touches other SWBs; the SWB
+      geometry is kept
+    - case 3/4: SWB touches several ponds; the SWB is merged with all of
+      them (one row per pond)
+    """
+    ponds_gdf = ponds_gdf.set_crs(target_crs, allow_override=True)
+    swb_gdf = swb_gdf.set_crs(target_crs, allow_override=True)
+    mws_gdf = mws_gdf.set_crs(target_crs, allow_override=True)
 
     if ponds_gdf.shape[0] == 1:
         ponds_gdf = split_multipolygon_into_individual_polygons(ponds_gdf)
@@ -217,17 +175,6 @@ def merge_swb_ponds(
     if "pond_id" not in ponds_gdf.columns:
         ponds_gdf = generate_pond_id(ponds_gdf)
 
-    # if admin_boundary_gdf.shape[0] > 1:
-    #     admin_boundary_gdf = dissolve_boundary(admin_boundary_gdf)
-
-    # ponds_gdf = clip_to_boundary(
-    #     data_gdf=ponds_gdf,
-    #     boundary_gdf=admin_boundary_gdf)
-
-    # swb_gdf = clip_to_boundary(
-    #     data_gdf=swb_gdf,
-    #     boundary_gdf=admin_boundary_gdf)
-
     mws_outer_boundary_gdf = dissolve_boundary(mws_gdf)
 
     ponds_gdf = clip_to_boundary(
@@ -236,153 +183,142 @@ def merge_swb_ponds(
 
     swb_gdf = clip_to_boundary(data_gdf=swb_gdf, boundary_gdf=mws_outer_boundary_gdf)
 
-    # Create merged df
-    # 1. add standalone swbs
-    intersecting_UIDs = swb_gdf.sjoin(ponds_gdf)["UID"].tolist()
-    standalone_swb_gdf = swb_gdf[~swb_gdf["UID"].isin(intersecting_UIDs)]
-    merged_gdf = standalone_swb_gdf
+    # One row per intersecting (SWB, pond) pair
+    pairs_gdf = swb_gdf.sjoin(ponds_gdf).drop(columns=["index_right"], errors="ignore")
+    ponds_per_swb = pairs_gdf.groupby("UID")["pond_id"].transform("nunique").to_numpy()
+    swbs_per_pond = pairs_gdf.groupby("pond_id")["UID"].transform("nunique").to_numpy()
+    pond_geometry = ponds_gdf.drop_duplicates("pond_id").set_index("pond_id").geometry
 
-    # 2. add standalone ponds
-    intersecting_pond_ids = ponds_gdf.sjoin(swb_gdf)["pond_id"].tolist()
-    standalone_ponds_gdf = ponds_gdf[~ponds_gdf["pond_id"].isin(intersecting_pond_ids)]
+    # 1. standalone swbs
+    merged_gdf = swb_gdf[~swb_gdf["UID"].isin(pairs_gdf["UID"])]
 
-    # add UID column to standalone ponds
-    mws_gdf.rename(columns={"uid": "MWS_UID"}, inplace=True)
-    mws_uid_ponds_df = standalone_ponds_gdf.sjoin(
-        mws_gdf[["MWS_UID", "geometry"]], how="left"
-    )
-    mws_uid_ponds_df.drop("index_right", inplace=True, axis=1)
-    pond_mws_intersections_df = (
-        mws_uid_ponds_df.groupby(["pond_id"])["MWS_UID"].unique().reset_index()
-    )
-    pond_mws_intersections_df["UID"] = pond_mws_intersections_df.apply(
-        lambda row: uid_for_ponds(row.MWS_UID, row.pond_id), axis=1
-    )
-    standalone_ponds_gdf = standalone_ponds_gdf.merge(
-        pond_mws_intersections_df[["pond_id", "UID"]]
+    # 2. standalone ponds
+    standalone_ponds_gdf = ponds_gdf[~ponds_gdf["pond_id"].isin(pairs_gdf["pond_id"])]
+    uids = pond_uids(standalone_ponds_gdf, mws_gdf)
+    standalone_ponds_gdf = standalone_ponds_gdf.assign(
+        UID=standalone_ponds_gdf["pond_id"].map(uids)
     )
 
     merged_gdf = pd.concat([merged_gdf, standalone_ponds_gdf])
 
     ## 3.Intersection scenarios
     # case 1:
-    intersections_gdf = swb_gdf.sjoin(ponds_gdf)
-    swb_intersections_df = (
-        intersections_gdf.groupby(["UID"])["pond_id"].unique().reset_index()
-    )
-    pond_intersections_df = (
-        intersections_gdf.groupby(["pond_id"])["UID"].unique().reset_index()
-    )
-
-    single_intersection_uids = [
-        row["UID"]
-        for ind, row in swb_intersections_df.iterrows()
-        if len(row["pond_id"]) == 1
-    ]
-
-    case_1_swb_ids = []
-    for x in single_intersection_uids:
-        for y in pond_intersections_df["UID"]:
-            if x in y:
-                if len(y) == 1:
-                    case_1_swb_ids.append(x)
-
-    case1_gdf = swb_gdf[swb_gdf["UID"].isin(case_1_swb_ids)].sjoin(
-        ponds_gdf, how="left"
+    case1_gdf = pairs_gdf[(ponds_per_swb == 1) & (swbs_per_pond == 1)]
+    case1_gdf = case1_gdf.set_geometry(
+        shapely.union(
+            case1_gdf.geometry.values,
+            pond_geometry.loc[case1_gdf["pond_id"]].values,
+        ),
+        crs=case1_gdf.crs,
     )
 
-    case1_gdf.drop(["index_right"], axis=1, inplace=True)
-
-    for index, row in case1_gdf.iterrows():
-        case1_gdf.loc[index, "geometry"] = shapely.ops.unary_union(
-            [
-                row["geometry"],
-                ponds_gdf[ponds_gdf["pond_id"] == row["pond_id"]]["geometry"].iloc[0],
-            ]
-        )
-
     merged_gdf = pd.concat([merged_gdf, case1_gdf])
 
     # case 2:
-    # single_intersection_pond_ids = [row['pond_id'] for ind,row in pond_intersections_df.iterrows() if len(row['UID']) == 1]
-    # #ponds that intersect with only 1 swb
-
-    # multi_intersection_pond_ids = [row['pond_id'] for ind,row in pond_intersections_df.iterrows() if len(row['UID']) > 1]
-    # #ponds that intersect with only 1 swb
-
-    case2_swb_ids = []
-    for x in single_intersection_uids:
-        for y in pond_intersections_df["UID"]:
-            if x in y:
-                if len(y) > 1:
-                    case2_swb_ids.append(x)
-
-    case2_gdf = swb_gdf[swb_gdf["UID"].isin(case2_swb_ids)].sjoin(ponds_gdf, how="left")
-
-    case2_gdf.drop(["index_right"], axis=1, inplace=True)
+    case2_gdf = pairs_gdf[(ponds_per_swb == 1) & (swbs_per_pond > 1)]
 
     merged_gdf = pd.concat([merged_gdf, case2_gdf])
 
     merged_gdf["pond_id"] = merged_gdf["pond_id"].astype("Int64")
 
     # case 3 and 4
-    multi_intersection_uids = [
-        row["UID"]
-        for ind, row in swb_intersections_df.iterrows()
-        if len(row["pond_id"]) > 1
-    ]
-
-    case3_4_swb_ids = []
-    case3_4_pond_ids = []
-    for x in multi_intersection_uids:
-        for ind, row in pond_intersections_df.iterrows():
-            if x in row["UID"]:
-                if len(row["UID"]) >= 1:
-                    # print(row['pond_id'])
-                    case3_4_swb_ids.append(x)
-                    case3_4_pond_ids.append(row["pond_id"])
-
-    case3_4_gdf = swb_gdf[swb_gdf["UID"].isin(case3_4_swb_ids)].sjoin(
-        ponds_gdf[ponds_gdf["pond_id"].isin(case3_4_pond_ids)], how="left"
+    case3_4_gdf = pairs_gdf[ponds_per_swb > 1]
+    parts_gdf = pd.concat(
+        [
+            case3_4_gdf[["UID", "geometry"]].drop_duplicates("UID"),
+            gpd.GeoDataFrame(
+                {
+                    "UID": case3_4_gdf["UID"].values,
+                    "geometry": pond_geometry.loc[case3_4_gdf["pond_id"]].values,
+                },
+                crs=case3_4_gdf.crs,
+            ),
+        ]
+    )
+    merged_geometry = parts_gdf.dissolve(by="UID").geometry
+    case3_4_gdf = case3_4_gdf.set_geometry(
+        merged_geometry.loc[case3_4_gdf["UID"]].values, crs=case3_4_gdf.crs
     )
-
-    swb_ponds_case3_4 = case3_4_gdf.groupby(["UID"])["pond_id"].agg(set).reset_index()
-    swb_ponds_case3_4["pond_id"] = swb_ponds_case3_4["pond_id"].apply(lambda x: list(x))
-
-    case3_4_merged_geom = []
-    for swb in swb_ponds_case3_4["UID"]:
-        # get corresponding farmpond geometries and merge them
-        # print(swb)
-        merged_geom = swb_gdf[swb_gdf["UID"] == swb]["geometry"].iloc[0]
-        # print(merged_geom)
-        # case3_gdf.loc[case3_gdf['UID'] == swb,'pond_id'] = np.nan
-        for pond in list(
-            swb_ponds_case3_4[swb_ponds_case3_4["UID"] == swb]["pond_id"].iloc[0]
-        ):
-            merged_geom = shapely.ops.unary_union(
-                [
-                    merged_geom,
-                    ponds_gdf[ponds_gdf["pond_id"] == pond]["geometry"].iloc[0],
-                ]
-            )
-        case3_4_merged_geom.append(merged_geom)
-        case3_4_gdf.loc[case3_4_gdf["UID"] == swb, "geometry"] = merged_geom
-
-    case3_4_gdf.drop(["index_right"], axis=1, inplace=True)
 
     merged_gdf = pd.concat([merged_gdf, case3_4_gdf])
 
     merged_gdf.reset_index(drop=True, inplace=True)
-    merged_gdf = merged_gdf.set_crs(target_crs)
+    return merged_gdf.set_crs(target_crs, allow_override=True)
+
+
+@app.task(bind=True)
+def merge_swb_ponds(
+    self,
+    state,
+    district,
+    block,
+    ee_assets_prefix=GEE_ASSET_PATH,
+    output_suffix="_merged_swb_ponds",
+    target_crs=CRS_4326,
+    swb_path=None,
+    ponds_path=None,
+    mws_path=None,
+):
+    """
+    module to merge swb and ponds layer
 
-    # merged_fc = geemap.geopandas_to_ee(merged_gdf)
+    ``swb_path``, ``ponds_path`` and ``mws_path`` may point to locally staged
+    GeoParquet/GPKG copies of the layers; any layer not given is read from
+    the block's GEE assets.
+    """
+    # ee.Initialize()
+    ee_initialize()
 
-    # try:
-    #     task = export_vector_asset_to_gee(merged_fc,'merging swb and pond layer', block_path_ee + str(district) + '_' + str(block) + output_suffix + '_test' )
-    #     print("Successfully started the merge chunk")
-    #     return task
-    # except Exception as e:
-    #     print(f"Error occurred in running merge task: {e}")
+    state = state.lower()
+    district = district.lower()
+    block = block.lower()
+
+    block_path_ee = get_gee_asset_path(
+        asset_path=ee_assets_prefix, state=state, district=district, block=block
+    )
+
+    layers = {}
+    for name, path in (("swb", swb_path), ("ponds", ponds_path), ("mws", mws_path)):
+        if path:
+            layers[name] = load_staged_layer(path, target_crs)
+
+    if len(layers) < 3:
+        assets = ee.data.listAssets({"parent": block_path_ee})["assets"]
+        # swb asset
+        swb_layer_path = [
+            asset["id"] for asset in assets if "swb3" in os.path.basename(asset["id"])
+        ]
+        if len(swb_layer_path) == 0:
+            swb_layer_path = [
+                asset["id"]
+                for asset in assets
+                if "swb2" in os.path.basename(asset["id"])
+            ]
+        layer_paths = {
+            "swb": swb_layer_path,
+            # ponds asset
+            "ponds": [
+                asset["id"]
+                for asset in assets
+                if "ponds_" in os.path.basename(asset["id"])
+            ],
+            # mws asset
+            "mws": [
+                asset["id"]
+                for asset in assets
+                if "mws_" in os.path.basename(asset["id"])
+            ],
+        }
+        for name, asset_ids in layer_paths.items():
+            if name not in layers:
+                layers[name] = fetch_layer_gdf(
+                    ee.FeatureCollection(asset_ids[0]),
+                    f"{valid_gee_text(district)}_{valid_gee_text(block)}_{name}",
+                )
+
+    merged_gdf = merge_swb_pond_layers(
+        layers["swb"], layers["ponds"], layers["mws"], target_crs=target_crs
+    )
 
     fc_output_suffix = str(district) + "_" + str(block) + output_suffix
     export_gdf_to_gee_in_chunks(
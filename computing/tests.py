@@ -1,3 +1,723 @@
-from django.test import TestCase
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from computing.drought import drought_causality
+from computing.mws.drainage_graph import DrainageGraph
+
+
+class DrainageGraphTest(SimpleTestCase):
+    #   1 -> 3 -> 4 -> 5
+    #   2 -> 3
+    #   6 -> 7 (separate stream)
+    def setUp(self):
+        self.graph = DrainageGraph.from_features(
+            [
+                {"properties": {"uid": "1", "downstream": "['3']"}},
+                {"properties": {"uid": "2", "downstream": "3"}},
+                {
+                    "properties": {
+                        "uid": "3",
+                        "upstream": "['1', '2']",
+                        "downstream": "4",
+                    }
+                },
+                {"properties": {"uid": "4", "downstream": ["5"]}},
+                {"properties": {"uid": "5", "downstream": None}},
+                {"properties": {"uid": "6", "downstream": "7"}},
+                {"properties": {"uid": "7"}},
+            ]
+        )
+
+    def test_k_hop_traversal(self):
+        self.assertEqual(self.graph.downstream(["1"]), [["3"], ["4"], ["5"]])
+        self.assertEqual(self.graph.downstream(["1"], hops=2), [["3"], ["4"]])
+        self.assertEqual(self.graph.upstream(["4"]), [["3"], ["1", "2"]])
+        self.assertEqual(self.graph.upstream(["1"]), [])
+
+    def test_catchment(self):
+        self.assertEqual(sorted(self.graph.catchment(["4"])), ["1", "2", "3", "4"])
+        self.assertEqual(self.graph.catchment(["missing"]), [])
+
+    def test_flow_path(self):
+        self.assertEqual(self.graph.flow_path("2", "5"), ["2", "3", "4", "5"])
+        self.assertEqual(self.graph.flow_path("5", "2"), ["5", "4", "3", "2"])
+        self.assertIsNone(self.graph.flow_path("1", "2"))
+        self.assertIsNone(self.graph.flow_path("1", "7"))
+
+    def test_save_load_and_merge(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.npz")
+            self.graph.save(path)
+            loaded = DrainageGraph.load(path)
+        self.assertEqual(loaded.downstream(["2"]), self.graph.downstream(["2"]))
+
+        other = DrainageGraph.from_edges([("5", "8"), ("7", "8")])
+        merged = DrainageGraph.merge([self.graph, other])
+        self.assertEqual(merged.downstream(["1"]), [["3"], ["4"], ["5"], ["8"]])
+        self.assertEqual(
+            sorted(merged.catchment(["8"])), ["1", "2", "3", "4", "5", "6", "7", "8"]
+        )
+
+
+def _legacy_calculation_df(year, df, gdf):
+    """Row-by-row classification that calculation_df replaced."""
+    binnings = [
+        ("vci", [-1.0, 40.0, 60.0, 100.0], ["poor", "fair", "good"], False),
+        ("mai", [-1.0, 25.0, 50.0, 100.0], ["poor", "fair", "good"], False),
+        (
+            "spi",
+            [-1000.0, -2.0, -1.5, -1.0, 0.0, 1.0, 1.5, 2.0, 1000.0],
+            [
+                "extremelyDry",
+                "severelyDry",
+                "moderatelyDry",
+                "mildlyDry",
+                "mildlyWet",
+                "moderatelyWet",
+                "severelyWet",
+                "extremelyWet",
+            ],
+            True,
+        ),
+    ]
+    df[f"mDrought_{year}"] = df[
+        [col for col in df.columns if "meteorological_drought" in col]
+    ].sum(axis=1)
+    df[f"drySpells_{year}"] = df[[col for col in df.columns if "dryspell" in col]].sum(
+        axis=1
+    )
+
+    df[f"cas_{year}_mode"] = 0
+    for index, row in df.iterrows():
+        val = df.at[index, f"percent_of_area_cropped_kharif_{year}"]
+        if val <= 33.3:
+            df.at[index, f"cas_{year}_mode"] = 3
+        elif val <= 50.0:
+            df.at[index, f"cas_{year}_mode"] = 2
+        else:
+            df.at[index, f"cas_{year}_mode"] = 1
+
+    for name, bins, labels, include_lowest in binnings:
+        cols = [col for col in df.columns if name in col]
+        for l in labels:
+            df[f"{name}_{year}_{l}"] = 0
+        for index, row in df.iterrows():
+            for col in cols:
+                if pd.isna(row[col]):
+                    continue
+                category = pd.cut(
+                    [row[col]], bins=bins, labels=labels, include_lowest=include_lowest
+                )[0]
+                if pd.notna(category):
+                    df.at[index, f"{name}_{year}_{category}"] += 1
+
+        df[f"{name}_{year}_mode"] = 0
+        for index, row in df.iterrows():
+            templ = []
+            i = 1
+            for l in labels[::-1]:
+                templ.append([df.at[index, f"{name}_{year}_{l}"], i])
+                i += 1
+            templ.sort()
+            df.at[index, f"{name}_{year}_mode"] = templ[-1][1]
+
+    columns_to_drop = [col for col in df.columns if col in gdf.columns and col != "uid"]
+    return pd.merge(gdf, df.drop(columns=columns_to_drop), on="uid", how="left")
+
+
+def _legacy_week_vector(fin_df, wkCt, year):
+    map = {"severe": 3, "moderate": 2, "mild": 1}
+    for index, row in fin_df.iterrows():
+        ds = row[f"dryspell_{year}_week_{wkCt}"]
+        rfdev = row[f"monthly_rainfall_deviation_{year}_week_{wkCt}"]
+        spi = row[f"spi_{year}_week_{wkCt}"]
+        vci = row[f"vci_{year}_week_{wkCt}"]
+        mai = row[f"mai_{year}_week_{wkCt}"]
+        cas = row[f"kharif_cropped_sqkm_{year}"]
+
+        vci_class = "mild"
+        if 60 < vci and vci <= 100:
+            vci_class = "severe"
+        elif 40 < vci and vci <= 60:
+            vci_class = "moderate"
+        else:
+            vci_class = "mild"
+
+        mai_class = "mild"
+        if mai <= 25:
+            mai_class = "severe"
+        elif mai <= 50:
+            mai_class = "moderate"
+        else:
+            mai_class = "mild"
+
+        cas_class = "mild"
+        if cas <= 33.3:
+            cas_class = "severe"
+        elif cas <= 50:
+            cas_class = "moderate"
+        else:
+            cas_class = "mild"
+
+        mD = 0
+        if ds == 1 or rfdev == "scanty" or spi < -1.5:
+            mD = 1
+        if mD == 1:
+            if (
+                vci_class == "severe"
+                and mai_class == "severe"
+                and cas_class == "severe"
+            ):
+                if ds == 1:
+                    fin_df.at[index, f"severe_drought_path1_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[index, f"severe_drought_path2_{year}"] += 1
+                else:
+                    fin_df.at[index, f"severe_drought_path3_{year}"] += 1
+            elif (
+                vci_class == "mild" and mai_class == "severe" and cas_class == "severe"
+            ):
+                if ds == 1:
+                    fin_df.at[index, f"moderate_drought_path1_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[index, f"moderate_drought_path2_{year}"] += 1
+                else:
+                    fin_df.at[index, f"moderate_drought_path3_{year}"] += 1
+            elif (
+                vci_class == "moderate"
+                and mai_class == "severe"
+                and cas_class == "severe"
+            ):
+                if ds == 1:
+                    fin_df.at[index, f"moderate_drought_path4_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[index, f"moderate_drought_path5_{year}"] += 1
+                else:
+                    fin_df.at[index, f"moderate_drought_path6_{year}"] += 1
+            elif (
+                vci_class == "severe" and mai_class == "mild" and cas_class == "severe"
+            ):
+                if ds == 1:
+                    fin_df.at[index, f"moderate_drought_path7_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[index, f"moderate_drought_path8_{year}"] += 1
+                else:
+                    fin_df.at[index, f"moderate_drought_path9_{year}"] += 1
+            elif (
+                vci_class == "severe"
+                and mai_class == "moderate"
+                and cas_class == "severe"
+            ):
+                if ds == 1:
+                    fin_df.at[index, f"moderate_drought_path10_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[index, f"moderate_drought_path11_{year}"] += 1
+                else:
+                    fin_df.at[index, f"moderate_drought_path12_{year}"] += 1
+            elif (
+                vci_class == "severe" and mai_class == "severe" and cas_class == "mild"
+            ):
+                if ds == 1:
+                    fin_df.at[index, f"moderate_drought_path13_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[index, f"moderate_drought_path14_{year}"] += 1
+                else:
+                    fin_df.at[index, f"moderate_drought_path15_{year}"] += 1
+            elif (
+                vci_class == "severe"
+                and mai_class == "severe"
+                and cas_class == "moderate"
+            ):
+                if ds == 1:
+                    fin_df.at[index, f"moderate_drought_path16_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[index, f"moderate_drought_path17_{year}"] += 1
+                else:
+                    fin_df.at[index, f"moderate_drought_path18_{year}"] += 1
+            else:
+                if ds == 1:
+                    fin_df.at[index, f"mild_drought_dryspell_score_{year}"] += 1
+                elif rfdev == "scanty":
+                    fin_df.at[
+                        index, f"mild_drought_rainfall_deviation_score_{year}"
+                    ] += 1
+                elif spi < -1.5:
+                    fin_df.at[index, f"mild_drought_spi_score_{year}"] += 1
+                fin_df.at[index, f"mild_drought_vci_score_{year}"] += map[vci_class]
+                fin_df.at[index, f"mild_drought_mai_score_{year}"] += map[mai_class]
+                fin_df.at[
+                    index, f"mild_drought_cropping_area_sown_score_{year}"
+                ] += map[cas_class]
+
+
+def _synthetic_drought_year(year, num_mws, num_weeks, rng):
+    """A drought_{year} frame with edge values, NaNs and out-of-range cells."""
+    columns = {"uid": [f"1_{i}" for i in range(num_mws)]}
+
+    def column(low, high, edges):
+        values = rng.uniform(low, high, num_mws).round(1)
+        picks = rng.random(num_mws)
+        values[picks < 0.3] = rng.choice(edges, (picks < 0.3).sum())
+        values[picks > 0.9] = np.nan
+        return values
+
+    columns[f"percent_of_area_cropped_kharif_{year}"] = column(0, 100, [33.3, 50.0])
+    columns[f"kharif_cropped_sqkm_{year}"] = column(0, 100, [33.3, 50.0])
+    for week in range(num_weeks):
+        date = (pd.Timestamp(f"{year}-06-01") + pd.Timedelta(weeks=week)).strftime(
+            "%Y-%m-%d"
+        )
+        columns[f"dryspell_{date}"] = rng.integers(0, 2, num_mws)
+        columns[f"meteorological_drought_{date}"] = rng.integers(0, 4, num_mws)
+        columns[f"monthly_rainfall_deviation_{date}"] = rng.choice(
+            ["scanty", "deficient", "normal", "excess"], num_mws
+        )
+        columns[f"vci_{date}"] = column(-5, 110, [-1.0, 40.0, 60.0, 100.0])
+        columns[f"mai_{date}"] = column(-5, 110, [-1.0, 25.0, 50.0, 100.0])
+        columns[f"spi_{date}"] = column(
+            -3, 3, [-1000.0, -2.0, -1.5, -1.0, 0.0, 1.0, 2.0]
+        )
+    return pd.DataFrame(columns)
+
+
+class DroughtCausalityParityTest(SimpleTestCase):
+    years = range(2019, 2023)
+
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+        self.frames = {
+            year: _synthetic_drought_year(year, 60, 20, self.rng) for year in self.years
+        }
+
+    def test_calculation_df_matches_row_wise_version(self):
+        legacy = new = pd.DataFrame({"uid": self.frames[self.years[0]]["uid"]})
+        for year in self.years:
+            legacy = _legacy_calculation_df(year, self.frames[year].copy(), legacy)
+            new = drought_causality.calculation_df(year, self.frames[year].copy(), new)
+        pd.testing.assert_frame_equal(new, legacy)
+
+    def test_week_vector_matches_per_week_version(self):
+        for year in self.years:
+            df = self.frames[year]
+            weeks = [col[len("vci_") :] for col in df.columns if col.startswith("vci_")]
+            columns = {"uid": df["uid"]}
+            for prefix, last in [
+                ("severe_drought_path", 3),
+                ("moderate_drought_path", 18),
+            ]:
+                for n in range(1, last + 1):
+                    columns[f"{prefix}{n}_{year}"] = 0
+            for name in [
+                "dryspell",
+                "rainfall_deviation",
+                "spi",
+                "vci",
+                "mai",
+                "cropping_area_sown",
+            ]:
+                columns[f"mild_drought_{name}_score_{year}"] = 0
+            columns[f"kharif_cropped_sqkm_{year}"] = df[f"kharif_cropped_sqkm_{year}"]
+            for label in [
+                "dryspell",
+                "monthly_rainfall_deviation",
+                "spi",
+                "vci",
+                "mai",
+            ]:
+                for i, date in enumerate(weeks):
+                    columns[f"{label}_{year}_week_{i + 1}"] = df[f"{label}_{date}"]
+            fin_df = pd.DataFrame(columns)
+
+            legacy = fin_df.copy()
+            for week in range(1, len(weeks) + 1):
+                _legacy_week_vector(legacy, week, year)
+            drought_causality.getWeekVector(fin_df, range(1, len(weeks) + 1), year)
+
+            pd.testing.assert_frame_equal(fin_df, legacy)
+            self.assertGreater(fin_df.filter(like="drought_path").to_numpy().sum(), 0)
+
+
+class CropGridTest(SimpleTestCase):
+    def test_matches_per_cell_coverage(self):
+        from shapely import geometry
+
+        from computing.crop_grid.crop_grid import gen_grids
+
+        coords = [
+            [77.30, 21.20],
+            [77.37, 21.21],
+            [77.35, 21.26],
+            [77.33, 21.23],
+            [77.31, 21.25],
+            [77.30, 21.20],
+        ]
+        (cells,) = gen_grids([coords], grid_size=0.004, cover_frac=0.3)
+
+        poly = geometry.Polygon(coords)
+        expected = []
+        x = 77.30
+        while x <= 77.37:
+            y = 21.20
+            while y <= 21.26:
+                box = geometry.box(x, y, x + 0.004, y + 0.004)
+                if box.within(poly) or poly.intersection(box).area >= 0.3 * 0.004**2:
+                    expected.append([x, y, x + 0.004, y + 0.004])
+                y += 0.004
+            x += 0.004
+
+        self.assertGreater(len(expected), 0)
+        np.testing.assert_array_equal(cells, np.array(expected))
+
+
+class MergeSwbPondsTest(SimpleTestCase):
+    def test_cases(self):
+        import geopandas as gpd
+        from shapely.geometry import box
+
+        from computing.surface_water_bodies.merge_swb_ponds import (
+            merge_swb_pond_layers,
+        )
+
+        mws = gpd.GeoDataFrame(
+            {"uid": ["12_1", "12_2"]},
+            geometry=[box(0, 0, 5, 10), box(5, 0, 10, 10)],
+        )
+        swb = gpd.GeoDataFrame(
+            {"UID": ["standalone", "case1", "case2_a", "case2_b", "case3"]},
+            geometry=[
+                box(1, 1, 2, 2),
+                box(1, 5, 2, 6),
+                box(6, 1, 7, 2),
+                box(7.05, 1, 8, 2),
+                box(6, 5, 8, 7),
+            ],
+        )
+        ponds = gpd.GeoDataFrame(
+            geometry=[
+                box(3, 3, 3.5, 3.5),  # 0: standalone
+                box(4.8, 8, 5.2, 8.4),  # 1: standalone across two MWS
+                box(1.9, 5.4, 2.3, 5.6),  # 2: case 1
+                box(6.9, 1.4, 7.2, 1.6),  # 3: case 2
+                box(5.8, 5.5, 6.1, 5.8),  # 4: case 3
+                box(7.9, 6, 8.2, 6.3),  # 5: case 3
+            ]
+        )
+
+        merged = merge_swb_pond_layers(swb, ponds, mws)
+        rows = {
+            (uid, None if pd.isna(pond) else int(pond)): geom
+            for uid, pond, geom in zip(
+                merged["UID"], merged["pond_id"], merged.geometry
+            )
+        }
+
+        self.assertEqual(
+            sorted(rows, key=str),
+            sorted(
+                [
+                    ("standalone", None),
+                    ("12_1_0", 0),
+                    ("12_1_12_2_1", 1),
+                    ("case1", 2),
+                    ("case2_a", 3),
+                    ("case2_b", 3),
+                    ("case3", 4),
+                    ("case3", 5),
+                ],
+                key=str,
+            ),
+        )
+        self.assertAlmostEqual(rows[("case1", 2)].area, 1 + 0.08 - 0.02)
+        self.assertEqual(rows[("case2_a", 3)].area, 1)
+        self.assertAlmostEqual(rows[("case3", 4)].area, 4 + 0.09 * 2 - 0.03 * 2)
+        self.assertTrue(rows[("case3", 4)].equals(rows[("case3", 5)]))
+
+
+class LulcAreaReductionTest(SimpleTestCase):
+    years = [2017, 2018, 2019]
+
+    def test_area_columns(self):
+        from computing.lulc.lulc_vector import lulc_area_columns
+
+        columns = lulc_area_columns(self.years)
+        self.assertEqual(len(columns), 12 * len(self.years))
+        self.assertEqual(
+            columns[:4],
+            [
+                "built-up_area_2017",
+                "built-up_area_2018",
+                "built-up_area_2019",
+                "k_water_area_2017",
+            ],
+        )
+        self.assertEqual(columns[-1], "shrub_scrub_area_2019")
+
+    def test_all_years_and_classes_are_reduced_once(self):
+        from computing.lulc import lulc_vector
+        from computing.tree_health import utils
+
+        fc = mock.Mock(name="fc")
+        images = [mock.Mock(name=f"lulc_{year}") for year in self.years]
+        with mock.patch.object(utils, "ee") as ee:
+            result = lulc_vector.reduce_lulc_areas(fc, images, self.years)
+
+        reduce_calls = [c for c in ee.mock_calls if c[0].endswith("reduceRegions")]
+        self.assertEqual(len(reduce_calls), 1)
+        fc.reduceRegions.assert_not_called()
+
+        stack = ee.Image.cat.return_value
+        kwargs = stack.reduceRegions.call_args.kwargs
+        self.assertIs(kwargs["collection"], fc)
+        self.assertEqual(kwargs["scale"], 10)
+        self.assertIs(kwargs["crs"], images[0].projection.return_value)
+
+        # Reducer inputs are (area, class) pairs, one pair per year.
+        (bands,) = ee.Image.cat.call_args.args
+        self.assertEqual(len(bands), 2 * len(self.years))
+        self.assertEqual(
+            [c.args for c in ee.Image.pixelArea.return_value.rename.call_args_list],
+            [(f"area_{i}",) for i in range(len(self.years))],
+        )
+        for i, image in enumerate(images):
+            image.select.assert_called_once_with(["predicted_label"])
+            image.select.return_value.rename.assert_called_once_with(f"class_{i}")
+
+        group = ee.Reducer.sum.return_value.group
+        self.assertEqual(group.call_count, len(self.years))
+        group.assert_called_with(groupField=1, groupName="class")
+        self.assertEqual(
+            [c.args for c in group.return_value.setOutputs.call_args_list],
+            [([f"classes_{i}"],) for i in range(len(self.years))],
+        )
+
+        self.assertIs(result, stack.reduceRegions.return_value.map.return_value)
+
+
+class ZonalStatsTest(SimpleTestCase):
+    """Synthetic GeoTIFFs on a 10 m UTM grid and a 0.01 degree grid."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_raster(self, name, data, transform, crs, nodata=None):
+        import rasterio
+
+        path = os.path.join(self.tmp.name, name)
+        with rasterio.open(
+            path,
+            "w",
+            driver="GTiff",
+            width=data.shape[1],
+            height=data.shape[0],
+            count=1,
+            dtype=data.dtype,
+            crs=crs,
+            transform=transform,
+            nodata=nodata,
+        ) as dst:
+            dst.write(data, 1)
+        return path
+
+    def utm_raster(self, data, nodata=None):
+        from rasterio.transform import from_origin
+
+        return self.write_raster(
+            "utm.tif", data, from_origin(500000, 2000100, 10, 10), "EPSG:32644", nodata
+        )
+
+    def zones(self, *geometries, crs="EPSG:32644"):
+        import geopandas as gpd
+
+        return gpd.GeoDataFrame(
+            {"uid": [f"z{i}" for i in range(len(geometries))]},
+            geometry=list(geometries),
+            crs=crs,
+        )
+
+    def test_class_areas_by_coverage_mode(self):
+        from shapely.geometry import box
+
+        from computing.zonal_stats import class_areas
+
+        # Left half class 1, right half class 2, 10 x 10 pixels of 100 m2.
+        data = np.ones((10, 10), dtype="uint8")
+        data[:, 5:] = 2
+        raster = self.utm_raster(data)
+        classes = {1: "one", 2: "two"}
+
+        aligned = box(500000, 2000000, 500100, 2000100)
+        # Half a pixel off the grid on every side: 9 x 9 pixels of area.
+        offset = box(500005, 2000005, 500095, 2000095)
+        zones = self.zones(aligned, offset)
+
+        exact = class_areas(raster, zones, classes)
+        self.assertAlmostEqual(exact.at[0, "one"], 0.5)
+        self.assertAlmostEqual(exact.at[0, "two"], 0.5)
+        self.assertAlmostEqual(exact.at[1, "one"], 0.405)
+        self.assertAlmostEqual(exact.at[1, "two"], 0.405)
+
+        touched = class_areas(raster, zones, classes, coverage="all_touched")
+        self.assertAlmostEqual(touched.at[1, "one"] + touched.at[1, "two"], 1.0)
+
+        center = class_areas(raster, zones, classes, coverage="center")
+        self.assertAlmostEqual(center.at[0, "one"] + center.at[0, "two"], 1.0)
+        self.assertLess(center.at[1, "one"] + center.at[1, "two"], 1.0)
+
+        with self.assertRaises(ValueError):
+            class_areas(raster, zones, classes, coverage="bilinear")
+
+    def test_geographic_pixel_area_follows_latitude(self):
+        from rasterio.transform import from_origin
+        from shapely.geometry import box
+
+        from computing.zonal_stats import class_areas
+
+        raster = self.write_raster(
+            "geo.tif",
+            np.ones((100, 100), dtype="uint8"),
+            from_origin(77, 21, 0.01, 0.01),
+            "EPSG:4326",
+        )
+        zones = self.zones(box(77, 20, 78, 21), crs="EPSG:4326")
+
+        area = class_areas(raster, zones, {1: "area"}).at[0, "area"]
+        # One square degree at 20-21N is about 11,600 km2.
+        self.assertAlmostEqual(area / 1.16e6, 1, places=2)
+
+    def test_zonal_statistics_skip_nodata(self):
+        from shapely.geometry import box
+
+        from computing.zonal_stats import zonal_statistics
+
+        data = np.arange(100, dtype="float32").reshape(10, 10)
+        data[0, 0] = -1
+        raster = self.utm_raster(data, nodata=-1)
+        outside = box(600000, 2000000, 600100, 2000100)
+        zones = self.zones(box(500000, 2000080, 500020, 2000100), outside)
+
+        stats = zonal_statistics(
+            raster, zones, stats=("sum", "mean", "count", "min", "max"), prefix="v_"
+        )
+        # Pixels 1, 10 and 11; pixel 0 is nodata.
+        self.assertEqual(stats.at[0, "v_sum"], 22)
+        self.assertEqual(stats.at[0, "v_count"], 3)
+        self.assertAlmostEqual(stats.at[0, "v_mean"], 22 / 3)
+        self.assertEqual(stats.at[0, "v_min"], 1)
+        self.assertEqual(stats.at[0, "v_max"], 11)
+
+        self.assertEqual(stats.at[1, "v_sum"], 0)
+        self.assertEqual(stats.at[1, "v_count"], 0)
+        self.assertTrue(np.isnan(stats.at[1, "v_mean"]))
+
+    def test_lulc_columns_match_gee_reduction(self):
+        from shapely.geometry import box
+
+        from computing.lulc.lulc_vector import lulc_area_columns, lulc_areas_local
+
+        data = np.full((10, 10), 5, dtype="uint8")
+        data[:2] = 1
+        raster = self.utm_raster(data)
+        zones = self.zones(box(500000, 2000000, 500100, 2000100))
+
+        result = lulc_areas_local(zones, {2018: raster, 2017: raster})
+        self.assertEqual(
+            list(result.columns), ["uid", "geometry"] + lulc_area_columns([2017, 2018])
+        )
+        self.assertAlmostEqual(result.at[0, "built-up_area_2017"], 0.2)
+        self.assertAlmostEqual(result.at[0, "cropland_area_2018"], 0.8)
+        self.assertEqual(result.at[0, "shrub_scrub_area_2018"], 0)
+
+
+class TreeHealthVectorTest(SimpleTestCase):
+    asset_dir = "projects/x/assets/bihar/gaya/atri/"
+
+    def run_ccd(self, existing, start_year=2017, end_year=2024):
+        from computing.tree_health import ccd_vector, utils
+
+        existing = set(existing)
+
+        def export(fc, description, asset_id):
+            existing.add(asset_id)
+            return description
+
+        ee = mock.Mock(name="ee")
+        with mock.patch.multiple(
+            ccd_vector,
+            ee=ee,
+            ee_initialize=mock.DEFAULT,
+            get_gee_dir_path=mock.Mock(return_value=self.asset_dir),
+            is_gee_asset_exists=existing.__contains__,
+            export_vector_asset_to_gee=mock.Mock(side_effect=export),
+            check_task_status=mock.DEFAULT,
+            make_asset_public=mock.DEFAULT,
+            save_layer_info_to_db=mock.DEFAULT,
+            sync_fc_to_geoserver=mock.Mock(return_value={"status_code": 500}),
+        ), mock.patch.multiple(utils, ee=ee, is_gee_asset_exists=existing.__contains__):
+            ccd_vector.tree_health_ccd_vector(
+                state="bihar",
+                district="gaya",
+                block="atri",
+                start_year=start_year,
+                end_year=end_year,
+            )
+            return ee, ccd_vector.export_vector_asset_to_gee
+
+    def raster_ids(self, ee):
+        return [c.args[0] for c in ee.Image.call_args_list]
+
+    def test_all_years_are_reduced_in_one_export(self):
+        ee, export = self.run_ccd(existing=[])
+
+        export.assert_called_once()
+        fc, description, asset_id = export.call_args.args
+        self.assertEqual(description, "ccd_vector_gaya_atri_2017_2024")
+        self.assertEqual(asset_id, self.asset_dir + description)
+
+        self.assertEqual(
+            self.raster_ids(ee),
+            [f"{self.asset_dir}ccd_raster_gaya_atri_{y}" for y in range(2017, 2025)],
+        )
+        reduce_calls = [c for c in ee.mock_calls if c[0].endswith("reduceRegions")]
+        self.assertEqual(len(reduce_calls), 1)
+
+        stack = ee.Image.cat.return_value
+        kwargs = stack.reduceRegions.call_args.kwargs
+        self.assertIs(kwargs["collection"], ee.FeatureCollection.return_value)
+        self.assertEqual((kwargs["scale"], kwargs["crs"]), (25, "EPSG:4326"))
+        (bands,) = ee.Image.cat.call_args.args
+        self.assertEqual(len(bands), 16)
+        self.assertEqual(
+            [c.args for c in ee.Reducer.sum().group().setOutputs.call_args_list],
+            [([f"classes_{i}"],) for i in range(8)],
+        )
+        self.assertIs(fc, stack.reduceRegions.return_value.map.return_value)
+
+    def test_new_year_extends_existing_range(self):
+        ee, export = self.run_ccd(
+            existing=[self.asset_dir + "ccd_vector_gaya_atri_2017_2023"]
+        )
+
+        export.assert_called_once()
+        self.assertEqual(export.call_args.args[1], "ccd_vector_gaya_atri_2017_2024")
+        self.assertEqual(
+            self.raster_ids(ee), [f"{self.asset_dir}ccd_raster_gaya_atri_2024"]
+        )
+        ee.FeatureCollection.assert_any_call(
+            self.asset_dir + "ccd_vector_gaya_atri_2017_2023"
+        )
+        kwargs = ee.Image.cat.return_value.reduceRegions.call_args.kwargs
+        self.assertIs(kwargs["collection"], ee.FeatureCollection.return_value)
+
+    def test_existing_range_is_not_recomputed(self):
+        ee, export = self.run_ccd(
+            existing=[self.asset_dir + "ccd_vector_gaya_atri_2017_2024"]
+        )
+
+        export.assert_not_called()
+        ee.Image.cat.assert_not_called()
@@ -16,7 +16,16 @@ from utilities.gee_utils import (
     make_asset_public,
     get_gee_dir_path,
 )
-from computing.mws.evapotranspiration import merge_assets_chunked_on_year
+from computing.tree_health.utils import latest_multi_year_asset, reduce_class_areas
+from computing.zonal_stats import class_areas
+
+# Canopy height classes of the "ch_class" band
+CH_CLASSES = {
+    0: "Short_Trees",
+    1: "Medium_Height_Trees",
+    2: "Tall_Trees",
+    3: "Missing_Data",
+}
 
 
 @app.task(bind=True)
@@ -54,48 +63,29 @@ def tree_health_ch_vector(
             + "_uid"
         )
 
-    yearly_assets = []
-
-    # Loop through years
-    for year in range(start_year, end_year + 1):
+    # Multi-year asset name
+    prefix = "ch_vector_" + valid_gee_text(district) + "_" + valid_gee_text(block)
+    description = prefix + "_" + str(start_year) + "_" + str(end_year)
 
-        description = f"ch_vector_{asset_suffix}_{year}"
+    asset_dir = get_gee_asset_path(state, district, block)
+    asset_id = asset_dir + description
 
-        year_asset_id = (
-            get_gee_dir_path(
-                asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
-            )
-            + description
-        )
-
-        # Create yearly asset if not exists
-        if not is_gee_asset_exists(year_asset_id):
-            fc = ch_vector(roi, year, asset_folder_list, asset_suffix, app_type)
-            task_id = export_vector_asset_to_gee(fc, description, year_asset_id)
-            check_task_status([task_id])
-
-        # Add to merge list
-        if is_gee_asset_exists(year_asset_id):
-            yearly_assets.append(year_asset_id)
-
-    # Final merged asset name
-    description = (
-        "ch_vector_"
-        + valid_gee_text(district)
-        + "_"
-        + valid_gee_text(block)
-        + "_"
-        + str(start_year)
-        + "_"
-        + str(end_year)
-    )
-
-    asset_id = get_gee_asset_path(state, district, block) + description
-
-    # Merge yearly assets if not exists
+    # Compute all missing years in one export, on top of the asset of a
+    # shorter range if one exists
     if not is_gee_asset_exists(asset_id):
-        task = merge_assets_chunked_on_year(yearly_assets, description, asset_id)
-        check_task_status([task])
+        base_asset_id, last_year = latest_multi_year_asset(
+            asset_dir, prefix, start_year, end_year
+        )
+        fc = ee.FeatureCollection(base_asset_id) if base_asset_id else roi
+        fc = ch_vector(
+            fc,
+            range(last_year + 1, end_year + 1),
+            asset_folder_list,
+            asset_suffix,
+            app_type,
+        )
+        task_id = export_vector_asset_to_gee(fc, description, asset_id)
+        check_task_status([task_id])
 
     merged_fc = ee.FeatureCollection(asset_id)
 
@@ -134,49 +124,33 @@ def tree_health_ch_vector(
     return layer_at_geoserver
 
 
-def ch_vector(roi, year, asset_folder_list, asset_suffix, app_type):
-    """Create vector data from canopy height raster for one year."""
-
-    # CH classes
-    args = [
-        {"value": 0, "label": "Short_Trees"},
-        {"value": 1, "label": "Medium_Height_Trees"},
-        {"value": 2, "label": "Tall_Trees"},
-        {"value": 3, "label": "Missing_Data"},
-    ]
+def ch_vector(roi, years, asset_folder_list, asset_suffix, app_type):
+    """Create vector data from the canopy height rasters of ``years``."""
 
-    # Load raster image
-    raster = ee.Image(
-        get_gee_dir_path(
-            asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
-        )
-        + f"ch_raster_{asset_suffix}_{year}"
-    )
-
-    fc = roi
-
-    # Calculate area for each class
-    for arg in args:
-        raster_ch = raster.select(["ch_class"])
-        mask = raster_ch.eq(ee.Number(arg["value"]))
-
-        pixel_area = ee.Image.pixelArea()
-        forest_area = pixel_area.updateMask(mask)
-
-        # Sum area per polygon
-        fc = forest_area.reduceRegions(
-            collection=fc,
-            reducer=ee.Reducer.sum(),
-            scale=25,
-            crs="EPSG:4326",
+    # Load raster images
+    rasters = [
+        ee.Image(
+            get_gee_dir_path(
+                asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
+            )
+            + f"ch_raster_{asset_suffix}_{year}"
         )
+        for year in years
+    ]
 
-        # Convert m² to hectares
-        def process_feature(feature):
-            area_val = ee.Number(feature.get("sum"))
-            area_ha = area_val.multiply(0.0001)
-            return feature.set(f"{arg['label']}_{year}", area_ha)
+    # Area of each class of each year
+    columns = [
+        {value: f"{label}_{year}" for value, label in CH_CLASSES.items()}
+        for year in years
+    ]
+    return reduce_class_areas(roi, rasters, "ch_class", columns, keep_sum=True)
 
-        fc = fc.map(process_feature)
 
-    return fc
+def ch_vector_local(zones, raster, year, band=1, coverage="exact"):
+    """
+    Same class-area columns as ``ch_vector``, computed on the worker from a
+    local or mirrored copy of the year's canopy height raster (``band``
+    holding "ch_class").
+    """
+    classes = {value: f"{label}_{year}" for value, label in CH_CLASSES.items()}
+    return zones.join(class_areas(raster, zones, classes, band, coverage))
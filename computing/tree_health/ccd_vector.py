@@ -16,7 +16,11 @@ from utilities.gee_utils import (
     get_gee_dir_path,
 )
 from nrm_app.celery import app
-from computing.mws.evapotranspiration import merge_assets_chunked_on_year
+from computing.tree_health.utils import latest_multi_year_asset, reduce_class_areas
+from computing.zonal_stats import class_areas
+
+# CCD density classes of the "cc" band
+CCD_CLASSES = {0.0: "Low_Density", 1.0: "High_Density", 2.0: "Missing_Data"}
 
 
 # Celery task to generate CCD vector data
@@ -54,53 +58,33 @@ def tree_health_ccd_vector(
             + "_uid"
         )
 
-    yearly_assets = []
-
-    # Process each year
-    for year in range(start_year, end_year + 1):
-
-        description = f"ccd_vector_{asset_suffix}_{year}"
-
-        year_asset_id = (
-            get_gee_dir_path(
-                asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
-            )
-            + description
-        )
-
-        # Create yearly asset if not exists
-        if not is_gee_asset_exists(year_asset_id):
-            fc = ccd_vector(
-                roi,
-                year,
-                asset_folder_list,
-                asset_suffix,
-                app_type,
-            )
-
-            task_id = export_vector_asset_to_gee(fc, description, year_asset_id)
-            check_task_status([task_id])
-
-        # Add existing asset to merge list
-        if is_gee_asset_exists(year_asset_id):
-            yearly_assets.append(year_asset_id)
+    asset_dir = get_gee_dir_path(
+        asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
+    )
 
-    # Final merged asset name
+    # Multi-year asset name
     description = (
         "ccd_vector_" + asset_suffix + "_" + str(start_year) + "_" + str(end_year)
     )
+    asset_id = asset_dir + description
 
-    asset_id = (
-        get_gee_dir_path(
-            asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
+    # Compute all missing years in one export, on top of the asset of a
+    # shorter range if one exists
+    if not is_gee_asset_exists(asset_id):
+        base_asset_id, last_year = latest_multi_year_asset(
+            asset_dir, "ccd_vector_" + asset_suffix, start_year, end_year
+        )
+        fc = ee.FeatureCollection(base_asset_id) if base_asset_id else roi
+        fc = ccd_vector(
+            fc,
+            range(last_year + 1, end_year + 1),
+            asset_folder_list,
+            asset_suffix,
+            app_type,
         )
-        + description
-    )
 
-    # Merge yearly assets if not exists
-    if not is_gee_asset_exists(asset_id):
-        task = merge_assets_chunked_on_year(yearly_assets, description, asset_id)
-        check_task_status([task])
+        task_id = export_vector_asset_to_gee(fc, description, asset_id)
+        check_task_status([task_id])
 
     layer_at_geoserver = False
 
@@ -133,48 +117,32 @@ def tree_health_ccd_vector(
     return layer_at_geoserver
 
 
-def ccd_vector(roi, year, asset_folder_list, asset_suffix, app_type):
-    """Create vector data from CCD raster."""
-
-    # Density classes
-    args = [
-        {"value": 0.0, "label": "Low_Density"},
-        {"value": 1.0, "label": "High_Density"},
-        {"value": 2.0, "label": "Missing_Data"},
-    ]
-
-    # Load CCD raster
-    raster = ee.Image(
-        get_gee_dir_path(
-            asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
-        )
-        + f"ccd_raster_{asset_suffix}_{year}"
-    )
-
-    fc = roi
+def ccd_vector(roi, years, asset_folder_list, asset_suffix, app_type):
+    """Create vector data from the CCD rasters of ``years``."""
 
-    # Calculate area for each class
-    for arg in args:
-        raster_cc = raster.select(["cc"])
-        mask = raster_cc.eq(ee.Number(arg["value"]))
-
-        pixel_area = ee.Image.pixelArea()
-        forest_area = pixel_area.updateMask(mask)
-
-        # Sum area per polygon
-        fc = forest_area.reduceRegions(
-            collection=fc,
-            reducer=ee.Reducer.sum(),
-            scale=25,
-            crs="EPSG:4326",
+    # Load CCD rasters
+    rasters = [
+        ee.Image(
+            get_gee_dir_path(
+                asset_folder_list, asset_path=GEE_PATHS[app_type]["GEE_ASSET_PATH"]
+            )
+            + f"ccd_raster_{asset_suffix}_{year}"
         )
+        for year in years
+    ]
 
-        # Convert m² to hectares
-        def process_feature(feature):
-            area_val = ee.Number(feature.get("sum"))
-            area_ha = area_val.multiply(0.0001)
-            return feature.set(f"{arg['label']}_{year}", area_ha)
+    # Area of each class of each year
+    columns = [
+        {value: f"{label}_{year}" for value, label in CCD_CLASSES.items()}
+        for year in years
+    ]
+    return reduce_class_areas(roi, rasters, "cc", columns, keep_sum=True)
 
-        fc = fc.map(process_feature)
 
-    return fc
+def ccd_vector_local(zones, raster, year, band=1, coverage="exact"):
+    """
+    Same class-area columns as ``ccd_vector``, computed on the worker from a
+    local or mirrored copy of the year's CCD raster (``band`` holding "cc").
+    """
+    classes = {value: f"{label}_{year}" for value, label in CCD_CLASSES.items()}
+    return zones.join(class_areas(raster, zones, classes, band, coverage))
@@ -16,6 +16,19 @@ from utilities.gee_utils import (
     get_gee_dir_path,
 )
 from nrm_app.celery import app
+from computing.tree_health.utils import reduce_class_areas
+
+# Change categories of the overall change raster
+OVERALL_CHANGE_CLASSES = {
+    -2: "Deforestation",
+    -1: "Degradation",
+    0: "No_Change",
+    1: "Improvement",
+    2: "Afforestation",
+    3: "Partially_Degraded",
+    4: "Partially_Degraded",
+    5: "Missing Data",
+}
 
 
 # Celery task to generate overall tree change vector
@@ -105,17 +118,6 @@ def tree_health_overall_change_vector(
 def overall_change_vector(roi, asset_folder_list, asset_suffix, app_type):
     """Create vector showing overall tree change categories."""
 
-    # Change categories
-    args = [
-        {"value": -2, "label": "Deforestation"},
-        {"value": -1, "label": "Degradation"},
-        {"value": 0, "label": "No_Change"},
-        {"value": 1, "label": "Improvement"},
-        {"value": 2, "label": "Afforestation"},
-        {"value": [3, 4], "label": "Partially_Degraded"},
-        {"value": 5, "label": "Missing Data"},
-    ]
-
     # Load overall change raster
     raster = ee.Image(
         get_gee_dir_path(
@@ -124,47 +126,5 @@ def overall_change_vector(roi, asset_folder_list, asset_suffix, app_type):
         + f"overall_change_raster_{asset_suffix}"
     )
 
-    fc = roi
-
-    # Calculate area for each change class
-    for arg in args:
-
-        raster = raster.select(["constant"])
-
-        # Handle single or multiple values
-        if isinstance(arg["value"], list) and len(arg["value"]) > 1:
-            ored_str = "raster.eq(ee.Number(" + str(arg["value"][0]) + "))"
-            for i in range(1, len(arg["value"])):
-                ored_str += ".Or(raster.eq(ee.Number(" + str(arg["value"][i]) + ")))"
-            mask = eval(ored_str)
-        else:
-            mask = raster.eq(ee.Number(arg["value"]))
-
-        pixel_area = ee.Image.pixelArea()
-        forest_area = pixel_area.updateMask(mask)
-
-        # Sum area per polygon
-        fc = forest_area.reduceRegions(
-            collection=fc,
-            reducer=ee.Reducer.sum(),
-            scale=25,
-            crs="EPSG:4326",
-        )
-
-        # Remove unwanted property
-        def remove_property(feat, prop):
-            properties = feat.propertyNames()
-            select_properties = properties.filter(ee.Filter.neq("item", prop))
-            return feat.select(select_properties)
-
-        # Convert m² to hectares and set label
-        def process_feature(feature):
-            value = feature.get("sum")
-            value = ee.Number(value).multiply(0.0001)
-            feature = feature.set(arg["label"], value)
-            feature = remove_property(feature, "sum")
-            return feature
-
-        fc = fc.map(process_feature)
-
-    return ee.FeatureCollection(fc)
+    # Area of each change class
+    return reduce_class_areas(roi, [raster], "constant", [OVERALL_CHANGE_CLASSES])
@@ -0,0 +1,92 @@
+import ee
+
+from utilities.gee_utils import is_gee_asset_exists
+
+
+def class_area_reducer(outputs):
+    """
+    One grouped pixel-area sum per name in ``outputs``, combined so that a
+    single reduceRegions over the stacked ``area``/``class`` band pairs
+    returns the area of every class of every image as group lists.
+    """
+    reducer = None
+    for output in outputs:
+        grouped = (
+            ee.Reducer.sum().group(groupField=1, groupName="class").setOutputs([output])
+        )
+        reducer = grouped if reducer is None else reducer.combine(grouped)
+    return reducer
+
+
+def reduce_class_areas(
+    fc, images, band, columns, scale=25, crs="EPSG:4326", keep_sum=False
+):
+    """
+    Set class-area columns (in hectares) of several class rasters on ``fc``
+    from one grouped reduction of the rasters stacked as bands.
+
+    Args:
+        fc: FeatureCollection to reduce over; its properties are kept
+        images: Class rasters, e.g. one per year
+        band: Class band of the rasters
+        columns: One ``{class value: column}`` dict per image; values mapped
+            to the same column are summed
+        keep_sum: Also set the ``sum`` column that the per-class
+            reduceRegions chains left behind: the area in m2 of the last
+            class of the last image
+    """
+    outputs = [f"classes_{i}" for i in range(len(images))]
+    pixel_area = ee.Image.pixelArea()
+    bands = []
+    for i, image in enumerate(images):
+        bands.append(pixel_area.rename(f"area_{i}"))
+        bands.append(image.select([band]).rename(f"class_{i}"))
+
+    reduced = ee.Image.cat(bands).reduceRegions(
+        collection=fc,
+        reducer=class_area_reducer(outputs),
+        scale=scale,
+        crs=crs,
+    )
+
+    last_class = str(int(list(columns[-1])[-1]))
+
+    def set_class_areas(feature):
+        areas = {}
+        for output, image_columns in zip(outputs, columns):
+            groups = ee.List(feature.get(output))
+            area_by_class = ee.Dictionary.fromLists(
+                groups.map(
+                    lambda group: ee.Number(ee.Dictionary(group).get("class"))
+                    .int()
+                    .format()
+                ),
+                groups.map(lambda group: ee.Dictionary(group).get("sum")),
+            )
+            for value, column in image_columns.items():
+                area = ee.Number(area_by_class.get(str(int(value)), 0)).multiply(0.0001)
+                areas[column] = areas[column].add(area) if column in areas else area
+        if keep_sum:
+            areas["sum"] = area_by_class.get(last_class, 0)
+
+        properties = feature.toDictionary().remove(outputs).combine(areas)
+        return ee.Feature(feature.geometry(), properties).copyProperties(
+            feature, ["system:index"]
+        )
+
+    return reduced.map(set_class_areas)
+
+
+def latest_multi_year_asset(asset_dir, prefix, start_year, end_year):
+    """
+    The newest ``{prefix}_{start_year}_{year}`` asset with ``year`` before
+    ``end_year``, so a longer range only needs the years after it.
+
+    Returns:
+        ``(asset_id, year)``, or ``(None, start_year - 1)`` if there is none
+    """
+    for year in range(end_year - 1, start_year - 1, -1):
+        asset_id = f"{asset_dir}{prefix}_{start_year}_{year}"
+        if is_gee_asset_exists(asset_id):
+            return asset_id, year
+    return None, start_year - 1
@@ -24,6 +24,7 @@ from utilities.gee_utils import (
     is_asset_public,
 )
 from utilities.geoserver_utils import Geoserver
+from public_dataservice.layer_index import index_layer
 import shutil
 from utilities.constants import (
     ADMIN_BOUNDARY_OUTPUT_DIR,
@@ -158,7 +159,17 @@ def sync_layer_to_geoserver(state_name, fc, layer_name, workspace):
             print(e)
 
     path = generate_shape_files(path)
-    return push_shape_to_geoserver(path, workspace=workspace, layer_name=layer_name)
+    res = push_shape_to_geoserver(path, workspace=workspace, layer_name=layer_name)
+    update_layer_index(workspace, layer_name, fc)
+    return res
+
+
+def update_layer_index(workspace, layer_name, geojson_fc):
+    """Refresh the coordinate search index of a layer pushed to GeoServer."""
+    try:
+        index_layer(workspace, layer_name, geojson_fc)
+    except Exception as e:
+        print(f"Failed to index layer {workspace}:{layer_name}: {e}")
 
 
 def sync_fc_to_geoserver(fc, shp_folder, layer_name, workspace, style_name=None):
@@ -188,6 +199,7 @@ def sync_fc_to_geoserver(fc, shp_folder, layer_name, workspace, style_name=None)
         # Save as GeoPackage
         gdf.to_file(path + ".gpkg", driver="GPKG")
         res = push_shape_to_geoserver(path, workspace=workspace, file_type="gpkg")
+        update_layer_index(workspace, layer_name, geojson_fc)
         if style_name:
             style_res = geo.publish_style(
                 layer_name=layer_name, style_name=style_name, workspace=workspace
@@ -227,9 +239,11 @@ def sync_project_fc_to_geoserver(fc, project_name, layer_name, workspace):
         # Save as GeoPackage
         gdf.to_file(path + ".gpkg", driver="GPKG")
         print("pushed to geoserver")
-        return push_shape_to_geoserver(
+        res = push_shape_to_geoserver(
             path, workspace=workspace, layer_name=layer_name, file_type="gpkg"
         )
+        update_layer_index(workspace, layer_name, geojson_fc)
+        return res
     else:
         print("no features found")
         return
@@ -712,6 +726,19 @@ def save_layer_info_to_db(
     return layer_obj.id
 
 
+def refresh_mws_time_series(state, district, block):
+    """Re-ingest the tehsil's MWS time-series store after hydrology/NDVI publish."""
+    if not (state and district and block):
+        return None
+    try:
+        from public_api.timeseries_store import ingest_tehsil
+
+        return ingest_tehsil(state, district, block)
+    except Exception as e:
+        print(f"Failed to refresh MWS time series store for {district}/{block}: {e}")
+        return None
+
+
 def get_existing_end_year(dataset_name, layer_name):
     """fetch objects from db on the basis of dataset name and layer_name"""
     dataset = Dataset.objects.get(name=dataset_name)
@@ -1,3 +1,7 @@
+from django.db.models import TextField, Value
+from django.db.models.fields.json import KT
+from django.db.models.functions import Lower, Replace, Trim
+
 from dpr.models import (
     Agri_maintenance,
     GW_maintenance,
@@ -192,6 +196,22 @@ def classify_demand_type(raw_value):
     return raw_value
 
 
+def normalized_demand_type(key_path):
+    """
+    Database-side counterpart of the normalisation in classify_demand_type.
+
+    Extracts the JSON text at ``key_path`` (a ``field__key__subkey`` lookup)
+    and lower-cases / trims it with underscores replaced by spaces, so it can
+    be compared against _COMMUNITY_DEMAND_VALUES / _INDIVIDUAL_DEMAND_VALUES
+    in a filter or conditional aggregate.
+    """
+    return Replace(
+        Lower(Trim(KT(key_path))),
+        Value("_", output_field=TextField()),
+        Value(" ", output_field=TextField()),
+    )
+
+
 def get_activity_type_from_waterbody(waterbody):
     """
     Extract the activity type VALUE from waterbody based on structure type and data_waterbody content.
@@ -13,7 +13,7 @@ from utilities.auth_utils import auth_free
 
 from .models import StateSOI, DistrictSOI, TehsilSOI, UserAPIKey
 from .serializers import BlockSerializer, DistrictSerializer, StateSerializer
-from .utils import activated_tehsils, normalize_name, transform_data
+from .utils import get_active_locations, normalize_name
 
 
 # state id is the census code while the district id is the id of the district from the DB
@@ -74,9 +74,7 @@ def get_blocks(request, district_id):
 @schema(None)
 def proposed_blocks(request):
     try:
-        response_data = activated_tehsils()
-        transformed_data = transform_data(data=response_data)
-        return Response(transformed_data, status=status.HTTP_200_OK)
+        return Response(get_active_locations(), status=status.HTTP_200_OK)
     except Exception as e:
         print("Exception in proposed_blocks api :: ", e)
         return Response(
@@ -1,3 +1,78 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from .models import DistrictSOI, StateSOI, TehsilSOI
+from .utils import get_active_locations
+
+
+class ActiveLocationsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.bihar = StateSOI.objects.create(state_name="Bihar", active_status=True)
+        StateSOI.objects.create(state_name="Assam", active_status=False)
+        self.gaya = DistrictSOI.objects.create(
+            state=self.bihar, district_name="Gaya", active_status=True
+        )
+        DistrictSOI.objects.create(
+            state=self.bihar, district_name="Arwal", active_status=True
+        )
+        DistrictSOI.objects.create(
+            state=self.bihar, district_name="Patna", active_status=False
+        )
+        self.atri = TehsilSOI.objects.create(
+            district=self.gaya, tehsil_name="Atri", active_status=True
+        )
+        TehsilSOI.objects.create(
+            district=self.gaya, tehsil_name="Wazirganj", active_status=False
+        )
+
+    def test_tree_is_built_with_one_query_per_level_and_cached(self):
+        # The cache version, then one query per level
+        with self.assertNumQueries(4):
+            locations = get_active_locations()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_active_locations(), locations)
+
+        self.assertEqual(
+            locations,
+            [
+                {
+                    "label": "Bihar",
+                    "state_id": str(self.bihar.id),
+                    "district": [
+                        {
+                            "label": "Arwal",
+                            "district_id": str(
+                                DistrictSOI.objects.get(district_name="Arwal").id
+                            ),
+                            "blocks": [],
+                        },
+                        {
+                            "label": "Gaya",
+                            "district_id": str(self.gaya.id),
+                            "blocks": [
+                                {
+                                    "label": "Atri",
+                                    "block_id": str(self.atri.id),
+                                    "tehsil_id": str(self.atri.id),
+                                }
+                            ],
+                        },
+                    ],
+                }
+            ],
+        )
+
+    def test_activation_change_invalidates_cache(self):
+        get_active_locations()
+
+        self.atri.active_status = False
+        self.atri.save()
+
+        gaya = get_active_locations()[0]["district"][1]
+        self.assertEqual(gaya["blocks"], [])
+
+        self.bihar.active_status = False
+        self.bihar.save()
+
+        self.assertEqual(get_active_locations(), [])
@@ -1,12 +1,15 @@
-from pathlib import Path
-from django.conf import settings
-import json
 import re
+from collections import defaultdict
 from operator import itemgetter
 from typing import Optional
 
+from utilities.cache import bump_cache_version, get_or_set_versioned
+
 from .models import DistrictSOI, StateSOI, TehsilSOI
 
+ACTIVE_LOCATIONS_CACHE_VERSION = "geoadmin_active_locations"
+ACTIVE_LOCATIONS_CACHE_TIMEOUT = 600  # seconds
+
 
 def normalize_name(name: Optional[str]) -> str:
     """
@@ -34,42 +37,57 @@ def normalize_name(name: Optional[str]) -> str:
 def activated_tehsils():
     """Returns all the activated Tehsils with tehsil id, tehsil name
 
+    The hierarchy is assembled from one query per level, so the cost does
+    not grow with the number of active states or districts.
+
     Returns:
         List: A list of JSON data
     """
-    active_states = StateSOI.objects.filter(active_status=True).order_by("state_name")
-    response_data = []
-    for state in active_states:
-        active_districts = DistrictSOI.objects.filter(
-            state=state, active_status=True
-        ).order_by("district_name")
-        districts_data = []
-        for district in active_districts:
-            active_blocks = TehsilSOI.objects.filter(
-                district=district, active_status=True
-            ).order_by("tehsil_name")
-            blocks_data = [
-                {
-                    "block_name": block.tehsil_name,
-                    "block_id": block.id,
-                }  # tehsil_name is block_name
-                for block in active_blocks
-            ]
-            districts_data.append(
-                {
-                    "district_name": district.district_name,
-                    "district_id": district.id,
-                    "blocks": blocks_data,
-                }
-            )
-        response_data.append(
+    states = (
+        StateSOI.objects.filter(active_status=True)
+        .order_by("state_name")
+        .values_list("id", "state_name")
+    )
+    districts = (
+        DistrictSOI.objects.filter(active_status=True, state__active_status=True)
+        .order_by("district_name")
+        .values_list("id", "district_name", "state_id")
+    )
+    blocks = (
+        TehsilSOI.objects.filter(
+            active_status=True,
+            district__active_status=True,
+            district__state__active_status=True,
+        )
+        .order_by("tehsil_name")
+        .values_list("id", "tehsil_name", "district_id")
+    )
+
+    blocks_by_district = defaultdict(list)
+    for block_id, tehsil_name, district_id in blocks:
+        # tehsil_name is block_name
+        blocks_by_district[district_id].append(
+            {"block_name": tehsil_name, "block_id": block_id}
+        )
+
+    districts_by_state = defaultdict(list)
+    for district_id, district_name, state_id in districts:
+        districts_by_state[state_id].append(
             {
-                "state_name": state.state_name,
-                "state_id": state.id,
-                "districts": districts_data,
+                "district_name": district_name,
+                "district_id": district_id,
+                "blocks": blocks_by_district[district_id],
             }
         )
-    return response_data
+
+    return [
+        {
+            "state_name": state_name,
+            "state_id": state_id,
+            "districts": districts_by_state[state_id],
+        }
+        for state_id, state_name in states
+    ]
 
 
 def transform_data(data):
@@ -101,16 +119,21 @@ def transform_data(data):
     ]
 
 
-def get_activated_location_json():
-    """Read proposed blocks data from JSON file"""
-    activate_locations_file_path = (
-        Path(settings.BASE_DIR) / "data/activated_locations/active_locations.json"
+def invalidate_active_locations():
+    bump_cache_version(ACTIVE_LOCATIONS_CACHE_VERSION)
+
+
+def get_active_locations():
+    """
+    The transformed state -> district -> block tree of active locations, as
+    served by the activated-locations endpoints, read through the cache.
+
+    The cache version is bumped whenever an activation flag changes (see
+    ``geoadmin.signals``).
+    """
+    return get_or_set_versioned(
+        ACTIVE_LOCATIONS_CACHE_VERSION,
+        "geoadmin_active_locations",
+        lambda: transform_data(data=activated_tehsils()),
+        ACTIVE_LOCATIONS_CACHE_TIMEOUT,
     )
-    try:
-        if activate_locations_file_path.exists():
-            with open(activate_locations_file_path, "r") as f:
-                return json.load(f)
-        return None
-    except Exception as e:
-        print(f"Error reading proposed blocks cache: {e}")
-        return None
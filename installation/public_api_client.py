@@ -32,6 +32,12 @@ Location scope rules:
 - `--state`: expand across all activated tehsils in that state
 - `--latitude --longitude`: resolve the containing tehsil automatically
 
+District and state downloads fetch several tehsils in parallel (`--workers`).
+Layer files are resumed with HTTP Range requests after a dropped connection,
+and each output directory keeps `metadata/download_manifest.jsonl`, a record
+of completed, checksummed outputs, so re-running an interrupted command skips
+finished work (`--no-resume` fetches everything again).
+
 Dataset bundles:
 
 - `metadata`: active locations + tehsil data + generated layer catalog
@@ -99,12 +105,17 @@ Examples:
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass
+import hashlib
+import http.client
 import importlib
 import json
 import os
 import sys
 import textwrap
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -400,6 +411,13 @@ resolve_best_hierarchy_candidate = _MATCHER_EXPORTS["resolve_best_hierarchy_cand
 
 DEFAULT_PUBLIC_API_BASE_URL = "https://geoserver.core-stack.org/api/v1"
 DEFAULT_TIMEOUT_SECONDS = 60
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_BACKOFF_SECONDS = 2.0
+MAX_RETRY_DELAY_SECONDS = 60.0
+RETRYABLE_HTTP_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+DOWNLOAD_CHUNK_SIZE = 1024 * 128
+DOWNLOAD_MANIFEST_FILENAME = "download_manifest.jsonl"
 DEFAULT_SAMPLE_STATE = "assam"
 DEFAULT_SAMPLE_DISTRICT = "cachar"
 DEFAULT_SAMPLE_TEHSIL = "lakhipur"
@@ -458,6 +476,10 @@ class PublicAPIHTTPError(PublicAPIError):
         super().__init__(f"{endpoint} failed with HTTP {status_code}: {snippet}")
 
 
+class IncompleteDownloadError(PublicAPIError):
+    """The connection ended before the whole file was received."""
+
+
 @dataclass(frozen=True)
 class ActiveLocationPath:
     state: str
@@ -538,6 +560,51 @@ def build_url(base_url: str, endpoint: str, params: dict[str, Any] | None = None
     return url
 
 
+def is_retryable_error(exc: BaseException) -> bool:
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code in RETRYABLE_HTTP_STATUS_CODES
+    if isinstance(exc, PublicAPIHTTPError):
+        return exc.status_code in RETRYABLE_HTTP_STATUS_CODES
+    return isinstance(
+        exc,
+        (
+            IncompleteDownloadError,
+            urllib.error.URLError,
+            http.client.HTTPException,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
+
+
+def retry_delay(attempt: int, backoff: float) -> float:
+    return min(backoff * (2**attempt), MAX_RETRY_DELAY_SECONDS)
+
+
+def call_with_retries(
+    func: Any,
+    *,
+    description: str,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+) -> Any:
+    """Call ``func`` until it succeeds, retrying transient network errors with exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as exc:  # noqa: BLE001
+            if attempt >= retries or not is_retryable_error(exc):
+                raise
+            delay = retry_delay(attempt, backoff)
+            print(
+                f"{description} failed ({exc}); retry {attempt + 1}/{retries} in {delay:.0f}s",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+
 def request_json(
     *,
     base_url: str,
@@ -545,6 +612,7 @@ def request_json(
     api_key: str,
     params: dict[str, Any] | None = None,
     timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    retries: int = DEFAULT_RETRIES,
 ) -> Any:
     url = build_url(base_url, endpoint, params)
     request = urllib.request.Request(
@@ -556,14 +624,20 @@ def request_json(
         },
     )
 
+    def fetch() -> str:
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.read().decode("utf-8")
+        except urllib.error.HTTPError as exc:
+            body = exc.read().decode("utf-8", errors="replace")
+            raise PublicAPIHTTPError(endpoint=endpoint, url=url, status_code=exc.code, body=body) from exc
+
     try:
-        with urllib.request.urlopen(request, timeout=timeout) as response:
-            body = response.read().decode("utf-8")
-    except urllib.error.HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="replace")
-        raise PublicAPIHTTPError(endpoint=endpoint, url=url, status_code=exc.code, body=body) from exc
+        body = call_with_retries(fetch, description=endpoint, retries=retries)
     except urllib.error.URLError as exc:
         raise PublicAPIError(f"{endpoint} failed while connecting to {url}: {exc.reason}") from exc
+    except (http.client.HTTPException, ConnectionError, TimeoutError) as exc:
+        raise PublicAPIError(f"{endpoint} failed while reading from {url}: {exc}") from exc
 
     try:
         return json.loads(body)
@@ -593,18 +667,182 @@ def request_optional_json(
         raise
 
 
-def download_to_file(url: str, destination: Path, timeout: int = DEFAULT_TIMEOUT_SECONDS) -> None:
-    ensure_directory(destination.parent)
-    request = urllib.request.Request(
-        url,
-        headers={"User-Agent": "corestack-public-api-client/2.0"},
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_content_range(value: str | None) -> tuple[int | None, int | None]:
+    """Return ``(start, total)`` from a ``bytes start-end/total`` or ``bytes */total`` header."""
+    if not value or not value.startswith("bytes "):
+        return None, None
+    byte_range, _, total = value[len("bytes ") :].partition("/")
+    start = byte_range.split("-", 1)[0]
+    return (
+        int(start) if start.isdigit() else None,
+        int(total) if total.isdigit() else None,
     )
-    with urllib.request.urlopen(request, timeout=timeout) as response, destination.open("wb") as handle:
-        while True:
-            chunk = response.read(1024 * 128)
-            if not chunk:
-                break
-            handle.write(chunk)
+
+
+def fetch_into_partial_file(url: str, partial: Path, timeout: int) -> None:
+    """Fetch ``url`` into ``partial``, continuing after the bytes it already holds when the server supports ranges."""
+    offset = partial.stat().st_size if partial.is_file() else 0
+    headers = {"User-Agent": "corestack-public-api-client/2.0"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+    request = urllib.request.Request(url, headers=headers)
+
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 416 or not offset:
+            raise
+        # Nothing left after the offset: complete if the sizes agree, otherwise start over
+        _, total = parse_content_range(exc.headers.get("Content-Range"))
+        if total == offset:
+            return
+        partial.unlink()
+        raise IncompleteDownloadError(f"{url}: partial file does not match the remote file") from exc
+
+    with response:
+        expected: int | None = None
+        if response.status == 206:
+            start, expected = parse_content_range(response.headers.get("Content-Range"))
+            if start != offset:
+                partial.unlink()
+                raise IncompleteDownloadError(f"{url}: server resumed at byte {start}, expected {offset}")
+            mode = "ab"
+        else:
+            # The server ignored the range, so the body is the whole file
+            offset = 0
+            mode = "wb"
+            content_length = response.headers.get("Content-Length")
+            if content_length and content_length.isdigit():
+                expected = int(content_length)
+
+        received = offset
+        with partial.open(mode) as handle:
+            while True:
+                chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                handle.write(chunk)
+                received += len(chunk)
+
+    if expected is not None and received < expected:
+        raise IncompleteDownloadError(f"{url}: received {received} of {expected} bytes")
+
+
+def download_to_file(
+    url: str,
+    destination: Path,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    *,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+) -> str:
+    """Download ``url`` to ``destination`` and return its SHA-256.
+
+    Bytes are written to ``<destination>.part`` first. After a dropped
+    connection the download resumes from the end of that file with an HTTP
+    Range request, both within the retries of this call and on a later run,
+    and the file only takes its final name once complete.
+    """
+    ensure_directory(destination.parent)
+    partial = destination.with_name(f"{destination.name}.part")
+    call_with_retries(
+        lambda: fetch_into_partial_file(url, partial, timeout),
+        description=f"Download of {url}",
+        retries=retries,
+        backoff=backoff,
+    )
+    os.replace(partial, destination)
+    return file_sha256(destination)
+
+
+class DownloadManifest:
+    """Completed outputs of one download directory, with their checksums.
+
+    Stored as ``metadata/download_manifest.jsonl`` under the directory.
+
+    Records are appended as JSON lines, so progress survives an interrupted
+    run and recording stays cheap for thousands of files. Later records
+    replace earlier ones for the same output.
+    """
+
+    def __init__(self, root: Path, *, resume: bool = True) -> None:
+        self.root = root
+        self.path = root / "metadata" / DOWNLOAD_MANIFEST_FILENAME
+        self.files: dict[str, dict[str, Any]] = {}
+        self.completed: dict[str, Any] = {}
+        self.lock = threading.Lock()
+        if resume and self.path.is_file():
+            self.load()
+
+    def load(self) -> None:
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run interrupted while appending leaves a torn last line
+                continue
+            if record.get("kind") == "file":
+                self.files[record["path"]] = record
+            elif record.get("kind") == "completed":
+                self.completed[record["key"]] = record["summary"]
+
+    def append(self, record: dict[str, Any]) -> None:
+        with self.lock:
+            ensure_directory(self.path.parent)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=True) + "\n")
+
+    def relative_path(self, output: Path) -> str:
+        return os.path.relpath(output, self.root).replace(os.sep, "/")
+
+    def record_file(self, output: Path, source: str, sha256: str | None = None) -> None:
+        record = {
+            "kind": "file",
+            "path": self.relative_path(output),
+            "source": source,
+            "size": output.stat().st_size,
+            "sha256": sha256 or file_sha256(output),
+        }
+        with self.lock:
+            self.files[record["path"]] = record
+        self.append(record)
+
+    def is_file_complete(self, output: Path, source: str) -> bool:
+        """Whether ``output`` was fetched from ``source`` and still matches its recorded checksum."""
+        record = self.files.get(self.relative_path(output))
+        return (
+            record is not None
+            and record["source"] == source
+            and output.is_file()
+            and output.stat().st_size == record["size"]
+            and file_sha256(output) == record["sha256"]
+        )
+
+    def all_files_intact(self) -> bool:
+        return all(
+            self.is_file_complete(self.root / record["path"], record["source"])
+            for record in list(self.files.values())
+        )
+
+    def record_completed(self, key: str, summary: dict[str, Any]) -> None:
+        with self.lock:
+            self.completed[key] = summary
+        self.append({"kind": "completed", "key": key, "summary": summary})
+
+    def completed_summary(self, key: str) -> dict[str, Any] | None:
+        """The summary of a finished run of ``key`` whose recorded outputs are all intact."""
+        summary = self.completed.get(key)
+        if summary is None or not self.all_files_intact():
+            return None
+        return summary
 
 
 def resolve_runtime_config(
@@ -1981,6 +2219,40 @@ def run_smoke_test(args: argparse.Namespace) -> int:
     return 0
 
 
+DOWNLOAD_REQUEST_ARGUMENTS = (
+    "layer_types",
+    "layer_limit",
+    "metadata_only",
+    "mws_id",
+    "mws_limit",
+    "all_mws_in_tehsil",
+    "village_id",
+    "village_name",
+    "strict_location_match",
+)
+
+
+def download_request_key(
+    args: argparse.Namespace,
+    *,
+    base_url: str,
+    location: dict[str, Any],
+    streams: set[str],
+) -> str:
+    """Identity of a tehsil download, so a re-run only reuses outputs of the same request."""
+    return json.dumps(
+        {
+            "base_url": base_url,
+            "location": {
+                key: location.get(key) for key in ("state", "district", "tehsil", "latitude", "longitude")
+            },
+            "streams": sorted(streams),
+            **{name: getattr(args, name, None) for name in DOWNLOAD_REQUEST_ARGUMENTS},
+        },
+        sort_keys=True,
+    )
+
+
 def download_for_tehsil_target(
     args: argparse.Namespace,
     *,
@@ -1996,6 +2268,16 @@ def download_for_tehsil_target(
         location=location,
         streams=streams,
     )
+    manifest = DownloadManifest(output_dir, resume=not getattr(args, "no_resume", False))
+    request_key = download_request_key(args, base_url=base_url, location=location, streams=streams)
+    completed_summary = manifest.completed_summary(request_key)
+    if completed_summary is not None:
+        print(
+            f"Skipping {location['state']} / {location['district']} / {location['tehsil']}: "
+            f"already downloaded under {output_dir}"
+        )
+        return completed_summary
+
     metadata_dir = ensure_directory(output_dir / "metadata")
     layers_dir = ensure_directory(output_dir / "layers")
     mws_dir = ensure_directory(output_dir / "mws")
@@ -2063,8 +2345,13 @@ def download_for_tehsil_target(
                 layer_name = str(layer.get("layer_name", f"layer_{index}"))
                 extension = infer_layer_extension(layer)
                 destination = layers_dir / f"{index:03d}_{sanitize_slug(layer_name)}.{extension}"
+                layer_url = str(layer["layer_url"])
+                if manifest.is_file_complete(destination, layer_url):
+                    print(f"Skipping layer {index}: {layer_name} (already downloaded)")
+                    continue
                 try:
-                    download_to_file(str(layer["layer_url"]), destination, timeout=args.timeout)
+                    sha256 = download_to_file(layer_url, destination, timeout=args.timeout)
+                    manifest.record_file(destination, layer_url, sha256)
                     print(f"Downloaded layer {index}: {layer_name}")
                 except Exception as exc:  # noqa: BLE001
                     layer_failures.append({"layer_name": layer_name, "error": str(exc)})
@@ -2140,6 +2427,10 @@ def download_for_tehsil_target(
                 endpoint_plan.append(("get_mws_report", "report.json"))
 
             for endpoint, filename in endpoint_plan:
+                destination = record_dir / filename
+                source = f"{endpoint}?{urllib.parse.urlencode(sorted(params.items()))}"
+                if manifest.is_file_complete(destination, source):
+                    continue
                 payload = request_optional_json(
                     base_url=base_url,
                     endpoint=endpoint,
@@ -2149,7 +2440,8 @@ def download_for_tehsil_target(
                 )
                 if payload is None:
                     continue
-                write_json(record_dir / filename, payload)
+                write_json(destination, payload)
+                manifest.record_file(destination, source)
 
             if not any(record_dir.iterdir()):
                 mws_failures.append({"mws_id": uid, "error": "No MWS payloads were returned."})
@@ -2168,6 +2460,7 @@ def download_for_tehsil_target(
         "metadata_only": args.metadata_only,
     }
     write_json(metadata_dir / "download_summary.json", summary)
+    manifest.record_completed(request_key, summary)
     return summary
 
 
@@ -2270,23 +2563,41 @@ def run_download(args: argparse.Namespace) -> int:
         )
     print(f"Writing bulk outputs under: {root_output_dir}")
 
-    tehsil_summaries: list[dict[str, Any]] = []
-    for index, target in enumerate(plan.tehsil_targets, start=1):
-        print(
-            f"[{index}/{len(plan.tehsil_targets)}] "
-            f"{target['state']} / {target['district']} / {target['tehsil']}"
-        )
-        child_output_dir = bulk_child_output_dir(root_output_dir, plan.scope, target)
-        summary = download_for_tehsil_target(
+    def download_target(target: dict[str, Any]) -> dict[str, Any]:
+        return download_for_tehsil_target(
             args,
             api_key=api_key,
             base_url=base_url,
             active_locations=active_locations,
             location=target,
             streams=streams,
-            output_dir=child_output_dir,
+            output_dir=bulk_child_output_dir(root_output_dir, plan.scope, target),
         )
-        tehsil_summaries.append(summary)
+
+    target_count = len(plan.tehsil_targets)
+    workers = max(1, min(getattr(args, "workers", DEFAULT_DOWNLOAD_WORKERS), target_count))
+    print(f"Downloading with {workers} parallel tehsil workers.")
+    results: list[dict[str, Any] | None] = [None] * target_count
+    tehsil_failures: list[dict[str, str]] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(download_target, target): index for index, target in enumerate(plan.tehsil_targets)
+        }
+        for finished, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            target = plan.tehsil_targets[index]
+            label = f"{target['state']} / {target['district']} / {target['tehsil']}"
+            try:
+                results[index] = future.result()
+                print(f"[{finished}/{target_count}] Finished {label}")
+            except Exception as exc:  # noqa: BLE001
+                tehsil_failures.append({**target, "error": str(exc)})
+                print(f"[{finished}/{target_count}] Download failed for {label}: {exc}", file=sys.stderr)
+
+    # Keep the plan order regardless of completion order
+    tehsil_summaries = [summary for summary in results if summary is not None]
+    if tehsil_failures:
+        write_json(root_metadata_dir / "tehsil_download_failures.json", tehsil_failures)
 
     aggregates = aggregate_bulk_download_outputs(
         root_output_dir=root_output_dir,
@@ -2302,6 +2613,7 @@ def run_download(args: argparse.Namespace) -> int:
         "datasets": sorted(streams),
         "streams": sorted(streams),
         "tehsil_count": len(plan.tehsil_targets),
+        "failed_tehsil_count": len(tehsil_failures),
         "notes": plan.notes,
         "aggregates": aggregates,
         "tehsils": [
@@ -2318,6 +2630,12 @@ def run_download(args: argparse.Namespace) -> int:
     }
     write_json(root_metadata_dir / "bulk_download_summary.json", bulk_summary)
     print(json.dumps(bulk_summary, indent=2))
+    if tehsil_failures:
+        print(
+            f"{len(tehsil_failures)} tehsil downloads failed; re-run the same command to resume them.",
+            file=sys.stderr,
+        )
+        return 1
     return 0
 
 
@@ -2523,6 +2841,17 @@ def build_parser() -> argparse.ArgumentParser:
         type=int,
         help="When downloading a district or state in bulk, only process the first N activated tehsils",
     )
+    download_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_DOWNLOAD_WORKERS,
+        help="Number of tehsils to download in parallel for district and state requests",
+    )
+    download_parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore the download manifest of earlier runs and fetch everything again",
+    )
     download_parser.add_argument("--mws-id", help="Fetch only one specific MWS id")
     download_parser.add_argument(
         "--all-mws-in-tehsil",
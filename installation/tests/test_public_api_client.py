@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import argparse
+import http.server
 import json
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -401,5 +403,218 @@ class PublicAPIClientTests(unittest.TestCase):
             self.assertEqual(len(aggregated_geojson["features"]), 1)
 
 
+class FlakyFileHandler(http.server.BaseHTTPRequestHandler):
+    """Serves ``server.files`` with Range support, optionally dropping the first response midway."""
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.requests.append((self.path, self.headers.get("Range")))
+        body = server.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and server.supports_ranges:
+            start = int(range_header[len("bytes=") :].rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        payload = body[start:]
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+
+        if server.drop_after is not None:
+            drop_after, server.drop_after = server.drop_after, None
+            self.wfile.write(payload[:drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+
+class ResumableDownloadTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FlakyFileHandler)
+        self.server.files = {
+            "/layer_a.tif": bytes(range(256)) * 400,
+            "/layer_b.geojson": b'{"type": "FeatureCollection", "features": []}',
+        }
+        self.server.requests = []
+        self.server.supports_ranges = True
+        self.server.drop_after = None
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.output_dir = Path(tmp_dir.name)
+
+        sleep_patcher = mock.patch.object(public_api_client.time, "sleep")
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def layer_requests(self) -> list[tuple[str, str | None]]:
+        return [request for request in self.server.requests if request[0].startswith("/layer_")]
+
+    def test_download_resumes_after_dropped_connection(self) -> None:
+        body = self.server.files["/layer_a.tif"]
+        self.server.drop_after = 30000
+        destination = self.output_dir / "layer_a.tif"
+
+        sha256 = public_api_client.download_to_file(f"{self.base_url}/layer_a.tif", destination, timeout=5)
+
+        self.assertEqual(destination.read_bytes(), body)
+        self.assertFalse(destination.with_name("layer_a.tif.part").exists())
+        self.assertEqual(self.server.requests, [("/layer_a.tif", None), ("/layer_a.tif", "bytes=30000-")])
+        self.assertEqual(sha256, public_api_client.file_sha256(destination))
+        self.sleep.assert_called_once_with(public_api_client.DEFAULT_RETRY_BACKOFF_SECONDS)
+
+    def test_download_continues_partial_file_from_earlier_run(self) -> None:
+        body = self.server.files["/layer_a.tif"]
+        destination = self.output_dir / "layer_a.tif"
+        destination.with_name("layer_a.tif.part").write_bytes(body[:1000])
+
+        public_api_client.download_to_file(f"{self.base_url}/layer_a.tif", destination, timeout=5)
+
+        self.assertEqual(destination.read_bytes(), body)
+        self.assertEqual(self.server.requests, [("/layer_a.tif", "bytes=1000-")])
+
+    def test_download_restarts_when_server_ignores_range(self) -> None:
+        body = self.server.files["/layer_a.tif"]
+        self.server.supports_ranges = False
+        destination = self.output_dir / "layer_a.tif"
+        destination.with_name("layer_a.tif.part").write_bytes(b"stale bytes")
+
+        public_api_client.download_to_file(f"{self.base_url}/layer_a.tif", destination, timeout=5)
+
+        self.assertEqual(destination.read_bytes(), body)
+
+    def test_download_gives_up_on_missing_file(self) -> None:
+        with self.assertRaises(public_api_client.urllib.error.HTTPError):
+            public_api_client.download_to_file(
+                f"{self.base_url}/missing.tif", self.output_dir / "missing.tif", timeout=5
+            )
+        self.assertEqual(len(self.server.requests), 1)
+        self.sleep.assert_not_called()
+
+    def download_args(self) -> argparse.Namespace:
+        return argparse.Namespace(
+            output_dir=None,
+            timeout=5,
+            strict_location_match=False,
+            layer_types=None,
+            metadata_only=False,
+            layer_limit=None,
+            mws_id=None,
+            mws_limit=None,
+            all_mws_in_tehsil=False,
+            village_id=None,
+            village_name=None,
+            no_resume=False,
+        )
+
+    def download_tehsil(self) -> mock.Mock:
+        layers = [
+            {"layer_name": "Layer A", "layer_url": f"{self.base_url}/layer_a.tif", "layer_type": "raster"},
+            {"layer_name": "Layer B", "layer_url": f"{self.base_url}/layer_b.geojson", "layer_type": "vector"},
+        ]
+        with mock.patch.object(public_api_client, "request_json", return_value=layers) as request_json:
+            public_api_client.download_for_tehsil_target(
+                self.download_args(),
+                api_key="key",
+                base_url="https://example.com/api/v1",
+                active_locations=[],
+                location={"state": "Assam", "district": "Cachar", "tehsil": "Lakhipur"},
+                streams={"layer_catalog", "layers"},
+                output_dir=self.output_dir,
+            )
+        return request_json
+
+    def test_rerun_skips_completed_tehsil_and_refetches_damaged_outputs(self) -> None:
+        self.download_tehsil()
+        self.assertEqual(len(self.layer_requests()), 2)
+
+        request_json = self.download_tehsil()
+        request_json.assert_not_called()
+        self.assertEqual(len(self.layer_requests()), 2)
+
+        # A damaged layer invalidates the completed tehsil, and only that layer is fetched again
+        damaged = next((self.output_dir / "layers").glob("*layer_a.tif"))
+        damaged.write_bytes(b"truncated")
+        request_json = self.download_tehsil()
+        request_json.assert_called_once()
+        self.assertEqual(self.layer_requests()[2:], [("/layer_a.tif", None)])
+        self.assertEqual(damaged.read_bytes(), self.server.files["/layer_a.tif"])
+
+    def test_bulk_download_runs_tehsils_in_parallel_and_reports_failures(self) -> None:
+        targets = [
+            {"state": "Assam", "district": "Cachar", "tehsil": name} for name in ("Lakhipur", "Sonai", "Katigorah")
+        ]
+        plan = public_api_client.DownloadPlan(
+            scope="district",
+            root_location={"state": "Assam", "district": "Cachar", "scope": "district"},
+            tehsil_targets=targets,
+            notes=[],
+        )
+        started = threading.Barrier(len(targets), timeout=5)
+
+        def download_for_tehsil_target(args, *, location, output_dir, **kwargs):
+            # Every tehsil must be running at once to pass the barrier
+            started.wait()
+            if location["tehsil"] == "Sonai":
+                raise public_api_client.PublicAPIError("connection reset")
+            return {"location": location, "output_dir": str(output_dir), "layer_count": 1, "mws_count": 0}
+
+        args = argparse.Namespace(
+            **vars(self.download_args()),
+            env_file=self.output_dir / ".env",
+            api_key="key",
+            base_url="https://example.com",
+            datasets="layer_catalog",
+            streams=None,
+            bundle=None,
+            active_locations_file=None,
+            refresh_active_locations=False,
+            state="assam",
+            district="cachar",
+            tehsil=None,
+            latitude=None,
+            longitude=None,
+            workers=3,
+        )
+        args.output_dir = str(self.output_dir)
+        with mock.patch.object(
+            public_api_client, "load_active_locations_catalog", return_value=[]
+        ), mock.patch.object(public_api_client, "resolve_download_plan", return_value=plan), mock.patch.object(
+            public_api_client, "download_for_tehsil_target", side_effect=download_for_tehsil_target
+        ), mock.patch.object(
+            public_api_client, "aggregate_bulk_download_outputs", return_value={}
+        ):
+            exit_code = public_api_client.run_download(args)
+
+        self.assertEqual(exit_code, 1)
+        metadata_dir = self.output_dir / "metadata"
+        summary = json.loads((metadata_dir / "bulk_download_summary.json").read_text(encoding="utf-8"))
+        self.assertEqual([tehsil["tehsil"] for tehsil in summary["tehsils"]], ["Lakhipur", "Katigorah"])
+        failures = json.loads((metadata_dir / "tehsil_download_failures.json").read_text(encoding="utf-8"))
+        self.assertEqual([(failure["tehsil"], failure["error"]) for failure in failures], [("Sonai", "connection reset")])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -126,6 +126,7 @@ INSTALLED_APPS = [
     "moderation",
     "users.apps.UsersConfig",
     "status_monitor",
+    "utilities.apps.UtilitiesConfig",
 ]
 
 # MARK: CORS Settings
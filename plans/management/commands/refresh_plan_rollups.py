@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from plans.rollups import backfill_test_plan_flags, refresh_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute PlanApp.is_test_plan and rebuild the PlanStewardRollup "
+        "table used by the steward meta-stats endpoints"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Also create/update a nightly periodic task running the refresh",
+        )
+
+    def handle(self, *args, **options):
+        reflagged = backfill_test_plan_flags()
+        self.stdout.write(f"Updated is_test_plan on {reflagged} plans")
+
+        rows = refresh_all()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup rows"))
+
+        if options["schedule"]:
+            from django_celery_beat.models import CrontabSchedule, PeriodicTask
+
+            schedule, _ = CrontabSchedule.objects.get_or_create(
+                minute="30",
+                hour="2",
+                day_of_month="*",
+                month_of_year="*",
+                day_of_week="*",
+                timezone="Asia/Kolkata",
+            )
+            task, created = PeriodicTask.objects.update_or_create(
+                name="Nightly Plan Rollup Refresh",
+                defaults={
+                    "task": "plans.refresh_plan_rollups",
+                    "crontab": schedule,
+                    "enabled": True,
+                },
+            )
+            action = "Created" if created else "Updated"
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{action} periodic task: '{task.name}' (runs at 02:30)"
+                )
+            )
@@ -5,6 +5,14 @@ from organization.models import Organization
 from projects.models import Project
 from users.models import User
 
+TEST_PLAN_MARKERS = ("test", "demo")
+
+
+def is_test_plan_name(plan_name):
+    name = (plan_name or "").lower()
+    return any(marker in name for marker in TEST_PLAN_MARKERS)
+
+
 PLAN_STATUS_CHOICES = [
     ("COMPLETED", "COMPLETED"),
     ("SUBMITTED", "SUBMITTED"),
@@ -111,11 +119,61 @@ class PlanApp(models.Model):
         max_digits=20, decimal_places=8, null=True, blank=True
     )
     plan_status = models.CharField(max_length=255, choices=PLAN_STATUS_CHOICES, default="IN_PROGRESS", null=True, blank=True)
+    is_test_plan = models.BooleanField(default=False, db_index=True)
 
     def __str__(self):
         return str(self.plan)
 
+    def save(self, *args, **kwargs):
+        self.is_test_plan = is_test_plan_name(self.plan)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "plan" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"is_test_plan"}
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Watershed Plan"
         verbose_name_plural = "Watershed Plans"
+
+
+class PlanStewardRollup(models.Model):
+    """
+    Pre-aggregated PlanApp counts, one row per
+    organization / project / location / steward / village combination.
+
+    Steward statistics are summed from this table instead of grouping the
+    whole PlanApp table on every request. Rows are rebuilt per
+    (organization, tehsil) partition by plans.rollups when a plan changes.
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=True)
+    state_soi = models.ForeignKey(StateSOI, on_delete=models.CASCADE, null=True)
+    district_soi = models.ForeignKey(
+        DistrictSOI, on_delete=models.CASCADE, null=True
+    )
+    tehsil_soi = models.ForeignKey(TehsilSOI, on_delete=models.CASCADE, null=True)
+    facilitator_name = models.CharField(max_length=512, null=True, blank=True)
+    effective_village = models.CharField(max_length=255)
+    is_test_plan = models.BooleanField(default=False)
+    plan_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    dpr_generated = models.PositiveIntegerField(default=0)
+    dpr_reviewed = models.PositiveIntegerField(default=0)
+    pending_dpr_generation = models.PositiveIntegerField(default=0)
+    pending_dpr_review = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Plan Steward Rollup"
+        verbose_name_plural = "Plan Steward Rollups"
+        indexes = [
+            models.Index(fields=["organization", "tehsil_soi"]),
+            models.Index(fields=["is_test_plan", "state_soi", "district_soi"]),
+            models.Index(fields=["facilitator_name"]),
+        ]
+
+    def __str__(self):
+        return f"{self.facilitator_name} @ {self.effective_village}: {self.plan_count}"
@@ -2,7 +2,6 @@ import csv
 import io
 from calendar import monthrange
 
-from django.db.models import Q
 from django.utils import timezone
 
 
@@ -25,11 +24,8 @@ def _base_queryset(cutoff):
     return PlanApp.objects.filter(
         created_at__lte=cutoff,
         enabled=True,
-    ).exclude(
-        Q(plan__icontains="test")
-        | Q(plan__icontains="demo")
-        | Q(facilitator_name__icontains="demo")
-    )
+        is_test_plan=False,
+    ).exclude(facilitator_name__icontains="demo")
 
 
 DETAILS_HEADER = [
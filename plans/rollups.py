@@ -0,0 +1,96 @@
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, Q, Value, When
+from django.db.models.functions import Length, Substr, Trim
+
+from utilities.logger import setup_logger
+
+from .models import PlanApp, PlanStewardRollup, TEST_PLAN_MARKERS
+
+logger = setup_logger(__name__)
+
+ROLLUP_KEYS = (
+    "organization_id",
+    "project_id",
+    "state_soi_id",
+    "district_soi_id",
+    "tehsil_soi_id",
+    "facilitator_name",
+    "effective_village",
+    "is_test_plan",
+)
+
+EFFECTIVE_VILLAGE = Case(
+    When(
+        ~Q(village_name="") & Q(village_name__isnull=False),
+        then=Trim(F("village_name")),
+    ),
+    When(
+        plan__startswith="Plan ",
+        then=Trim(Substr("plan", 6, Length("plan") - Value(5))),
+    ),
+    default=Trim(F("plan")),
+    output_field=CharField(max_length=255),
+)
+
+
+def _aggregate_rows(plan_queryset):
+    return (
+        plan_queryset.filter(enabled=True)
+        .annotate(effective_village=EFFECTIVE_VILLAGE)
+        .values(*ROLLUP_KEYS)
+        .annotate(
+            plan_count=Count("id"),
+            completed_count=Count("id", filter=Q(is_completed=True)),
+            in_progress_count=Count("id", filter=Q(is_completed=False)),
+            dpr_generated=Count("id", filter=Q(is_dpr_generated=True)),
+            dpr_reviewed=Count("id", filter=Q(is_dpr_reviewed=True)),
+            pending_dpr_generation=Count(
+                "id", filter=Q(is_completed=True, is_dpr_generated=False)
+            ),
+            pending_dpr_review=Count(
+                "id", filter=Q(is_dpr_generated=True, is_dpr_reviewed=False)
+            ),
+        )
+        .order_by()
+    )
+
+
+def refresh_partition(organization_id, tehsil_soi_id):
+    """Rebuild the rollup rows of one (organization, tehsil) partition."""
+    plans = PlanApp.objects.filter(
+        organization_id=organization_id, tehsil_soi_id=tehsil_soi_id
+    )
+    rows = [PlanStewardRollup(**row) for row in _aggregate_rows(plans)]
+
+    with transaction.atomic():
+        PlanStewardRollup.objects.filter(
+            organization_id=organization_id, tehsil_soi_id=tehsil_soi_id
+        ).delete()
+        PlanStewardRollup.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_all():
+    """Rebuild every rollup row from PlanApp."""
+    rows = [PlanStewardRollup(**row) for row in _aggregate_rows(PlanApp.objects.all())]
+
+    with transaction.atomic():
+        PlanStewardRollup.objects.all().delete()
+        PlanStewardRollup.objects.bulk_create(rows, batch_size=2000)
+    logger.info(f"Rebuilt {len(rows)} plan steward rollup rows")
+    return len(rows)
+
+
+def backfill_test_plan_flags():
+    """Recompute PlanApp.is_test_plan for rows written without save()."""
+    is_test = Q()
+    for marker in TEST_PLAN_MARKERS:
+        is_test |= Q(plan__icontains=marker)
+
+    flagged = PlanApp.objects.filter(is_test, is_test_plan=False).update(
+        is_test_plan=True
+    )
+    unflagged = PlanApp.objects.filter(~is_test, is_test_plan=True).update(
+        is_test_plan=False
+    )
+    return flagged + unflagged
@@ -0,0 +1,40 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import PlanApp
+from .rollups import refresh_partition
+
+
+def _schedule_refresh(partitions):
+    def _refresh():
+        for organization_id, tehsil_soi_id in partitions:
+            refresh_partition(organization_id, tehsil_soi_id)
+
+    transaction.on_commit(_refresh)
+
+
+@receiver(pre_save, sender=PlanApp)
+def remember_plan_partition(sender, instance, **kwargs):
+    """Keep the partition a plan is moving out of, so it gets refreshed too."""
+    instance._previous_rollup_partition = None
+    if instance.pk:
+        instance._previous_rollup_partition = (
+            PlanApp.objects.filter(pk=instance.pk)
+            .values_list("organization_id", "tehsil_soi_id")
+            .first()
+        )
+
+
+@receiver(post_save, sender=PlanApp)
+def refresh_plan_rollup_on_save(sender, instance, **kwargs):
+    partitions = {(instance.organization_id, instance.tehsil_soi_id)}
+    previous = getattr(instance, "_previous_rollup_partition", None)
+    if previous:
+        partitions.add(previous)
+    _schedule_refresh(partitions)
+
+
+@receiver(post_delete, sender=PlanApp)
+def refresh_plan_rollup_on_delete(sender, instance, **kwargs):
+    _schedule_refresh({(instance.organization_id, instance.tehsil_soi_id)})
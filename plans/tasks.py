@@ -56,3 +56,12 @@ def send_monthly_plan_report(self, force=False):
 
     logger.info(f"Monthly plan report sent to {', '.join(recipients)}")
     return {"status": "sent", "month": month_label, "recipients": recipients}
+
+
+@app.task(bind=True, name="plans.refresh_plan_rollups")
+def refresh_plan_rollups(self):
+    from .rollups import backfill_test_plan_flags, refresh_all
+
+    reflagged = backfill_test_plan_flags()
+    rows = refresh_all()
+    return {"status": "refreshed", "rows": rows, "reflagged_plans": reflagged}
@@ -8,6 +8,7 @@ from projects.models import Project, AppType
 from organization.models import Organization
 from users.models import User, UserProjectGroup
 from django.contrib.auth.models import Group, Permission
+from django.utils import timezone
 
 
 class PlanModelTest(TestCase):
@@ -312,3 +313,123 @@ class PlanAPITest(APITestCase):
 
         # Verify plan was not deleted
         self.assertEqual(Plan.objects.count(), 1)
+
+
+class DemandTypeCountTest(TestCase):
+    def setUp(self):
+        from dpr.models import GW_maintenance, ODK_livelihood
+
+        common = {
+            "plan_id": "42",
+            "plan_name": "Plan 42",
+            "latitude": 0.0,
+            "longitude": 0.0,
+            "status_re": "",
+        }
+        for i, demand_type in enumerate(
+            ["Community", "public_well", " Private ", "unknown", None]
+        ):
+            GW_maintenance.objects.create(
+                uuid=f"gw-{i}",
+                work_id=f"w{i}",
+                corresponding_work_id=f"c{i}",
+                data_gw_maintenance={"demand_type": demand_type},
+                **common,
+            )
+        GW_maintenance.objects.create(
+            uuid="gw-deleted",
+            work_id="wd",
+            corresponding_work_id="cd",
+            data_gw_maintenance={"demand_type": "Community"},
+            is_deleted=True,
+            **common,
+        )
+
+        livelihood_common = {
+            "beneficiary_settlement": "",
+            "block_name": "",
+            "beneficiary_contact": "",
+            "livestock_development": "",
+            "submission_time": timezone.now(),
+            "fisheries": "",
+            "common_asset": "",
+            "system": {},
+            "gps_point": {},
+            **common,
+        }
+        ODK_livelihood.objects.create(
+            uuid="lv-1",
+            data_livelihood={
+                "Livestock": {
+                    "is_demand_livestock": "Yes",
+                    "livestock_demand": "individual_demand",
+                },
+                "fisheries": {"demand_type_fisheries": "Community"},
+                "select_one_demand_plantation": "yes",
+                "plantations": {"demand_type_plantations": "Community Demand"},
+            },
+            **livelihood_common,
+        )
+
+    def test_counts_match_python_classification(self):
+        from .views import _count_demand_types
+
+        counts = _count_demand_types(["42"])
+
+        # 5 maintenance rows (deleted one skipped) + livestock + plantation;
+        # fisheries is not counted because no demand was flagged for it.
+        self.assertEqual(counts["total_demands"], 7)
+        self.assertEqual(counts["community_demands"], 3)
+        self.assertEqual(counts["individual_demands"], 2)
+
+    def test_counts_are_aggregate_queries(self):
+        from .views import _count_demand_types
+
+        # One aggregate per source model, independent of row count.
+        with self.assertNumQueries(8):
+            _count_demand_types(["42"])
+
+
+class PlanStewardRollupTest(TestCase):
+    def setUp(self):
+        self.organization = Organization.objects.create(name="Rollup Organization")
+
+    def _create_plan(self, name, **kwargs):
+        from .models import PlanApp
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return PlanApp.objects.create(
+                plan=name,
+                organization=self.organization,
+                facilitator_name="Asha Devi",
+                village_name="Rampur",
+                gram_panchayat="Rampur GP",
+                **kwargs,
+            )
+
+    def test_is_test_plan_flag_set_on_save(self):
+        self.assertTrue(self._create_plan("Demo plan").is_test_plan)
+        self.assertTrue(self._create_plan("TEST village").is_test_plan)
+        self.assertFalse(self._create_plan("Plan Rampur").is_test_plan)
+
+    def test_rollup_tracks_plan_changes(self):
+        from .models import PlanStewardRollup
+
+        plan = self._create_plan("Plan Rampur")
+        self._create_plan("Plan Rampur 2", is_completed=True)
+
+        row = PlanStewardRollup.objects.get(is_test_plan=False)
+        self.assertEqual(row.plan_count, 2)
+        self.assertEqual(row.completed_count, 1)
+        self.assertEqual(row.in_progress_count, 1)
+
+        plan.is_completed = True
+        with self.captureOnCommitCallbacks(execute=True):
+            plan.save()
+        # Partitions are rebuilt, so the row has to be fetched again.
+        row = PlanStewardRollup.objects.get(is_test_plan=False)
+        self.assertEqual(row.completed_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            plan.delete()
+        self.assertEqual(PlanStewardRollup.objects.get().plan_count, 1)
@@ -1,6 +1,6 @@
 # plans/views.py
-from django.db.models import Avg, Case, CharField as CharFieldOutput, Count, F, Max, Min, Q, Value, When
-from django.db.models.functions import Coalesce, Concat, Length, Substr, Trim
+from django.db.models import Avg, Case, CharField as CharFieldOutput, Count, F, Max, Min, Q, Sum, TextField, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat, Length, Substr, Trim
 from django.utils import timezone
 from rest_framework import permissions, status, viewsets
 from rest_framework.authentication import BaseAuthentication
@@ -11,22 +11,29 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from geoadmin.models import UserAPIKey
 from organization.models import Organization
 from projects.models import AppType, Project
+from users.access import TEST_PLAN_REVIEWER_GROUP, get_request_access
 from users.models import User, UserProjectGroup
 
-from .models import PlanApp
+from .models import PlanApp, PlanStewardRollup
 from .serializers import (
     PlanAppSerializer,
     PlanCreateSerializer,
     PlanUpdateSerializer,
 )
 
-from dpr.mapping import classify_demand_type
+from dpr.mapping import (
+    _COMMUNITY_DEMAND_VALUES,
+    _INDIVIDUAL_DEMAND_VALUES,
+    normalized_demand_type,
+)
 from dpr.models import (
     Agri_maintenance,
     DPR_Report,
     GW_maintenance,
     ODK_agri,
+    ODK_agrohorticulture,
     ODK_groundwater,
+    ODK_livelihood,
     SWB_RS_maintenance,
     SWB_maintenance,
 )
@@ -86,114 +93,118 @@ STEWARD_FULL_NAME = Trim(
 
 
 # MARK: Demand Type Counting 
+def _demand_aggregates(prefix, demand, condition=None):
+    """Conditional aggregates tallying one demand-type expression per row."""
+    condition = condition if condition is not None else Q()
+    return {
+        f"{prefix}_total": Count("pk", filter=condition),
+        f"{prefix}_community": Count(
+            "pk", filter=condition & Q(**{f"{demand}__in": list(_COMMUNITY_DEMAND_VALUES)})
+        ),
+        f"{prefix}_individual": Count(
+            "pk", filter=condition & Q(**{f"{demand}__in": list(_INDIVIDUAL_DEMAND_VALUES)})
+        ),
+    }
+
+
+def _is_yes(key_path):
+    return Q(**{f"{key_path}__iexact": "yes"})
+
+
 def _count_demand_types(plan_id_strs):
-    from dpr.mapping import classify_demand_type
-    from dpr.models import (
-        Agri_maintenance,
-        GW_maintenance,
-        ODK_agri,
-        ODK_agrohorticulture,
-        ODK_groundwater,
-        ODK_livelihood,
-        SWB_RS_maintenance,
-        SWB_maintenance,
-    )
+    """
+    Tally community / individual demands across the plans' works.
+
+    Demand types are extracted from the JSONB payloads and classified in the
+    database (see dpr.mapping.normalized_demand_type), so each model costs one
+    aggregate query regardless of how many rows it has. ``plan_id_strs`` may
+    be a list of ids or a ``values`` subquery of text plan ids.
+    """
+    sources = [
+        # Section E — maintenance models
+        (GW_maintenance, "data_gw_maintenance__demand_type", False),
+        (Agri_maintenance, "data_agri_maintenance__demand_type", False),
+        (SWB_maintenance, "data_swb_maintenance__demand_type", False),
+        (SWB_RS_maintenance, "data_swb_rs_maintenance__demand_type", False),
+        # Section F — NRM works models
+        (ODK_groundwater, "data_groundwater__demand_type", True),
+        (ODK_agri, "data_agri__demand_type_irrigation", True),
+        # Section G.2 — agrohorticulture plantations
+        (ODK_agrohorticulture, "data_agohorticulture__demand_type_plantations", True),
+    ]
 
     community = 0
     individual = 0
     total = 0
 
-    def _tally(raw_values):
+    def _add(counts, prefix):
         nonlocal community, individual, total
-        for raw in raw_values:
-            total += 1
-            classified = classify_demand_type(raw)
-            if classified == "Community Demand":
-                community += 1
-            elif classified == "Individual Demand":
-                individual += 1
-
-    # Section E — maintenance models
-    # Fetch full JSON dict and extract key in Python to avoid ->operator issues on text columns
-    _tally(
-        (d or {}).get("demand_type")
-        for d in GW_maintenance.objects.filter(plan_id__in=plan_id_strs).exclude(is_deleted=True).values_list("data_gw_maintenance", flat=True)
-    )
-    _tally(
-        (d or {}).get("demand_type")
-        for d in Agri_maintenance.objects.filter(plan_id__in=plan_id_strs).exclude(is_deleted=True).values_list("data_agri_maintenance", flat=True)
-    )
-    _tally(
-        (d or {}).get("demand_type")
-        for d in SWB_maintenance.objects.filter(plan_id__in=plan_id_strs).exclude(is_deleted=True).values_list("data_swb_maintenance", flat=True)
-    )
-    _tally(
-        (d or {}).get("demand_type")
-        for d in SWB_RS_maintenance.objects.filter(plan_id__in=plan_id_strs).exclude(is_deleted=True).values_list("data_swb_rs_maintenance", flat=True)
-    )
-
-    # Section F — NRM works models
-    _tally(
-        (d or {}).get("demand_type")
-        for d in ODK_groundwater.objects.filter(plan_id__in=plan_id_strs).exclude(is_deleted=True).exclude(status_re="rejected").values_list("data_groundwater", flat=True)
-    )
-    _tally(
-        (d or {}).get("demand_type_irrigation")
-        for d in ODK_agri.objects.filter(plan_id__in=plan_id_strs).exclude(is_deleted=True).exclude(status_re="rejected").values_list("data_agri", flat=True)
-    )
+        total += counts[f"{prefix}_total"]
+        community += counts[f"{prefix}_community"]
+        individual += counts[f"{prefix}_individual"]
+
+    for model, key_path, excludes_rejected in sources:
+        qs = model.objects.filter(plan_id__in=plan_id_strs).exclude(is_deleted=True)
+        if excludes_rejected:
+            qs = qs.exclude(status_re="rejected")
+        counts = qs.annotate(_demand=normalized_demand_type(key_path)).aggregate(
+            **_demand_aggregates("d", "_demand")
+        )
+        _add(counts, "d")
 
     # Section G — Livelihood works (G.1 Livestock/Fisheries, G.2 Plantations/Kitchen Gardens)
-    def _livelihood_demand_types():
-        for dl in (
-            d or {}
-            for d in ODK_livelihood.objects.filter(plan_id__in=plan_id_strs)
-            .exclude(is_deleted=True)
-            .exclude(status_re="rejected")
-            .values_list("data_livelihood", flat=True)
-        ):
-            livestock = dl.get("Livestock") or {}
-            fisheries = dl.get("fisheries") or {}
-            plantations = dl.get("plantations") or {}
-            kitchen_garden = dl.get("kitchen_gardens") or {}
-
-            if (
-                str(livestock.get("is_demand_livestock", "")).lower() == "yes"
-                or str(dl.get("select_one_demand_promoting_livestock", "")).lower() == "yes"
-            ):
-                yield livestock.get("livestock_demand")
-
-            if (
-                str(fisheries.get("is_demand_fisheris", "")).lower() == "yes"
-                or str(dl.get("select_one_demand_promoting_fisheries", "")).lower() == "yes"
-            ):
-                yield fisheries.get("demand_type_fisheries")
-
-            if (
-                str(dl.get("select_one_demand_plantation", "")).lower() == "yes"
-                or str(plantations.get("select_plantation_demands", "")).lower() == "yes"
-            ):
-                yield plantations.get("demand_type_plantations")
-
-            if (
-                str(dl.get("indi_assets", "")).lower() == "yes"
-                or str(kitchen_garden.get("assets_kg", "")).lower() == "yes"
-            ):
-                yield kitchen_garden.get("demand_type_kitchen_garden")
-
-    _tally(_livelihood_demand_types())
-
-    _tally(
-        (d or {}).get("demand_type_plantations")
-        for d in ODK_agrohorticulture.objects.filter(plan_id__in=plan_id_strs)
+    livelihood_sections = {
+        "livestock": (
+            "data_livelihood__Livestock__livestock_demand",
+            _is_yes("data_livelihood__Livestock__is_demand_livestock")
+            | _is_yes("data_livelihood__select_one_demand_promoting_livestock"),
+        ),
+        "fisheries": (
+            "data_livelihood__fisheries__demand_type_fisheries",
+            _is_yes("data_livelihood__fisheries__is_demand_fisheris")
+            | _is_yes("data_livelihood__select_one_demand_promoting_fisheries"),
+        ),
+        "plantations": (
+            "data_livelihood__plantations__demand_type_plantations",
+            _is_yes("data_livelihood__select_one_demand_plantation")
+            | _is_yes("data_livelihood__plantations__select_plantation_demands"),
+        ),
+        "kitchen_garden": (
+            "data_livelihood__kitchen_gardens__demand_type_kitchen_garden",
+            _is_yes("data_livelihood__indi_assets")
+            | _is_yes("data_livelihood__kitchen_gardens__assets_kg"),
+        ),
+    }
+    livelihood_qs = (
+        ODK_livelihood.objects.filter(plan_id__in=plan_id_strs)
         .exclude(is_deleted=True)
         .exclude(status_re="rejected")
-        .values_list("data_agohorticulture", flat=True)
+        .annotate(
+            **{
+                f"_{section}_demand": normalized_demand_type(key_path)
+                for section, (key_path, _) in livelihood_sections.items()
+            }
+        )
     )
+    aggregates = {}
+    for section, (_, condition) in livelihood_sections.items():
+        aggregates.update(
+            _demand_aggregates(section, f"_{section}_demand", condition)
+        )
+    counts = livelihood_qs.aggregate(**aggregates)
+    for section in livelihood_sections:
+        _add(counts, section)
 
     return {"community_demands": community, "individual_demands": individual, "total_demands": total}
 
 
 def _build_steward_meta_stats(queryset, organization_id=None):
+    """
+    Steward statistics summed from a PlanStewardRollup queryset.
+
+    The rollup already carries per-(steward, village, location) plan counts,
+    so every figure here is an aggregate over that much smaller table.
+    """
     valid_steward_qs = (
         User.objects.filter(groups__name="App User")
         .exclude(organization_id=CFPT_ORG_ID)
@@ -207,57 +218,41 @@ def _build_steward_meta_stats(queryset, organization_id=None):
         .annotate(full_name=STEWARD_FULL_NAME)
         .values_list("full_name", flat=True)
     )
-    queryset = queryset.filter(facilitator_name__in=valid_steward_names)
-
-    effective_village = Case(
-        When(
-            ~Q(village_name="") & Q(village_name__isnull=False),
-            then=Trim(F("village_name")),
-        ),
-        When(
-            plan__startswith="Plan ",
-            then=Trim(Substr("plan", 6, Length("plan") - Value(5))),
-        ),
-        default=Trim(F("plan")),
-        output_field=CharFieldOutput(max_length=255),
-    )
-    qs = queryset.annotate(effective_village=effective_village)
+    qs = queryset.filter(facilitator_name__in=valid_steward_names)
 
     per_steward = (
         qs.values("facilitator_name")
         .annotate(
-            plan_count=Count("id"),
-            completed_count=Count("id", filter=Q(is_completed=True)),
-            in_progress_count=Count("id", filter=Q(is_completed=False)),
-            dpr_generated=Count("id", filter=Q(is_dpr_generated=True)),
-            dpr_reviewed=Count("id", filter=Q(is_dpr_reviewed=True)),
+            steward_plans=Sum("plan_count"),
+            steward_completed=Sum("completed_count"),
+            steward_in_progress=Sum("in_progress_count"),
         )
+        .order_by()
     )
 
     agg = per_steward.aggregate(
-        avg_plans=Avg("plan_count"),
-        min_plans=Min("plan_count"),
-        max_plans=Max("plan_count"),
+        avg_plans=Avg("steward_plans"),
+        min_plans=Min("steward_plans"),
+        max_plans=Max("steward_plans"),
         avg_completion=Avg(
             Case(
-                When(plan_count__gt=0, then=F("completed_count") * 100.0 / F("plan_count")),
+                When(
+                    steward_plans__gt=0,
+                    then=F("steward_completed") * 100.0 / F("steward_plans"),
+                ),
                 default=Value(0.0),
             )
         ),
     )
 
-    active_stewards = per_steward.filter(in_progress_count__gt=0).count()
+    active_stewards = per_steward.filter(steward_in_progress__gt=0).count()
     inactive_stewards = total_stewards - active_stewards
 
     dpr_agg = qs.aggregate(
-        total_dpr_generated=Count("id", filter=Q(is_dpr_generated=True)),
-        total_dpr_reviewed=Count("id", filter=Q(is_dpr_reviewed=True)),
-        pending_dpr_generation=Count(
-            "id", filter=Q(is_completed=True, is_dpr_generated=False)
-        ),
-        pending_dpr_review=Count(
-            "id", filter=Q(is_dpr_generated=True, is_dpr_reviewed=False)
-        ),
+        total_dpr_generated=Coalesce(Sum("dpr_generated"), 0),
+        total_dpr_reviewed=Coalesce(Sum("dpr_reviewed"), 0),
+        pending_dpr_generation=Coalesce(Sum("pending_dpr_generation"), 0),
+        pending_dpr_review=Coalesce(Sum("pending_dpr_review"), 0),
     )
 
     by_organization = [
@@ -486,27 +481,16 @@ class PlanPermission(permissions.BasePermission):
         if not project_id:
             return False
 
-        if request.user.groups.filter(
-            name__in=["Organization Admin", "Org Admin", "Administrator"]
-        ).exists():
-            try:
-                project = Project.objects.get(id=project_id)
-                return project.organization == request.user.organization
-            except Project.DoesNotExist:
-                return False
+        access = get_request_access(request)
+        if access.is_org_admin:
+            return access.administers(project_id)
 
         if request.method == "POST":
-            return request.user.has_project_permission(
-                project_id=project_id, codename="add_watershed"
-            )
+            return access.has_project_permission(project_id, "add_watershed")
         elif request.method in ["PUT", "PATCH"]:
-            return request.user.has_project_permission(
-                project_id=project_id, codename="change_watershed"
-            )
+            return access.has_project_permission(project_id, "change_watershed")
         elif request.method == "DELETE":
-            return request.user.has_project_permission(
-                project_id=project_id, codename="delete_watershed"
-            )
+            return access.has_project_permission(project_id, "delete_watershed")
 
         return False
 
@@ -527,19 +511,14 @@ class PlanPermission(permissions.BasePermission):
         if not project:
             return False
 
-        if request.user.groups.filter(
-            name__in=["Organization Admin", "Org Admin", "Administrator"]
-        ).exists():
-            return project.organization == request.user.organization
+        access = get_request_access(request)
+        if access.is_org_admin:
+            return project.organization_id == request.user.organization_id
 
         if request.method in ["PUT", "PATCH"]:
-            return request.user.has_project_permission(
-                project=project, codename="change_watershed"
-            )
+            return access.has_project_permission(project.id, "change_watershed")
         elif request.method == "DELETE":
-            return request.user.has_project_permission(
-                project=project, codename="delete_watershed"
-            )
+            return access.has_project_permission(project.id, "delete_watershed")
 
         return False
 
@@ -650,9 +629,7 @@ class GlobalPlanViewSet(viewsets.ReadOnlyModelViewSet):
         # by state/district/tehsil so it scans fewer rows
         filter_test_demo = self.request.query_params.get("filter_test_plan", "").lower() == "true"
         if filter_test_demo:
-            queryset = queryset.exclude(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            queryset = queryset.filter(is_test_plan=False)
 
         return queryset.order_by("-created_at")
     @action(detail=False, methods=["get"], url_path="meta-stats")
@@ -675,9 +652,7 @@ class GlobalPlanViewSet(viewsets.ReadOnlyModelViewSet):
         """
         base_queryset = PlanApp.objects.filter(enabled=True)
 
-        base_queryset = base_queryset.exclude(
-            Q(plan__icontains="test") | Q(plan__icontains="demo")
-        )
+        base_queryset = base_queryset.filter(is_test_plan=False)
 
         organization_id = request.query_params.get("organization")
         project_id = request.query_params.get("project")
@@ -698,22 +673,30 @@ class GlobalPlanViewSet(viewsets.ReadOnlyModelViewSet):
         elif state_id:
             base_queryset = base_queryset.filter(state_soi_id=state_id)
 
-        plan_id_strs = [str(pid) for pid in base_queryset.values_list("id", flat=True)]
-
-        total_plans = base_queryset.count()
-        completed_plans = base_queryset.filter(is_completed=True).count()
-        dpr_generated = base_queryset.filter(is_dpr_generated=True).count()
-        dpr_reviewed = base_queryset.filter(is_dpr_reviewed=True).count()
-
-        in_progress_plans = base_queryset.filter(is_completed=False).count()
+        plan_id_strs = base_queryset.annotate(
+            id_str=Cast("id", TextField())
+        ).values("id_str")
 
-        pending_dpr_generation = base_queryset.filter(
-            is_completed=True, is_dpr_generated=False
-        ).count()
-
-        pending_dpr_review = base_queryset.filter(
-            is_dpr_generated=True, is_dpr_reviewed=False
-        ).count()
+        summary_counts = base_queryset.aggregate(
+            total_plans=Count("id"),
+            completed_plans=Count("id", filter=Q(is_completed=True)),
+            dpr_generated=Count("id", filter=Q(is_dpr_generated=True)),
+            dpr_reviewed=Count("id", filter=Q(is_dpr_reviewed=True)),
+            in_progress_plans=Count("id", filter=Q(is_completed=False)),
+            pending_dpr_generation=Count(
+                "id", filter=Q(is_completed=True, is_dpr_generated=False)
+            ),
+            pending_dpr_review=Count(
+                "id", filter=Q(is_dpr_generated=True, is_dpr_reviewed=False)
+            ),
+        )
+        total_plans = summary_counts["total_plans"]
+        completed_plans = summary_counts["completed_plans"]
+        dpr_generated = summary_counts["dpr_generated"]
+        dpr_reviewed = summary_counts["dpr_reviewed"]
+        in_progress_plans = summary_counts["in_progress_plans"]
+        pending_dpr_generation = summary_counts["pending_dpr_generation"]
+        pending_dpr_review = summary_counts["pending_dpr_review"]
 
         cc_operational_queryset = base_queryset.filter(tehsil_soi__active_status=True)
         cc_active_tehsils = (
@@ -933,9 +916,7 @@ class GlobalPlanViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="steward-meta-stats")
     def steward_meta_stats(self, request, *args, **kwargs):
-        base_queryset = PlanApp.objects.filter(enabled=True).exclude(
-            Q(plan__icontains="test") | Q(plan__icontains="demo")
-        )
+        base_queryset = PlanStewardRollup.objects.filter(is_test_plan=False)
 
         organization_id = request.query_params.get("organization")
         project_id = request.query_params.get("project")
@@ -967,9 +948,7 @@ class GlobalPlanViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="steward-listing")
     def steward_listing(self, request, *args, **kwargs):
-        base_queryset = PlanApp.objects.filter(enabled=True).exclude(
-            Q(plan__icontains="test") | Q(plan__icontains="demo")
-        )
+        base_queryset = PlanApp.objects.filter(enabled=True, is_test_plan=False)
 
         organization_id = request.query_params.get("organization")
         project_id = request.query_params.get("project")
@@ -1038,9 +1017,7 @@ class OrganizationPlanViewSet(viewsets.ReadOnlyModelViewSet):
 
         filter_test_demo = self.request.query_params.get("filter_test_plan", "").lower() == "true"
         if filter_test_demo:
-            queryset = queryset.exclude(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            queryset = queryset.filter(is_test_plan=False)
 
         return queryset.order_by("-created_at")
 
@@ -1167,11 +1144,10 @@ class PlanViewSet(viewsets.ModelViewSet):
         App Users: can see all the plans from a project they are associated with
         """
         project_id = self.kwargs.get("project_pk")
+        access = get_request_access(self.request)
 
-        if self.request.user.groups.filter(name="Test Plan Reviewer").exists():
-            base_queryset = PlanApp.objects.filter(enabled=True).filter(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+        if access.in_group(TEST_PLAN_REVIEWER_GROUP):
+            base_queryset = PlanApp.objects.filter(enabled=True, is_test_plan=True)
             if project_id:
                 base_queryset = base_queryset.filter(project_id=project_id)
             tehsil_id = self.request.query_params.get("tehsil")
@@ -1193,11 +1169,9 @@ class PlanViewSet(viewsets.ModelViewSet):
             else:
                 base_queryset = PlanApp.objects.filter(enabled=True)
 
-        elif self.request.user.groups.filter(
-            name__in=["Organization Admin", "Org Admin", "Administrator"]
-        ).exists():
+        elif access.is_org_admin:
             base_queryset = PlanApp.objects.filter(
-                organization=self.request.user.organization, enabled=True
+                organization_id=self.request.user.organization_id, enabled=True
             )
 
             if project_id:
@@ -1205,7 +1179,7 @@ class PlanViewSet(viewsets.ModelViewSet):
                     project = Project.objects.get(
                         id=project_id, app_type=AppType.WATERSHED, enabled=True
                     )
-                    if project.organization == self.request.user.organization:
+                    if project.organization_id == self.request.user.organization_id:
                         base_queryset = base_queryset.filter(project=project)
                     else:
                         return PlanApp.objects.none()
@@ -1234,11 +1208,9 @@ class PlanViewSet(viewsets.ModelViewSet):
 
         filter_test_demo = self.request.query_params.get("filter_test_plan", "").lower() == "true"
         if filter_test_demo:
-            base_queryset = base_queryset.exclude(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            base_queryset = base_queryset.filter(is_test_plan=False)
 
-        return base_queryset
+        return base_queryset.select_related("project", "organization", "created_by")
 
     def get_serializer_class(self):
         """
@@ -1335,9 +1307,7 @@ class PlanViewSet(viewsets.ModelViewSet):
         project_id = self.kwargs.get("project_pk")
 
         if user.groups.filter(name="Test Plan Reviewer").exists():
-            plans = PlanApp.objects.filter(enabled=True).filter(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            plans = PlanApp.objects.filter(enabled=True, is_test_plan=True)
             if project_id:
                 plans = plans.filter(project_id=project_id)
             tehsil_id = request.query_params.get("tehsil")
@@ -1432,15 +1402,11 @@ class PlanViewSet(viewsets.ModelViewSet):
         base_queryset = PlanApp.objects.filter(enabled=True)
 
         if is_test_plan_reviewer:
-            base_queryset = base_queryset.filter(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            base_queryset = base_queryset.filter(is_test_plan=True)
             if project_id:
                 base_queryset = base_queryset.filter(project_id=project_id)
         else:
-            base_queryset = base_queryset.exclude(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            base_queryset = base_queryset.filter(is_test_plan=False)
 
             if project_id:
                 try:
@@ -1669,18 +1635,14 @@ class PlanViewSet(viewsets.ModelViewSet):
 
         is_test_plan_reviewer = user.groups.filter(name="Test Plan Reviewer").exists()
 
-        base_queryset = PlanApp.objects.filter(enabled=True)
+        base_queryset = PlanStewardRollup.objects.all()
 
         if is_test_plan_reviewer:
-            base_queryset = base_queryset.filter(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            base_queryset = base_queryset.filter(is_test_plan=True)
             if project_id:
                 base_queryset = base_queryset.filter(project_id=project_id)
         else:
-            base_queryset = base_queryset.exclude(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            base_queryset = base_queryset.filter(is_test_plan=False)
 
             if project_id:
                 try:
@@ -1766,15 +1728,11 @@ class PlanViewSet(viewsets.ModelViewSet):
         base_queryset = PlanApp.objects.filter(enabled=True)
 
         if is_test_plan_reviewer:
-            base_queryset = base_queryset.filter(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            base_queryset = base_queryset.filter(is_test_plan=True)
             if project_id:
                 base_queryset = base_queryset.filter(project_id=project_id)
         else:
-            base_queryset = base_queryset.exclude(
-                Q(plan__icontains="test") | Q(plan__icontains="demo")
-            )
+            base_queryset = base_queryset.filter(is_test_plan=False)
 
             if project_id:
                 try:
@@ -0,0 +1,167 @@
+"""
+Background KML ingestion.
+
+Uploaded KMLs are converted to GeoJSON by a Celery task, not in the upload
+request. The converted FeatureCollection is stored on the ``KMLFile``, and
+its features are appended to the project's merged
+``saytrees/geojson/project_<id>.geojson`` without rewriting the file.
+Deleting a KML rebuilds the merged file by streaming the stored features
+of the remaining KMLs. KMLs uploaded before ingestion moved to the
+background have no stored features; they are converted before any rebuild
+of their project, or all at once by the ``convert_legacy_kml_files``
+command.
+
+File updates for a project run under a row lock on the project, so appends
+and rebuilds from concurrent tasks never interleave.
+"""
+
+import os
+
+from django.conf import settings
+from django.db import transaction
+
+from projects.models import Project
+
+from .models import KMLFile
+from .utils.kml_converter import (
+    append_features,
+    convert_kml_to_geojson,
+    write_feature_collection,
+)
+
+PROJECT_GEOJSON_DIR = "saytrees/geojson"
+
+
+def project_geojson_path(project_id):
+    """Path of the merged GeoJSON relative to ``MEDIA_ROOT``."""
+    return f"{PROJECT_GEOJSON_DIR}/project_{project_id}.geojson"
+
+
+def _dispatch(task, project_id, **kwargs):
+    try:
+        task.apply_async(kwargs={"project_id": project_id, **kwargs}, queue="nrm")
+    except Exception as e:
+        print(f"Failed to queue {task.name} for project {project_id}: {e}")
+
+
+def queue_kml_ingestion(project_id, kml_file_ids):
+    """Convert the KMLs and add them to the project GeoJSON after commit."""
+    from .tasks import ingest_kml_files_task
+
+    transaction.on_commit(
+        lambda: _dispatch(
+            ingest_kml_files_task, project_id, kml_file_ids=list(kml_file_ids)
+        )
+    )
+
+
+def queue_project_geojson_rebuild(project_id):
+    """Rebuild the project GeoJSON from the stored features after commit."""
+    from .tasks import rebuild_project_geojson_task
+
+    transaction.on_commit(lambda: _dispatch(rebuild_project_geojson_task, project_id))
+
+
+def _convert_kml_files(kml_files):
+    """``{kml_file_id: FeatureCollection}`` of the KMLs that could be converted."""
+    converted = {}
+    for kml_file in kml_files.only("id", "file"):
+        geojson_data = convert_kml_to_geojson(kml_file.file.path)
+        if geojson_data is None:
+            print(f"Could not convert KML file {kml_file.id}")
+            continue
+        converted[kml_file.id] = geojson_data
+    return converted
+
+
+def _store_features(converted):
+    """
+    Store the converted features of KMLs still unconverted. KMLs deleted or
+    converted by another task meanwhile are left out.
+
+    Returns:
+        list: Features of the KMLs stored
+    """
+    features = []
+    for kml_file_id, geojson_data in converted.items():
+        if KMLFile.objects.filter(id=kml_file_id, geojson_data__isnull=True).update(
+            geojson_data=geojson_data
+        ):
+            features.extend(geojson_data.get("features", []))
+    return features
+
+
+def convert_pending_kml_files(project_id):
+    """Convert and store the project's KMLs that have no stored features yet."""
+    _store_features(
+        _convert_kml_files(
+            KMLFile.objects.filter(project_id=project_id, geojson_data__isnull=True)
+        )
+    )
+
+
+def _write_project_geojson(project):
+    """Rewrite the merged file from the stored features. Caller holds the lock."""
+    # The merged file must keep the sites of KMLs not converted yet
+    if KMLFile.objects.filter(project=project, geojson_data__isnull=True).exists():
+        convert_pending_kml_files(project.id)
+
+    relative_path = project_geojson_path(project.id)
+    stored = (
+        KMLFile.objects.filter(project=project, geojson_data__isnull=False)
+        .order_by("id")
+        .values_list("geojson_data", flat=True)
+    )
+    count = write_feature_collection(
+        stored.iterator(), os.path.join(settings.MEDIA_ROOT, relative_path)
+    )
+
+    geojson_path = relative_path if count else None
+    if project.geojson_path != geojson_path:
+        project.geojson_path = geojson_path
+        project.save(update_fields=["geojson_path"])
+
+
+def rebuild_project_geojson(project_id):
+    # Convert outside the lock; _write_project_geojson only picks up KMLs
+    # uploaded meanwhile.
+    convert_pending_kml_files(project_id)
+    with transaction.atomic():
+        project = Project.objects.select_for_update().filter(id=project_id).first()
+        if project is None:
+            return
+        _write_project_geojson(project)
+
+
+def ingest_kml_files(project_id, kml_file_ids):
+    """
+    Convert the project's not yet converted KMLs among ``kml_file_ids`` and
+    add their features to the project GeoJSON. Used by the Celery task.
+
+    Returns:
+        list: Ids of the KMLs converted
+    """
+    converted = _convert_kml_files(
+        KMLFile.objects.filter(
+            project_id=project_id, id__in=kml_file_ids, geojson_data__isnull=True
+        )
+    )
+    if not converted:
+        return []
+
+    with transaction.atomic():
+        project = Project.objects.select_for_update().filter(id=project_id).first()
+        if project is None:
+            return []
+
+        features = _store_features(converted)
+        output_path = os.path.join(
+            settings.MEDIA_ROOT, project_geojson_path(project.id)
+        )
+        if project.geojson_path and append_features(output_path, features):
+            return list(converted)
+
+        # First features of the project, or a missing/foreign file
+        _write_project_geojson(project)
+
+    return list(converted)
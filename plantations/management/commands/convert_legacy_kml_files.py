@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from plantations.ingest import rebuild_project_geojson
+from plantations.models import KMLFile
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the KML files that have no stored GeoJSON (uploaded before "
+        "background ingestion) and rebuild their projects' merged GeoJSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, help="Only this project id")
+
+    def handle(self, *args, **options):
+        pending = KMLFile.objects.filter(geojson_data__isnull=True)
+        if options["project"]:
+            pending = pending.filter(project_id=options["project"])
+        project_ids = sorted(set(pending.values_list("project_id", flat=True)))
+
+        rebuilt = 0
+        failed = 0
+        for project_id in project_ids:
+            try:
+                rebuild_project_geojson(project_id)
+                rebuilt += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"Project {project_id}: {e}"))
+
+        remaining = KMLFile.objects.filter(
+            project_id__in=project_ids, geojson_data__isnull=True
+        ).count()
+        self.stdout.write(
+            f"Rebuilt: {rebuilt}, Failed: {failed}, "
+            f"KML files still unconverted: {remaining}"
+        )
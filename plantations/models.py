@@ -55,6 +55,8 @@ class KMLFile(models.Model):
     name = models.CharField(max_length=255)
     file = models.FileField(upload_to=kml_file_path, storage=overwrite_storage, max_length=511)
     kml_hash = models.CharField(max_length=64, unique=True)  # md5 hash of file
+    # FeatureCollection converted from the KML in the background
+    geojson_data = models.JSONField(null=True, blank=True)
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -40,8 +40,9 @@ class KMLFileDetailSerializer(serializers.ModelSerializer):
             "uploaded_by",
             "uploaded_by_username",
             "created_at",
+            "geojson_data",
         ]
-        read_only_fields = ["id", "uploaded_by", "created_at"]
+        read_only_fields = ["id", "uploaded_by", "created_at", "geojson_data"]
 
 
 class PlantationProfileSerializer(serializers.ModelSerializer):
@@ -0,0 +1,13 @@
+from nrm_app.celery import app
+
+from .ingest import ingest_kml_files, rebuild_project_geojson
+
+
+@app.task(bind=True, name="plantations.ingest_kml_files")
+def ingest_kml_files_task(self, project_id, kml_file_ids):
+    return ingest_kml_files(project_id, kml_file_ids)
+
+
+@app.task(bind=True, name="plantations.rebuild_project_geojson")
+def rebuild_project_geojson_task(self, project_id):
+    return rebuild_project_geojson(project_id)
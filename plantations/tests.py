@@ -1,13 +1,19 @@
 # plantations/tests.py
+import io
 import os
+import json
 import hashlib
 import tempfile
-from django.test import TestCase
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from .ingest import ingest_kml_files, project_geojson_path, rebuild_project_geojson
 from .models import KMLFile
+from .utils.kml_converter import append_features, write_feature_collection
 from projects.models import Project, AppType
 from organization.models import Organization
 from users.models import User
@@ -141,3 +147,176 @@ class KMLFileAPITest(APITestCase):
 
         # Clean up
         KMLFile.objects.first().file.delete()
+
+
+def site_geojson(name, count=1):
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": {"Name": f"{name}_{i}"},
+                "geometry": {"type": "Point", "coordinates": [77.0, 20.0]},
+            }
+            for i in range(count)
+        ],
+    }
+
+
+class KMLIngestionTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root.name
+
+        patcher = mock.patch("users.signals.send_email_notification")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        organization = Organization.objects.create(name="Test Organization")
+        self.user = User.objects.create_user(
+            username="testuser", organization=organization
+        )
+        self.project = Project.objects.create(
+            name="Test Project",
+            organization=organization,
+            app_type=AppType.PLANTATION,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+    def create_kml(self, name):
+        return KMLFile.objects.create(
+            project=self.project,
+            name=name,
+            file=f"kml/{name}.kml",
+            kml_hash=f"hash_{name}",
+            uploaded_by=self.user,
+        )
+
+    def converting(self):
+        return mock.patch(
+            "plantations.ingest.convert_kml_to_geojson",
+            side_effect=lambda path: site_geojson(
+                os.path.splitext(os.path.basename(path))[0], 2
+            ),
+        )
+
+    def ingest(self, kml_files, write=write_feature_collection):
+        with self.converting(), mock.patch(
+            "plantations.ingest.write_feature_collection", wraps=write
+        ) as w:
+            ingest_kml_files(self.project.id, [kml.id for kml in kml_files])
+        return w
+
+    def project_features(self):
+        self.project.refresh_from_db()
+        path = os.path.join(self.media_root, self.project.geojson_path)
+        with open(path) as f:
+            return [f["properties"]["Name"] for f in json.load(f)["features"]]
+
+    def test_new_files_are_appended_without_rewriting(self):
+        first = self.create_kml("a")
+        write = self.ingest([first, self.create_kml("b")])
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(self.project_features(), ["a_0", "a_1", "b_0", "b_1"])
+        self.assertEqual(
+            self.project.geojson_path, project_geojson_path(self.project.id)
+        )
+
+        write = self.ingest([self.create_kml("c"), first])
+        write.assert_not_called()
+        self.assertEqual(
+            self.project_features(), ["a_0", "a_1", "b_0", "b_1", "c_0", "c_1"]
+        )
+        self.assertEqual(
+            KMLFile.objects.get(name="c").geojson_data, site_geojson("c", 2)
+        )
+
+    def test_delete_rebuilds_from_stored_features(self):
+        kml_files = [self.create_kml(name) for name in "abc"]
+        self.ingest(kml_files)
+
+        kml_files[1].delete()
+        rebuild_project_geojson(self.project.id)
+        self.assertEqual(self.project_features(), ["a_0", "a_1", "c_0", "c_1"])
+
+        KMLFile.objects.all().delete()
+        rebuild_project_geojson(self.project.id)
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.geojson_path)
+
+    def test_kml_files_from_before_ingestion_are_kept(self):
+        # Uploaded before ingestion, so never converted
+        legacy = [self.create_kml(name) for name in "ab"]
+
+        # The first ingestion of the project writes the whole file
+        self.ingest([self.create_kml("c")])
+        self.assertEqual(
+            self.project_features(), ["a_0", "a_1", "b_0", "b_1", "c_0", "c_1"]
+        )
+
+        KMLFile.objects.filter(id=legacy[0].id).update(geojson_data=None)
+        self.create_kml("d")
+        legacy[1].delete()
+        with self.converting():
+            rebuild_project_geojson(self.project.id)
+        self.assertEqual(
+            self.project_features(), ["a_0", "a_1", "c_0", "c_1", "d_0", "d_1"]
+        )
+        self.assertFalse(KMLFile.objects.filter(geojson_data__isnull=True).exists())
+
+    def test_legacy_kml_files_are_converted_by_the_command(self):
+        for name in "ab":
+            self.create_kml(name)
+        with self.converting():
+            call_command("convert_legacy_kml_files", stdout=io.StringIO())
+        self.assertEqual(self.project_features(), ["a_0", "a_1", "b_0", "b_1"])
+        self.assertFalse(KMLFile.objects.filter(geojson_data__isnull=True).exists())
+
+    def test_append_rejects_files_it_did_not_write(self):
+        path = os.path.join(self.media_root, "merged.geojson")
+        self.assertFalse(append_features(path, []))
+
+        write_feature_collection([], path)
+        self.assertTrue(append_features(path, site_geojson("a")["features"]))
+        self.assertTrue(append_features(path, site_geojson("b")["features"]))
+        with open(path) as f:
+            self.assertEqual(len(json.load(f)["features"]), 2)
+
+        with open(path, "w") as f:
+            json.dump(site_geojson("x"), f)
+        self.assertFalse(append_features(path, site_geojson("c")["features"]))
+
+    @mock.patch("plantations.tasks.ingest_kml_files_task.apply_async")
+    def test_upload_queues_one_ingestion_for_the_batch(self, apply_async):
+        self.user.is_superadmin = True
+        self.user.save()
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        content = b'<?xml version="1.0" encoding="UTF-8"?><kml xmlns="http://www.opengis.net/kml/2.2"></kml>'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                reverse("project-kml-list", kwargs={"project_pk": self.project.pk}),
+                {
+                    "files[]": [
+                        SimpleUploadedFile("a.kml", content),
+                        SimpleUploadedFile("b.kml", content + b" "),
+                    ]
+                },
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        apply_async.assert_called_once_with(
+            kwargs={
+                "project_id": self.project.id,
+                "kml_file_ids": list(
+                    KMLFile.objects.order_by("id").values_list("id", flat=True)
+                ),
+            },
+            queue="nrm",
+        )
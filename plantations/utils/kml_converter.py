@@ -1,89 +1,103 @@
 import os
 import json
 import subprocess
-from django.conf import settings
+
+FEATURE_COLLECTION_HEADER = b'{"type": "FeatureCollection", "features": [\n'
+FEATURE_COLLECTION_TRAILER = b'\n]}\n'
 
 
 def convert_kml_to_geojson(kml_file_path):
     """
     Convert KML file to GeoJSON using ogr2ogr.
-    
+
+    The GeoJSON is read from ogr2ogr's stdout, so concurrent conversions of
+    files with the same name do not share a temporary file.
+
     Args:
         kml_file_path: Path to the KML file
-        
+
     Returns:
         dict: Parsed GeoJSON data or None if conversion failed
     """
     try:
-        # Create a temporary GeoJSON file path
-        filename = os.path.basename(kml_file_path)
-        base_name = os.path.splitext(filename)[0]
-        temp_geojson_path = os.path.join(
-            settings.MEDIA_ROOT, 
-            'temp', 
-            f"{base_name}.geojson"
-        )
-        
-        # Create temp directory if it doesn't exist
-        os.makedirs(os.path.dirname(temp_geojson_path), exist_ok=True)
-        
-        # Run ogr2ogr to convert KML to GeoJSON
         cmd = [
             'ogr2ogr',
             '-f', 'GeoJSON',
-            temp_geojson_path,
+            '/vsistdout/',
             kml_file_path
         ]
-        
-        # Execute the command
-        subprocess.run(cmd, check=True)
-        
-        # Read the generated GeoJSON file
-        with open(temp_geojson_path, 'r') as f:
-            geojson_data = json.load(f)
-        
-        # Clean up temporary file
-        os.remove(temp_geojson_path)
-        
-        return geojson_data
-    
+        result = subprocess.run(cmd, check=True, capture_output=True)
+        return json.loads(result.stdout)
+
     except Exception as e:
         print(f"Error converting KML to GeoJSON: {str(e)}")
         return None
 
 
-def merge_geojson_files(geojson_list, output_path):
+def _encode_features(features, first):
+    chunks = []
+    for feature in features:
+        if not first:
+            chunks.append(b',\n')
+        chunks.append(json.dumps(feature).encode())
+        first = False
+    return b''.join(chunks), first
+
+
+def write_feature_collection(geojson_iter, output_path):
     """
-    Merge multiple GeoJSON objects into a single GeoJSON file.
-    
+    Stream the features of GeoJSON FeatureCollections into a single
+    FeatureCollection file, one FeatureCollection at a time. The file is
+    written next to ``output_path`` and then moved over it.
+
     Args:
-        geojson_list: List of GeoJSON objects
+        geojson_iter: Iterable of GeoJSON objects
         output_path: Path where to save the merged GeoJSON
-        
+
     Returns:
-        bool: True if successful, False otherwise
+        int: Number of features written
     """
-    try:
-        # Create a base FeatureCollection
-        merged_geojson = {
-            "type": "FeatureCollection",
-            "features": []
-        }
-        
-        # Add features from each GeoJSON object
-        for geojson in geojson_list:
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    count = 0
+    first = True
+    with open(tmp_path, 'wb') as f:
+        f.write(FEATURE_COLLECTION_HEADER)
+        for geojson in geojson_iter:
             if geojson and geojson.get("type") == "FeatureCollection":
-                merged_geojson["features"].extend(geojson.get("features", []))
-        
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Write merged GeoJSON to file
-        with open(output_path, 'w') as f:
-            json.dump(merged_geojson, f)
-        
+                features = geojson.get("features", [])
+                data, first = _encode_features(features, first)
+                f.write(data)
+                count += len(features)
+        f.write(FEATURE_COLLECTION_TRAILER)
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def append_features(output_path, features):
+    """
+    Append features to a FeatureCollection file written by
+    ``write_feature_collection`` in place, without reading it.
+
+    Returns:
+        bool: True if appended, False if the file is missing or was not
+        written by ``write_feature_collection``
+    """
+    try:
+        with open(output_path, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            start = end - len(FEATURE_COLLECTION_TRAILER)
+            if start < len(FEATURE_COLLECTION_HEADER):
+                return False
+            f.seek(start)
+            if f.read() != FEATURE_COLLECTION_TRAILER:
+                return False
+
+            data, _ = _encode_features(
+                features, first=start == len(FEATURE_COLLECTION_HEADER)
+            )
+            f.seek(start)
+            f.write(data + FEATURE_COLLECTION_TRAILER)
         return True
-    
-    except Exception as e:
-        print(f"Error merging GeoJSON files: {str(e)}")
-        return False
\ No newline at end of file
+    except FileNotFoundError:
+        return False
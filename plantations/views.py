@@ -1,6 +1,4 @@
-import os
 import hashlib
-from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.db import IntegrityError
 from rest_framework import viewsets, permissions, status
@@ -19,7 +17,7 @@ from .serializers import (
     PlantationProfileSerializer,
     PlantationProfileGetSerializer,
 )
-from .utils.kml_converter import merge_geojson_files
+from .ingest import queue_kml_ingestion, queue_project_geojson_rebuild
 
 
 class KMLFileViewSet(viewsets.ModelViewSet):
@@ -41,7 +39,12 @@ class KMLFileViewSet(viewsets.ModelViewSet):
                 project = Project.objects.get(
                     id=project_id, app_type=AppType.PLANTATION, enabled=True
                 )
-                return KMLFile.objects.filter(project=project)
+                queryset = KMLFile.objects.filter(project=project).select_related(
+                    "uploaded_by"
+                )
+                if self.action == "list":
+                    queryset = queryset.defer("geojson_data")
+                return queryset
             except Project.DoesNotExist:
                 return KMLFile.objects.none()
         return KMLFile.objects.none()
@@ -95,6 +98,7 @@ class KMLFileViewSet(viewsets.ModelViewSet):
 
         # Process each file
         created_files = []
+        created_ids = []
         errors = []
 
         for uploaded_file in files:
@@ -135,16 +139,8 @@ class KMLFileViewSet(viewsets.ModelViewSet):
                         kml_hash=kml_hash,
                     )
 
-                    # # Convert KML to GeoJSON
-                    # file_path = kml_file.file.path
-                    # geojson_data = convert_kml_to_geojson(file_path)
-                    #
-                    # if geojson_data:
-                    #     # Update GeoJSON data in the model
-                    #     kml_file.geojson_data = geojson_data
-                    #     kml_file.save(update_fields=["geojson_data"])
-
                     created_files.append(serializer.data)
+                    created_ids.append(kml_file.id)
                 else:
                     errors.append(
                         f"Error validating file '{uploaded_file.name}': {serializer.errors}"
@@ -153,9 +149,10 @@ class KMLFileViewSet(viewsets.ModelViewSet):
                 errors.append(f"Error saving file '{uploaded_file.name}': {str(e)}")
                 continue
 
-        # # Update the merged GeoJSON file for the project if any files were created
-        # if created_files:
-        #     self.update_project_geojson(project)
+        # Convert the new files and add them to the project GeoJSON in the
+        # background
+        if created_ids:
+            queue_kml_ingestion(project.id, created_ids)
 
         # Prepare response
         response_data = {"files_created": len(created_files), "files": created_files}
@@ -172,44 +169,9 @@ class KMLFileViewSet(viewsets.ModelViewSet):
 
     def perform_destroy(self, instance):
         """Override destroy to update project GeoJSON after deletion"""
-        project = instance.project
+        project_id = instance.project_id
         super().perform_destroy(instance)
-        self.update_project_geojson(project)
-
-    def update_project_geojson(self, project):
-        """Update the merged GeoJSON file for a project"""
-        try:
-            # Get all KML files for this project
-            kml_files = KMLFile.objects.filter(project=project)
-
-            # Collect GeoJSON data
-            geojson_list = [
-                kml.geojson_data
-                for kml in kml_files
-                if hasattr(kml, "geojson_data") and kml.geojson_data
-            ]
-
-            if geojson_list:
-                # Create directory if it doesn't exist
-                directory = "saytrees/geojson"
-                full_path = os.path.join(settings.MEDIA_ROOT, directory)
-                os.makedirs(full_path, exist_ok=True)
-
-                # Create merged GeoJSON
-                output_path = f"{full_path}/project_{project.id}.geojson"
-                if merge_geojson_files(geojson_list, output_path):
-                    # Update project geojson_path
-                    relative_path = f"{directory}/project_{project.id}.geojson"
-                    project.geojson_path = relative_path
-                    project.save(update_fields=["geojson_path"])
-                    return True
-            else:
-                # No KML files, clear the geojson_path
-                project.geojson_path = None
-                project.save(update_fields=["geojson_path"])
-        except Exception as e:
-            print(f"Error updating project GeoJSON: {str(e)}")
-            return False
+        queue_project_geojson_rebuild(project_id)
 
 
 class PlantationProfileViewSet(viewsets.ModelViewSet):
@@ -1,13 +1,17 @@
 from rest_framework.decorators import schema
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from utilities.gee_utils import (
     valid_gee_text,
 )
+from computing.mws.drainage_graph import load_graph
+from .timeseries_store import VARIABLES as TIME_SERIES_VARIABLES
+from .vector_tiles import MAX_ZOOM, TILE_LAYERS, get_tile
 from .views import (
     is_valid_string,
     is_valid_mws_id,
+    is_valid_date,
     excel_file_exists,
     fetch_generated_layer_urls,
     get_location_info_by_lat_lon,
@@ -32,12 +36,11 @@ from .swagger_schemas import (
     get_mws_data_schema,
     get_village_geometries_schema,
     get_mws_geometries_schema,
+    get_mws_network_schema,
+    get_mws_tiles_schema,
+    get_village_tiles_schema,
 )
-from geoadmin.utils import (
-    transform_data,
-    activated_tehsils,
-    get_activated_location_json,
-)
+from geoadmin.utils import get_active_locations
 
 
 @swagger_auto_schema(**admin_by_latlon_schema)
@@ -137,6 +140,9 @@ def get_mws_by_lat_lon(request):
 def get_mws_data(request):
     """
     Retrieve MWS data for a given state, district, tehsil, and MWS ID.
+
+    ``mws_id`` may be a comma-separated list for a batch query; the series
+    can be narrowed with ``start_date``/``end_date`` and ``variables``.
     """
     print("Inside mws data by excel api")
     try:
@@ -165,13 +171,46 @@ def get_mws_data(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not is_valid_mws_id(mws_id):
+        if not all(is_valid_mws_id(m) for m in mws_id.split(",")):
             return Response(
                 {"error": "MWS id can only contain numbers and underscores"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = get_mws_time_series_data(state, district, tehsil, mws_id)
+        start_date = request.query_params.get("start_date")
+        end_date = request.query_params.get("end_date")
+        variables = request.query_params.get("variables")
+        variables = (
+            [v.strip() for v in variables.split(",") if v.strip()]
+            if variables
+            else None
+        )
+        for value in (start_date, end_date):
+            if value and not is_valid_date(value):
+                return Response(
+                    {"error": "Dates must be in YYYY-MM-DD format"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        if variables and not set(variables) <= set(TIME_SERIES_VARIABLES):
+            return Response(
+                {
+                    "error": f"'variables' must be a comma-separated subset of {', '.join(TIME_SERIES_VARIABLES)}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if "," in mws_id:
+            mws_id = [m.strip() for m in mws_id.split(",") if m.strip()]
+
+        data = get_mws_time_series_data(
+            state,
+            district,
+            tehsil,
+            mws_id,
+            start_date=start_date,
+            end_date=end_date,
+            variables=variables,
+        )
         if not data:
             return Response(
                 {"error": "Data not found for the given mws_id"},
@@ -403,18 +442,11 @@ def get_mws_report_urls(request):
 @api_security_check(auth_type="API_key")
 def generate_active_locations(request):
     """
-    Return proposed blocks data from get_activated_location_json if available,
-    otherwise generate and store the data
+    Return the active state -> district -> block tree, served from the cache
+    and rebuilt whenever an activation flag changes
     """
     try:
-        activated_locations_data = get_activated_location_json()
-
-        if activated_locations_data is not None:
-            return Response(activated_locations_data, status=status.HTTP_200_OK)
-
-        response_data = activated_tehsils()
-        transformed_data = transform_data(data=response_data)
-        return Response(transformed_data, status=status.HTTP_200_OK)
+        return Response(get_active_locations(), status=status.HTTP_200_OK)
 
     except Exception as e:
         print("Exception in proposed_blocks api :: ", e)
@@ -487,3 +519,166 @@ def get_village_geometries(request):
             {"error": f"Internal server error: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+@swagger_auto_schema(**get_mws_network_schema)
+@api_security_check(auth_type="API_key")
+def get_mws_network(request):
+    """
+    Upstream/downstream MWS, catchment or flow path from the tehsil's
+    drainage graph.
+    """
+    print("Inside get MWS network")
+    try:
+        state = valid_gee_text(request.query_params.get("state", "").lower())
+        district = valid_gee_text(request.query_params.get("district", "").lower())
+        tehsil = valid_gee_text(request.query_params.get("tehsil", "").lower())
+        mws_id = request.query_params.get("mws_id", "")
+        query = request.query_params.get("query", "downstream").lower()
+        hops = request.query_params.get("hops")
+        target_mws_id = request.query_params.get("target_mws_id", "")
+
+        mws_ids = [m.strip() for m in mws_id.split(",") if m.strip()]
+        if not all([state, district, tehsil]) or not mws_ids:
+            return Response(
+                {
+                    "error": "All parameters (state, district, tehsil, mws_id) are required"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not all(is_valid_mws_id(m) for m in mws_ids + [target_mws_id]):
+            return Response(
+                {"error": "MWS id can only contain numbers and underscores"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if query not in ("upstream", "downstream", "catchment", "path"):
+            return Response(
+                {
+                    "error": "'query' must be one of upstream, downstream, catchment, path"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if hops is not None:
+            if not hops.isdigit() or int(hops) < 1:
+                return Response(
+                    {"error": "'hops' must be a positive integer"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            hops = int(hops)
+        if query == "path" and (len(mws_ids) != 1 or not target_mws_id):
+            return Response(
+                {"error": "query=path needs a single 'mws_id' and a 'target_mws_id'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        graph = load_graph([(state, district, tehsil)])
+        if graph is None:
+            return Response(
+                {"error": "MWS drainage network not found for the given location."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        result = {"mws_id": mws_ids, "query": query}
+        if query == "path":
+            result["target_mws_id"] = target_mws_id
+            result["path"] = graph.flow_path(mws_ids[0], target_mws_id)
+        elif query == "catchment":
+            result["mws_ids"] = graph.catchment(mws_ids)
+        else:
+            traverse = graph.upstream if query == "upstream" else graph.downstream
+            levels = traverse(mws_ids, hops)
+            result["levels"] = levels
+            result["mws_ids"] = [m for level in levels for m in level]
+
+        return Response(result, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response(
+            {"error": f"Internal server error: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+TILE_MAX_AGE = 86400  # seconds
+
+
+def vector_tile_response(request, kind, z, x, y):
+    try:
+        state = valid_gee_text(request.query_params.get("state", "").lower())
+        district = valid_gee_text(request.query_params.get("district", "").lower())
+        tehsil = valid_gee_text(request.query_params.get("tehsil", "").lower())
+        fields = [
+            field.strip()
+            for field in request.query_params.get("fields", "").split(",")
+            if field.strip()
+        ]
+
+        if not all([state, district, tehsil]):
+            return Response(
+                {"error": "All parameters (state, district, tehsil) are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if z > MAX_ZOOM:
+            return Response(
+                {
+                    "error": f"Tiles are served up to zoom {MAX_ZOOM}; "
+                    f"overzoom zoom {MAX_ZOOM} tiles beyond it"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not (0 <= x < 2**z and 0 <= y < 2**z):
+            return Response(
+                {"error": f"Invalid tile {z}/{x}/{y}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        unknown_fields = sorted(set(fields) - set(TILE_LAYERS[kind]["attributes"]))
+        if unknown_fields:
+            return Response(
+                {
+                    "error": f"Unknown fields: {', '.join(unknown_fields)}",
+                    "fields": list(TILE_LAYERS[kind]["attributes"]),
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result = get_tile(kind, state, district, tehsil, z, x, y, fields)
+        if result is None:
+            return Response(
+                {"error": "Layer not found for the given location."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        tile, version = result
+        etag = f'"{version}-{"-".join(sorted(set(fields))) or "all"}"'
+        if request.headers.get("If-None-Match") == etag:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(tile, content_type=MVT_CONTENT_TYPE)
+        response["Cache-Control"] = f"public, max-age={TILE_MAX_AGE}"
+        response["ETag"] = etag
+        return response
+
+    except Exception as e:
+        return Response(
+            {"error": f"Internal server error: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@swagger_auto_schema(**get_mws_tiles_schema)
+@api_security_check(auth_type="API_key")
+def get_mws_tiles(request, z, x, y):
+    """
+    Vector tile of the MWS boundaries of a tehsil.
+    """
+    return vector_tile_response(request, "mws", z, x, y)
+
+
+@swagger_auto_schema(**get_village_tiles_schema)
+@api_security_check(auth_type="API_key")
+def get_village_tiles(request, z, x, y):
+    """
+    Vector tile of the village boundaries of a tehsil.
+    """
+    return vector_tile_response(request, "villages", z, x, y)
@@ -53,6 +53,30 @@ mws_id_param = openapi.Parameter(
     required=True,
 )
 
+start_date_param = openapi.Parameter(
+    "start_date",
+    openapi.IN_QUERY,
+    description="Only return dates on or after this day (YYYY-MM-DD)",
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+end_date_param = openapi.Parameter(
+    "end_date",
+    openapi.IN_QUERY,
+    description="Only return dates on or before this day (YYYY-MM-DD)",
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+variables_param = openapi.Parameter(
+    "variables",
+    openapi.IN_QUERY,
+    description="Comma-separated subset of et, runoff, precipitation, ndvi_crop, ndvi_shrub, ndvi_tree",
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
 # Village Parameters
 village_id_param = openapi.Parameter(
     "village_id",
@@ -182,6 +206,7 @@ get_mws_data_schema = {
     "operation_summary": "Get MWS Time Series Data",
     "operation_description": """
     Retrieve MWS time series data, including ET, Runoff, Precipitation and NDVI(crop, tree, shrubs) for a given state, district, tehsil, and MWS ID.
+    Pass several comma-separated MWS IDs to get `{"results": [...]}` with one entry per MWS.
     
     **Response dataset details:**
     ```
@@ -215,6 +240,9 @@ get_mws_data_schema = {
         district_param,
         tehsil_param,
         mws_id_param,
+        start_date_param,
+        end_date_param,
+        variables_param,
         authorization_param,
     ],
     "responses": {
@@ -818,3 +846,180 @@ get_village_geometries_schema = {
     },
     "tags": ["Dataset APIs"],
 }
+
+# MWS Network Parameters
+network_mws_id_param = openapi.Parameter(
+    "mws_id",
+    openapi.IN_QUERY,
+    description="MWS identifier, or a comma-separated list (e.g. '12_234647,12_234648')",
+    type=openapi.TYPE_STRING,
+    required=True,
+)
+
+network_query_param = openapi.Parameter(
+    "query",
+    openapi.IN_QUERY,
+    description="One of 'upstream', 'downstream', 'catchment' or 'path' (default: 'downstream')",
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+hops_param = openapi.Parameter(
+    "hops",
+    openapi.IN_QUERY,
+    description="Limit upstream/downstream traversal to this many hops (default: no limit)",
+    type=openapi.TYPE_INTEGER,
+    required=False,
+)
+
+target_mws_id_param = openapi.Parameter(
+    "target_mws_id",
+    openapi.IN_QUERY,
+    description="Target MWS for query=path",
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+get_mws_network_schema = {
+    "method": "get",
+    "operation_id": "get_mws_network",
+    "operation_summary": "Get MWS Drainage Network",
+    "operation_description": """
+    Traverse the MWS drainage network of a tehsil.
+
+    **Queries:**
+    - `upstream` / `downstream`: MWS reached from `mws_id`, grouped by hop
+    - `catchment`: `mws_id` plus every MWS that drains into it
+    - `path`: chain of MWS between `mws_id` and `target_mws_id` along the drainage direction
+
+    **Response dataset details:**
+    ```
+    {
+        "mws_id": ["12_234647"],
+        "query": "downstream",
+        "levels": [["12_234650"], ["12_234655"]],
+        "mws_ids": ["12_234650", "12_234655"]
+    }
+    ```
+    """,
+    "manual_parameters": [
+        state_param,
+        district_param,
+        tehsil_param,
+        network_mws_id_param,
+        network_query_param,
+        hops_param,
+        target_mws_id_param,
+        authorization_param,
+    ],
+    "responses": {
+        200: openapi.Response(
+            description="Success - Returns the MWS reached by the query",
+            examples={
+                "application/json": {
+                    "mws_id": ["12_234647"],
+                    "query": "downstream",
+                    "levels": [["12_234650"], ["12_234655"]],
+                    "mws_ids": ["12_234650", "12_234655"],
+                }
+            },
+        ),
+        400: bad_request_response,
+        401: unauthorized_response,
+        404: openapi.Response(
+            description="Not Found - Drainage network not built for this tehsil",
+            examples={
+                "application/json": {
+                    "error": "MWS drainage network not found for the given location."
+                }
+            },
+        ),
+        500: internal_error_response,
+    },
+    "tags": ["Dataset APIs"],
+}
+
+# Vector Tile Parameters
+tile_z_param = openapi.Parameter(
+    "z",
+    openapi.IN_PATH,
+    description="Zoom level, up to 14",
+    type=openapi.TYPE_INTEGER,
+)
+
+tile_x_param = openapi.Parameter(
+    "x", openapi.IN_PATH, description="Tile column", type=openapi.TYPE_INTEGER
+)
+
+tile_y_param = openapi.Parameter(
+    "y", openapi.IN_PATH, description="Tile row (XYZ scheme)", type=openapi.TYPE_INTEGER
+)
+
+
+def tile_fields_param(fields):
+    return openapi.Parameter(
+        "fields",
+        openapi.IN_QUERY,
+        description=f"Comma-separated attributes to include (default: {', '.join(fields)})",
+        type=openapi.TYPE_STRING,
+        required=False,
+    )
+
+
+def vector_tile_schema(operation_id, summary, boundaries, fields):
+    return {
+        "method": "get",
+        "operation_id": operation_id,
+        "operation_summary": summary,
+        "operation_description": f"""
+    Mapbox Vector Tile (MVT) of the {boundaries} boundaries of a tehsil, for map
+    clients that render the whole tehsil. Use the URL as a vector source
+    template, e.g. `.../{operation_id}/{{z}}/{{x}}/{{y}}/?state=...&district=...&tehsil=...`.
+
+    Geometries are simplified to the tile resolution of each zoom level up to
+    zoom 14; clients should overzoom beyond it. Tiles carry one layer named
+    after the boundaries with the attributes {', '.join(fields)}, and are
+    served with `Cache-Control` and `ETag` headers. Tiles outside the tehsil
+    are empty.
+    """,
+        "manual_parameters": [
+            tile_z_param,
+            tile_x_param,
+            tile_y_param,
+            state_param,
+            district_param,
+            tehsil_param,
+            tile_fields_param(fields),
+            authorization_param,
+        ],
+        "responses": {
+            200: openapi.Response(
+                description="Success - Returns the tile as application/vnd.mapbox-vector-tile"
+            ),
+            304: openapi.Response(description="Not Modified - ETag matches"),
+            400: bad_request_response,
+            401: unauthorized_response,
+            404: openapi.Response(
+                description="Not Found - Layer not published for this tehsil",
+                examples={
+                    "application/json": {
+                        "error": "Layer not found for the given location."
+                    }
+                },
+            ),
+            500: internal_error_response,
+        },
+        "tags": ["Dataset APIs"],
+    }
+
+
+get_mws_tiles_schema = vector_tile_schema(
+    "get_mws_tiles", "Get MWS Vector Tiles", "MWS", ["uid"]
+)
+
+get_village_tiles_schema = vector_tile_schema(
+    "get_village_tiles",
+    "Get Village Vector Tiles",
+    "village",
+    ["vill_ID", "vill_name (zoom 11 and above)"],
+)
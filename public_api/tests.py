@@ -1,3 +1,484 @@
-from django.test import TestCase
+import json
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import shapely
+import shapely.geometry
+from django.test import SimpleTestCase, TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from computing.models import Dataset, Layer, LayerType
+from geoadmin.models import DistrictSOI, StateSOI, TehsilSOI
+
+from . import timeseries_store, vector_tiles
+from .api import vector_tile_response
+from .views import _fetch_mws_time_series_from_geoserver, fetch_generated_layer_urls
+
+# Reference decoder, only needed to run the tests
+try:
+    import mapbox_vector_tile
+except ImportError:
+    mapbox_vector_tile = None
+
+
+class MWSTimeSeriesStoreTest(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(timeseries_store, "EXCEL_PATH", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        water = {
+            "12_1": {
+                "uid": "12_1",
+                "2024-01-01": json.dumps(
+                    {"ET": 2.514, "RunOff": 1.3, "Precipitation": 10.2}
+                ),
+                "2024-01-15": json.dumps(
+                    {"ET": 3.1, "RunOff": 0, "Precipitation": 5.4}
+                ),
+            },
+            "12_2": {"uid": "12_2", "2024-01-01": "not json"},
+        }
+        ndvi = {
+            "crop": {"12_1": {"2024-01-15": 0.4567, "2024-02-01": "0.3"}},
+            "shrub": {},
+            "tree": {},
+        }
+        frame = timeseries_store.build_frame(water, ndvi)
+        path = timeseries_store.store_path("Bihar", "Gaya", "Atri")
+        os.makedirs(os.path.dirname(path))
+        frame.to_parquet(path, index=False)
+
+    def test_query_matches_legacy_shape(self):
+        [result] = timeseries_store.query("Bihar", "Gaya", "Atri", ["12_1"])
+
+        self.assertEqual(result["mws_id"], "12_1")
+        self.assertEqual(
+            result["time_series"][0],
+            {
+                "date": "2024-01-01",
+                "et": 2.51,
+                "runoff": 1.3,
+                "precipitation": 10.2,
+                "ndvi_crop": "",
+                "ndvi_shrub": "",
+                "ndvi_tree": "",
+            },
+        )
+        self.assertEqual(result["time_series"][1]["runoff"], 0.0)
+        self.assertEqual(result["time_series"][1]["ndvi_crop"], 0.46)
+        # NDVI-only dates get zero hydrology, as the WFS path did.
+        self.assertEqual(result["time_series"][2]["et"], 0.0)
+
+    def test_filters_and_batch(self):
+        results = timeseries_store.query(
+            "Bihar",
+            "Gaya",
+            "Atri",
+            ["12_1", "12_2", "99_9"],
+            start_date="2024-01-10",
+            variables=["et"],
+        )
+
+        self.assertEqual(
+            results[0]["time_series"],
+            [{"date": "2024-01-15", "et": 3.1}, {"date": "2024-02-01", "et": 0.0}],
+        )
+        self.assertEqual(results[1]["time_series"], [])
+        self.assertEqual(results[2]["time_series"], [])
+
+    def test_missing_tehsil_returns_none(self):
+        self.assertIsNone(timeseries_store.query("Bihar", "Gaya", "Other", ["12_1"]))
+
+
+class MWSTimeSeriesWithoutNDVITest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(timeseries_store, "EXCEL_PATH", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        state = StateSOI.objects.create(state_name="Bihar")
+        district = DistrictSOI.objects.create(state=state, district_name="Gaya")
+        TehsilSOI.objects.create(district=district, tehsil_name="Atri")
+
+        self.water = {
+            "uid": "12_1",
+            "2024-01-01": json.dumps({"ET": 2.514, "RunOff": 1.3}),
+            "2024-01-15": "not json",
+        }
+
+    def test_store_matches_geoserver_path(self):
+        # No post-1.0 hydrology layer is registered, so neither path has NDVI
+        frame = timeseries_store.build_frame({"12_1": self.water}, {})
+        self.assertNotIn("ndvi_crop", frame.columns)
+        path = timeseries_store.store_path("Bihar", "Gaya", "Atri")
+        os.makedirs(os.path.dirname(path))
+        frame.to_parquet(path, index=False)
+
+        response = mock.Mock()
+        response.json.return_value = {"features": [{"properties": self.water}]}
+        with mock.patch("public_api.views.requests.get", return_value=response):
+            legacy = _fetch_mws_time_series_from_geoserver(
+                "Bihar", "Gaya", "Atri", "12_1"
+            )
+
+        [stored] = timeseries_store.query("Bihar", "Gaya", "Atri", ["12_1"])
+        self.assertEqual(stored, legacy)
+        self.assertEqual(legacy["time_series"][0]["ndvi_crop"], "")
+
+
+class FetchGeneratedLayerUrlsTest(TestCase):
+    def setUp(self):
+        self.state = StateSOI.objects.create(state_name="Bihar")
+        self.district = DistrictSOI.objects.create(
+            state=self.state, district_name="Gaya"
+        )
+        self.tehsil = TehsilSOI.objects.create(
+            district=self.district, tehsil_name="Atri"
+        )
+        self.vector = Dataset.objects.create(
+            name="Drainage",
+            layer_type=LayerType.VECTOR,
+            workspace="drainage",
+            misc={"style_url": "https://example.org/drainage.sld"},
+        )
+        self.raster = Dataset.objects.create(
+            name="LULC", layer_type=LayerType.RASTER, workspace="LULC"
+        )
+        self.custom = Dataset.objects.create(
+            name="Custom", layer_type=LayerType.CUSTOM, workspace="custom"
+        )
+
+    def add_layer(self, dataset, layer_name, layer_version):
+        return Layer.objects.create(
+            dataset=dataset,
+            layer_name=layer_name,
+            layer_version=layer_version,
+            state=self.state,
+            district=self.district,
+            block=self.tehsil,
+        )
+
+    def fetch(self):
+        return fetch_generated_layer_urls("bihar", "gaya", "atri")
+
+    def test_returns_latest_version_per_layer(self):
+        self.add_layer(self.vector, "gaya_atri_drainage", "1.0")
+        self.add_layer(self.raster, "LULC_17_18_gaya_atri", None)
+        self.add_layer(self.vector, "GAYA_ATRI_DRAINAGE", "2.0")
+        self.add_layer(self.raster, "lulc_17_18_gaya_atri", "")
+        self.add_layer(self.custom, "gaya_atri_custom", "9")
+        self.add_layer(self.vector, "gaya_atri_precipitation", "1")
+        self.add_layer(self.vector, "gaya_atri_mws_connectivity_run_off", "1")
+
+        layers = self.fetch()
+
+        self.assertEqual(
+            [(layer["layer_name"], layer["layer_version"]) for layer in layers],
+            [
+                ("GAYA_ATRI_DRAINAGE", "2.0"),
+                ("LULC_17_18_gaya_atri", None),
+                ("gaya_atri_mws_connectivity_run_off", "1"),
+            ],
+        )
+        self.assertEqual(layers[0]["dataset_name"], "Drainage")
+        self.assertEqual(layers[0]["style_url"], "https://example.org/drainage.sld")
+        self.assertIn("/drainage/", layers[0]["layer_url"])
+        self.assertIn("request=GetCoverage", layers[1]["layer_url"])
+        self.assertEqual(layers[1]["style_url"], "")
+
+    def test_non_numeric_versions_rank_lowest(self):
+        self.add_layer(self.vector, "gaya_atri_drainage", "1.5")
+        self.add_layer(self.vector, "gaya_atri_drainage", "2.0-beta")
+        self.add_layer(self.vector, "gaya_atri_drainage", "v3")
+        self.add_layer(self.raster, "gaya_atri_lulc", "draft")
+        self.add_layer(self.raster, "gaya_atri_lulc", " 1e1 ")
+
+        self.assertEqual(
+            [(layer["layer_name"], layer["layer_version"]) for layer in self.fetch()],
+            [("gaya_atri_drainage", "1.5"), ("gaya_atri_lulc", " 1e1 ")],
+        )
+
+    def test_query_count_does_not_grow_with_layers(self):
+        for i in range(50):
+            self.add_layer(self.vector, f"gaya_atri_layer_{i}", "1")
+            self.add_layer(self.vector, f"gaya_atri_layer_{i}", "2")
+            self.add_layer(self.raster, f"gaya_atri_raster_{i}", "1")
+
+        # state, district and tehsil lookups plus one query for the layers
+        with self.assertNumQueries(4):
+            layers = self.fetch()
+        self.assertEqual(len(layers), 100)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, pos
+
+
+def _read_message(data):
+    """Protobuf fields as ``{number: [values]}`` (varints and raw bytes)."""
+    fields = {}
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = data[pos : pos + 8], pos + 8
+        else:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos : pos + length], pos + length
+        fields.setdefault(number, []).append(value)
+    return fields
+
+
+def _read_packed(data):
+    values = []
+    pos = 0
+    while pos < len(data):
+        value, pos = _read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def decode_tile(tile):
+    """The layers of an MVT tile as ``{name: [(properties, rings)]}``."""
+    layers = {}
+    for layer_data in _read_message(tile).get(3, []):
+        layer = _read_message(layer_data)
+        keys = [key.decode() for key in layer.get(3, [])]
+        values = []
+        for value_data in layer.get(4, []):
+            value = _read_message(value_data)
+            values.append(value[1][0].decode() if 1 in value else value[5][0])
+
+        features = []
+        for feature_data in layer.get(2, []):
+            feature = _read_message(feature_data)
+            tags = _read_packed(feature[2][0]) if 2 in feature else []
+            properties = {
+                keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)
+            }
+            commands = _read_packed(feature[4][0])
+            rings, x, y, i = [], 0, 0, 0
+            while i < len(commands):
+                command, count = commands[i] & 7, commands[i] >> 3
+                i += 1
+                if command == 7:
+                    continue
+                if command == 1:
+                    rings.append([])
+                for _ in range(count):
+                    dx, dy = commands[i], commands[i + 1]
+                    x += (dx >> 1) ^ -(dx & 1)
+                    y += (dy >> 1) ^ -(dy & 1)
+                    rings[-1].append((x, y))
+                    i += 2
+            features.append((properties, rings))
+        layers[layer[1][0].decode()] = features
+    return layers
+
+
+def ring_area(ring):
+    return sum(
+        x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1])
+    )
+
+
+class VectorTileTest(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(vector_tiles, "EXCEL_PATH", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # A square with a hole and a jagged neighbour sharing its east edge
+        jagged = [(85.1, 25.0)]
+        for i in range(1, 200):
+            jagged.append((85.15 + (0.0001 if i % 2 else 0), 25.0 + i * 0.0005))
+        jagged += [(85.1, 25.1), (85.1, 25.0)]
+        self.features = [
+            {
+                "type": "Feature",
+                "properties": {"uid": "12_1", "area_in_ha": 10.5},
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [
+                        [[85.0, 25.0], [85.1, 25.0], [85.1, 25.1], [85.0, 25.1]],
+                        [
+                            [85.04, 25.04],
+                            [85.06, 25.04],
+                            [85.06, 25.06],
+                            [85.04, 25.06],
+                        ],
+                    ],
+                },
+            },
+            {
+                "type": "Feature",
+                "properties": {"uid": "12_2"},
+                "geometry": {"type": "Polygon", "coordinates": [jagged]},
+            },
+        ]
+        fetch = mock.patch.object(
+            vector_tiles, "_fetch_features", side_effect=lambda *_: self.features
+        )
+        self.fetch = fetch.start()
+        self.addCleanup(fetch.stop)
+
+    def tile_of(self, z, lon=85.05, lat=25.05):
+        x = int((lon + 180) / 360 * 2**z)
+        lat = math.radians(lat)
+        y = int((1 - math.asinh(math.tan(lat)) / math.pi) / 2 * 2**z)
+        return z, x, y
+
+    def get_tile(self, kind, z, x, y, fields=None):
+        return vector_tiles.get_tile(kind, "Bihar", "Gaya", "Atri", z, x, y, fields)
+
+    def test_tile_features_attributes_and_winding(self):
+        tile, _ = self.get_tile("mws", *self.tile_of(8))
+        features = decode_tile(tile)["mws"]
+
+        self.assertEqual([p for p, _ in features], [{"uid": "12_1"}, {"uid": "12_2"}])
+        exterior, hole = features[0][1]
+        self.assertGreater(ring_area(exterior), 0)
+        self.assertLess(ring_area(hole), 0)
+        self.fetch.assert_called_once_with("mws", "gaya", "atri")
+
+    def test_geometries_are_simplified_per_zoom(self):
+        vertices = {}
+        for z in (8, 14):
+            tile, _ = self.get_tile("mws", *self.tile_of(z, lon=85.15, lat=25.05))
+            [(_, rings)] = [
+                f for f in decode_tile(tile)["mws"] if f[0] == {"uid": "12_2"}
+            ]
+            vertices[z] = sum(len(ring) for ring in rings)
+        self.assertLess(vertices[8], 10)
+        self.assertGreater(vertices[14], 20)
+
+    def test_attributes_are_projected_per_zoom_and_request(self):
+        self.features = [
+            dict(f, properties={"vill_ID": 7, "vill_name": "Atri"})
+            for f in self.features
+        ]
+        low, _ = self.get_tile("villages", *self.tile_of(9))
+        high, _ = self.get_tile("villages", *self.tile_of(12))
+        names_only, _ = self.get_tile(
+            "villages", *self.tile_of(12), fields=["vill_name"]
+        )
+
+        self.assertEqual(decode_tile(low)["villages"][0][0], {"vill_ID": 7})
+        self.assertEqual(
+            decode_tile(high)["villages"][0][0], {"vill_ID": 7, "vill_name": "Atri"}
+        )
+        self.assertEqual(
+            decode_tile(names_only)["villages"][0][0], {"vill_name": "Atri"}
+        )
+
+    def test_tiles_are_cached_on_disk_until_rebuilt(self):
+        tile_index = self.tile_of(11)
+        tile, version = self.get_tile("mws", *tile_index)
+
+        with mock.patch.object(vector_tiles, "render_tile") as render_tile:
+            self.assertEqual(self.get_tile("mws", *tile_index), (tile, version))
+        render_tile.assert_not_called()
+
+        # Tiles away from the tehsil are empty and not stored
+        self.assertEqual(self.get_tile("mws", 11, 0, 0), (b"", version))
+
+        self.features = self.features[:1]
+        vector_tiles.build_tehsil_tiles("mws", "Bihar", "Gaya", "Atri")
+        rebuilt, new_version = self.get_tile("mws", *tile_index)
+
+        self.assertNotEqual(new_version, version)
+        self.assertEqual(len(decode_tile(rebuilt)["mws"]), 1)
+        tile_root = os.path.splitext(
+            vector_tiles.geometry_path("mws", "Bihar", "Gaya", "Atri")
+        )[0]
+        self.assertEqual(os.listdir(tile_root), [new_version])
+
+    def test_unavailable_layer(self):
+        self.fetch.side_effect = ValueError("layer not found")
+        self.assertIsNone(self.get_tile("mws", *self.tile_of(10)))
+
+    def test_zoom_above_max_is_rejected(self):
+        request = Request(
+            APIRequestFactory().get(
+                "/", {"state": "Bihar", "district": "Gaya", "tehsil": "Atri"}
+            )
+        )
+        with mock.patch("public_api.api.get_tile") as get_tile:
+            response = vector_tile_response(
+                request, "mws", *self.tile_of(vector_tiles.MAX_ZOOM + 1)
+            )
+        self.assertEqual(response.status_code, 400)
+        get_tile.assert_not_called()
+
+    def reference_decode(self, tile):
+        """``tile`` as read by an independent MVT decoder, in tile coordinates."""
+        return mapbox_vector_tile.decode(tile, default_options={"y_coord_down": True})
+
+    @unittest.skipUnless(mapbox_vector_tile, "mapbox_vector_tile is not installed")
+    def test_reference_decoder_reads_values_of_every_type(self):
+        properties = {
+            "name": "Atri",
+            "count": 7,
+            "delta": -3,
+            "ratio": 1.5,
+            "flag": True,
+        }
+        commands = vector_tiles.encode_polygons(shapely.box(0, 0, 10, 10))
+        layer = self.reference_decode(
+            vector_tiles.encode_layer("mws", [(properties, commands)])
+        )
+
+        self.assertEqual(layer["mws"]["extent"], vector_tiles.EXTENT)
+        self.assertEqual(layer["mws"]["features"][0]["properties"], properties)
+
+    @unittest.skipUnless(mapbox_vector_tile, "mapbox_vector_tile is not installed")
+    def test_reference_decoder_reads_the_source_geometry(self):
+        z, x, y = self.tile_of(8)
+        tile, _ = self.get_tile("mws", z, x, y)
+        features = self.reference_decode(tile)["mws"]["features"]
+        self.assertEqual(
+            [f["properties"] for f in features], [{"uid": "12_1"}, {"uid": "12_2"}]
+        )
+
+        min_x, _, max_x, max_y = vector_tiles.tile_bounds(z, x, y)
+        scale = vector_tiles.EXTENT / (max_x - min_x)
+        expected = shapely.transform(
+            vector_tiles.to_web_mercator(
+                shapely.geometry.shape(self.features[0]["geometry"])
+            ),
+            lambda coords: np.column_stack(
+                [(coords[:, 0] - min_x) * scale, (max_y - coords[:, 1]) * scale]
+            ),
+        )
+        decoded = shapely.geometry.shape(features[0]["geometry"])
+
+        self.assertEqual(decoded.geom_type, "Polygon")
+        self.assertEqual(len(decoded.interiors), 1)
+        # Exteriors have positive area in tile coordinates, holes negative
+        self.assertTrue(decoded.exterior.is_ccw)
+        self.assertFalse(decoded.interiors[0].is_ccw)
+        self.assertLess(
+            decoded.symmetric_difference(expected).area, 0.01 * expected.area
+        )
@@ -0,0 +1,232 @@
+"""
+Columnar store for per-MWS hydrology and NDVI time series.
+
+When the fortnightly hydrology or NDVI layers of a tehsil are published, the
+whole layer is pulled from GeoServer once and written as a Parquet file with
+one row per ``(uid, date)``. ``get_mws_data`` then answers from that file
+(kept in memory between requests) instead of issuing four WFS requests per
+MWS.
+"""
+
+import json
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import requests
+
+from nrm_app.settings import EXCEL_PATH, GEOSERVER_URL
+from utilities.file_cache import FileCache
+from utilities.gee_utils import valid_gee_text
+
+HYDROLOGY_VARIABLES = ["et", "runoff", "precipitation"]
+NDVI_VARIABLES = ["ndvi_crop", "ndvi_shrub", "ndvi_tree"]
+VARIABLES = HYDROLOGY_VARIABLES + NDVI_VARIABLES
+
+_HYDROLOGY_KEYS = {"et": "ET", "runoff": "RunOff", "precipitation": "Precipitation"}
+
+# Stores of the tehsils served most recently
+_frames = FileCache(max_entries=64)
+
+
+def store_path(state, district, tehsil):
+    district = valid_gee_text(district.lower())
+    tehsil = valid_gee_text(tehsil.lower())
+    return os.path.join(
+        EXCEL_PATH,
+        "data/mws_timeseries",
+        state.replace(" ", "_").upper(),
+        district.upper(),
+        f"{district}_{tehsil}.parquet",
+    )
+
+
+def _is_date_key(key):
+    return "-" in key and key.count("-") == 2
+
+
+def _fetch_layer_properties(workspace, layer_name):
+    """All feature properties of a WFS layer, keyed by uid."""
+    params = {
+        "service": "WFS",
+        "version": "1.0.0",
+        "request": "GetFeature",
+        "typeName": f"{workspace}:{layer_name}",
+        "outputFormat": "json",
+    }
+    response = requests.get(
+        f"{GEOSERVER_URL}/{workspace}/ows", params=params, timeout=120
+    )
+    response.raise_for_status()
+    return {
+        str(feature["properties"].get("uid")): feature["properties"]
+        for feature in response.json().get("features", [])
+    }
+
+
+def _hydrology_values(raw):
+    """Mirror the legacy per-request parsing: falsy -> 0.0, bad JSON -> NaN."""
+    try:
+        values = json.loads(raw if raw is not None else "{}")
+        return [
+            round(values.get(key), 2) if values.get(key) else 0.0
+            for key in _HYDROLOGY_KEYS.values()
+        ]
+    except Exception:
+        return [np.nan] * len(_HYDROLOGY_KEYS)
+
+
+def _ndvi_value(raw):
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return np.nan
+    return round(value, 2)
+
+
+def build_frame(water_layer, ndvi_layers):
+    """
+    Build the long ``(uid, date)`` frame from layer properties.
+
+    ``water_layer`` maps uid -> hydrology properties (one JSON string per
+    date); ``ndvi_layers`` maps ``crop``/``shrub``/``tree`` to uid -> NDVI
+    properties (one number per date). When it is empty the tehsil has no NDVI
+    and the frame has no NDVI columns.
+    """
+    variables = HYDROLOGY_VARIABLES + (NDVI_VARIABLES if ndvi_layers else [])
+    veg_types = ["crop", "shrub", "tree"] if ndvi_layers else []
+    uids = set(water_layer)
+    for layer in ndvi_layers.values():
+        uids.update(layer)
+
+    rows = []
+    for uid in uids:
+        water = water_layer.get(uid, {})
+        ndvi = {veg: layer.get(uid, {}) for veg, layer in ndvi_layers.items()}
+
+        dates = {key for key in water if _is_date_key(key)}
+        for props in ndvi.values():
+            dates.update(key for key in props if _is_date_key(key))
+
+        for date in dates:
+            rows.append(
+                [uid, date]
+                + _hydrology_values(water.get(date))
+                + [_ndvi_value(ndvi.get(veg, {}).get(date)) for veg in veg_types]
+            )
+
+    frame = pd.DataFrame(rows, columns=["uid", "date"] + variables)
+    frame["date"] = pd.to_datetime(frame["date"])
+    frame[variables] = frame[variables].astype("float32")
+    return frame.sort_values(["uid", "date"]).reset_index(drop=True)
+
+
+def _ndvi_published(state, district, tehsil, water_layer_name):
+    """NDVI is only served alongside a post-1.0 hydrology layer."""
+    from computing.models import Layer
+
+    return (
+        Layer.objects.filter(
+            state__state_name__iexact=state,
+            district__district_name__iexact=district,
+            block__tehsil_name__iexact=tehsil,
+            dataset__name="Hydrology",
+            layer_name=water_layer_name,
+        )
+        .exclude(layer_version="1.0", algorithm_version="1.0")
+        .exists()
+    )
+
+
+def ingest_tehsil(state, district, tehsil, include_ndvi=None):
+    """
+    Pull the tehsil's hydrology and NDVI layers from GeoServer and rewrite its
+    time-series file. Called after those layers are published.
+    """
+    district_key = valid_gee_text(district.lower())
+    tehsil_key = valid_gee_text(tehsil.lower())
+    suffix = f"{district_key}_{tehsil_key}"
+
+    if include_ndvi is None:
+        include_ndvi = _ndvi_published(
+            state, district, tehsil, f"deltaG_fortnight_{suffix}"
+        )
+
+    water_layer = _fetch_layer_properties("mws_layers", f"deltaG_fortnight_{suffix}")
+    ndvi_layers = {}
+    if include_ndvi:
+        for veg_type in ["crop", "shrub", "tree"]:
+            try:
+                ndvi_layers[veg_type] = _fetch_layer_properties(
+                    "ndvi_timeseries", f"ndvi_timeseries_{suffix}_{veg_type}"
+                )
+            except Exception as e:
+                print(f"NDVI layer {veg_type} unavailable for {suffix}: {e}")
+                ndvi_layers[veg_type] = {}
+
+    frame = build_frame(water_layer, ndvi_layers)
+
+    path = store_path(state, district, tehsil)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    print(f"MWS time series stored for {suffix}: {len(frame)} rows")
+    return path
+
+
+def _load(path):
+    return _frames.get(
+        path, [path], lambda: pd.read_parquet(path).set_index("uid").sort_index()
+    )
+
+
+def has_tehsil(state, district, tehsil):
+    return os.path.exists(store_path(state, district, tehsil))
+
+
+def _format(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return round(float(value), 2)
+
+
+def query(
+    state, district, tehsil, mws_ids, start_date=None, end_date=None, variables=None
+):
+    """
+    Time series for one or more MWS of a tehsil, in the ``get_mws_data``
+    response shape. Returns ``None`` when the tehsil has not been ingested.
+    """
+    path = store_path(state, district, tehsil)
+    if not os.path.exists(path):
+        return None
+
+    variables = [v for v in (variables or VARIABLES) if v in VARIABLES]
+    frame = _load(path)
+
+    results = []
+    for mws_id in mws_ids:
+        if mws_id in frame.index:
+            series = frame.loc[[mws_id]]
+        else:
+            series = frame.iloc[0:0]
+        if start_date:
+            series = series[series["date"] >= pd.Timestamp(start_date)]
+        if end_date:
+            series = series[series["date"] <= pd.Timestamp(end_date)]
+
+        dates = series["date"].dt.strftime("%Y-%m-%d").tolist()
+        # Tehsils stored without NDVI answer "" for it, like the WFS path
+        columns = {
+            v: series[v].tolist() if v in series else [None] * len(dates)
+            for v in variables
+        }
+        time_series = [
+            {"date": date, **{v: _format(columns[v][i]) for v in variables}}
+            for i, date in enumerate(dates)
+        ]
+        results.append({"mws_id": mws_id, "time_series": time_series})
+    return results
@@ -27,9 +27,20 @@ urlpatterns = [
         name="get_active_locations",
     ),
     path("get_mws_geometries/", api.get_mws_geometries, name="get-mws-geometries"),
+    path("get_mws_network/", api.get_mws_network, name="get-mws-network"),
     path(
         "get_village_geometries/",
         api.get_village_geometries,
         name="get-village-geometries",
     ),
+    path(
+        "get_mws_tiles/<int:z>/<int:x>/<int:y>/",
+        api.get_mws_tiles,
+        name="get-mws-tiles",
+    ),
+    path(
+        "get_village_tiles/<int:z>/<int:x>/<int:y>/",
+        api.get_village_tiles,
+        name="get-village-tiles",
+    ),
 ]
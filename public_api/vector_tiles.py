@@ -0,0 +1,431 @@
+"""
+Mapbox Vector Tiles of the MWS and village boundaries of a tehsil.
+
+A tehsil's boundary layer is pulled from GeoServer once, projected to Web
+Mercator and stored as a Parquet file holding the published attributes and,
+for every zoom level from ``MIN_ZOOM`` to ``MAX_ZOOM``, the geometries
+simplified to one tile unit at that zoom. Tiles are cut from the geometries
+of their zoom level, encoded as MVT and written to disk, so later requests
+for a tile are a file read. Rebuilding the geometry file (after the layer is
+published again) starts a new tile directory and removes the old one.
+Tiles are only served up to ``MAX_ZOOM``; clients overzoom them beyond it.
+"""
+
+import json
+import math
+import os
+import shutil
+import struct
+import threading
+
+import numpy as np
+import pandas as pd
+import requests
+import shapely
+from shapely.geometry import shape
+
+from nrm_app.settings import EXCEL_PATH, GEOSERVER_URL
+from utilities.file_cache import FileCache
+from utilities.gee_utils import valid_gee_text
+
+EXTENT = 4096
+BUFFER = 64
+MIN_ZOOM = 6
+MAX_ZOOM = 14
+WEB_MERCATOR_HALF_WIDTH = 20037508.342789244
+WEB_MERCATOR_MAX_LATITUDE = 85.0511287798
+
+# Attributes are projected per zoom: each one is only included in tiles at or
+# above its zoom level.
+TILE_LAYERS = {
+    "mws": {
+        "workspace": "mws",
+        "layer_name": "mws_{district}_{tehsil}",
+        "attributes": {"uid": MIN_ZOOM},
+    },
+    "villages": {
+        "workspace": "panchayat_boundaries",
+        "layer_name": "{district}_{tehsil}",
+        "attributes": {"vill_ID": MIN_ZOOM, "vill_name": 11},
+    },
+}
+
+_MOVE_TO = 1
+_LINE_TO = 2
+_CLOSE_PATH = 7
+_POLYGON = 3
+
+# Geometries of the tehsil layers served most recently
+_geometries = FileCache(max_entries=32)
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+
+def geometry_path(kind, state, district, tehsil):
+    district = valid_gee_text(district.lower())
+    tehsil = valid_gee_text(tehsil.lower())
+    return os.path.join(
+        EXCEL_PATH,
+        "data/vector_tiles",
+        state.replace(" ", "_").upper(),
+        district.upper(),
+        f"{kind}_{district}_{tehsil}.parquet",
+    )
+
+
+def _tile_root(path):
+    """Directory holding one tile tree per version of a geometry file."""
+    return os.path.splitext(path)[0]
+
+
+def tile_bounds(z, x, y):
+    """Web Mercator bounds ``(min_x, min_y, max_x, max_y)`` of a tile."""
+    size = 2 * WEB_MERCATOR_HALF_WIDTH / 2**z
+    min_x = -WEB_MERCATOR_HALF_WIDTH + x * size
+    max_y = WEB_MERCATOR_HALF_WIDTH - y * size
+    return min_x, max_y - size, min_x + size, max_y
+
+
+def _tile_unit(zoom):
+    return 2 * WEB_MERCATOR_HALF_WIDTH / 2**zoom / EXTENT
+
+
+def to_web_mercator(geometries):
+    def project(coords):
+        lat = np.clip(
+            coords[:, 1], -WEB_MERCATOR_MAX_LATITUDE, WEB_MERCATOR_MAX_LATITUDE
+        )
+        x = coords[:, 0] * WEB_MERCATOR_HALF_WIDTH / 180
+        y = np.log(np.tan(np.radians(90 + lat) / 2)) * WEB_MERCATOR_HALF_WIDTH / math.pi
+        return np.column_stack([x, y])
+
+    return shapely.transform(geometries, project)
+
+
+def build_geometry_frame(features, attributes):
+    """
+    One row per GeoJSON feature with its ``attributes`` (as JSON) and its
+    Web Mercator geometry simplified for every zoom level (as WKB).
+    """
+    geometries = []
+    properties = []
+    for feature in features:
+        if not feature.get("geometry"):
+            continue
+        geometries.append(shape(feature["geometry"]))
+        values = feature.get("properties") or {}
+        properties.append(
+            json.dumps(
+                {key: values[key] for key in attributes if values.get(key) is not None}
+            )
+        )
+
+    projected = to_web_mercator(np.array(geometries, dtype=object))
+    frame = pd.DataFrame({"properties": properties})
+    for zoom in range(MIN_ZOOM, MAX_ZOOM + 1):
+        frame[f"z{zoom}"] = shapely.to_wkb(
+            shapely.simplify(projected, _tile_unit(zoom))
+        )
+    return frame
+
+
+def _fetch_features(kind, district, tehsil):
+    config = TILE_LAYERS[kind]
+    layer_name = config["layer_name"].format(district=district, tehsil=tehsil)
+    params = {
+        "service": "WFS",
+        "version": "1.0.0",
+        "request": "GetFeature",
+        "typeName": f"{config['workspace']}:{layer_name}",
+        "outputFormat": "application/json",
+    }
+    response = requests.get(
+        f"{GEOSERVER_URL}/{config['workspace']}/ows", params=params, timeout=120
+    )
+    response.raise_for_status()
+    return response.json().get("features", [])
+
+
+def build_tehsil_tiles(kind, state, district, tehsil):
+    """
+    Pull the tehsil's ``kind`` layer from GeoServer and rewrite its geometry
+    file. Called after the layer is published.
+    """
+    district_key = valid_gee_text(district.lower())
+    tehsil_key = valid_gee_text(tehsil.lower())
+    features = _fetch_features(kind, district_key, tehsil_key)
+    if not features:
+        raise ValueError(f"No features found in {kind} layer of {tehsil_key}")
+
+    frame = build_geometry_frame(features, TILE_LAYERS[kind]["attributes"])
+
+    path = geometry_path(kind, state, district, tehsil)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    # Tiles cut from the previous geometries are stale
+    version = str(os.stat(path).st_mtime_ns)
+    tile_root = _tile_root(path)
+    if os.path.isdir(tile_root):
+        for entry in os.listdir(tile_root):
+            if entry != version:
+                shutil.rmtree(os.path.join(tile_root, entry), ignore_errors=True)
+
+    print(
+        f"{kind} tile geometries stored for {district_key}_{tehsil_key}: {len(frame)}"
+    )
+    return path
+
+
+class TehsilGeometries:
+    def __init__(self, version, properties, levels):
+        self.version = version
+        self.properties = properties
+        self.levels = levels
+        self.tree = shapely.STRtree(levels[MAX_ZOOM])
+        self.bounds = shapely.total_bounds(levels[MAX_ZOOM])
+
+    def intersects_tile(self, z, x, y):
+        min_x, min_y, max_x, max_y = tile_bounds(z, x, y)
+        margin = (max_x - min_x) * BUFFER / EXTENT
+        return not (
+            max_x + margin < self.bounds[0]
+            or min_x - margin > self.bounds[2]
+            or max_y + margin < self.bounds[1]
+            or min_y - margin > self.bounds[3]
+        )
+
+
+def _read_geometries(path):
+    version = str(os.stat(path).st_mtime_ns)
+    frame = pd.read_parquet(path)
+    return TehsilGeometries(
+        version,
+        [json.loads(value) for value in frame["properties"]],
+        {
+            zoom: shapely.from_wkb(frame[f"z{zoom}"].to_numpy())
+            for zoom in range(MIN_ZOOM, MAX_ZOOM + 1)
+        },
+    )
+
+
+def _load(path):
+    return _geometries.get(path, [path], lambda: _read_geometries(path))
+
+
+def load_tehsil(kind, state, district, tehsil):
+    """
+    The tile geometries of a tehsil's layer, pulled from GeoServer on first
+    use. Returns ``None`` when the layer is not available.
+    """
+    path = geometry_path(kind, state, district, tehsil)
+    if not os.path.exists(path):
+        with _build_locks_lock:
+            lock = _build_locks.setdefault(path, threading.Lock())
+        with lock:
+            if not os.path.exists(path):
+                try:
+                    build_tehsil_tiles(kind, state, district, tehsil)
+                except Exception as e:
+                    print(f"{kind} layer unavailable for {district}_{tehsil}: {e}")
+                    return None
+    return _load(path)
+
+
+def _varint(value):
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _key(number, wire_type):
+    return _varint((number << 3) | wire_type)
+
+
+def _length_delimited(number, payload):
+    return _key(number, 2) + _varint(len(payload)) + payload
+
+
+def _packed(number, values):
+    return _length_delimited(number, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value):
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value < 0:
+            return _key(6, 0) + _varint((value << 1) ^ (value >> 63))
+        return _key(5, 0) + _varint(value)
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _length_delimited(1, str(value).encode())
+
+
+def _ring(coords, exterior):
+    """
+    Integer tile coordinates of a ring without repeated or closing points,
+    wound as MVT expects (positive area for exteriors), or ``None`` if the
+    ring collapses at tile precision.
+    """
+    points = np.rint(coords).astype(np.int64)
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = (np.diff(points, axis=0) != 0).any(axis=1)
+    points = points[keep]
+    while len(points) > 1 and (points[-1] == points[0]).all():
+        points = points[:-1]
+    if len(points) < 3:
+        return None
+
+    x, y = points[:, 0], points[:, 1]
+    area = int(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+    if area == 0:
+        return None
+    if (area > 0) != exterior:
+        points = points[::-1]
+    return points
+
+
+def encode_polygons(geometry):
+    """MVT geometry commands of the polygons in ``geometry`` (tile coordinates)."""
+    rings = []
+    for polygon in shapely.get_parts(geometry):
+        if polygon.geom_type == "MultiPolygon":
+            parts = list(polygon.geoms)
+        elif polygon.geom_type == "Polygon":
+            parts = [polygon]
+        else:
+            continue
+        for part in parts:
+            exterior = _ring(np.asarray(part.exterior.coords)[:, :2], True)
+            if exterior is None:
+                continue
+            rings.append(exterior)
+            for interior in part.interiors:
+                ring = _ring(np.asarray(interior.coords)[:, :2], False)
+                if ring is not None:
+                    rings.append(ring)
+
+    commands = []
+    cursor = np.zeros(2, dtype=np.int64)
+    for points in rings:
+        deltas = np.diff(np.vstack([cursor, points]), axis=0)
+        cursor = points[-1]
+        params = ((deltas << 1) ^ (deltas >> 63)).ravel().tolist()
+        commands.append(_MOVE_TO | (1 << 3))
+        commands.extend(params[:2])
+        commands.append(_LINE_TO | ((len(points) - 1) << 3))
+        commands.extend(params[2:])
+        commands.append(_CLOSE_PATH | (1 << 3))
+    return commands
+
+
+def encode_layer(name, features):
+    """
+    An MVT tile with one layer of polygon ``features``, each given as
+    ``(properties, geometry commands)``. Empty when there are no features.
+    """
+    if not features:
+        return b""
+
+    keys = {}
+    values = {}
+    encoded_features = []
+    for properties, commands in features:
+        tags = []
+        for key, value in properties.items():
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault(_encode_value(value), len(values)))
+        feature = b""
+        if tags:
+            feature += _packed(2, tags)
+        feature += _key(3, 0) + _varint(_POLYGON) + _packed(4, commands)
+        encoded_features.append(_length_delimited(2, feature))
+
+    layer = b"".join(
+        [_key(15, 0) + _varint(2), _length_delimited(1, name.encode())]
+        + encoded_features
+        + [_length_delimited(3, key.encode()) for key in keys]
+        + [_length_delimited(4, value) for value in values]
+        + [_key(5, 0) + _varint(EXTENT)]
+    )
+    return _length_delimited(3, layer)
+
+
+def render_tile(geometries, kind, z, x, y, fields):
+    level = min(max(z, MIN_ZOOM), MAX_ZOOM)
+    min_x, min_y, max_x, max_y = tile_bounds(z, x, y)
+    size = max_x - min_x
+    margin = size * BUFFER / EXTENT
+    clip_box = (min_x - margin, min_y - margin, max_x + margin, max_y + margin)
+
+    candidates = np.sort(geometries.tree.query(shapely.box(*clip_box)))
+    if not len(candidates):
+        return b""
+
+    scale = EXTENT / size
+    clipped = shapely.clip_by_rect(geometries.levels[level][candidates], *clip_box)
+    in_tile = shapely.transform(
+        clipped,
+        lambda coords: np.column_stack(
+            [(coords[:, 0] - min_x) * scale, (max_y - coords[:, 1]) * scale]
+        ),
+    )
+
+    attributes = TILE_LAYERS[kind]["attributes"]
+    keys = [key for key in fields if attributes[key] <= z]
+    features = []
+    for index, geometry in zip(candidates, in_tile):
+        commands = encode_polygons(geometry)
+        if not commands:
+            continue
+        properties = geometries.properties[index]
+        features.append(
+            ({key: properties[key] for key in keys if key in properties}, commands)
+        )
+    return encode_layer(kind, features)
+
+
+def get_tile(kind, state, district, tehsil, z, x, y, fields=None):
+    """
+    The MVT tile ``z/x/y`` of a tehsil's ``kind`` layer, with the attributes
+    in ``fields`` (default: all). Non-empty tiles are rendered once and then
+    read from disk.
+
+    Returns:
+        ``(tile bytes, version)``, or ``None`` if the layer is not available
+    """
+    geometries = load_tehsil(kind, state, district, tehsil)
+    if geometries is None:
+        return None
+    if not geometries.intersects_tile(z, x, y):
+        return b"", geometries.version
+
+    fields = sorted(set(fields or TILE_LAYERS[kind]["attributes"]))
+    path = os.path.join(
+        _tile_root(geometry_path(kind, state, district, tehsil)),
+        geometries.version,
+        "-".join(fields) or "none",
+        str(z),
+        str(x),
+        f"{y}.mvt",
+    )
+    try:
+        with open(path, "rb") as f:
+            return f.read(), geometries.version
+    except FileNotFoundError:
+        pass
+
+    tile = render_tile(geometries, kind, z, x, y, fields)
+    if tile:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(tile)
+        os.replace(tmp_path, path)
+    return tile, geometries.version
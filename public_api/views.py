@@ -2,6 +2,7 @@ import ee
 import os
 import json
 import requests
+from datetime import datetime
 import pandas as pd
 import numpy as np
 from rest_framework.response import Response
@@ -16,10 +17,15 @@ from nrm_app.settings import EXCEL_PATH, GEOSERVER_URL, GEE_HELPER_ACCOUNT_ID
 from geoadmin.models import StateSOI, DistrictSOI, TehsilSOI
 from computing.models import Layer, LayerType
 from stats_generator.utils import get_url
-from django.db.models import Q
+from django.db.models import Case, F, FloatField, Min, Q, Value, When, Window
+from django.db.models.functions import Cast, Lower, RowNumber
+from . import timeseries_store
 
 # Create your views here.
 
+# layer_version values the database can cast to a float; others rank as 0
+NUMERIC_VERSION_PATTERN = r"^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$"
+
 
 def is_valid_string(value):
     if not value:
@@ -43,6 +49,14 @@ def is_valid_mws_id(value):
     return all(c.isdigit() or c == "_" for c in value)
 
 
+def is_valid_date(value):
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
 def excel_file_exists(state, district, tehsil):
     base_path = os.path.join(EXCEL_PATH, "data/stats_excel_files")
     state_path = os.path.join(base_path, state.upper())
@@ -66,7 +80,12 @@ def fetch_generated_layer_urls(state_name, district_name, block_name):
     district = DistrictSOI.objects.get(district_name__iexact=district_name, state=state)
     tehsil = TehsilSOI.objects.get(tehsil_name__iexact=block_name, district=district)
 
-    layers = Layer.objects.filter(state=state, district=district, block=tehsil)
+    layers = Layer.objects.filter(
+        state=state,
+        district=district,
+        block=tehsil,
+        dataset__layer_type__in=[LayerType.VECTOR, LayerType.POINT, LayerType.RASTER],
+    )
 
     EXCLUDE_LAYER_KEYWORDS = [
         "run_off",
@@ -78,6 +97,31 @@ def fetch_generated_layer_urls(state_name, district_name, block_name):
             Q(layer_name__icontains=word) & ~Q(layer_name__icontains="mws_connectivity")
         )
 
+    # Keep only the highest layer_version of each (case-insensitive) layer
+    # name, the oldest row winning ties, listed in order of first appearance.
+    name_key = Lower("layer_name")
+    version = Case(
+        When(
+            layer_version__regex=NUMERIC_VERSION_PATTERN,
+            then=Cast("layer_version", FloatField()),
+        ),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    layers = (
+        layers.select_related("dataset")
+        .annotate(
+            version_rank=Window(
+                RowNumber(),
+                partition_by=[name_key],
+                order_by=[version.desc(), F("id").asc()],
+            ),
+            first_id=Window(Min("id"), partition_by=[name_key]),
+        )
+        .filter(version_rank=1)
+        .order_by("first_id")
+    )
+
     layer_data = []
 
     for layer in layers:
@@ -92,12 +136,10 @@ def fetch_generated_layer_urls(state_name, district_name, block_name):
             else ""
         )
 
-        if layer_type in [LayerType.VECTOR, LayerType.POINT]:
-            layer_url = get_url(workspace, layer_name)
-        elif layer_type == LayerType.RASTER:
+        if layer_type == LayerType.RASTER:
             layer_url = raster_tiff_download_url(workspace, layer_name)
         else:
-            continue  # Skip unknown types
+            layer_url = get_url(workspace, layer_name)
 
         layer_data.append(
             {
@@ -111,18 +153,7 @@ def fetch_generated_layer_urls(state_name, district_name, block_name):
             }
         )
 
-    latest_layers = {}
-    for entry in layer_data:
-        name = entry["layer_name"].lower()
-        if name not in latest_layers:
-            latest_layers[name] = entry
-        else:
-            current_version = float(latest_layers[name]["layer_version"] or 0)
-            new_version = float(entry["layer_version"] or 0)
-            if new_version > current_version:
-                latest_layers[name] = entry
-
-    return list(latest_layers.values())
+    return layer_data
 
 
 def get_location_info_by_lat_lon(lat, lon):
@@ -224,7 +255,55 @@ def get_mws_id_by_lat_lon(lon, lat):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-def get_mws_time_series_data(state, district, tehsil, mws_id):
+def get_mws_time_series_data(
+    state, district, tehsil, mws_id, start_date=None, end_date=None, variables=None
+):
+    """
+    Time series for one MWS, or a list of MWS ids of the same tehsil.
+
+    Served from the tehsil's columnar store when it has been ingested, and
+    from GeoServer otherwise. A list of ids returns ``{"results": [...]}``.
+    """
+    mws_ids = mws_id if isinstance(mws_id, (list, tuple)) else [mws_id]
+
+    try:
+        results = timeseries_store.query(
+            state, district, tehsil, mws_ids, start_date, end_date, variables
+        )
+    except Exception as e:
+        print(f"MWS time series store read failed, using GeoServer: {e}")
+        results = None
+
+    if results is None:
+        results = []
+        for single_id in mws_ids:
+            data = _fetch_mws_time_series_from_geoserver(
+                state, district, tehsil, single_id
+            )
+            if "error" in data:
+                return data
+            results.append(_filter_time_series(data, start_date, end_date, variables))
+
+    if isinstance(mws_id, (list, tuple)):
+        return {"results": results}
+    return results[0]
+
+
+def _filter_time_series(data, start_date=None, end_date=None, variables=None):
+    time_series = data["time_series"]
+    if start_date:
+        time_series = [e for e in time_series if e["date"] >= start_date]
+    if end_date:
+        time_series = [e for e in time_series if e["date"] <= end_date]
+    if variables:
+        time_series = [
+            {k: v for k, v in e.items() if k == "date" or k in variables}
+            for e in time_series
+        ]
+    return {"mws_id": data["mws_id"], "time_series": time_series}
+
+
+def _fetch_mws_time_series_from_geoserver(state, district, tehsil, mws_id):
     """Fetch and merge water and NDVI time series data for a specific MWS location."""
 
     def fetch_geoserver_data(base_url, layer_name, mws_id):
@@ -391,7 +470,7 @@ def get_mws_json_from_kyl_indicator(state, district, tehsil, mws_id):
         return {"error": f"Error reading or processing file: {str(e)}"}
 
 
-def get_tehsil_json(state, district, tehsil, regenerate):
+def get_tehsil_json(state, district, tehsil, regenerate, stats_sheets=None):
     file_path, file_exists = excel_file_exists(state, district, tehsil)
     json_path = file_path.replace(".xlsx", ".json")
 
@@ -399,7 +478,11 @@ def get_tehsil_json(state, district, tehsil, regenerate):
         with open(json_path, "r") as f:
             return json.load(f)
 
-    xls = pd.read_excel(file_path, sheet_name=None)
+    if stats_sheets is not None:
+        # Frames are shared with the other stats builders; don't modify them.
+        xls = {name: df.copy() for name, df in stats_sheets.items()}
+    else:
+        xls = pd.read_excel(file_path, sheet_name=None)
     json_data = {}
 
     for sheet_name, df in xls.items():
@@ -0,0 +1,83 @@
+"""
+GeoServer requests shared by the coordinate search and the layer index
+backfill. Every helper takes an authenticated ``requests.Session``.
+"""
+
+import xml.etree.ElementTree as ET
+
+from nrm_app.settings import GEOSERVER_URL
+
+WFS_NS = "{http://www.opengis.net/wfs}"
+OWS_NS = "{http://www.opengis.net/ows}"
+
+
+def geoserver_workspaces(session):
+    response = session.get(
+        f"{GEOSERVER_URL}/rest/workspaces", headers={"Accept": "application/json"}
+    )
+    response.raise_for_status()
+    workspaces = (response.json().get("workspaces") or {}).get("workspace", [])
+    return [workspace["name"] for workspace in workspaces]
+
+
+def workspace_layer_names(session, workspace):
+    response = session.get(
+        f"{GEOSERVER_URL}/rest/workspaces/{workspace}/layers",
+        headers={"Accept": "application/json"},
+    )
+    response.raise_for_status()
+    layers = (response.json().get("layers") or {}).get("layer", [])
+    return [layer["name"] for layer in layers]
+
+
+def layer_bounding_boxes(session, workspace):
+    """
+    The lon/lat bounding box GeoServer reports for each vector layer of the
+    workspace, read from one WFS GetCapabilities request.
+
+    Returns:
+        dict: ``{layer_name: (min_x, min_y, max_x, max_y)}``, empty if the
+        capabilities could not be read
+    """
+    try:
+        response = session.get(
+            f"{GEOSERVER_URL}/{workspace}/wfs",
+            params={"service": "WFS", "version": "1.1.0", "request": "GetCapabilities"},
+        )
+        response.raise_for_status()
+        root = ET.fromstring(response.content)
+    except Exception as e:
+        print(f"Could not read the WFS capabilities of {workspace}: {e}")
+        return {}
+
+    boxes = {}
+    for feature_type in root.iter(f"{WFS_NS}FeatureType"):
+        name = feature_type.findtext(f"{WFS_NS}Name")
+        lower = feature_type.findtext(f"{OWS_NS}WGS84BoundingBox/{OWS_NS}LowerCorner")
+        upper = feature_type.findtext(f"{OWS_NS}WGS84BoundingBox/{OWS_NS}UpperCorner")
+        if not (name and lower and upper):
+            continue
+        try:
+            min_x, min_y = map(float, lower.split())
+            max_x, max_y = map(float, upper.split())
+        except ValueError:
+            continue
+        boxes[name.split(":", 1)[-1]] = (min_x, min_y, max_x, max_y)
+    return boxes
+
+
+def fetch_layer_geojson(session, workspace, layer_name):
+    """All features of a vector layer as a lon/lat GeoJSON FeatureCollection."""
+    response = session.get(
+        f"{GEOSERVER_URL}/{workspace}/ows",
+        params={
+            "service": "WFS",
+            "version": "1.0.0",
+            "request": "GetFeature",
+            "typeName": f"{workspace}:{layer_name}",
+            "srsName": "EPSG:4326",
+            "outputFormat": "application/json",
+        },
+    )
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,116 @@
+"""
+Local geometry index of the vector layers synced to GeoServer.
+
+Every layer pushed through ``computing.utils`` is recorded here as one WKB
+file holding the geometries of its features,
+``data/layer_index/<workspace>/<layer>.wkb``. Layers published before the
+index existed are added with the ``index_workspace_layers`` command.
+Coordinate search reads the files of a workspace once per process,
+reloading a file only when it is replaced, and answers point-in-layer
+queries with a bounding-box filter followed by an exact intersection test
+instead of one WFS request per layer.
+"""
+
+import os
+import re
+import threading
+
+import shapely
+from shapely.geometry import shape
+
+from utilities.file_cache import FileCache
+
+LAYER_INDEX_DIR = "data/layer_index"
+
+_NAME_PATTERN = re.compile(r"^[\w.-]+$")
+
+# Layers of the workspaces searched most recently
+_layers = FileCache(max_entries=2048)
+
+
+def is_valid_name(name):
+    """Whether ``name`` can be used as a workspace or layer file name."""
+    return bool(name) and bool(_NAME_PATTERN.match(name)) and name not in (".", "..")
+
+
+def workspace_index_dir(workspace):
+    return os.path.join(LAYER_INDEX_DIR, workspace)
+
+
+def layer_index_path(workspace, layer_name):
+    return os.path.join(workspace_index_dir(workspace), f"{layer_name}.wkb")
+
+
+def index_layer(workspace, layer_name, geojson_fc):
+    """
+    Record the features of a GeoJSON FeatureCollection as the geometry of
+    ``workspace:layer_name``, replacing any previous entry.
+
+    Returns:
+        bool: True if the layer was indexed
+    """
+    if not (is_valid_name(workspace) and is_valid_name(layer_name)):
+        print(f"Not indexing layer with invalid name: {workspace}:{layer_name}")
+        return False
+
+    geometries = [
+        shape(feature["geometry"])
+        for feature in geojson_fc.get("features", [])
+        if feature.get("geometry")
+    ]
+    if not geometries:
+        return False
+
+    os.makedirs(workspace_index_dir(workspace), exist_ok=True)
+    path = layer_index_path(workspace, layer_name)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(shapely.to_wkb(shapely.GeometryCollection(geometries)))
+    os.replace(tmp_path, path)
+    return True
+
+
+def _load_layer(path):
+    with open(path, "rb") as f:
+        geometry = shapely.from_wkb(f.read())
+    shapely.prepare(geometry)
+    return shapely.bounds(geometry), geometry
+
+
+def load_workspace_index(workspace):
+    """
+    The indexed layers of ``workspace``.
+
+    Returns:
+        dict: ``{layer_name: (bounds, prepared geometry)}``
+    """
+    index_dir = workspace_index_dir(workspace)
+    if not is_valid_name(workspace) or not os.path.isdir(index_dir):
+        return {}
+
+    layers = {}
+    with os.scandir(index_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".wkb"):
+                continue
+            layer_name = entry.name[: -len(".wkb")]
+            try:
+                layers[layer_name] = _layers.get(
+                    entry.path, [entry.path], lambda: _load_layer(entry.path)
+                )
+            except Exception as e:
+                print(f"Could not load index of layer {layer_name}: {e}")
+    return layers
+
+
+def layers_containing_point(layers, lon, lat):
+    """Names of the ``layers`` (see ``load_workspace_index``) the point falls in."""
+    point = shapely.Point(lon, lat)
+    matches = []
+    for layer_name, (bounds, geometry) in layers.items():
+        min_x, min_y, max_x, max_y = bounds
+        if not (min_x <= lon <= max_x and min_y <= lat <= max_y):
+            continue
+        if geometry.intersects(point):
+            matches.append(layer_name)
+    return matches
@@ -0,0 +1,73 @@
+import os
+
+import requests
+from django.core.management.base import BaseCommand
+from requests.auth import HTTPBasicAuth
+
+from nrm_app.settings import GEOSERVER_PASSWORD, GEOSERVER_USERNAME
+from public_dataservice.geoserver import (
+    fetch_layer_geojson,
+    geoserver_workspaces,
+    workspace_layer_names,
+)
+from public_dataservice.layer_index import index_layer, is_valid_name, layer_index_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Index the geometries of the vector layers already on GeoServer for "
+        "coordinate search, for the given workspaces or every workspace"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("workspaces", nargs="*", help="Workspace names")
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Skip layers that are already indexed",
+        )
+
+    def handle(self, *args, **options):
+        session = requests.Session()
+        session.auth = HTTPBasicAuth(GEOSERVER_USERNAME, GEOSERVER_PASSWORD)
+
+        indexed = 0
+        skipped = 0
+        failed = 0
+        try:
+            workspaces = options["workspaces"] or geoserver_workspaces(session)
+            for workspace in workspaces:
+                if not is_valid_name(workspace):
+                    self.stdout.write(
+                        self.style.ERROR(f"Invalid workspace: {workspace}")
+                    )
+                    continue
+                try:
+                    layer_names = workspace_layer_names(session, workspace)
+                except requests.exceptions.RequestException as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"{workspace}: {e}"))
+                    continue
+
+                for layer_name in layer_names:
+                    if options["missing_only"] and os.path.exists(
+                        layer_index_path(workspace, layer_name)
+                    ):
+                        continue
+                    try:
+                        geojson_fc = fetch_layer_geojson(session, workspace, layer_name)
+                    except Exception as e:
+                        # Raster layers have no features to fetch
+                        failed += 1
+                        self.stdout.write(
+                            self.style.ERROR(f"{workspace}:{layer_name}: {e}")
+                        )
+                        continue
+                    if index_layer(workspace, layer_name, geojson_fc):
+                        indexed += 1
+                    else:
+                        skipped += 1
+        finally:
+            session.close()
+
+        self.stdout.write(f"Indexed: {indexed}, Skipped: {skipped}, Failed: {failed}")
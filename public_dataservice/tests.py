@@ -1,3 +1,172 @@
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase
+
+from . import layer_index
+from .views import search_layer_by_coordinates
+
+
+def square(min_x, min_y, size=1.0):
+    return {
+        "type": "Feature",
+        "properties": {},
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [
+                [
+                    [min_x, min_y],
+                    [min_x + size, min_y],
+                    [min_x + size, min_y + size],
+                    [min_x, min_y + size],
+                    [min_x, min_y],
+                ]
+            ],
+        },
+    }
+
+
+def feature_collection(*features):
+    return {"type": "FeatureCollection", "features": list(features)}
+
+
+def capabilities(**boxes):
+    feature_types = "".join(
+        f"<FeatureType><Name>ws:{name}</Name><ows:WGS84BoundingBox>"
+        f"<ows:LowerCorner>{min_x} {min_y}</ows:LowerCorner>"
+        f"<ows:UpperCorner>{max_x} {max_y}</ows:UpperCorner>"
+        f"</ows:WGS84BoundingBox></FeatureType>"
+        for name, (min_x, min_y, max_x, max_y) in boxes.items()
+    )
+    return mock.Mock(
+        content=(
+            '<WFS_Capabilities xmlns="http://www.opengis.net/wfs" '
+            'xmlns:ows="http://www.opengis.net/ows" version="1.1.0">'
+            f"<FeatureTypeList>{feature_types}</FeatureTypeList></WFS_Capabilities>"
+        ).encode()
+    )
+
+
+class LayerIndexSearchTest(SimpleTestCase):
+    def setUp(self):
+        index_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, index_dir)
+        patcher = mock.patch.object(layer_index, "LAYER_INDEX_DIR", index_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Two squares whose bounding box also covers (1.5, 0.5)
+        layer_index.index_layer(
+            "ws", "layer_a", feature_collection(square(0, 0), square(1, 1))
+        )
+        layer_index.index_layer("ws", "layer_b", feature_collection(square(10, 10)))
+
+        session_patcher = mock.patch("public_dataservice.views.requests.Session")
+        self.session = session_patcher.start().return_value
+        self.addCleanup(session_patcher.stop)
+
+    def layers_response(self, *names):
+        response = mock.Mock()
+        response.json.return_value = {
+            "layers": {"layer": [{"name": name} for name in names]}
+        }
+        return response
+
+    def search(self, lon, lat, workspace="ws"):
+        request = RequestFactory().get(
+            "/search-layer/", {"lat": lat, "lon": lon, "workspace": workspace}
+        )
+        response = search_layer_by_coordinates(request)
+        return response.status_code, json.loads(response.content)
+
+    def wfs_urls(self):
+        return [
+            call.kwargs["params"]["typeName"]
+            for call in self.session.get.call_args_list
+            if call.kwargs.get("params", {}).get("request") == "GetFeature"
+        ]
+
+    def test_indexed_layers_are_searched_locally(self):
+        self.session.get.return_value = self.layers_response("layer_a", "layer_b")
+
+        status, data = self.search(0.5, 0.5)
+        self.assertEqual(status, 200)
+        self.assertEqual(data["intersecting_layers"], ["layer_a"])
+
+        # Inside the bounding box of layer_a but outside its geometry
+        status, data = self.search(1.5, 0.5)
+        self.assertEqual(data["intersecting_layers"], [])
+
+        status, data = self.search(10.5, 10.5)
+        self.assertEqual(data["intersecting_layers"], ["layer_b"])
+        self.assertEqual(self.wfs_urls(), [])
+
+    def test_only_unindexed_candidate_layers_are_queried(self):
+        hit, miss = mock.Mock(content=b"x" * 100), mock.Mock(content=b"")
+
+        def get(url, **kwargs):
+            if "params" not in kwargs:
+                return self.layers_response(
+                    "layer_a", "layer_c", "layer_d", "layer_e", "layer_f"
+                )
+            if kwargs["params"]["request"] == "GetCapabilities":
+                # layer_f reports no bounding box
+                return capabilities(
+                    layer_c=(0, 0, 1, 1), layer_d=(0, 0, 2, 2), layer_e=(5, 5, 6, 6)
+                )
+            return hit if kwargs["params"]["typeName"] == "ws:layer_c" else miss
+
+        self.session.get.side_effect = get
+
+        status, data = self.search(0.5, 0.5)
+        self.assertEqual(status, 200)
+        self.assertEqual(data["intersecting_layers"], ["layer_a", "layer_c"])
+        self.assertCountEqual(
+            self.wfs_urls(), ["ws:layer_c", "ws:layer_d", "ws:layer_f"]
+        )
+
+    def test_reindexed_layer_is_reloaded(self):
+        self.session.get.return_value = self.layers_response("layer_b")
+        self.assertEqual(self.search(20.5, 20.5)[1]["intersecting_layers"], [])
+
+        layer_index.index_layer("ws", "layer_b", feature_collection(square(20, 20)))
+        self.assertEqual(self.search(20.5, 20.5)[1]["intersecting_layers"], ["layer_b"])
+
+    def test_invalid_workspace(self):
+        status, _ = self.search(0.5, 0.5, workspace="../ws")
+        self.assertEqual(status, 400)
+        self.session.get.assert_not_called()
+
+    def test_index_command_backfills_existing_layers(self):
+        def get(url, **kwargs):
+            if "params" not in kwargs:
+                return self.layers_response("layer_a", "layer_c", "raster")
+            layer = kwargs["params"]["typeName"]
+            if layer == "ws:raster":
+                raise ValueError("not a vector layer")
+            return mock.Mock(json=lambda: feature_collection(square(30, 30)))
+
+        session = mock.Mock(get=mock.Mock(side_effect=get))
+        with mock.patch(
+            "public_dataservice.management.commands.index_workspace_layers"
+            ".requests.Session",
+            return_value=session,
+        ):
+            call_command(
+                "index_workspace_layers", "ws", "--missing-only", stdout=io.StringIO()
+            )
+
+        self.assertEqual(
+            [
+                call.kwargs["params"]["typeName"]
+                for call in session.get.call_args_list[1:]
+            ],
+            ["ws:layer_c", "ws:raster"],
+        )
+        self.session.get.return_value = self.layers_response("layer_a", "layer_c")
+        self.assertEqual(self.search(30.5, 30.5)[1]["intersecting_layers"], ["layer_c"])
+        self.assertEqual(self.wfs_urls(), [])
@@ -3,15 +3,52 @@ from rest_framework import viewsets, permissions, serializers, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
+from nrm_app.settings import GEOSERVER_URL, GEOSERVER_USERNAME, GEOSERVER_PASSWORD
+
+from .geoserver import layer_bounding_boxes, workspace_layer_names
+from .layer_index import is_valid_name, layers_containing_point, load_workspace_index
+
+WFS_FALLBACK_WORKERS = 8
+
+
+def _layer_intersects_point(session, workspace, layer_name, lon, lat):
+    """Ask GeoServer whether any feature of the layer intersects the point."""
+    wfs_response = session.get(
+        f"{GEOSERVER_URL}/wfs",
+        params={
+            "service": "WFS",
+            "version": "1.1.0",
+            "request": "GetFeature",
+            "typeName": f"{workspace}:{layer_name}",
+            "maxFeatures": 1,
+            "CQL_FILTER": f"INTERSECTS(geometry,POINT({lon} {lat}))",
+        },
+    )
+    return len(wfs_response.content) > 50  # Basic check for non-empty response
+
+
+def _box_contains(box, lon, lat):
+    """Whether the point is in ``box``; an unknown box may contain anything."""
+    if box is None:
+        return True
+    min_x, min_y, max_x, max_y = box
+    return min_x <= lon <= max_x and min_y <= lat <= max_y
+
 
 def search_layer_by_coordinates(request):
     """
     Search which layer a specific coordinate falls into
 
+    Layers indexed in ``public_dataservice.layer_index`` are tested locally.
+    GeoServer is only queried, concurrently, for layers not indexed yet
+    whose reported bounding box contains the point.
+
     Expected Query Parameters:
     - lat: Latitude
     - lon: Longitude
@@ -45,51 +82,63 @@ def search_layer_by_coordinates(request):
             status=400,
         )
 
-    # GeoServer connection details
-    geoserver_url = "http://geoserver.core-stack.org:8443/geoserver"
-    username = "admin"
-    password = "tbiuBlock1@123"
+    if not is_valid_name(workspace):
+        return JsonResponse(
+            {"error": "Invalid workspace", "workspace": workspace}, status=400
+        )
 
-    # Layers in the workspace
-    layers_url = f"{geoserver_url}/rest/workspaces/{workspace}/layers"
+    session = requests.Session()
+    session.auth = HTTPBasicAuth(GEOSERVER_USERNAME, GEOSERVER_PASSWORD)
+    session.mount(
+        "http://", HTTPAdapter(pool_connections=1, pool_maxsize=WFS_FALLBACK_WORKERS)
+    )
+    session.mount(
+        "https://", HTTPAdapter(pool_connections=1, pool_maxsize=WFS_FALLBACK_WORKERS)
+    )
 
     try:
-        # Fetch layers in the workspace
-        layers_response = requests.get(
-            layers_url,
-            auth=HTTPBasicAuth(username, password),
-            headers={"Accept": "application/json"},
-        )
-        layers_response.raise_for_status()
-        layers_data = layers_response.json()
-
-        # Intersecting layers
-        intersecting_layers = []
-
-        # Check each layer for intersection
-        for layer in layers_data["layers"]["layer"]:
-            layer_name = layer["name"]
-
-            # Construct WFS GetFeature request
-            wfs_url = (
-                f"{geoserver_url}/wfs?"
-                f"service=WFS&version=1.1.0&request=GetFeature"
-                f"&typeName={workspace}:{layer_name}"
-                f"&CQL_FILTER=INTERSECTS(geometry,POINT({lon} {lat}))"
+        # Fetch layers in the workspace; indexed layers that were removed from
+        # GeoServer are left out
+        layer_names = workspace_layer_names(session, workspace)
+
+        indexed = load_workspace_index(workspace)
+        intersecting_layers = set(
+            layers_containing_point(
+                {name: indexed[name] for name in layer_names if name in indexed},
+                lon,
+                lat,
             )
+        )
 
-            # Send WFS request
-            wfs_response = requests.get(wfs_url, auth=HTTPBasicAuth(username, password))
-
-            # Check if layer intersects with point
-            if len(wfs_response.content) > 50:  # Basic check for non-empty response
-                intersecting_layers.append(layer_name)
+        # Layers not indexed yet (see the index_workspace_layers command).
+        # Those whose bounding box misses the point cannot contain it; a
+        # layer without a reported box is still queried.
+        unindexed = [name for name in layer_names if name not in indexed]
+        candidates = []
+        if unindexed:
+            boxes = layer_bounding_boxes(session, workspace)
+            candidates = [
+                name for name in unindexed if _box_contains(boxes.get(name), lon, lat)
+            ]
+        if candidates:
+            with ThreadPoolExecutor(max_workers=WFS_FALLBACK_WORKERS) as executor:
+                results = executor.map(
+                    lambda name: _layer_intersects_point(
+                        session, workspace, name, lon, lat
+                    ),
+                    candidates,
+                )
+                intersecting_layers.update(
+                    name for name, hit in zip(candidates, results) if hit
+                )
 
         return JsonResponse(
             {
                 "coordinates": {"latitude": lat, "longitude": lon},
                 "workspace": workspace,
-                "intersecting_layers": intersecting_layers,
+                "intersecting_layers": [
+                    name for name in layer_names if name in intersecting_layers
+                ],
             }
         )
 
@@ -97,6 +146,8 @@ def search_layer_by_coordinates(request):
         return JsonResponse(
             {"error": "GeoServer connection error", "details": str(e)}, status=500
         )
+    finally:
+        session.close()
 
 
 # URL Configuration
@@ -2,6 +2,9 @@ from rest_framework.decorators import api_view, schema
 from rest_framework.response import Response
 from rest_framework import status
 from .utils import *
+from .builds import build_status
+from .manifest import load_manifest
+from .models import StatsExcelBuild
 from .mws_indicators import generate_mws_data_for_kyl_filters
 from .village_indicators import get_generate_filter_data_village
 from utilities.auth_utils import auth_free
@@ -38,8 +41,42 @@ def generate_stats_excel_file_data(request):
         state = valid_gee_text(request.query_params.get("state", "").lower())
         district = valid_gee_text(request.query_params.get("district", "").lower())
         block = valid_gee_text(request.query_params.get("block", "").lower())
+        force = request.query_params.get("force", "").lower() in ("1", "true")
 
-        return generate_stats_excel_file(state, district, block)
+        return queue_stats_excel_build(state, district, block, force=force)
+
+    except Exception as e:
+        return Response(
+            {"status": "error", "message": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@auth_free
+@schema(None)
+def stats_excel_build_status(request):
+    print("Inside stats_excel_build_status API.")
+    try:
+        state = valid_gee_text(request.query_params.get("state", "").lower())
+        district = valid_gee_text(request.query_params.get("district", "").lower())
+        block = valid_gee_text(request.query_params.get("block", "").lower())
+
+        build = StatsExcelBuild.objects.filter(
+            state=state, district=district, block=block
+        ).first()
+        if build is None:
+            return Response(
+                {"status": "error", "message": "No stats excel build found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(
+            {
+                **build_status(build),
+                "manifest": load_manifest(stats_excel_path(state, district, block)),
+            },
+            status=status.HTTP_200_OK,
+        )
 
     except Exception as e:
         return Response(
@@ -59,8 +96,7 @@ def add_sheets_in_stats_excel(request):
         block = valid_gee_text(request.query_params.get("block", "").lower())
         workspace = request.query_params.get("workspace", "")
 
-        response_data = add_sheets_to_excel(state, district, block, workspace)
-        return Response({"status": "success"}, status=status.HTTP_200_OK)
+        return add_sheets_to_excel(state, district, block, workspace)
 
     except Exception as e:
         return Response(
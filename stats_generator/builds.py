@@ -0,0 +1,156 @@
+import threading
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import StatsExcelBuild
+from .utils import build_stats_excel_file
+
+# A build still queued or running after this long is assumed lost (e.g. the
+# worker died) and no longer blocks a new one.
+BUILD_TIMEOUT = timedelta(hours=2)
+# A running build refreshes its updated_at this often, so a long build is not
+# mistaken for a lost one.
+HEARTBEAT_INTERVAL = timedelta(minutes=10)
+
+
+def is_active(build):
+    return (
+        build.status in StatsExcelBuild.ACTIVE_STATUSES
+        and build.updated_at >= timezone.now() - BUILD_TIMEOUT
+    )
+
+
+def _dispatch(build_id):
+    from .tasks import build_stats_excel_file_task
+
+    try:
+        result = build_stats_excel_file_task.apply_async(args=[build_id], queue="nrm")
+    except Exception as e:
+        print(f"Failed to queue stats excel build {build_id}: {e}")
+        StatsExcelBuild.objects.filter(id=build_id).update(
+            status=StatsExcelBuild.STATUS_FAILED,
+            message=f"Failed to queue build: {e}",
+            finished_at=timezone.now(),
+        )
+        return
+    StatsExcelBuild.objects.filter(id=build_id).update(task_id=result.id)
+
+
+def request_build(state, district, block, force=False, workspaces=None):
+    """
+    Queue a workbook rebuild for the tehsil unless one is already queued or
+    running. ``force`` rebuilds every sheet and ``workspaces`` names sheets
+    to rebuild even if their layers are unchanged; a request joining a build
+    that has not started yet adds both to it. Returns ``(build, queued)``.
+    """
+    workspaces = list(workspaces or [])
+    with transaction.atomic():
+        build, created = StatsExcelBuild.objects.select_for_update().get_or_create(
+            state=state, district=district, block=block
+        )
+        if not created and is_active(build):
+            if build.status == StatsExcelBuild.STATUS_QUEUED:
+                added = [w for w in workspaces if w not in build.workspaces]
+                if (force and not build.force_full) or added:
+                    build.force_full = build.force_full or force
+                    build.workspaces = build.workspaces + added
+                    build.save(update_fields=["force_full", "workspaces", "updated_at"])
+            return build, False
+
+        build.status = StatsExcelBuild.STATUS_QUEUED
+        build.force_full = force
+        build.workspaces = workspaces
+        build.task_id = None
+        build.message = None
+        build.requested_at = timezone.now()
+        build.started_at = None
+        build.finished_at = None
+        build.save()
+        transaction.on_commit(lambda: _dispatch(build.id))
+    return build, True
+
+
+def _record_outcome(build_id, started_at, status, message=None):
+    """
+    Record the outcome of the run claimed at ``started_at``. A run that
+    outlived ``BUILD_TIMEOUT`` may have been requeued since; its outcome is
+    then dropped so the newer build is left to run.
+    """
+    recorded = StatsExcelBuild.objects.filter(
+        id=build_id, status=StatsExcelBuild.STATUS_RUNNING, started_at=started_at
+    ).update(status=status, message=message, finished_at=timezone.now())
+    if not recorded:
+        print(f"Stats excel build {build_id} was requeued while running, skipping")
+
+
+def _keep_alive(build_id, started_at, stop):
+    """Refresh the claimed run's updated_at until ``stop`` is set."""
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL.total_seconds()):
+            StatsExcelBuild.objects.filter(
+                id=build_id,
+                status=StatsExcelBuild.STATUS_RUNNING,
+                started_at=started_at,
+            ).update(updated_at=timezone.now())
+    finally:
+        connection.close()
+
+
+def run_build(build_id):
+    """Claim a queued build and generate the workbook. Used by the Celery task."""
+    started_at = timezone.now()
+    # update() skips auto_now, so set updated_at here: BUILD_TIMEOUT counts
+    # from the start of the run, not from when it was queued.
+    claimed = StatsExcelBuild.objects.filter(
+        id=build_id, status=StatsExcelBuild.STATUS_QUEUED
+    ).update(
+        status=StatsExcelBuild.STATUS_RUNNING,
+        started_at=started_at,
+        updated_at=started_at,
+    )
+    if not claimed:
+        print(f"Stats excel build {build_id} is not queued, skipping")
+        return None
+
+    build = StatsExcelBuild.objects.get(id=build_id)
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_keep_alive, args=(build_id, started_at, stop), daemon=True
+    )
+    heartbeat.start()
+    try:
+        build_stats_excel_file(
+            build.state,
+            build.district,
+            build.block,
+            force=build.force_full,
+            workspaces=build.workspaces,
+        )
+    except Exception as e:
+        print(f"Stats excel build failed for {build}: {e}")
+        _record_outcome(build_id, started_at, StatsExcelBuild.STATUS_FAILED, str(e))
+        return StatsExcelBuild.STATUS_FAILED
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    _record_outcome(build_id, started_at, StatsExcelBuild.STATUS_SUCCESS)
+    return StatsExcelBuild.STATUS_SUCCESS
+
+
+def build_status(build):
+    return {
+        "state": build.state,
+        "district": build.district,
+        "block": build.block,
+        "status": build.status,
+        "force_full": build.force_full,
+        "workspaces": build.workspaces,
+        "task_id": build.task_id,
+        "message": build.message,
+        "requested_at": build.requested_at,
+        "started_at": build.started_at,
+        "finished_at": build.finished_at,
+    }
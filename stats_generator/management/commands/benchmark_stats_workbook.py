@@ -0,0 +1,109 @@
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from stats_generator.workbook import StatsWorkbookWriter
+
+
+def synthetic_sheets(num_sheets, num_rows, seed=0):
+    """
+    Stats-like ``(sheet_name, frame)`` pairs, built one at a time as a sheet
+    builder would: a UID column, yearly float columns with gaps, counts.
+    """
+    rng = np.random.default_rng(seed)
+    uids = [f"12_{i}" for i in range(num_rows)]
+    for s in range(num_sheets):
+        data = {"UID": uids, "area_in_ha": rng.random(num_rows) * 1000}
+        for year in range(2017, 2024):
+            values = rng.random(num_rows) * 100
+            values[rng.random(num_rows) < 0.05] = np.nan
+            data[f"value_{year}"] = values.round(2)
+        data["count"] = rng.integers(0, 50, num_rows)
+        data["category"] = rng.choice(["low", "medium", "high"], num_rows)
+        yield f"sheet_{s}", pd.DataFrame(data)
+
+
+def write_with_append_mode(path, sheets):
+    """The old pattern: reopen the workbook in append mode for every sheet."""
+    for sheet_name, df in sheets:
+        mode = "a" if os.path.exists(path) else "w"
+        with pd.ExcelWriter(
+            path,
+            engine="openpyxl",
+            mode=mode,
+            if_sheet_exists="replace" if mode == "a" else None,
+        ) as writer:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def write_streaming(path, sheets):
+    with StatsWorkbookWriter(path) as writer:
+        for sheet_name, df in sheets:
+            writer.write_sheet(df, sheet_name)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare wall-clock time and peak memory of writing a synthetic "
+        "stats workbook with per-sheet append-mode ExcelWriter vs the "
+        "streaming StatsWorkbookWriter"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sheets", type=int, default=20)
+        parser.add_argument("--rows", type=int, default=50000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--skip-append",
+            action="store_true",
+            help="Only run the streaming writer (the append-mode run is slow)",
+        )
+
+    @staticmethod
+    def _run(write, sheet_args, path, conn):
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        # Frames are built in here, so their memory counts towards the peak
+        write(path, synthetic_sheets(*sheet_args))
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        conn.send((elapsed, (peak - baseline) * 1024))
+        conn.close()
+
+    def measure(self, write, sheet_args, tmp, name):
+        """
+        Build the sheets and run ``write`` in a forked process so its peak
+        RSS is its own.
+        """
+        path = os.path.join(tmp, f"{name}.xlsx")
+        context = multiprocessing.get_context("fork")
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(
+            target=self._run, args=(write, sheet_args, path, child_conn)
+        )
+        process.start()
+        elapsed, peak = parent_conn.recv()
+        process.join()
+        self.stdout.write(
+            f"{name}: {elapsed:.1f}s, peak RSS growth {peak / 2**20:.0f} MB, "
+            f"file {os.path.getsize(path) / 2**20:.1f} MB"
+        )
+
+    def handle(self, *args, **options):
+        sheet_args = (options["sheets"], options["rows"], options["seed"])
+        _, sample = next(synthetic_sheets(1, 1))
+        self.stdout.write(
+            f"{options['sheets']} sheets x {options['rows']} rows x "
+            f"{sample.shape[1]} columns"
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            if not options["skip_append"]:
+                self.measure(write_with_append_mode, sheet_args, tmp, "append_mode")
+            self.measure(write_streaming, sheet_args, tmp, "streaming")
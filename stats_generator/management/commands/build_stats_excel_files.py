@@ -0,0 +1,131 @@
+import os
+import time
+from collections import deque
+
+from django.core.management.base import BaseCommand
+
+from geoadmin.models import TehsilSOI
+from nrm_app.settings import EXCEL_PATH
+from stats_generator.builds import is_active, request_build
+from stats_generator.models import StatsExcelBuild
+from utilities.gee_utils import valid_gee_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the stats workbooks of all activated tehsils as Celery jobs, "
+        "keeping at most --concurrency builds in flight"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--state", help="Only tehsils of this state")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Maximum number of builds queued or running at once",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Skip tehsils that already have a workbook",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild every sheet, not only those whose source layers changed",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=10,
+            help="Seconds between build status checks",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the tehsils without queueing builds",
+        )
+
+    def get_locations(self, options):
+        tehsils = TehsilSOI.objects.filter(
+            active_status=True,
+            district__active_status=True,
+            district__state__active_status=True,
+        )
+        if options["state"]:
+            tehsils = tehsils.filter(
+                district__state__state_name__iexact=options["state"]
+            )
+
+        locations = []
+        for state, district, block in tehsils.order_by(
+            "district__state__state_name", "district__district_name", "tehsil_name"
+        ).values_list(
+            "district__state__state_name", "district__district_name", "tehsil_name"
+        ):
+            location = tuple(
+                valid_gee_text(x.lower()) for x in (state, district, block)
+            )
+            if options["missing_only"] and os.path.exists(
+                os.path.join(
+                    EXCEL_PATH,
+                    "data/stats_excel_files",
+                    location[0].upper(),
+                    location[1].upper(),
+                    f"{location[1]}_{location[2]}.xlsx",
+                )
+            ):
+                continue
+            locations.append(location)
+        return locations
+
+    def handle(self, *args, **options):
+        locations = self.get_locations(options)
+        self.stdout.write(f"{len(locations)} tehsils to build")
+        if options["dry_run"]:
+            for location in locations:
+                self.stdout.write("/".join(location))
+            return
+
+        concurrency = max(options["concurrency"], 1)
+        pending = deque(locations)
+        in_flight = set()
+        build_ids = []
+        started = time.monotonic()
+
+        while pending or in_flight:
+            if in_flight:
+                in_flight = {
+                    build.id
+                    for build in StatsExcelBuild.objects.filter(id__in=in_flight)
+                    if is_active(build)
+                }
+
+            while pending and len(in_flight) < concurrency:
+                build, queued = request_build(
+                    *pending.popleft(), force=options["force"]
+                )
+                if not queued:
+                    self.stdout.write(f"Joined running build: {build}")
+                in_flight.add(build.id)
+                build_ids.append(build.id)
+
+            if in_flight:
+                self.stdout.write(
+                    f"{len(build_ids) - len(in_flight)}/{len(locations)} done, "
+                    f"{len(in_flight)} in flight"
+                )
+                time.sleep(options["poll_interval"])
+
+        builds = StatsExcelBuild.objects.filter(id__in=build_ids)
+        failed = builds.filter(status=StatsExcelBuild.STATUS_FAILED)
+        for build in failed:
+            self.stdout.write(self.style.ERROR(f"{build}: {build.message}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built: {builds.filter(status=StatsExcelBuild.STATUS_SUCCESS).count()}, "
+                f"Failed: {failed.count()}, "
+                f"Elapsed: {time.monotonic() - started:.0f}s"
+            )
+        )
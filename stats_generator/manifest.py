@@ -0,0 +1,180 @@
+"""
+Per-layer manifest of a tehsil's stats workbook.
+
+The manifest is stored as ``{district}_{block}_manifest.json`` next to the
+xlsx. For every configured ``LayerInfo`` layer it records the sheets that the
+layer produced and the ``computing.Layer`` rows (id, version, last update)
+they were built from. A refresh compares those with the current Layer rows
+and only re-fetches the layers that changed.
+"""
+
+import json
+import os
+from collections import defaultdict
+
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from computing.models import Layer
+
+MANIFEST_VERSION = 1
+
+# Layers read by a workspace's sheet builders on top of the layer itself.
+SOURCE_DEPENDENCIES = {
+    "swb": [("mws", "mws_{district}_{block}")],
+    "nrega_assets": [
+        ("mws_layers", "deltaG_well_depth_{district}_{block}"),
+        ("panchayat_boundaries", "{district}_{block}"),
+    ],
+    "mws_layers": [("panchayat_boundaries", "{district}_{block}")],
+}
+
+
+def manifest_path(xlsx_file):
+    return xlsx_file[: -len(".xlsx")] + "_manifest.json"
+
+
+def layer_name_for(layer, district, block):
+    if "{district}" in layer["layer_name"] and "{block}" in layer["layer_name"]:
+        return layer["layer_name"].format(district=district, block=block)
+    return layer["layer_name"]
+
+
+def layer_key(workspace, layer_name):
+    return f"{workspace}:{layer_name}"
+
+
+def new_manifest(state, district, block):
+    return {
+        "version": MANIFEST_VERSION,
+        "state": state,
+        "district": district,
+        "block": block,
+        "updated_at": None,
+        "layers": {},
+    }
+
+
+def load_manifest(xlsx_file):
+    """The stored manifest, or ``None`` if it is missing or unreadable."""
+    path = manifest_path(xlsx_file)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable stats manifest {path}: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(xlsx_file, manifest):
+    path = manifest_path(xlsx_file)
+    manifest["updated_at"] = timezone.now().isoformat()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _source_refs(layer, district, block):
+    refs = [(layer["workspace"], layer_name_for(layer, district, block))]
+    for workspace, template in SOURCE_DEPENDENCIES.get(layer["workspace"], []):
+        refs.append((workspace, template.format(district=district, block=block)))
+    return refs
+
+
+def current_sources(layers, district, block):
+    """
+    ``{layer_key: {source_key: fingerprint}}`` for the configured layers,
+    from one query on ``computing.Layer``. The first source of each entry is
+    the layer itself; a ``None`` fingerprint means no Layer row was found.
+    """
+    refs_by_key = {
+        layer_key(layer["workspace"], layer_name_for(layer, district, block)): (
+            _source_refs(layer, district, block)
+        )
+        for layer in layers
+    }
+    names = {name.lower() for refs in refs_by_key.values() for _, name in refs}
+
+    rows_by_name = defaultdict(list)
+    for row in (
+        Layer.objects.annotate(name_lower=Lower("layer_name"))
+        .filter(name_lower__in=names)
+        .values(
+            "id",
+            "name_lower",
+            "layer_version",
+            "algorithm_version",
+            "updated_at",
+            "dataset__workspace",
+        )
+    ):
+        rows_by_name[row["name_lower"]].append(row)
+
+    def fingerprint(workspace, name):
+        rows = rows_by_name.get(name.lower(), [])
+        # Names such as "{district}_{block}" are shared by several datasets.
+        rows = [r for r in rows if r["dataset__workspace"] == workspace] or rows
+        if not rows:
+            return None
+        latest = max(rows, key=lambda r: r["updated_at"])
+        return {
+            "layer_id": latest["id"],
+            "layer_version": latest["layer_version"],
+            "algorithm_version": latest["algorithm_version"],
+            "updated_at": latest["updated_at"].isoformat(),
+        }
+
+    return {
+        key: {
+            layer_key(workspace, name): fingerprint(workspace, name)
+            for workspace, name in refs
+        }
+        for key, refs in refs_by_key.items()
+    }
+
+
+def stale_layers(layers, manifest, sources, district, block):
+    """
+    Configured layers whose sheets must be regenerated: new, previously
+    failed, untracked (no Layer row to compare against) or changed upstream.
+    """
+    stale = []
+    for layer in layers:
+        name = layer_name_for(layer, district, block)
+        key = layer_key(layer["workspace"], name)
+        entry = manifest["layers"].get(key)
+        layer_sources = sources.get(key, {})
+        if (
+            entry is None
+            or entry.get("status") != "success"
+            or layer_sources.get(key) is None
+            or entry.get("sources") != layer_sources
+        ):
+            stale.append(layer)
+    return stale
+
+
+def record_results(manifest, layers, results, sources, district, block):
+    """Update the manifest entries of the layers processed in this refresh."""
+    results = {layer_key(r["workspace"], r["layer"]): r for r in results}
+    now = timezone.now().isoformat()
+    for layer in layers:
+        name = layer_name_for(layer, district, block)
+        key = layer_key(layer["workspace"], name)
+        result = results.get(key, {})
+        succeeded = result.get("status") == "success"
+        manifest["layers"][key] = {
+            "workspace": layer["workspace"],
+            "layer_name": name,
+            "status": "success" if succeeded else "failed",
+            "sheets": result.get("sheets", []),
+            "sources": sources.get(key) if succeeded else None,
+            "generated_at": now,
+        }
+    return manifest
@@ -25,3 +25,47 @@ class LayerInfo(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+
+
+class StatsExcelBuild(models.Model):
+    """
+    Latest stats workbook build of a tehsil. There is one row per tehsil and
+    it doubles as the build lock: while a build is queued or running, new
+    requests join it instead of starting another.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCESS = "success"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCESS, "Success"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    state = models.CharField(max_length=255)
+    district = models.CharField(max_length=255)
+    block = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    task_id = models.CharField(max_length=255, blank=True, null=True)
+    # Rebuild every sheet instead of only those whose source layers changed.
+    force_full = models.BooleanField(default=False)
+    # Workspaces whose sheets are rebuilt even if their layers are unchanged.
+    workspaces = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True, null=True)
+    requested_at = models.DateTimeField(blank=True, null=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.state}/{self.district}/{self.block}: {self.status}"
+
+    class Meta:
+        unique_together = ("state", "district", "block")
+        indexes = [models.Index(fields=["status"])]
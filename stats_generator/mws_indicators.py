@@ -49,7 +49,7 @@ def create_geojson_for_all_mws(existing_geojson_path, df, new_geojson_path):
 
 
 def generate_mws_data_for_kyl_filters(
-    state, district, block, file_type, regenerate=None
+    state, district, block, file_type, regenerate=None, stats_sheets=None
 ):
     state_folder = state.replace(" ", "_").upper()
     district_folder = district.replace(" ", "_").upper()
@@ -92,7 +92,10 @@ def generate_mws_data_for_kyl_filters(
             }
 
             try:
-                with pd.ExcelFile(file_xl_path + ".xlsx") as xl:
+                if stats_sheets is None:
+                    stats_sheets = pd.ExcelFile(file_xl_path + ".xlsx")
+
+                with stats_sheets as xl:
                     available_sheets = xl.sheet_names  # Get list of available sheets
 
                     # Try to parse each sheet if it exists
@@ -0,0 +1,8 @@
+from nrm_app.celery import app
+
+from .builds import run_build
+
+
+@app.task(bind=True, name="stats_generator.build_stats_excel_file")
+def build_stats_excel_file_task(self, build_id):
+    return run_build(build_id)
@@ -1,3 +1,486 @@
-from django.test import TestCase
+import gc
+import json
+import os
+import tempfile
+import weakref
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .builds import BUILD_TIMEOUT, request_build, run_build
+from .manifest import new_manifest, record_results, stale_layers
+from .village_indicators import (
+    extract_facilities,
+    extract_nrega,
+    extract_soc_eco,
+    village_indicator_rows,
+)
+from .models import StatsExcelBuild
+from .workbook import StatsWorkbookWriter
+
+
+@mock.patch(
+    "stats_generator.tasks.build_stats_excel_file_task.apply_async",
+    **{"return_value.id": "task-1"},
+)
+class StatsExcelBuildTest(TestCase):
+    def request(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return request_build("bihar", "gaya", "atri")
+
+    def test_concurrent_requests_share_one_build(self, apply_async):
+        build, queued = self.request()
+        self.assertTrue(queued)
+        apply_async.assert_called_once_with(args=[build.id], queue="nrm")
+
+        again, queued = self.request()
+        self.assertFalse(queued)
+        self.assertEqual(again.id, build.id)
+        self.assertEqual(apply_async.call_count, 1)
+        self.assertEqual(StatsExcelBuild.objects.get().task_id, "task-1")
+
+    def test_finished_or_stale_builds_are_requeued(self, apply_async):
+        build, _ = self.request()
+        StatsExcelBuild.objects.filter(id=build.id).update(
+            status=StatsExcelBuild.STATUS_SUCCESS
+        )
+        _, queued = self.request()
+        self.assertTrue(queued)
+
+        StatsExcelBuild.objects.filter(id=build.id).update(
+            status=StatsExcelBuild.STATUS_RUNNING,
+            updated_at=timezone.now() - BUILD_TIMEOUT - timedelta(minutes=1),
+        )
+        _, queued = self.request()
+        self.assertTrue(queued)
+        self.assertEqual(apply_async.call_count, 3)
+
+    def test_forced_request_upgrades_a_queued_build(self, apply_async):
+        build, _ = self.request()
+        self.assertFalse(build.force_full)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            _, queued = request_build("bihar", "gaya", "atri", force=True)
+        self.assertFalse(queued)
+        self.assertTrue(StatsExcelBuild.objects.get(id=build.id).force_full)
+
+    def test_requested_sheets_join_a_queued_build(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            build, _ = request_build("bihar", "gaya", "atri", workspaces=["terrain"])
+            _, queued = request_build(
+                "bihar", "gaya", "atri", workspaces=["terrain", "swb"]
+            )
+        self.assertFalse(queued)
+        self.assertEqual(apply_async.call_count, 1)
+        self.assertEqual(
+            StatsExcelBuild.objects.get(id=build.id).workspaces, ["terrain", "swb"]
+        )
+
+        with mock.patch("stats_generator.builds.build_stats_excel_file") as build_file:
+            run_build(build.id)
+        build_file.assert_called_once_with(
+            "bihar", "gaya", "atri", force=False, workspaces=["terrain", "swb"]
+        )
+
+    def test_timeout_counts_from_the_start_of_the_run(self, apply_async):
+        build, _ = self.request()
+        # Sat in the queue for almost the whole timeout before a worker took it.
+        StatsExcelBuild.objects.filter(id=build.id).update(
+            updated_at=timezone.now() - BUILD_TIMEOUT + timedelta(minutes=1)
+        )
+
+        def still_running(*args, **kwargs):
+            StatsExcelBuild.objects.filter(id=build.id).update(
+                updated_at=F("updated_at") - timedelta(minutes=2)
+            )
+            self.assertFalse(self.request()[1])
+
+        with mock.patch(
+            "stats_generator.builds.build_stats_excel_file",
+            side_effect=still_running,
+        ):
+            self.assertEqual(run_build(build.id), StatsExcelBuild.STATUS_SUCCESS)
+        self.assertEqual(apply_async.call_count, 1)
+
+    def test_run_build_records_outcome(self, apply_async):
+        build, _ = self.request()
+
+        with mock.patch("stats_generator.builds.build_stats_excel_file") as build_file:
+            self.assertEqual(run_build(build.id), StatsExcelBuild.STATUS_SUCCESS)
+            build_file.assert_called_once_with(
+                "bihar", "gaya", "atri", force=False, workspaces=[]
+            )
+            # Already claimed, so a duplicate delivery does nothing.
+            self.assertIsNone(run_build(build.id))
+            self.assertEqual(build_file.call_count, 1)
+
+        build, _ = self.request()
+        with mock.patch(
+            "stats_generator.builds.build_stats_excel_file",
+            side_effect=ValueError("GeoServer down"),
+        ):
+            self.assertEqual(run_build(build.id), StatsExcelBuild.STATUS_FAILED)
+        build.refresh_from_db()
+        self.assertEqual(build.message, "GeoServer down")
+        self.assertIsNotNone(build.finished_at)
+
+    def test_requeued_build_is_not_overwritten_by_the_stale_run(self, apply_async):
+        build, _ = self.request()
+
+        def outlive_timeout(*args, **kwargs):
+            StatsExcelBuild.objects.filter(id=build.id).update(
+                updated_at=timezone.now() - BUILD_TIMEOUT - timedelta(minutes=1)
+            )
+            self.assertTrue(self.request()[1])
+
+        with mock.patch(
+            "stats_generator.builds.build_stats_excel_file",
+            side_effect=outlive_timeout,
+        ):
+            run_build(build.id)
+        build.refresh_from_db()
+        self.assertEqual(build.status, StatsExcelBuild.STATUS_QUEUED)
+        self.assertIsNone(build.finished_at)
+
+        with mock.patch("stats_generator.builds.build_stats_excel_file"):
+            self.assertEqual(run_build(build.id), StatsExcelBuild.STATUS_SUCCESS)
+
+
+class WrittenFramesTest(SimpleTestCase):
+    def test_frames_match_reading_the_saved_workbook(self):
+        rng = np.random.default_rng(7)
+        n = 500
+        frames = {
+            "hydrological_annual": pd.DataFrame(
+                {
+                    "UID": [f"12_{i}" for i in range(n)],
+                    "area_in_ha": rng.random(n) * 100,
+                    "count": rng.integers(0, 5, n),
+                    "whole": np.full(n, 2.0),
+                    "gaps": np.where(rng.random(n) < 0.2, np.nan, rng.random(n)),
+                    "inf": np.where(rng.random(n) < 0.1, np.inf, 1.5),
+                    "flag": rng.random(n) < 0.5,
+                    "name": np.where(rng.random(n) < 0.3, None, "atri"),
+                    "big": rng.integers(10**16, 10**17, n),
+                    "created": pd.date_range("2020-01-01 06:30:00.123456", periods=n),
+                }
+            ),
+            "mining": pd.DataFrame(columns=["UID ", " count"]),
+            "empty": pd.DataFrame(),
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            xlsx_file = os.path.join(tmp, "gaya_atri.xlsx")
+            with StatsWorkbookWriter(xlsx_file, keep_frames=True) as writer:
+                for sheet_name, df in frames.items():
+                    writer.write_sheet(df, sheet_name)
+
+            sheets = writer.frames
+            expected = pd.read_excel(xlsx_file, sheet_name=None)
+
+        self.assertEqual(sheets.sheet_names, list(expected))
+        for sheet_name, df in expected.items():
+            with sheets as xl:
+                pd.testing.assert_frame_equal(
+                    xl.parse(sheet_name), df, check_exact=True
+                )
+
+
+class StatsManifestTest(SimpleTestCase):
+    layers = [
+        {"workspace": "terrain", "layer_name": "{district}_{block}_cluster"},
+        {
+            "workspace": "mws_layers",
+            "layer_name": "deltaG_well_depth_{district}_{block}",
+        },
+        {"workspace": "facilities_proximity", "layer_name": "facilities_proximity"},
+    ]
+
+    @staticmethod
+    def source(layer_id, updated_at="2025-01-01T00:00:00+00:00"):
+        return {
+            "layer_id": layer_id,
+            "layer_version": "1.0",
+            "algorithm_version": "1.0",
+            "updated_at": updated_at,
+        }
+
+    def sources(self, **overrides):
+        sources = {
+            "terrain:gaya_atri_cluster": {
+                "terrain:gaya_atri_cluster": self.source(1),
+            },
+            "mws_layers:deltaG_well_depth_gaya_atri": {
+                "mws_layers:deltaG_well_depth_gaya_atri": self.source(2),
+                "panchayat_boundaries:gaya_atri": self.source(3),
+            },
+            "facilities_proximity:facilities_proximity": {
+                "facilities_proximity:facilities_proximity": None,
+            },
+        }
+        sources.update(overrides)
+        return sources
+
+    def built_manifest(self, sources):
+        results = [
+            {
+                "layer": "gaya_atri_cluster",
+                "workspace": "terrain",
+                "status": "success",
+                "sheets": ["terrain"],
+            },
+            {
+                "layer": "deltaG_well_depth_gaya_atri",
+                "workspace": "mws_layers",
+                "status": "success",
+                "sheets": ["hydrological_annual", "mws_intersect_villages"],
+            },
+            {
+                "layer": "facilities_proximity",
+                "workspace": "facilities_proximity",
+                "status": "success",
+                "sheets": ["facilities_proximity"],
+            },
+        ]
+        manifest = new_manifest("bihar", "gaya", "atri")
+        return record_results(manifest, self.layers, results, sources, "gaya", "atri")
+
+    def stale_names(self, manifest, sources):
+        return [
+            layer["workspace"]
+            for layer in stale_layers(self.layers, manifest, sources, "gaya", "atri")
+        ]
+
+    def test_only_changed_or_untracked_layers_are_stale(self):
+        manifest = self.built_manifest(self.sources())
+        self.assertEqual(
+            manifest["layers"]["mws_layers:deltaG_well_depth_gaya_atri"]["sheets"],
+            ["hydrological_annual", "mws_intersect_villages"],
+        )
+        # Layers without a Layer row can't be compared, so they always refresh.
+        self.assertEqual(
+            self.stale_names(manifest, self.sources()), ["facilities_proximity"]
+        )
+
+        changed = self.sources(
+            **{
+                "mws_layers:deltaG_well_depth_gaya_atri": {
+                    "mws_layers:deltaG_well_depth_gaya_atri": self.source(2),
+                    "panchayat_boundaries:gaya_atri": self.source(
+                        3, updated_at="2025-02-01T00:00:00+00:00"
+                    ),
+                }
+            }
+        )
+        self.assertEqual(
+            self.stale_names(manifest, changed),
+            ["mws_layers", "facilities_proximity"],
+        )
+
+    def test_failed_and_new_layers_are_stale(self):
+        sources = self.sources()
+        manifest = new_manifest("bihar", "gaya", "atri")
+        record_results(
+            manifest,
+            self.layers[:1],
+            [
+                {
+                    "layer": "gaya_atri_cluster",
+                    "workspace": "terrain",
+                    "status": "failed",
+                }
+            ],
+            sources,
+            "gaya",
+            "atri",
+        )
+        entry = manifest["layers"]["terrain:gaya_atri_cluster"]
+        self.assertEqual(entry["status"], "failed")
+        self.assertIsNone(entry["sources"])
+        self.assertEqual(
+            self.stale_names(manifest, sources),
+            ["terrain", "mws_layers", "facilities_proximity"],
+        )
+
+
+class StatsWorkbookWriterTest(SimpleTestCase):
+    def frames(self, seed=3):
+        rng = np.random.default_rng(seed)
+        n = 300
+        return {
+            "terrain": pd.DataFrame(
+                {
+                    "UID": [f"12_{i}" for i in range(n)],
+                    "area_in_ha": rng.random(n) * 100,
+                    "count": rng.integers(0, 5, n),
+                    "gaps": np.where(rng.random(n) < 0.2, np.nan, rng.random(n)),
+                    "inf": np.where(rng.random(n) < 0.1, -np.inf, 1.0),
+                    "flag": rng.random(n) < 0.5,
+                    "name": np.where(rng.random(n) < 0.3, None, "atri"),
+                    "created": pd.date_range("2021-06-01 10:15:00", periods=n),
+                }
+            ),
+            "mining": pd.DataFrame(columns=["UID", "count"]),
+            "empty": pd.DataFrame(),
+            "mws": pd.DataFrame({"UID": ["12_1", "12_2"], "value": [1.5, None]}),
+        }
+
+    def write_with_pandas(self, path, frames):
+        with pd.ExcelWriter(path, engine="openpyxl", mode="w") as writer:
+            for sheet_name, df in frames.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    def assertSheetsEqual(self, actual, expected):
+        self.assertEqual(list(actual), list(expected))
+        for sheet_name, df in expected.items():
+            pd.testing.assert_frame_equal(actual[sheet_name], df, check_exact=True)
+
+    def test_reads_back_like_pandas_excel_writer(self):
+        frames = self.frames()
+        with tempfile.TemporaryDirectory() as tmp:
+            expected_path = os.path.join(tmp, "expected.xlsx")
+            path = os.path.join(tmp, "gaya_atri.xlsx")
+            self.write_with_pandas(expected_path, frames)
+
+            with StatsWorkbookWriter(path, keep_frames=True) as writer:
+                for sheet_name, df in frames.items():
+                    writer.write_sheet(df, sheet_name)
+
+            expected = pd.read_excel(expected_path, sheet_name=None)
+            self.assertSheetsEqual(pd.read_excel(path, sheet_name=None), expected)
+            self.assertSheetsEqual(writer.frames, expected)
+
+    def test_rewriting_sheets_keeps_the_others_in_place(self):
+        frames = self.frames()
+        updated = {
+            "mws": pd.DataFrame({"UID": ["12_9"], "value": [7.25]}),
+            "new_sheet": pd.DataFrame({"a": [1, 2]}),
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            expected_path = os.path.join(tmp, "expected.xlsx")
+            path = os.path.join(tmp, "gaya_atri.xlsx")
+            self.write_with_pandas(expected_path, {**frames, **updated})
+
+            with StatsWorkbookWriter(path) as writer:
+                for sheet_name, df in frames.items():
+                    writer.write_sheet(df, sheet_name)
+            with StatsWorkbookWriter(path, keep_frames=True) as writer:
+                for sheet_name, df in updated.items():
+                    writer.write_sheet(df, sheet_name)
+
+            expected = pd.read_excel(expected_path, sheet_name=None)
+            self.assertSheetsEqual(pd.read_excel(path, sheet_name=None), expected)
+            self.assertSheetsEqual(writer.frames, expected)
+            self.assertEqual(writer.written, ["mws", "new_sheet"])
+
+    def test_written_frames_are_not_kept_until_close(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with StatsWorkbookWriter(os.path.join(tmp, "gaya_atri.xlsx")) as writer:
+                df = pd.DataFrame({"a": [1, 2]})
+                ref = weakref.ref(df)
+                writer.write_sheet(df, "mws")
+                del df
+                gc.collect()
+                self.assertIsNone(ref())
+            self.assertEqual(os.listdir(tmp), ["gaya_atri.xlsx"])
+
+    def test_failed_build_leaves_existing_workbook_untouched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gaya_atri.xlsx")
+            with StatsWorkbookWriter(path) as writer:
+                writer.write_sheet(pd.DataFrame({"a": [1]}), "mws")
+
+            with self.assertRaises(RuntimeError):
+                with StatsWorkbookWriter(path) as writer:
+                    writer.write_sheet(pd.DataFrame({"a": [2]}), "mws")
+                    raise RuntimeError("GeoServer down")
+
+            self.assertEqual(pd.read_excel(path)["a"].tolist(), [1])
+
+
+class VillageIndicatorRowsTest(SimpleTestCase):
+    facility_columns = [
+        "school_primary_distance",
+        "school_secondary_distance",
+        "college_distance",
+        "health_phc_distance",
+        "pds_distance",
+        "bank_atm_distance",
+        "apmc_distance",
+        "agri_industry_storage_warehousing_distance",
+        "agri_industry_co_operatives_societies_distance",
+        "agri_industry_dairy_animal_husbandry_distance",
+    ]
+
+    def sheets(self, seed=5, n=400):
+        rng = np.random.default_rng(seed)
+        ids = rng.integers(0, n // 2, n)
+        soc_eco = pd.DataFrame(
+            {
+                "village_id": ids,
+                "total_population_count": rng.integers(0, 5000, n),
+                "SC_percent": rng.random(n) * 100,
+                "ST_percent": np.where(rng.random(n) < 0.1, np.nan, rng.random(n)),
+                "literacy_rate_percent": rng.random(n) * 100,
+            }
+        )
+        nrega = pd.DataFrame(
+            {
+                "vill_id": rng.integers(0, n // 2, n),
+                "vill_name": "atri",
+                "Irrigation": rng.integers(0, 9, n),
+                "Land restoration": np.where(rng.random(n) < 0.2, np.nan, 2.0),
+            }
+        )
+        facilities = pd.DataFrame(
+            {
+                "censuscode2011": rng.integers(0, n // 2, n),
+                "name": "atri",
+                **{
+                    col: np.select(
+                        [rng.random(n) < 0.2, rng.random(n) < 0.2],
+                        [-1, np.nan],
+                        rng.random(n) * 30,
+                    )
+                    for col in self.facility_columns
+                },
+            }
+        )
+        return soc_eco, nrega, facilities
+
+    def legacy_rows(self, df_soc_eco_indi, df_nrega_village, df_facilities):
+        results = []
+        for v_id in df_soc_eco_indi["village_id"].unique():
+            if v_id == 0:
+                continue
+            results.append(
+                {
+                    "village_id": v_id,
+                    **extract_soc_eco(df_soc_eco_indi, v_id),
+                    "total_assets": extract_nrega(df_nrega_village, v_id),
+                    **extract_facilities(df_facilities, v_id),
+                }
+            )
+        return results
+
+    def assertSameJson(self, *sheets):
+        expected = pd.DataFrame(self.legacy_rows(*sheets)).to_dict(orient="records")
+        actual = pd.DataFrame(village_indicator_rows(*sheets)).to_dict(orient="records")
+        self.assertEqual(json.dumps(actual, indent=4), json.dumps(expected, indent=4))
+
+    def test_matches_per_village_lookup(self):
+        soc_eco, nrega, facilities = self.sheets()
+        self.assertSameJson(soc_eco, nrega, facilities)
+        # All-numeric facilities rows are read as floats, mixed ones as objects.
+        self.assertSameJson(soc_eco, nrega, facilities.drop(columns="name"))
+
+    def test_missing_sheets(self):
+        soc_eco, nrega, facilities = self.sheets()
+        self.assertSameJson(soc_eco, pd.DataFrame(), pd.DataFrame())
+        self.assertSameJson(soc_eco, nrega.iloc[:0], facilities.iloc[:5])
+        self.assertEqual(village_indicator_rows(pd.DataFrame(), nrega, facilities), [])
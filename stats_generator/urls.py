@@ -13,6 +13,11 @@ urlpatterns = [
         api.generate_stats_excel_file_data,
         name="generate_stats_excel_file",
     ),
+    path(
+        "stats_excel_build_status/",
+        api.stats_excel_build_status,
+        name="stats_excel_build_status",
+    ),
     path(
         "add_new_layer_data_to_excel/",
         api.add_sheets_in_stats_excel,
@@ -10,6 +10,16 @@ from nrm_app.settings import GEOSERVER_URL, EXCEL_PATH
 import numpy as np
 from shapely.geometry import Point, shape
 from .models import LayerInfo
+from .workbook import StatsWorkbookWriter
+from .manifest import (
+    current_sources,
+    layer_name_for,
+    load_manifest,
+    new_manifest,
+    record_results,
+    save_manifest,
+    stale_layers,
+)
 from django.http import HttpResponse
 from rest_framework import status
 from pathlib import Path
@@ -31,7 +41,9 @@ def get_url(workspace, layer_name):
     return geojson_url
 
 
-def get_vector_layer_geoserver(state, district, block, specific_sheets=None):
+def get_vector_layer_geoserver(
+    state, district, block, specific_sheets=None, return_sheets=False, layers=None
+):
     print(f"Generate Stats excel for {state}_{district}_{block}")
     base_path = os.path.join(EXCEL_PATH, "data/stats_excel_files")
     district_path = os.path.join(
@@ -42,19 +54,14 @@ def get_vector_layer_geoserver(state, district, block, specific_sheets=None):
 
     workspaces_to_process = specific_sheets
 
-    # Handle existing sheets when adding specific workspaces
+    # Sheets are streamed into the workbook in one pass when the writer
+    # closes; an existing workbook keeps the sheets not rewritten here.
     results = []
-    file_exists = os.path.exists(xlsx_file)
-    mode = "a" if file_exists else "w"
-
-    # Use append mode with if_sheet_exists='replace'
-    with pd.ExcelWriter(
-        xlsx_file,
-        engine="openpyxl",
-        mode=mode,
-        if_sheet_exists="replace" if mode == "a" else None,
-    ) as writer:
-        for layer in fetch_layers_for_excel_generation():
+    with StatsWorkbookWriter(xlsx_file, keep_frames=return_sheets) as writer:
+        if layers is None:
+            layers = fetch_layers_for_excel_generation()
+
+        for layer in layers:
             workspace = layer["workspace"]
 
             if workspaces_to_process and workspace not in workspaces_to_process:
@@ -63,10 +70,9 @@ def get_vector_layer_geoserver(state, district, block, specific_sheets=None):
             start_year = layer.get("start_year")
             end_year = layer.get("end_year")
 
-            if "{district}" in layer["layer_name"] and "{block}" in layer["layer_name"]:
-                layer_name = layer["layer_name"].format(district=district, block=block)
-            else:
-                layer_name = layer["layer_name"]
+            layer_name = layer_name_for(layer, district, block)
+
+            sheets_before = len(writer.written)
 
             print(f"Processing layer: {layer_name}")
             print(f"Workspace for the layer is: {workspace}")
@@ -236,9 +242,16 @@ def get_vector_layer_geoserver(state, district, block, specific_sheets=None):
                 create_excel_for_facilities(geojson_data, writer)
 
             results.append(
-                {"layer": layer_name, "status": "success", "workspace": workspace}
+                {
+                    "layer": layer_name,
+                    "status": "success",
+                    "workspace": workspace,
+                    "sheets": writer.written[sheets_before:],
+                }
             )
 
+    if return_sheets:
+        return results, writer.frames
     return results
 
 
@@ -295,7 +308,7 @@ def create_excel_for_mws_intersect_swb(swb_geojson, writer, district, block):
         numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
         df[numeric_cols] = df[numeric_cols].round(6)
 
-    df.to_excel(writer, sheet_name="mws_intersect_swb", index=False)
+    writer.write_sheet(df, "mws_intersect_swb")
     print("Excel sheet 'mws_intersect_swb' created successfully")
 
 
@@ -310,7 +323,7 @@ def create_excel_for_facilities(data, writer):
     other_cols = [c for c in df.columns if c not in first_cols]
     df = df[first_cols + other_cols]
 
-    df.to_excel(writer, sheet_name="facilities_proximity", index=False)
+    writer.write_sheet(df, "facilities_proximity")
     print("Excel file created for facilities_proximity")
 
 
@@ -332,7 +345,7 @@ def create_excel_for_mws(data, writer):
 
     df = pd.DataFrame(df_data)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="mws", index=False)
+    writer.write_sheet(df, "mws")
     print("Excel file created for mws")
 
 
@@ -366,7 +379,7 @@ def create_excel_for_mws_connectivity(data, writer):
     df = pd.DataFrame(df_data)
     df.replace("", "unknown", inplace=True)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="mws_connectivity", index=False)
+    writer.write_sheet(df, "mws_connectivity")
     print("Excel file created for mws_connectivity")
 
 
@@ -395,7 +408,7 @@ def create_excel_for_stream_order(data, writer):
     df = pd.DataFrame(df_data)
     df.replace("", "unknown", inplace=True)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="stream_order", index=False)
+    writer.write_sheet(df, "stream_order")
     print("Excel file created for stream order")
 
 
@@ -417,7 +430,7 @@ def create_excel_for_mining(data, writer):
     df = pd.DataFrame(df_data)
     df.replace("", "unknown", inplace=True)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="mining", index=False)
+    writer.write_sheet(df, "mining")
     print("Excel file created for mining")
 
 
@@ -438,7 +451,7 @@ def create_excel_for_green_credit(data, writer):
         df_data.append(row)
     df = pd.DataFrame(df_data)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="green_credit", index=False)
+    writer.write_sheet(df, "green_credit")
     print("Excel file created for green_credit")
 
 
@@ -458,7 +471,7 @@ def create_excel_for_factory_csr(data, writer):
         df_data.append(row)
     df = pd.DataFrame(df_data)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="factory_csr", index=False)
+    writer.write_sheet(df, "factory_csr")
     print("Excel file created for factory_csr")
 
 
@@ -481,7 +494,7 @@ def create_excel_for_agroecological(data, writer):
         df_data.append(row)
     df = pd.DataFrame(df_data)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="agroecological", index=False)
+    writer.write_sheet(df, "agroecological")
     print("Excel file created for agroecological")
 
 
@@ -500,7 +513,7 @@ def create_excel_for_lcw(data, writer):
         df_data.append(row)
     df = pd.DataFrame(df_data)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="lcw_conflict", index=False)
+    writer.write_sheet(df, "lcw_conflict")
     print("Excel file created for lcw_conflict")
 
 
@@ -526,7 +539,7 @@ def create_excel_for_soge(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="soge_vector", index=False)
+    writer.write_sheet(df, "soge_vector")
     print(f"Excel file created for soge_vector")
 
 
@@ -598,7 +611,7 @@ def create_excel_for_aquifer(data, writer):
     numeric_cols = df.select_dtypes(include=["number"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
     df = df.sort_values(["UID"])
-    df.to_excel(writer, sheet_name="aquifer_vector", index=False)
+    writer.write_sheet(df, "aquifer_vector")
     print("Excel file created for aquifer_vector")
 
 
@@ -625,7 +638,7 @@ def create_excel_for_restoration(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="restoration_vector", index=False)
+    writer.write_sheet(df, "restoration_vector")
     print(f"Excel file created for restoration_vector")
 
 
@@ -655,7 +668,7 @@ def create_excel_for_overall_tree_change(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="overall_tree_change", index=False)
+    writer.write_sheet(df, "overall_tree_change")
     print(f"Excel file created for overall_tree_change")
 
 
@@ -690,7 +703,7 @@ def create_excel_for_ccd(data, xlsx_file, writer, start_year, end_year):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="Canopy_Cover_Density", index=False)
+    writer.write_sheet(df, "Canopy_Cover_Density")
     print(f"Excel file created for Canopy_Cover_Density")
 
 
@@ -728,7 +741,7 @@ def create_excel_for_ch(data, xlsx_file, writer, start_year, end_year):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="Canopy_height", index=False)
+    writer.write_sheet(df, "Canopy_height")
     print(f"Excel file created for Canopy_height")
 
 
@@ -760,7 +773,7 @@ def create_excel_for_drought_causality(data, xlsx_file, writer, start_year, end_
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="drought_causality", index=False)
+    writer.write_sheet(df, "drought_causality")
     print(f"Excel file created for drought_causality")
 
 
@@ -791,7 +804,7 @@ def create_excel_chan_detection_afforestation(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="change_detection_afforestation", index=False)
+    writer.write_sheet(df, "change_detection_afforestation")
     print(f"Excel file created for change_detection_afforestation")
 
 
@@ -828,7 +841,7 @@ def create_excel_chan_detection_cropintensity(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="change_detection_cropintensity", index=False)
+    writer.write_sheet(df, "change_detection_cropintensity")
     print(f"Excel file created for change_detection_cropintensity")
 
 
@@ -859,7 +872,7 @@ def create_excel_chan_detection_deforestation(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="change_detection_deforestation", index=False)
+    writer.write_sheet(df, "change_detection_deforestation")
     print(f"Excel file created for change_detection_deforestation")
 
 
@@ -889,7 +902,7 @@ def create_excel_chan_detection_degradation(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="change_detection_degradation", index=False)
+    writer.write_sheet(df, "change_detection_degradation")
     print(f"Excel file created for change_detection_degradation")
 
 
@@ -919,7 +932,7 @@ def create_excel_chan_detection_urbanization(data, xlsx_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="change_detection_urbanization", index=False)
+    writer.write_sheet(df, "change_detection_urbanization")
     print(f"Excel file created for change_detection_urbanization")
 
 
@@ -993,7 +1006,7 @@ def create_excel_mws_inters_villages(mws_geojson, xlsx_file, writer, district, b
     df = pd.DataFrame(data)
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
-    df.to_excel(writer, sheet_name="mws_intersect_villages", index=False)
+    writer.write_sheet(df, "mws_intersect_villages")
     print("The data has been saved to mws_intersect_villages")
 
 
@@ -1110,7 +1123,7 @@ def create_excel_for_terrain(data, output_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="terrain", index=False)
+    writer.write_sheet(df, "terrain")
     print(f"Excel file created for terrain vector")
 
 
@@ -1151,7 +1164,7 @@ def create_excel_for_terrain_lulc_slope(data, output_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="terrain_lulc_slope", index=False)
+    writer.write_sheet(df, "terrain_lulc_slope")
     print("Excel file created for terrain_lulc_slope")
 
 
@@ -1192,7 +1205,7 @@ def create_excel_for_terrain_lulc_plain(data, output_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="terrain_lulc_plain", index=False)
+    writer.write_sheet(df, "terrain_lulc_plain")
     print("Excel file created for terrain_lulc_plain")
 
 
@@ -1266,7 +1279,7 @@ def create_excel_for_swb(data, output_file, writer, start_year, end_year):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="surfaceWaterBodies_annual", index=False)
+    writer.write_sheet(df, "surfaceWaterBodies_annual")
     print("Excel file created for surfaceWaterBodies_annual")
 
 
@@ -1367,7 +1380,7 @@ def create_excel_for_nrega_assets(
 
     if df_data:
         df = pd.DataFrame(df_data)
-        df.to_excel(writer, sheet_name="nrega_annual", index=False)
+        writer.write_sheet(df, "nrega_annual")
         print("Excel file created for nrega_annual")
         return "successfully created"
     else:
@@ -1435,7 +1448,7 @@ def create_excel_village_nrega_assets(
 
     # Save to Excel
     final_df = final_df.drop_duplicates(subset=["vill_id", "vill_name"])
-    final_df.to_excel(writer, sheet_name="nrega_assets_village", index=False)
+    writer.write_sheet(final_df, "nrega_assets_village")
     print("Excel file created successfully with all villages.")
 
 
@@ -1618,7 +1631,7 @@ def create_excel_crop_inten(data, output_file, writer, start_year, end_year):
     df[numeric_cols] = df[numeric_cols].round(2)
 
     # Write to Excel
-    df.to_excel(writer, sheet_name="croppingIntensity_annual", index=False)
+    writer.write_sheet(df, "croppingIntensity_annual")
     print("Excel file created for cropping intensity.")
 
 
@@ -1663,7 +1676,7 @@ def create_excel_crop_drou(data, output_file, writer, start_year, end_year):
     df[numeric_cols] = df[numeric_cols].round(2)
 
     # Write to Excel
-    df.to_excel(writer, sheet_name="croppingDrought_kharif", index=False)
+    writer.write_sheet(df, "croppingDrought_kharif")
     print("Excel file created for cropping drought.")
 
 
@@ -1719,7 +1732,7 @@ def create_excel_annual_mws(data, output_file, writer):
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="hydrological_annual", index=False)
+    writer.write_sheet(df, "hydrological_annual")
     print("Excel file created for hydrological_annual")
 
 
@@ -1815,7 +1828,7 @@ def create_excel_seas_mws(processed_data, output_file, writer, start_year, end_y
     numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
     df[numeric_cols] = df[numeric_cols].round(2)
 
-    df.to_excel(writer, sheet_name="hydrological_seasonal", index=False)
+    writer.write_sheet(df, "hydrological_seasonal")
     print(f"Excel file created hydrological_seasonal")
 
 
@@ -1878,7 +1891,7 @@ def create_excel_for_village_boun(old_geojson, writer):
         )
 
     results_df = pd.DataFrame(results)
-    results_df.to_excel(writer, sheet_name="social_economic_indicator", index=False)
+    writer.write_sheet(results_df, "social_economic_indicator")
 
     print(f"Excel file created for social_economic_indicator")
 
@@ -1894,29 +1907,8 @@ def download_layers_excel_file(state, district, block):
     output_dir.mkdir(parents=True, exist_ok=True)
 
     if not os.path.exists(file_path):
-        try:
-            if not get_vector_layer_geoserver(state, district, block):
-                return Response(
-                    {
-                        "status": "error",
-                        "message": "Failed to generate vector layer from GeoServer.",
-                    },
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
-            if not os.path.exists(file_path):
-                return Response(
-                    {"status": "error", "message": "Failed to generate Excel file."},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
-
-        except Exception as e:
-            return Response(
-                {
-                    "status": "error",
-                    "message": f"Error during file generation: {str(e)}",
-                },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        # Built by a Celery job; the client polls stats_excel_build_status.
+        return queue_stats_excel_build(state, district, block)
     else:
         print(f"Excel file already exists at: {file_path}")
 
@@ -1942,89 +1934,107 @@ def download_layers_excel_file(state, district, block):
         )
 
 
-def generate_stats_excel_file(state, district, block):
+def stats_excel_path(state, district, block):
+    return os.path.join(
+        EXCEL_PATH,
+        "data/stats_excel_files",
+        state.upper(),
+        district.upper(),
+        f"{district}_{block}.xlsx",
+    )
+
+
+def build_stats_excel_file(state, district, block, force=False, workspaces=None):
     """
-    Deletes existing Excel layer file and forces regeneration.
-    Then returns the newly generated file.
+    Refreshes the tehsil's Excel layer file. Only the sheets whose source
+    layers changed since the last build (per the workbook manifest) or whose
+    workspace is listed in ``workspaces`` are regenerated; ``force`` deletes
+    the file and rebuilds every sheet. Runs
+    inside the stats_generator.build_stats_excel_file Celery task; raises on
+    failure.
     """
-    base_path = os.path.join(EXCEL_PATH, "data/stats_excel_files")
-    state_path = os.path.join(base_path, state.upper())
-    district_path = os.path.join(state_path, district.upper())
-    filename = f"{district}_{block}.xlsx"
-    file_path = os.path.join(district_path, filename)
+    file_path = stats_excel_path(state, district, block)
 
-    try:
-        # Create directory if it doesn't exist
-        output_dir = Path(file_path).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
+    # Create directory if it doesn't exist
+    output_dir = Path(file_path).parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    layers = fetch_layers_for_excel_generation()
+    # Taken before fetching, so a layer republished mid-build is stale next time.
+    sources = current_sources(layers, district, block)
 
-        # ALWAYS delete existing file if it exists
+    manifest = None
+    if not force and os.path.exists(file_path):
+        manifest = load_manifest(file_path)
+
+    if manifest is None:
         if os.path.exists(file_path):
             os.remove(file_path)
+        manifest = new_manifest(state, district, block)
+        layers_to_build = layers
+    else:
+        stale = stale_layers(layers, manifest, sources, district, block)
+        layers_to_build = [
+            layer
+            for layer in layers
+            if layer in stale or layer["workspace"] in (workspaces or ())
+        ]
+        if not layers_to_build:
+            print(f"Stats excel for {district}_{block} is up to date")
+            return file_path
+
+    from .mws_indicators import generate_mws_data_for_kyl_filters
+    from .village_indicators import get_generate_filter_data_village
+    from public_api.views import get_tehsil_json
+
+    print(f"Regenerating {len(layers_to_build)} of {len(layers)} layers")
+    # Read the sheets back once from the workbook still in memory and hand
+    # the same frames to every derived output.
+    results, stats_sheets = get_vector_layer_geoserver(
+        state, district, block, return_sheets=True, layers=layers_to_build
+    )
+    get_tehsil_json(state, district, block, 1, stats_sheets=stats_sheets)
+    generate_mws_data_for_kyl_filters(
+        state, district, block, "json", 1, stats_sheets=stats_sheets
+    )
+    get_generate_filter_data_village(
+        state, district, block, 1, stats_sheets=stats_sheets
+    )
 
-        from .mws_indicators import generate_mws_data_for_kyl_filters
-        from .village_indicators import get_generate_filter_data_village
-        from public_api.views import get_tehsil_json
+    if not os.path.exists(file_path):
+        raise FileNotFoundError("Excel file generation completed but file not found.")
 
-        get_vector_layer_geoserver(state, district, block)
-        get_tehsil_json(state, district, block, 1)
-        generate_mws_data_for_kyl_filters(state, district, block, "json", 1)
-        get_generate_filter_data_village(state, district, block, 1)
+    record_results(manifest, layers_to_build, results, sources, district, block)
+    save_manifest(file_path, manifest)
+    return file_path
 
-        if not os.path.exists(file_path):
-            return Response(
-                {
-                    "status": "error",
-                    "message": "Excel file generation completed but file not found.",
-                },
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
 
-        # Return the newly generated file
-        with open(file_path, "rb") as file:
-            response = HttpResponse(
-                file.read(),
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-            response["Content-Disposition"] = f"attachment; filename={filename}"
-            return response
+def queue_stats_excel_build(state, district, block, force=False, workspaces=None):
+    """Queue (or join) the tehsil's workbook build and report its status."""
+    from .builds import build_status, request_build
 
-    except Exception as e:
-        return Response(
-            {"status": "error", "message": f"Failed to generate stats excel: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    build, queued = request_build(
+        state, district, block, force=force, workspaces=workspaces
+    )
+    return Response(
+        {
+            "status": "queued" if queued else "in_progress",
+            "message": (
+                "Stats excel build queued."
+                if queued
+                else "Stats excel build already in progress."
+            ),
+            "build": build_status(build),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
 
 
 def add_sheets_to_excel(state, district, block, sheets):
-    try:
-        sheets_to_add = [sheet.strip() for sheet in sheets.split(",") if sheet.strip()]
-        results = []
-
-        for sheet in sheets_to_add:
-            r = get_vector_layer_geoserver(state, district, block, sheet)
-            results.append(r)
-
-        from .mws_indicators import generate_mws_data_for_kyl_filters
-        from .village_indicators import get_generate_filter_data_village
-        from public_api.views import get_tehsil_json
-
-        get_tehsil_json(state, district, block, 1)
-        generate_mws_data_for_kyl_filters(state, district, block, "json", 1)
-        get_generate_filter_data_village(state, district, block, 1)
-
-        successful = [r for r in results if r["status"] == "success"]
-        failed = [r for r in results if r["status"] == "failed"]
-
-        response_data = {
-            "status": "success" if successful else "failed",
-            "message": f"Stats data added info. {len(successful)} successful, {len(failed)} failed.",
-        }
-
-        return response_data
-
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": str(e),
-        }
+    """
+    Queue a build that regenerates the given workspaces' sheets. It joins
+    the tehsil's build lock, so the workbook is never written from the
+    request while a worker is rebuilding it.
+    """
+    sheets_to_add = [sheet.strip() for sheet in sheets.split(",") if sheet.strip()]
+    return queue_stats_excel_build(state, district, block, workspaces=sheets_to_add)
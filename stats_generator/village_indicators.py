@@ -26,6 +26,19 @@ def extract_facilities(df_facilities, v_id):
         "agricultural_support_infrastructure": -1,
     }
 
+    if df_facilities.empty:
+        return DEFAULT_VALUE.copy()
+
+    fac_row = df_facilities[df_facilities["censuscode2011"] == v_id]
+    if fac_row.empty:
+        return DEFAULT_VALUE.copy()
+
+    return facility_indicators(fac_row.iloc[0])
+
+
+def facility_indicators(row):
+    """Grouped max facility indicators of one facilities_proximity row."""
+
     # Safely check the nan and pass the max or -1 value
     def get_max(values):
         valid = [v for v in values if pd.notna(v) and v != -1]
@@ -35,15 +48,6 @@ def extract_facilities(df_facilities, v_id):
     def safe_val(v):
         return round(v, 4) if pd.notna(v) and v != -1 else -1
 
-    if df_facilities.empty:
-        return DEFAULT_VALUE.copy()
-
-    fac_row = df_facilities[df_facilities["censuscode2011"] == v_id]
-    if fac_row.empty:
-        return DEFAULT_VALUE.copy()
-
-    row = fac_row.iloc[0]
-
     result = {
         "essential_education_infra": get_max(
             [
@@ -142,7 +146,64 @@ def extract_soc_eco(df_soc_eco_indi, v_id):
     }
 
 
-def get_generate_filter_data_village(state, district, block, regenerate=0):
+def village_indicator_rows(df_soc_eco_indi, df_nrega_village, df_facilities):
+    """
+    One indicator dict per village of the social_economic_indicator sheet, in
+    sheet order. The NREGA totals and the first soc-eco/facilities row of each
+    village are looked up by village_id in one pass over each sheet, rather
+    than by filtering every sheet once per village.
+    """
+    if df_soc_eco_indi.empty:
+        return []
+
+    villages = df_soc_eco_indi[df_soc_eco_indi["village_id"] != 0].drop_duplicates(
+        subset="village_id"
+    )
+    village_ids = villages["village_id"]
+
+    if df_nrega_village.empty:
+        total_assets = [-1] * len(villages)
+    else:
+        asset_counts = df_nrega_village.drop(
+            columns=["vill_id", "vill_name"], errors="ignore"
+        ).sum(axis=1)
+        totals = asset_counts.groupby(df_nrega_village["vill_id"]).sum()
+        total_assets = [int(t) for t in village_ids.map(totals).fillna(0)]
+
+    if df_facilities.empty:
+        facility_rows = None
+    else:
+        facility_rows = df_facilities.drop_duplicates(subset="censuscode2011")
+        positions = pd.Index(facility_rows["censuscode2011"]).get_indexer(village_ids)
+
+    columns = {
+        "total_population": villages["total_population_count"].to_numpy(),
+        "percent_sc_population": villages["SC_percent"].round(4).to_numpy(),
+        "percent_st_population": villages["ST_percent"].round(4).to_numpy(),
+        "literacy_level": villages["literacy_rate_percent"].round(4).to_numpy(),
+    }
+
+    results = []
+    for i, v_id in enumerate(village_ids.to_numpy()):
+        if facility_rows is None or positions[i] < 0:
+            fac_data = extract_facilities(pd.DataFrame(), v_id)
+        else:
+            fac_data = facility_indicators(facility_rows.iloc[positions[i]])
+
+        results.append(
+            {
+                "village_id": v_id,
+                **{key: values[i] for key, values in columns.items()},
+                "total_assets": total_assets[i],
+                **fac_data,
+            }
+        )
+    return results
+
+
+def get_generate_filter_data_village(
+    state, district, block, regenerate=0, stats_sheets=None
+):
     print("Generation of village filter json")
     state_folder = state.replace(" ", "_").upper()
     district_folder = district.replace(" ", "_").upper()
@@ -166,46 +227,30 @@ def get_generate_filter_data_village(state, district, block, regenerate=0):
             )
             return response
 
+    def read_sheet(sheet_name):
+        if stats_sheets is not None:
+            return stats_sheets.parse(sheet_name)
+        return pd.read_excel(xlsx_file, sheet_name=sheet_name)
+
     try:
-        df_soc_eco_indi = pd.read_excel(
-            xlsx_file, sheet_name="social_economic_indicator"
-        )
+        df_soc_eco_indi = read_sheet("social_economic_indicator")
     except Exception as e:
         print("Failed to load social_economic_indicator:", e)
         df_soc_eco_indi = pd.DataFrame()
 
     try:
-        df_nrega_village = pd.read_excel(xlsx_file, sheet_name="nrega_assets_village")
+        df_nrega_village = read_sheet("nrega_assets_village")
     except Exception as e:
         print("Failed to load nrega_assets_village:", e)
         df_nrega_village = pd.DataFrame()
 
     try:
-        df_facilities = pd.read_excel(xlsx_file, sheet_name="facilities_proximity")
+        df_facilities = read_sheet("facilities_proximity")
     except Exception as e:
         print("Failed to load facilities_proximity:", e)
         df_facilities = pd.DataFrame()
 
-    results = []
-
-    if not df_soc_eco_indi.empty:
-        for v_id in df_soc_eco_indi["village_id"].unique():
-            if v_id == 0:
-                continue
-
-            soc_eco = extract_soc_eco(df_soc_eco_indi, v_id)
-            total_assets = extract_nrega(df_nrega_village, v_id)
-            fac_data = extract_facilities(df_facilities, v_id)
-
-            results.append(
-                {
-                    "village_id": v_id,
-                    **soc_eco,
-                    "total_assets": total_assets,
-                    **fac_data,
-                }
-            )
-
+    results = village_indicator_rows(df_soc_eco_indi, df_nrega_village, df_facilities)
     results_list = pd.DataFrame(results).to_dict(orient="records")
 
     with open(json_path, "w") as f:
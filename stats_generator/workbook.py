@@ -0,0 +1,302 @@
+"""
+Single-pass writer for the stats workbooks.
+
+Sheet builders hand their DataFrames to ``StatsWorkbookWriter.write_sheet``,
+which converts the rows at once and spills them to a temporary file, so no
+frame outlives its own write. On close every sheet is streamed once, in
+order, through an openpyxl write-only workbook into a temporary file that
+then replaces the xlsx. Sheets of an existing workbook that were not
+rewritten are copied across row by row from a read-only load, so peak
+memory stays at about one chunk of rows however many sheets a build writes,
+and the workbook is never re-serialised once per sheet.
+
+Cells are converted the way ``DataFrame.to_excel(index=False)`` converts
+them, so the file reads back exactly as one written by ``pd.ExcelWriter``.
+"""
+
+import datetime
+import itertools
+import math
+import os
+import pickle
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.utils.datetime import from_excel, to_excel
+
+# Rows converted at once when streaming a DataFrame into a sheet.
+CHUNK_ROWS = 5000
+
+DATE_FORMAT = "YYYY-MM-DD"
+DATETIME_FORMAT = "YYYY-MM-DD HH:MM:SS"
+
+# pandas' default header style
+_THIN = Side(style="thin")
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+class StatsSheets(dict):
+    """
+    ``pd.ExcelFile``-like view over the as-read frames of a stats workbook,
+    so the KYL and tehsil JSON builders can share them instead of each
+    parsing the xlsx again.
+    """
+
+    @property
+    def sheet_names(self):
+        return list(self)
+
+    def parse(self, sheet_name):
+        return self[sheet_name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def _saved_number(value):
+    """A numeric cell value as openpyxl writes it ("%.16g") and reads it back."""
+    if math.isnan(value) or math.isinf(value):
+        return None
+    text = "%.16g" % value
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def saved_value(value, epoch):
+    """
+    A converted cell value as it reads back once openpyxl has saved it:
+    numbers and dates go through the same text round-trip the file applies
+    to them.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return _saved_number(value)
+    if isinstance(value, datetime.date):
+        return from_excel(_saved_number(to_excel(value, epoch)), epoch)
+    return value
+
+
+def excel_value(val):
+    """``(value, number_format)`` of one cell as ``DataFrame.to_excel`` writes it."""
+    if pd.api.types.is_scalar(val) and pd.isna(val):
+        return "", None
+    if isinstance(val, (bool, np.bool_)):
+        return bool(val), None
+    if isinstance(val, (int, np.integer)):
+        return int(val), None
+    if isinstance(val, (float, np.floating)):
+        if math.isinf(val):
+            return ("inf" if val > 0 else "-inf"), None
+        return float(val), None
+    if isinstance(val, datetime.datetime):
+        if val.tzinfo is not None:
+            raise ValueError("Excel does not support datetimes with timezones.")
+        return val, DATETIME_FORMAT
+    if isinstance(val, datetime.date):
+        return val, DATE_FORMAT
+    if isinstance(val, datetime.timedelta):
+        return val.total_seconds() / 86400, "0"
+    return str(val), None
+
+
+def _column_values(series):
+    """Converted values and number formats (``None`` if none) of one column."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        return series.to_numpy().tolist(), None
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        array = series.to_numpy()
+        values = array.tolist()
+        for i in np.flatnonzero(~np.isfinite(array)):
+            values[i] = excel_value(array[i])[0]
+        return values, None
+
+    converted = [excel_value(val) for val in series]
+    values = [value for value, _ in converted]
+    formats = [fmt for _, fmt in converted]
+    return values, (formats if any(formats) else None)
+
+
+def _frame_rows(df, chunk_rows=CHUNK_ROWS):
+    """
+    Header row and a generator of body rows of ``df`` as
+    ``(value, number_format)`` lists, converted a chunk of rows at a time.
+    """
+    header = [excel_value(col) for col in df.columns]
+
+    def rows():
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start : start + chunk_rows]
+            columns = [_column_values(chunk.iloc[:, i]) for i in range(df.shape[1])]
+            for r in range(len(chunk)):
+                yield [
+                    (values[r], formats[r] if formats else None)
+                    for values, formats in columns
+                ]
+
+    return header, rows()
+
+
+def _existing_rows(worksheet):
+    """Header row and a generator of body rows of a read-only worksheet."""
+    worksheet.reset_dimensions()
+    rows = (
+        [(cell.value, cell.number_format if cell.is_date else None) for cell in row]
+        for row in worksheet.iter_rows()
+    )
+    return next(rows, []), rows
+
+
+def _spilled_rows(spill):
+    """Header row and a generator of body rows of a sheet spilled to ``spill``."""
+    spill.seek(0)
+    header = pickle.load(spill)
+
+    def rows():
+        while True:
+            try:
+                chunk = pickle.load(spill)
+            except EOFError:
+                return
+            yield from chunk
+
+    return header, rows()
+
+
+class StatsWorkbookWriter:
+    """
+    Spills the sheets of a stats workbook as they are written and writes
+    them in one pass on close. If ``path`` exists, its other sheets are kept, in place, and
+    rewritten sheets keep their position. With ``keep_frames`` the as-read
+    frames of every sheet are left in ``frames`` after closing.
+    """
+
+    def __init__(self, path, keep_frames=False):
+        self.path = path
+        self.keep_frames = keep_frames
+        # Sheet name -> temporary file holding its converted rows
+        self.staged = {}
+        self.written = []
+        self.frames = StatsSheets() if keep_frames else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Leave the existing workbook untouched if a sheet builder blew up.
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+        return False
+
+    def _discard(self):
+        for spill in self.staged.values():
+            spill.close()
+        self.staged.clear()
+
+    def write_sheet(self, df, sheet_name):
+        header, rows = _frame_rows(df)
+        rows = self._read_back(sheet_name, header, rows)
+        spill = tempfile.TemporaryFile()
+        pickle.dump(header, spill)
+        while chunk := list(itertools.islice(rows, CHUNK_ROWS)):
+            pickle.dump(chunk, spill)
+
+        previous = self.staged.pop(sheet_name, None)
+        if previous is not None:
+            previous.close()
+        self.staged[sheet_name] = spill
+        self.written.append(sheet_name)
+
+    def _read_back(self, sheet_name, header, rows):
+        """
+        Pass ``rows`` through and, with ``keep_frames``, build the sheet's
+        as-read frame from them once they are exhausted.
+        """
+        if not self.keep_frames:
+            yield from rows
+            return
+
+        # Sheet-sized scratch book the as-read frame is parsed from.
+        scratch = Workbook().active
+        epoch = scratch.parent.epoch
+        if header:
+            scratch.append([saved_value(v, epoch) for v, _ in header])
+        for row in rows:
+            scratch.append([saved_value(v, epoch) for v, _ in row])
+            yield row
+        self.frames[sheet_name] = pd.read_excel(scratch.parent, engine="openpyxl")
+
+    def _write_rows(self, worksheet, header, rows):
+        if header:
+            cells = []
+            for value, fmt in header:
+                cell = WriteOnlyCell(worksheet, value=value)
+                cell.font = HEADER_FONT
+                cell.border = HEADER_BORDER
+                cell.alignment = HEADER_ALIGNMENT
+                if fmt:
+                    cell.number_format = fmt
+                cells.append(cell)
+            worksheet.append(cells)
+
+        for row in rows:
+            cells = []
+            for value, fmt in row:
+                if fmt:
+                    value = WriteOnlyCell(worksheet, value=value)
+                    value.number_format = fmt
+                cells.append(value)
+            worksheet.append(cells)
+
+    def close(self):
+        existing = None
+        if os.path.exists(self.path):
+            existing = load_workbook(self.path, read_only=True, data_only=True)
+
+        sheet_names = list(existing.sheetnames) if existing else []
+        sheet_names += [name for name in self.staged if name not in sheet_names]
+        if not sheet_names:
+            return
+
+        book = Workbook(write_only=True)
+        try:
+            for sheet_name in sheet_names:
+                worksheet = book.create_sheet(sheet_name)
+                if sheet_name in self.staged:
+                    header, rows = _spilled_rows(self.staged[sheet_name])
+                else:
+                    header, rows = _existing_rows(existing[sheet_name])
+                    rows = self._read_back(sheet_name, header, rows)
+                self._write_rows(worksheet, header, rows)
+        finally:
+            if existing is not None:
+                existing.close()
+            self._discard()
+
+        if self.keep_frames:
+            self.frames = StatsSheets(
+                (sheet_name, self.frames[sheet_name]) for sheet_name in sheet_names
+            )
+
+        # Unique per writer, so overlapping builds never share a temp file
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            book.save(tmp_path)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
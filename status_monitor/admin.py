@@ -1,11 +1,11 @@
 from django.contrib import admin
 
-from .models import Endpoint, StatusCheck
+from .models import Endpoint, StatusCheck, StatusRollup
 
 
 @admin.register(Endpoint)
 class EndpointAdmin(admin.ModelAdmin):
-    list_display = ("name", "url", "is_active", "created_at")
+    list_display = ("name", "url", "is_active", "timeout_seconds", "created_at")
     list_filter = ("is_active",)
     search_fields = ("name", "url")
 
@@ -16,3 +16,11 @@ class StatusCheckAdmin(admin.ModelAdmin):
     list_filter = ("is_up", "endpoint")
     readonly_fields = ("endpoint", "status_code", "response_time_ms", "is_up", "error", "checked_at")
     ordering = ("-checked_at",)
+
+
+@admin.register(StatusRollup)
+class StatusRollupAdmin(admin.ModelAdmin):
+    list_display = ("endpoint", "period_start", "up_checks", "total_checks", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    list_filter = ("endpoint",)
+    readonly_fields = ("endpoint", "period_start", "total_checks", "up_checks", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    ordering = ("-period_start",)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from status_monitor.tasks import backfill_rollups
+
+
+class Command(BaseCommand):
+    help = "Build hourly status rollups from the stored status checks"
+
+    def handle(self, *args, **options):
+        written = backfill_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} status rollups"))
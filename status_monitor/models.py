@@ -6,6 +6,7 @@ class Endpoint(models.Model):
     url = models.URLField(max_length=1024, unique=True)
     headers = models.JSONField(default=dict, blank=True)
     is_active = models.BooleanField(default=True)
+    timeout_seconds = models.PositiveSmallIntegerField(default=15)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -28,3 +29,25 @@ class StatusCheck(models.Model):
     def __str__(self):
         status = "UP" if self.is_up else "DOWN"
         return f"{self.endpoint.name} - {status} @ {self.checked_at}"
+
+
+class StatusRollup(models.Model):
+    """Check counts and latency percentiles of an endpoint for one hour."""
+
+    endpoint = models.ForeignKey(
+        Endpoint, on_delete=models.CASCADE, related_name="rollups"
+    )
+    period_start = models.DateTimeField(db_index=True)
+    total_checks = models.PositiveIntegerField(default=0)
+    up_checks = models.PositiveIntegerField(default=0)
+    p50_ms = models.IntegerField(null=True, blank=True)
+    p95_ms = models.IntegerField(null=True, blank=True)
+    p99_ms = models.IntegerField(null=True, blank=True)
+    max_ms = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-period_start"]
+        unique_together = ("endpoint", "period_start")
+
+    def __str__(self):
+        return f"{self.endpoint.name} @ {self.period_start}: {self.up_checks}/{self.total_checks} up"
@@ -1,13 +1,202 @@
 import logging
+import math
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import timedelta
 
 import requests
 from celery import shared_task
 from django.utils import timezone
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+SWEEP_MAX_WORKERS = 16
+# Extra time allowed past an endpoint's timeout before the sweep gives up on it
+SWEEP_GRACE_SECONDS = 5
+ROLLUP_PERIOD = timedelta(hours=1)
+CHECK_RETENTION_DAYS = 90
+ROLLUP_RETENTION_DAYS = 365
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list, or None if it is empty."""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def probe_endpoint(session, ep):
+    """
+    One unsaved ``StatusCheck`` for ``ep``. Only the status line and headers
+    are read, so the response time is the time to the first response.
+    """
+    from .models import StatusCheck
+
+    start = time.monotonic()
+    try:
+        with session.get(
+            ep.url,
+            headers=ep.headers or {},
+            timeout=ep.timeout_seconds,
+            allow_redirects=True,
+            stream=True,
+        ) as resp:
+            elapsed_ms = int((time.monotonic() - start) * 1000)
+            logger.info("%s → %s (%dms)", ep.name, resp.status_code, elapsed_ms)
+            return StatusCheck(
+                endpoint=ep,
+                status_code=resp.status_code,
+                response_time_ms=elapsed_ms,
+                is_up=resp.status_code < 400,
+            )
+    except Exception as exc:
+        elapsed_ms = int((time.monotonic() - start) * 1000)
+        logger.warning("%s → FAILED (%s)", ep.name, str(exc)[:200])
+        return StatusCheck(
+            endpoint=ep,
+            response_time_ms=elapsed_ms,
+            is_up=False,
+            error=str(exc)[:500],
+        )
+
+
+def sweep_endpoints(endpoints, max_workers=SWEEP_MAX_WORKERS):
+    """
+    Probe ``endpoints`` concurrently over one pooled session.
+
+    Endpoints still pending once the sweep deadline (their timeout plus a
+    grace period, per round of workers) has passed are reported down, so a
+    hanging endpoint cannot hold up the sweep.
+
+    Returns:
+        list: One unsaved ``StatusCheck`` per endpoint, in order
+    """
+    from .models import StatusCheck
+
+    workers = min(max_workers, len(endpoints))
+    rounds = math.ceil(len(endpoints) / workers)
+    budget = rounds * (
+        max(ep.timeout_seconds for ep in endpoints) + SWEEP_GRACE_SECONDS
+    )
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(probe_endpoint, session, ep) for ep in endpoints]
+    wait(futures, timeout=budget)
+    # Pending probes are abandoned; their threads end with their socket timeouts
+    executor.shutdown(wait=False, cancel_futures=True)
+    if all(future.done() for future in futures):
+        session.close()
+
+    results = []
+    for ep, future in zip(endpoints, futures):
+        if future.done() and not future.cancelled():
+            results.append(future.result())
+            continue
+        logger.warning("%s → FAILED (sweep deadline)", ep.name)
+        results.append(
+            StatusCheck(
+                endpoint=ep,
+                response_time_ms=int((time.monotonic() - start) * 1000),
+                is_up=False,
+                error=f"No response within the {budget}s sweep deadline",
+            )
+        )
+    return results
+
+
+def rollup_period(checked_at):
+    return checked_at.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_checks(endpoint_ids, start, end):
+    """Recompute the hourly rollups of ``endpoint_ids`` for the hours in [start, end)."""
+    from .models import StatusCheck, StatusRollup
+
+    latencies = defaultdict(list)
+    counts = defaultdict(lambda: [0, 0])
+    rows = StatusCheck.objects.filter(
+        endpoint_id__in=endpoint_ids, checked_at__gte=start, checked_at__lt=end
+    ).values_list("endpoint_id", "checked_at", "is_up", "response_time_ms")
+    for endpoint_id, checked_at, is_up, response_time_ms in rows:
+        key = (endpoint_id, rollup_period(checked_at))
+        counts[key][0] += 1
+        if is_up:
+            counts[key][1] += 1
+            if response_time_ms is not None:
+                latencies[key].append(response_time_ms)
+
+    rollups = []
+    for (endpoint_id, period_start), (total, up) in counts.items():
+        values = sorted(latencies[(endpoint_id, period_start)])
+        rollups.append(
+            StatusRollup(
+                endpoint_id=endpoint_id,
+                period_start=period_start,
+                total_checks=total,
+                up_checks=up,
+                p50_ms=percentile(values, 50),
+                p95_ms=percentile(values, 95),
+                p99_ms=percentile(values, 99),
+                max_ms=values[-1] if values else None,
+            )
+        )
+    return StatusRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=["endpoint", "period_start"],
+        update_fields=["total_checks", "up_checks", "p50_ms", "p95_ms", "p99_ms", "max_ms"],
+    )
+
+
+def update_rollups(checks):
+    """Recompute the hourly rollups of the endpoints and hours of ``checks``."""
+    if not checks:
+        return []
+    periods = [rollup_period(check.checked_at) for check in checks]
+    return rollup_checks(
+        {check.endpoint_id for check in checks},
+        min(periods),
+        max(periods) + ROLLUP_PERIOD,
+    )
+
+
+def backfill_rollups():
+    """
+    Roll up every stored check, one day at a time. Rollups are upserted, so
+    this is safe to run again.
+
+    Returns:
+        int: Number of rollups written
+    """
+    from .models import Endpoint, StatusCheck
+
+    first = (
+        StatusCheck.objects.order_by("checked_at")
+        .values_list("checked_at", flat=True)
+        .first()
+    )
+    if first is None:
+        return 0
+
+    endpoint_ids = list(Endpoint.objects.values_list("id", flat=True))
+    written = 0
+    start = rollup_period(first)
+    now = timezone.now()
+    while start <= now:
+        end = start + timedelta(days=1)
+        written += len(rollup_checks(endpoint_ids, start, end))
+        start = end
+    return written
+
 
 @shared_task(name="status_monitor.check_all_endpoints")
 def check_all_endpoints():
@@ -18,35 +207,10 @@ def check_all_endpoints():
         logger.warning("No active endpoints found — nothing to check")
         return "No active endpoints"
 
-    results = []
-    for ep in endpoints:
-        start = time.monotonic()
-        try:
-            resp = requests.get(ep.url, headers=ep.headers or {}, timeout=15, allow_redirects=True)
-            elapsed_ms = int((time.monotonic() - start) * 1000)
-            is_up = resp.status_code < 400
-            results.append(
-                StatusCheck(
-                    endpoint=ep,
-                    status_code=resp.status_code,
-                    response_time_ms=elapsed_ms,
-                    is_up=is_up,
-                )
-            )
-            logger.info("%s → %s (%dms)", ep.name, resp.status_code, elapsed_ms)
-        except Exception as exc:
-            elapsed_ms = int((time.monotonic() - start) * 1000)
-            results.append(
-                StatusCheck(
-                    endpoint=ep,
-                    response_time_ms=elapsed_ms,
-                    is_up=False,
-                    error=str(exc)[:500],
-                )
-            )
-            logger.warning("%s → FAILED (%s)", ep.name, str(exc)[:200])
-
+    results = sweep_endpoints(endpoints)
     StatusCheck.objects.bulk_create(results)
+    update_rollups(results)
+
     up = sum(1 for r in results if r.is_up)
     logger.info("Checked %d endpoints: %d up, %d down", len(results), up, len(results) - up)
     return f"Checked {len(results)} endpoints: {up} up, {len(results) - up} down"
@@ -54,8 +218,14 @@ def check_all_endpoints():
 
 @shared_task(name="status_monitor.purge_old_checks")
 def purge_old_checks():
-    from .models import StatusCheck
+    """Individual checks are kept for 90 days, hourly rollups for a year."""
+    from .models import StatusCheck, StatusRollup
 
-    cutoff = timezone.now() - timedelta(days=90)
-    deleted, _ = StatusCheck.objects.filter(checked_at__lt=cutoff).delete()
-    return f"Deleted {deleted} old status checks"
+    now = timezone.now()
+    deleted, _ = StatusCheck.objects.filter(
+        checked_at__lt=now - timedelta(days=CHECK_RETENTION_DAYS)
+    ).delete()
+    deleted_rollups, _ = StatusRollup.objects.filter(
+        period_start__lt=now - timedelta(days=ROLLUP_RETENTION_DAYS)
+    ).delete()
+    return f"Deleted {deleted} old status checks and {deleted_rollups} old rollups"
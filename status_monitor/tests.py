@@ -0,0 +1,169 @@
+import socket
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Endpoint, StatusCheck, StatusRollup
+from .tasks import (
+    backfill_rollups,
+    check_all_endpoints,
+    percentile,
+    purge_old_checks,
+    rollup_period,
+    sweep_endpoints,
+)
+
+SLOW_DELAY_SECONDS = 3
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/slow":
+            time.sleep(SLOW_DELAY_SECONDS)
+        status = 500 if path == "/error" else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class EndpointSweepTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def endpoint(self, name, path, timeout_seconds=1):
+        return Endpoint.objects.create(
+            name=name, url=f"{self.base_url}{path}", timeout_seconds=timeout_seconds
+        )
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_sweep_is_concurrent_and_bounded_by_timeouts(self):
+        endpoints = [self.endpoint(f"ok-{i}", f"/ok?{i}") for i in range(3)]
+        endpoints += [
+            self.endpoint("slow-1", "/slow?1"),
+            self.endpoint("slow-2", "/slow?2"),
+            self.endpoint("error", "/error"),
+            Endpoint.objects.create(
+                name="closed",
+                url=f"http://127.0.0.1:{closed_port()}/",
+                timeout_seconds=1,
+            ),
+        ]
+
+        start = time.monotonic()
+        results = sweep_endpoints(endpoints)
+        elapsed = time.monotonic() - start
+
+        # Sequential probing would wait out each slow endpoint in turn
+        self.assertLess(elapsed, SLOW_DELAY_SECONDS)
+        by_name = {check.endpoint.name: check for check in results}
+        self.assertEqual([check.endpoint for check in results], endpoints)
+        for i in range(3):
+            self.assertTrue(by_name[f"ok-{i}"].is_up)
+            self.assertEqual(by_name[f"ok-{i}"].status_code, 200)
+        for name in ("slow-1", "slow-2", "closed"):
+            self.assertFalse(by_name[name].is_up)
+            self.assertIsNone(by_name[name].status_code)
+            self.assertTrue(by_name[name].error)
+        self.assertFalse(by_name["error"].is_up)
+        self.assertEqual(by_name["error"].status_code, 500)
+
+    def test_check_all_endpoints_records_rollups(self):
+        ok = self.endpoint("ok", "/ok")
+        error = self.endpoint("error", "/error")
+        Endpoint.objects.create(
+            name="inactive", url=f"{self.base_url}/inactive", is_active=False
+        )
+
+        self.assertEqual(check_all_endpoints(), "Checked 2 endpoints: 1 up, 1 down")
+        check_all_endpoints()
+
+        self.assertEqual(StatusCheck.objects.count(), 4)
+        rollups = {rollup.endpoint_id: rollup for rollup in StatusRollup.objects.all()}
+        # Both sweeps fall in the same hour and update one rollup per endpoint
+        self.assertEqual(set(rollups), {ok.id, error.id})
+
+        ok_rollup = rollups[ok.id]
+        latencies = sorted(ok.checks.values_list("response_time_ms", flat=True))
+        self.assertEqual((ok_rollup.total_checks, ok_rollup.up_checks), (2, 2))
+        self.assertEqual(ok_rollup.p50_ms, latencies[0])
+        self.assertEqual(ok_rollup.p95_ms, latencies[1])
+        self.assertEqual(ok_rollup.max_ms, latencies[1])
+        self.assertEqual(
+            ok_rollup.period_start, rollup_period(ok.checks.first().checked_at)
+        )
+
+        error_rollup = rollups[error.id]
+        self.assertEqual((error_rollup.total_checks, error_rollup.up_checks), (2, 0))
+        self.assertIsNone(error_rollup.p95_ms)
+
+    def test_purge_old_checks_keeps_rollups_longer(self):
+        ep = self.endpoint("ok", "/ok")
+        now = timezone.now()
+        old_check = StatusCheck.objects.create(endpoint=ep, is_up=True)
+        StatusCheck.objects.filter(pk=old_check.pk).update(
+            checked_at=now - timedelta(days=100)
+        )
+        StatusCheck.objects.create(endpoint=ep, is_up=True)
+        StatusRollup.objects.create(endpoint=ep, period_start=now - timedelta(days=40))
+        StatusRollup.objects.create(endpoint=ep, period_start=now - timedelta(days=400))
+
+        self.assertEqual(
+            purge_old_checks(), "Deleted 1 old status checks and 1 old rollups"
+        )
+        self.assertEqual(StatusCheck.objects.count(), 1)
+        self.assertEqual(StatusRollup.objects.count(), 1)
+
+    def test_backfill_rolls_up_existing_checks(self):
+        ep = self.endpoint("ok", "/ok")
+        hour = rollup_period(timezone.now()) - timedelta(days=45)
+        for minutes, is_up, response_time_ms in [(5, True, 100), (10, True, 300)]:
+            check = StatusCheck.objects.create(
+                endpoint=ep, is_up=is_up, response_time_ms=response_time_ms
+            )
+            StatusCheck.objects.filter(pk=check.pk).update(
+                checked_at=hour + timedelta(minutes=minutes)
+            )
+        StatusCheck.objects.create(endpoint=ep, is_up=False)
+
+        self.assertEqual(backfill_rollups(), 2)
+        # Upserted, so running it again changes nothing
+        self.assertEqual(backfill_rollups(), 2)
+
+        old, recent = StatusRollup.objects.order_by("period_start")
+        self.assertEqual(old.period_start, hour)
+        self.assertEqual((old.total_checks, old.up_checks), (2, 2))
+        self.assertEqual((old.p50_ms, old.max_ms), (100, 300))
+        self.assertEqual((recent.total_checks, recent.up_checks), (1, 0))
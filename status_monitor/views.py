@@ -6,7 +6,7 @@ from django.views.generic import TemplateView
 
 from django_celery_beat.models import PeriodicTask
 
-from .models import Endpoint, StatusCheck
+from .models import Endpoint, StatusCheck, StatusRollup
 
 
 class StatusPageView(TemplateView):
@@ -18,16 +18,18 @@ class StatusPageView(TemplateView):
         thirty_days_ago = now - timedelta(days=30)
 
         endpoints = Endpoint.objects.filter(is_active=True).order_by("name")
-        checks = StatusCheck.objects.filter(
-            endpoint__in=endpoints, checked_at__gte=thirty_days_ago
-        ).values("endpoint_id", "checked_at", "is_up")
+        rollups = StatusRollup.objects.filter(
+            endpoint__in=endpoints, period_start__gte=thirty_days_ago
+        ).values("endpoint_id", "period_start", "total_checks", "up_checks", "p95_ms")
 
         daily = defaultdict(lambda: defaultdict(lambda: {"up": 0, "total": 0}))
-        for c in checks:
-            day = timezone.localtime(c["checked_at"]).date().isoformat()
-            daily[c["endpoint_id"]][day]["total"] += 1
-            if c["is_up"]:
-                daily[c["endpoint_id"]][day]["up"] += 1
+        latest_p95 = {}
+        for r in rollups:
+            day = timezone.localtime(r["period_start"]).date().isoformat()
+            daily[r["endpoint_id"]][day]["total"] += r["total_checks"]
+            daily[r["endpoint_id"]][day]["up"] += r["up_checks"]
+            # Rollups are ordered newest first
+            latest_p95.setdefault(r["endpoint_id"], r["p95_ms"])
 
         date_range = [
             (thirty_days_ago + timedelta(days=i)).date() for i in range(31)
@@ -70,6 +72,7 @@ class StatusPageView(TemplateView):
                 "current_up": current_up,
                 "uptime_pct": uptime_pct,
                 "response_time_ms": latest.response_time_ms if latest else None,
+                "p95_ms": latest_p95.get(ep.id),
                 "days": days,
             })
 
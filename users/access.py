@@ -0,0 +1,123 @@
+"""
+Per-user permission resolution for the project and organization checks.
+
+A user's group names, their organization's project ids (for organization
+admins) and the permission codenames of their role in every project are
+loaded together once per request and cached across requests. Each user's
+cache entry is versioned in the database (see ``utilities.cache``), and
+the version is bumped whenever a group, group membership, project role or
+project that affects the user changes (see ``users.signals``).
+"""
+
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+
+from projects.models import Project
+from users.models import UserProjectGroup
+from utilities.cache import bump_cache_versions, get_or_set_versioned
+
+ADMIN_GROUPS = frozenset(["Organization Admin", "Org Admin", "Administrator"])
+TEST_PLAN_REVIEWER_GROUP = "Test Plan Reviewer"
+
+USER_ACCESS_CACHE_TIMEOUT = 300  # seconds
+
+
+def _project_key(project_id):
+    try:
+        return int(project_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class UserAccess:
+    """Groups, organization projects and project permissions of one user."""
+
+    def __init__(self, groups, organization_projects, project_permissions):
+        self.groups = groups
+        self.organization_projects = organization_projects
+        self.project_permissions = project_permissions
+
+    @property
+    def is_org_admin(self):
+        return not self.groups.isdisjoint(ADMIN_GROUPS)
+
+    def in_group(self, name):
+        return name in self.groups
+
+    def administers(self, project_id):
+        """Whether the user is an admin of the organization owning the project."""
+        return (
+            self.is_org_admin and _project_key(project_id) in self.organization_projects
+        )
+
+    def has_project_permission(self, project_id, codename):
+        """Whether the user's role in the project grants ``codename``."""
+        return codename in self.project_permissions.get(_project_key(project_id), ())
+
+
+def load_user_access(user):
+    groups = frozenset(user.groups.values_list("name", flat=True))
+
+    organization_projects = frozenset()
+    if user.organization_id and not groups.isdisjoint(ADMIN_GROUPS):
+        organization_projects = frozenset(
+            Project.objects.filter(organization_id=user.organization_id).values_list(
+                "id", flat=True
+            )
+        )
+
+    project_permissions = defaultdict(set)
+    for project_id, codename in UserProjectGroup.objects.filter(
+        user_id=user.pk
+    ).values_list("project_id", "group__permissions__codename"):
+        codenames = project_permissions[project_id]
+        if codename:
+            codenames.add(codename)
+
+    return UserAccess(
+        groups,
+        organization_projects,
+        {
+            project_id: frozenset(codes)
+            for project_id, codes in project_permissions.items()
+        },
+    )
+
+
+def _access_version(user_id):
+    return f"users_access:{user_id}"
+
+
+def invalidate_user_access(user_ids):
+    """Drop the cached access of ``user_ids`` once the change commits."""
+    names = [_access_version(user_id) for user_id in set(user_ids)]
+    if names:
+        transaction.on_commit(partial(bump_cache_versions, names))
+
+
+def get_user_access(user):
+    """
+    The ``UserAccess`` of ``user``, read through the cache. The organization
+    id is part of the key, so moving a user to another organization needs no
+    invalidation.
+    """
+    return get_or_set_versioned(
+        _access_version(user.pk),
+        f"users_access:{user.pk}:{user.organization_id}",
+        partial(load_user_access, user),
+        USER_ACCESS_CACHE_TIMEOUT,
+    )
+
+
+def get_request_access(request):
+    """
+    The ``UserAccess`` of the request's user, resolved once and shared by
+    every permission check of the request.
+    """
+    access = getattr(request, "_user_access", None)
+    if access is None:
+        access = get_user_access(request.user)
+        request._user_access = access
+    return access
@@ -77,33 +77,17 @@ class User(AbstractUser):
         if self.is_superadmin or self.is_superuser:
             return True
 
-        if not project and project_id:
-            from projects.models import Project
+        if project:
+            project_id = project.id
 
-            try:
-                project = Project.objects.get(id=project_id)
-            except Project.DoesNotExist:
-                return False
+        from users.access import get_user_access
 
         # org admin should have permission for all the projects in their org
-        if (
-            self.organization
-            and project
-            and project.organization == self.organization
-            and self.groups.filter(
-                name_in=["Organization Admin", "Org Admin", "Administrator"]
-            ).exists()
-        ):
+        access = get_user_access(self)
+        if access.administers(project_id):
             return True
 
-        try:
-            user_project_group = UserProjectGroup.objects.get(
-                user=self, project=project
-            )
-            group = user_project_group.group
-            return group.permissions.filter(codename=codename).exists()
-        except UserProjectGroup.DoesNotExist:
-            return False
+        return access.has_project_permission(project_id, codename)
 
     def get_project_group(self, project):
         """Get the user's group (role) for a specific project."""
@@ -5,6 +5,7 @@ from rest_framework import permissions
 from plans.models import Plan
 from plantations.models import KMLFile
 from projects.models import Project
+from users.access import TEST_PLAN_REVIEWER_GROUP, get_request_access
 
 
 class IsOrganizationMember(permissions.BasePermission):
@@ -19,23 +20,22 @@ class IsOrganizationMember(permissions.BasePermission):
         if request.user.is_superadmin or request.user.is_superuser:
             return True
 
-        return request.user.organization is not None
+        return request.user.organization_id is not None
 
     def has_object_permission(self, request, view, obj):
         if request.user.is_superadmin or request.user.is_superuser:
             return True
 
-        if (
-            request.method in permissions.SAFE_METHODS
-            and request.user.groups.filter(name="Test Plan Reviewer").exists()
-        ):
+        if request.method in permissions.SAFE_METHODS and get_request_access(
+            request
+        ).in_group(TEST_PLAN_REVIEWER_GROUP):
             return True
 
-        if hasattr(obj, "organization"):
-            return obj.organization == request.user.organization
+        if hasattr(obj, "organization_id"):
+            return obj.organization_id == request.user.organization_id
 
-        if hasattr(obj, "project") and hasattr(obj.project, "organization"):
-            return obj.project.organization == request.user.organization
+        if hasattr(obj, "project") and hasattr(obj.project, "organization_id"):
+            return obj.project.organization_id == request.user.organization_id
 
         return False
 
@@ -56,21 +56,14 @@ class HasProjectPermission(permissions.BasePermission):
         if not project_id:
             return False
 
-        if request.user.groups.filter(
-            name__in=["Organization Admin", "Org Admin", "Administrator"]
-        ).exists():
-            try:
-                project = Project.objects.get(id=project_id)
-                return project.organization == request.user.organization
-            except Project.DoesNotExist:
-                return False
+        access = get_request_access(request)
+        if access.is_org_admin:
+            return access.administers(project_id)
 
         method = request.method
         permission_codename = self._get_permission_codename(method, view)
 
-        return request.user.has_project_permission(
-            project_id=project_id, codename=permission_codename
-        )
+        return access.has_project_permission(project_id, permission_codename)
 
     def has_object_permission(self, request, view, obj):
         if request.user.is_superadmin or request.user.is_superuser:
@@ -85,17 +78,14 @@ class HasProjectPermission(permissions.BasePermission):
         if not project:
             return False
 
-        if request.user.groups.filter(
-            name__in=["Organization Admin", "Org Admin", "Administrator"]
-        ).exists():
-            return project.organization == request.user.organization
+        access = get_request_access(request)
+        if access.is_org_admin:
+            return project.organization_id == request.user.organization_id
 
         method = request.method
         permission_codename = self._get_permission_codename(method, view)
 
-        return request.user.has_project_permission(
-            project=project, codename=permission_codename
-        )
+        return access.has_project_permission(project.id, permission_codename)
 
     def _get_permission_codename(self, method, view):
         """Map HTTP methods to permission codenames."""
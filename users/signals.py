@@ -1,8 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
-from users.models import AccountType
+from projects.models import Project
+from users.access import ADMIN_GROUPS, invalidate_user_access
+from users.models import AccountType, UserProjectGroup
 
 User = get_user_model()
 from nrm_app.settings import BASE_URL, ADMIN_GROUP_ID
@@ -75,3 +77,70 @@ def send_email_to_org_admin(sender, instance, created, **kwargs):
             ]
         )
         send_email_notification.delay(subject, "", message, recipients)
+
+
+def _m2m_changed_pks(instance, action, reverse, pk_set, related):
+    """Primary keys of the forward-side rows whose relation changed."""
+    if not reverse:
+        return [instance.pk] if action.startswith("post_") else []
+    if action in ("post_add", "post_remove"):
+        return pk_set
+    if action == "pre_clear":
+        return list(related(instance).values_list("pk", flat=True))
+    return []
+
+
+def _group_users(group_ids):
+    """Users who are members of, or hold a project role in, the groups."""
+    members = User.objects.filter(groups__in=group_ids).values_list("pk", flat=True)
+    role_holders = UserProjectGroup.objects.filter(group_id__in=group_ids)
+    return set(members) | set(role_holders.values_list("user_id", flat=True))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_access_on_membership_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    invalidate_user_access(
+        _m2m_changed_pks(
+            instance, action, reverse, pk_set, lambda group: group.custom_user_set
+        )
+    )
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_access_on_group_permission_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    group_ids = _m2m_changed_pks(
+        instance, action, reverse, pk_set, lambda permission: permission.group_set
+    )
+    if group_ids:
+        invalidate_user_access(_group_users(group_ids))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_access_on_group_change(sender, instance, **kwargs):
+    # pre_delete, as the memberships are gone by post_delete
+    if not kwargs.get("created"):
+        invalidate_user_access(_group_users([instance.pk]))
+
+
+@receiver(post_save, sender=UserProjectGroup)
+@receiver(post_delete, sender=UserProjectGroup)
+def invalidate_access_on_role_change(sender, instance, **kwargs):
+    invalidate_user_access([instance.user_id])
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_access_on_project_change(sender, instance, **kwargs):
+    """Organization admins can access every project of their organization."""
+    if instance.organization_id:
+        invalidate_user_access(
+            User.objects.filter(
+                organization_id=instance.organization_id,
+                groups__name__in=ADMIN_GROUPS,
+            ).values_list("pk", flat=True)
+        )
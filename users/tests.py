@@ -1,3 +1,174 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from organization.models import Organization
+from plans.models import PlanApp
+from plantations.models import KMLFile
+from projects.models import AppType, Project
+
+from .access import get_user_access
+from .models import User, UserProjectGroup
+from .permissions import create_app_permissions
+
+
+class PermissionResolutionTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch("users.signals.send_email_notification")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        create_app_permissions()
+        self.organization = Organization.objects.create(name="Test Organization")
+        owner = User.objects.create_user(
+            username="owner", organization=self.organization
+        )
+        self.watershed = Project.objects.create(
+            name="Watershed",
+            organization=self.organization,
+            app_type=AppType.WATERSHED,
+            created_by=owner,
+            updated_by=owner,
+        )
+        self.plantation = Project.objects.create(
+            name="Plantation",
+            organization=self.organization,
+            app_type=AppType.PLANTATION,
+            created_by=owner,
+            updated_by=owner,
+        )
+
+        self.app_user = Group.objects.create(name="App User")
+        self.app_user.permissions.set(
+            Permission.objects.filter(
+                codename__in=["view_watershed", "add_watershed", "view_plantation"]
+            )
+        )
+        self.user = User.objects.create_user(
+            username="member", organization=self.organization
+        )
+        for project in (self.watershed, self.plantation):
+            UserProjectGroup.objects.create(
+                user=self.user, project=project, group=self.app_user
+            )
+
+        for i in range(5):
+            PlanApp.objects.create(
+                plan=f"Plan {i}",
+                project=self.watershed,
+                organization=self.organization,
+                village_name="Village",
+                gram_panchayat="Panchayat",
+                created_by=owner,
+            )
+            KMLFile.objects.create(
+                project=self.plantation,
+                name=f"site_{i}.kml",
+                file=f"kml/site_{i}.kml",
+                kml_hash=f"hash_{i}",
+                uploaded_by=owner,
+            )
+
+        self.plans_url = reverse(
+            "project-plan-list", kwargs={"project_pk": self.watershed.id}
+        )
+        self.kml_url = reverse(
+            "project-kml-list", kwargs={"project_pk": self.plantation.id}
+        )
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, num_queries):
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_plan_list_resolves_permissions_once(self):
+        # Access version, access (groups, project roles), project, plans with
+        # their relations
+        response = self.get(self.plans_url, 5)
+        self.assertEqual(len(response.data), 5)
+        # Access is cached across requests
+        self.get(self.plans_url, 3)
+
+    def test_kml_list_resolves_permissions_once(self):
+        # Access version, access (groups, project roles), project, KML files
+        # with uploaders
+        response = self.get(self.kml_url, 5)
+        self.assertEqual(len(response.data), 5)
+        self.get(self.kml_url, 3)
+
+    def test_role_and_group_changes_invalidate_cached_access(self):
+        self.get(self.kml_url, 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.app_user.permissions.remove(
+                Permission.objects.get(codename="view_plantation")
+            )
+        response = self.client.get(self.kml_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        # Organization admins can access every project of their organization
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(Group.objects.create(name="Org Admin"))
+        self.get(self.kml_url, 6)
+
+    def test_every_kind_of_change_drops_the_cached_access(self):
+        view_plantation = Permission.objects.get(codename="view_plantation")
+
+        def after(change):
+            get_user_access(self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            return get_user_access(self.user)
+
+        def can_view_plantation(access):
+            return access.has_project_permission(self.plantation.id, "view_plantation")
+
+        # Permissions of a role's group, from either side of the relation
+        access = after(lambda: self.app_user.permissions.remove(view_plantation))
+        self.assertFalse(can_view_plantation(access))
+        access = after(lambda: view_plantation.group_set.add(self.app_user))
+        self.assertTrue(can_view_plantation(access))
+
+        # Project roles
+        role = UserProjectGroup.objects.get(user=self.user, project=self.plantation)
+        self.assertFalse(can_view_plantation(after(role.delete)))
+        role = UserProjectGroup(
+            user=self.user, project=self.plantation, group=self.app_user
+        )
+        self.assertTrue(can_view_plantation(after(role.save)))
+        role.group = Group.objects.create(name="Viewer")
+        self.assertFalse(can_view_plantation(after(role.save)))
+
+        # Group memberships, from either side, and group renames
+        admins = Group.objects.create(name="Org Admin")
+        self.assertTrue(after(lambda: self.user.groups.add(admins)).is_org_admin)
+        admins.name = "Field Staff"
+        access = after(admins.save)
+        self.assertFalse(access.is_org_admin)
+        self.assertTrue(access.in_group("Field Staff"))
+        access = after(admins.custom_user_set.clear)
+        self.assertFalse(access.in_group("Field Staff"))
+
+        reviewers = Group.objects.create(name="Test Plan Reviewer")
+        self.user.groups.add(reviewers)
+        self.assertFalse(after(reviewers.delete).in_group("Test Plan Reviewer"))
+
+        # Projects of an organization the user administers
+        self.user.groups.add(Group.objects.create(name="Administrator"))
+        project = Project(
+            name="Nursery",
+            organization=self.organization,
+            app_type=AppType.PLANTATION,
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        self.assertTrue(after(project.save).administers(project.id))
+        project_id = project.id
+        self.assertFalse(after(project.delete).administers(project_id))
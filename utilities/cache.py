@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import CacheVersion
+
+
+def get_cache_version(name):
+    return (
+        CacheVersion.objects.filter(name=name).values_list("version", flat=True).first()
+        or 1
+    )
+
+
+def bump_cache_version(name):
+    """Invalidate the values cached under ``name`` in every process."""
+    bump_cache_versions([name])
+
+
+def bump_cache_versions(names):
+    """Bump every version in ``names`` with one update and one insert."""
+    names = set(names)
+    existing = set(
+        CacheVersion.objects.filter(name__in=names).values_list("name", flat=True)
+    )
+    CacheVersion.objects.filter(name__in=existing).update(version=F("version") + 1)
+    # A concurrent first bump of the same name also leaves it past 1.
+    CacheVersion.objects.bulk_create(
+        [CacheVersion(name=name, version=2) for name in names - existing],
+        ignore_conflicts=True,
+    )
+
+
+def get_or_set_versioned(name, key, compute, timeout):
+    """
+    Read ``key`` through the cache, recomputing it with ``compute()`` once
+    the version ``name`` has been bumped.
+
+    The version is read from the database on every call, so a bump made by
+    any process is seen at once even when the cache is process-local.
+    """
+    versioned_key = f"{key}:v{get_cache_version(name)}"
+    value = cache.get(versioned_key)
+    if value is None:
+        value = compute()
+        cache.set(versioned_key, value, timeout)
+    return value
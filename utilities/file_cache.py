@@ -0,0 +1,52 @@
+"""
+Bounded in-process cache of values loaded from files.
+
+Several read paths (MWS time series, drainage graphs, vector tile
+geometries, the coordinate search index) keep what they parse from disk in
+memory between requests. ``FileCache`` holds those values in least recently
+used order, drops the oldest once it is full, and reloads a value as soon
+as one of the files it was loaded from is replaced.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_version(path):
+    """Changes whenever the file is rewritten or replaced."""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class FileCache:
+    """LRU cache of at most ``max_entries`` values loaded from files."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, paths, load):
+        """
+        The value cached under ``key``, loaded with ``load()`` if it is not
+        cached or any of ``paths`` changed since it was loaded.
+        """
+        version = tuple(file_version(path) for path in paths)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        value = load()
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -461,6 +461,27 @@ def export_vector_asset_to_gee(fc, description, asset_id):
         return None
 
 
+def append_to_vector_asset(asset_id, fc, description):
+    """
+    Append the features of ``fc`` to the existing table asset ``asset_id``
+    without downloading it: the old and new features are merged server-side
+    into ``{asset_id}_tmp``, which then replaces the asset.
+    """
+    tmp_asset_id = f"{asset_id}_tmp"
+    if is_gee_asset_exists(tmp_asset_id):
+        ee.data.deleteAsset(tmp_asset_id)
+
+    merged = ee.FeatureCollection([ee.FeatureCollection(asset_id), fc]).flatten()
+    task_id = export_vector_asset_to_gee(merged, f"{description}_append", tmp_asset_id)
+    check_task_status([task_id])
+
+    if not is_gee_asset_exists(tmp_asset_id):
+        raise Exception(f"Failed to append features to {asset_id}")
+    ee.data.deleteAsset(asset_id)
+    ee.data.copyAsset(tmp_asset_id, asset_id)
+    ee.data.deleteAsset(tmp_asset_id)
+
+
 def export_raster_asset_to_gee(
     image,
     description,
@@ -496,6 +517,29 @@ def export_raster_asset_to_gee(
         return None
 
 
+def mosaic_into_raster_asset(asset_id, image, description, scale, region):
+    """
+    Paint ``image`` over the existing image asset ``asset_id``: the two are
+    mosaicked server-side into ``{asset_id}_tmp``, which then replaces the
+    asset. Pixels of ``image`` take precedence where both have data.
+    """
+    tmp_asset_id = f"{asset_id}_tmp"
+    if is_gee_asset_exists(tmp_asset_id):
+        ee.data.deleteAsset(tmp_asset_id)
+
+    mosaic = ee.ImageCollection([ee.Image(asset_id), image]).mosaic()
+    task_id = export_raster_asset_to_gee(
+        mosaic, f"{description}_mosaic", tmp_asset_id, scale, region
+    )
+    check_task_status([task_id])
+
+    if not is_gee_asset_exists(tmp_asset_id):
+        raise Exception(f"Failed to mosaic into {asset_id}")
+    ee.data.deleteAsset(asset_id)
+    ee.data.copyAsset(tmp_asset_id, asset_id)
+    ee.data.deleteAsset(tmp_asset_id)
+
+
 def geojson_to_ee_featurecollection(geojson_data):
     """
     Convert a GeoJSON FeatureCollection to an Earth Engine FeatureCollection
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class CacheVersion(models.Model):
+    """
+    Version of a group of cached values. Bumping it in the database makes
+    every process rebuild its cached copies, however its cache is backed.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    version = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
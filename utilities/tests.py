@@ -0,0 +1,54 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from .file_cache import FileCache
+
+
+class FileCacheTest(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.loads = []
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return path
+
+    def get(self, cache, path):
+        def load():
+            self.loads.append(path)
+            with open(path) as f:
+                return f.read()
+
+        return cache.get(path, [path], load)
+
+    def test_value_is_reloaded_when_the_file_is_replaced(self):
+        cache = FileCache(max_entries=4)
+        path = self.write("a", "one")
+        self.assertEqual(self.get(cache, path), "one")
+        self.assertEqual(self.get(cache, path), "one")
+        self.assertEqual(len(self.loads), 1)
+
+        self.write("a", "two")
+        self.assertEqual(self.get(cache, path), "two")
+        self.assertEqual(len(self.loads), 2)
+
+    def test_least_recently_used_value_is_dropped(self):
+        cache = FileCache(max_entries=2)
+        a, b, c = (self.write(name, name) for name in "abc")
+        self.get(cache, a)
+        self.get(cache, b)
+        self.get(cache, a)
+        self.get(cache, c)
+        self.assertEqual(self.loads, [a, b, c])
+
+        self.get(cache, a)
+        self.get(cache, b)
+        self.assertEqual(self.loads, [a, b, c, b])